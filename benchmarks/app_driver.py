@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Runs one Kramden app under the time-to-interactive harness (tti.py).
+
+Started in place of the app's launcher. It instruments the app without
+changing it and appends timing marks, as JSON lines of time.monotonic()
+values, to the file named by KRAMDEN_BENCH_MARKS:
+
+    first-frame      the first window's first frame has been painted
+    page-ready       the visible page has nothing loading on the main loop
+    gather-complete  SpecInfo/SysInfo finished gathering and rendered
+
+Once the first page is ready the driver switches to the app's SpecInfo or
+SysInfo page, the way a technician would, and quits when its gather has
+completed or KRAMDEN_BENCH_TIMEOUT seconds have passed.
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "src")
+
+ENV_MARKS = "KRAMDEN_BENCH_MARKS"
+ENV_TIMEOUT = "KRAMDEN_BENCH_TIMEOUT"
+POLL_MS = 5
+
+# App -> (module, stack page holding SpecInfo/SysInfo, gather page class)
+APPS = {
+    "spec": ("spec", "page2", "SpecInfo"),
+    "osload": ("osload", "page3", "SysInfo"),
+    "finaltest": ("finaltest", "page1", "SysInfo"),
+    "deviceinfo": ("deviceinfo", "page2", "SysInfo"),
+}
+
+
+class MarkWriter:
+    def __init__(self, path):
+        self.path = path
+        self.seen = set()
+
+    def mark(self, name):
+        """Record the first occurrence of name."""
+        if name in self.seen:
+            return
+        self.seen.add(name)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"mark": name, "t": time.monotonic()}) + "\n")
+
+
+def page_loading(page):
+    return bool(getattr(page, "_gather_in_progress", False))
+
+
+class Driver:
+    def __init__(self, app_name, marks, timeout):
+        self.module_name, self.gather_page, self.gather_class = APPS[app_name]
+        self.marks = marks
+        self.timeout = timeout
+        self.app = None
+        self.window = None
+
+    def run(self):
+        from gi.repository import Gio, GLib
+
+        module = importlib.import_module(self.module_name)
+        page_module = importlib.import_module(self.gather_class.lower())
+        self._wrap_gather_complete(getattr(page_module, self.gather_class))
+
+        self.app = module.Application()
+        # Never hand off to an instance already running in this session
+        self.app.set_flags(self.app.get_flags() | Gio.ApplicationFlags.NON_UNIQUE)
+        self.app.connect("window-added", self._on_window_added)
+        GLib.timeout_add_seconds(self.timeout, self._on_timeout)
+        return self.app.run([])
+
+    def _wrap_gather_complete(self, page_class):
+        original = page_class._on_gather_complete
+        driver = self
+
+        def _on_gather_complete(page, *args):
+            result = original(page, *args)
+            driver.marks.mark("gather-complete")
+            driver._quit_when_done()
+            return result
+
+        page_class._on_gather_complete = _on_gather_complete
+
+    def _on_window_added(self, app, window):
+        if self.window is not None:
+            return
+        self.window = window
+        window.connect("realize", self._on_realize)
+
+    def _on_realize(self, window):
+        clock = window.get_frame_clock()
+        self._paint_handler = clock.connect("after-paint", self._on_after_paint)
+
+    def _on_after_paint(self, clock):
+        from gi.repository import GLib
+
+        clock.disconnect(self._paint_handler)
+        self.marks.mark("first-frame")
+        # A low-priority idle only runs once the main loop has drained the
+        # work queued for the first page.
+        GLib.idle_add(self._check_page_ready, priority=GLib.PRIORITY_LOW)
+
+    def _check_page_ready(self):
+        from gi.repository import GLib
+
+        page = self.window.stack.get_visible_child()
+        if page_loading(page) or getattr(self.window, "_resume_pending", False):
+            # Poll rather than spin an idle while a gather thread runs
+            GLib.timeout_add(
+                POLL_MS, self._check_page_ready, priority=GLib.PRIORITY_LOW
+            )
+            return False
+        self.marks.mark("page-ready")
+        self._show_gather_page()
+        self._quit_when_done()
+        return False
+
+    def _show_gather_page(self):
+        window = self.window
+        if window.stack.get_visible_child_name() != self.gather_page:
+            if hasattr(window, "current_page"):
+                window.current_page = int(self.gather_page[len("page") :]) - 1
+            window.stack.set_visible_child_name(self.gather_page)
+            if hasattr(window, "update_buttons"):
+                window.update_buttons()
+
+    def _quit_when_done(self):
+        if {"page-ready", "gather-complete"} <= self.marks.seen:
+            self.app.quit()
+
+    def _on_timeout(self):
+        print(f"app_driver: timed out after {self.timeout} s", file=sys.stderr)
+        self.marks.mark("timeout")
+        self.app.quit()
+        return False
+
+
+def main(argv):
+    if len(argv) != 2 or argv[1] not in APPS:
+        print(f"usage: {argv[0]} {{{','.join(APPS)}}}", file=sys.stderr)
+        return 2
+    marks_path = os.environ.get(ENV_MARKS)
+    if not marks_path:
+        print(f"app_driver: {ENV_MARKS} is not set", file=sys.stderr)
+        return 2
+    sys.path.insert(1, SRC_DIR)
+    timeout = int(os.environ.get(ENV_TIMEOUT, "60"))
+    return Driver(argv[1], MarkWriter(marks_path), timeout).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
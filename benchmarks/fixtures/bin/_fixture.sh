@@ -0,0 +1,20 @@
+# Shared by the benchmark stand-ins for hardware probe commands.
+# KRAMDEN_BENCH_FIXTURES is the directory of recorded outputs and
+# KRAMDEN_BENCH_PROBE_DELAY the seconds each probe takes.
+
+probe_delay() {
+    case "$KRAMDEN_BENCH_PROBE_DELAY" in
+        "" | 0 | 0.0) ;;
+        *) sleep "$KRAMDEN_BENCH_PROBE_DELAY" ;;
+    esac
+}
+
+# Print a recorded output, or fail like a missing tool if there is none
+fixture() {
+    probe_delay
+    if [ -f "$KRAMDEN_BENCH_FIXTURES/$1" ]; then
+        cat "$KRAMDEN_BENCH_FIXTURES/$1"
+    else
+        exit 1
+    fi
+}
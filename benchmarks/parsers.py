@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the text parsers in utils.py.
+
+Each parser is timed against large, realistic inputs: a 24-DIMM server's
+dmidecode dump, a long lspci listing, a 128-thread /proc/cpuinfo and a
+machine with dozens of input devices. Throughput is compared against the
+stored baseline (parsers_baseline.json) and drops beyond the tolerance are
+flagged as regressions.
+
+    python3 benchmarks/parsers.py                      # report and compare
+    python3 benchmarks/parsers.py --check              # exit 1 on regression
+    python3 benchmarks/parsers.py --update-baseline    # after a deliberate change
+
+Baselines are machine-specific; refresh it on the machine that runs the
+comparison.
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(1, os.path.join(BENCH_DIR, "..", "src"))
+
+from utils import Utils
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "parsers_baseline.json")
+BASELINE_VERSION = 1
+DEFAULT_TOLERANCE = 0.25
+
+
+def dmidecode_memory_devices(count, size="16 GB", empty_every=0):
+    devices = []
+    for i in range(count):
+        installed = not (empty_every and i % empty_every == empty_every - 1)
+        devices.append(
+            f"Handle 0x{0x1100 + i:04X}, DMI type 17, 84 bytes\n"
+            "Memory Device\n"
+            "\tArray Handle: 0x1000\n"
+            "\tError Information Handle: Not Provided\n"
+            "\tTotal Width: 72 bits\n"
+            "\tData Width: 64 bits\n"
+            f"\tSize: {size if installed else 'No Module Installed'}\n"
+            "\tForm Factor: DIMM\n"
+            "\tSet: None\n"
+            f"\tLocator: CPU{i // 12 + 1}_DIMM_{chr(65 + i % 12)}1\n"
+            f"\tBank Locator: NODE {i // 12} CHANNEL {i % 12}\n"
+            "\tType: DDR4\n"
+            "\tType Detail: Synchronous Registered (Buffered)\n"
+            "\tSpeed: 2933 MT/s\n"
+            "\tManufacturer: Samsung\n"
+            f"\tSerial Number: {0x3A1F0000 + i:08X}\n"
+            "\tAsset Tag: Not Specified\n"
+            "\tPart Number: M393A2K43DB3-CWE\n"
+            "\tRank: 2\n"
+            "\tConfigured Memory Speed: 2933 MT/s\n"
+            "\tMinimum Voltage: 1.2 V\n"
+            "\tMaximum Voltage: 1.2 V\n"
+            "\tConfigured Voltage: 1.2 V\n"
+            "\tMemory Technology: DRAM\n"
+            "\tMemory Operating Mode Capability: Volatile memory\n"
+            "\tModule Manufacturer ID: Bank 1, Hex 0xCE\n"
+            "\tNon-Volatile Size: None\n"
+            "\tVolatile Size: 16 GB\n"
+            "\tCache Size: None\n"
+            "\tLogical Size: None\n"
+        )
+    return "\n".join(devices) + "\n"
+
+
+def dmidecode_server_dump(computrace_line=None):
+    """A full dmidecode dump from a two-socket, 24-DIMM server."""
+    sections = [
+        "# dmidecode 3.5\nGetting SMBIOS data from sysfs.\nSMBIOS 3.2.0 present.\n",
+        "Handle 0x0000, DMI type 0, 26 bytes\nBIOS Information\n"
+        "\tVendor: Dell Inc.\n\tVersion: 2.19.1\n\tRelease Date: 03/07/2024\n"
+        + "".join(f"\t\tCharacteristic {i} is supported\n" for i in range(24)),
+    ]
+    for cpu in range(2):
+        sections.append(
+            f"Handle 0x04{cpu:02X}, DMI type 4, 48 bytes\nProcessor Information\n"
+            f"\tSocket Designation: CPU{cpu + 1}\n\tType: Central Processor\n"
+            "\tFamily: Xeon\n\tManufacturer: Intel\n"
+            + "".join(f"\t\t{flag}\n" for flag in ("FPU", "VME", "DE", "PSE") * 8)
+            + "\tVersion: Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz\n"
+            "\tCore Count: 20\n\tThread Count: 40\n"
+        )
+    for cache in range(6):
+        sections.append(
+            f"Handle 0x07{cache:02X}, DMI type 7, 27 bytes\nCache Information\n"
+            f"\tSocket Designation: L{cache % 3 + 1} Cache\n"
+            "\tConfiguration: Enabled, Not Socketed, Level 1\n"
+            "\tOperational Mode: Write Back\n\tInstalled Size: 1280 kB\n"
+        )
+    for slot in range(40):
+        sections.append(
+            f"Handle 0x09{slot:02X}, DMI type 9, 17 bytes\nSystem Slot Information\n"
+            f"\tDesignation: PCIe Slot {slot}\n\tType: x16 PCI Express 3\n"
+            "\tCurrent Usage: Available\n\tLength: Long\n"
+            f"\tID: {slot}\n\tBus Address: 0000:{slot:02x}:00.0\n"
+        )
+    options = "\tOption 1: To Be Filled By O.E.M.\n"
+    if computrace_line:
+        options += f"\tOption 2: {computrace_line}\n\tOption 3: Status: Activated\n"
+    sections.append(
+        "Handle 0x0C00, DMI type 12, 5 bytes\nSystem Configuration Options\n" + options
+    )
+    sections.append(
+        "Handle 0x1000, DMI type 16, 23 bytes\nPhysical Memory Array\n"
+        "\tLocation: System Board Or Motherboard\n\tMaximum Capacity: 3 TB\n"
+        "\tNumber Of Devices: 24\n"
+    )
+    sections.append(dmidecode_memory_devices(24))
+    for i in range(24):
+        sections.append(
+            f"Handle 0x13{i:02X}, DMI type 20, 35 bytes\nMemory Device Mapped Address\n"
+            f"\tStarting Address: 0x{i * 0x400000000:011X}\n"
+            f"\tEnding Address: 0x{(i + 1) * 0x400000000 - 1:011X}\n"
+            "\tRange Size: 16 GB\n"
+        )
+    return "\n".join(sections)
+
+
+def lspci_listing(devices=180, dual_gpu=False):
+    lines = []
+    for i in range(devices):
+        bus, dev = divmod(i, 32)
+        lines.append(
+            f"{bus:02x}:{dev:02x}.0 PCI bridge [0604]: Intel Corporation "
+            f"Sky Lake-E PCI Express Root Port {chr(65 + i % 26)} [8086:{0x2030 + i % 16:04x}] (rev 07)"
+        )
+    if dual_gpu:
+        lines.insert(2, "00:02.0 VGA compatible controller [0300]: Intel Corporation "
+                        "CometLake-H GT2 [UHD Graphics] [8086:9bc4] (rev 05)")
+        lines.append("01:00.0 VGA compatible controller [0300]: NVIDIA Corporation "
+                     "TU116M [GeForce GTX 1660 Ti Mobile] [10de:2191] (rev a1)")
+    else:
+        # Server BMC graphics sits behind the bridges
+        lines.append("03:00.0 VGA compatible controller [0300]: ASPEED Technology, "
+                     "Inc. ASPEED Graphics Family [1a03:2000] (rev 41)")
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = [
+    "Mesa Intel(R) UHD Graphics 620 (KBL GT2)",
+    "NVIDIA GeForce GTX 1660 Ti/PCIe/SSE2",
+    "zink Vulkan 1.4(NVIDIA GeForce RTX 3060 Laptop GPU (NVIDIA_PROPRIETARY))",
+    "AMD Radeon Graphics (radeonsi, renoir, LLVM 17.0.6, DRM 3.57, 6.8.0-45-generic)",
+    "llvmpipe (LLVM 17.0.6, 256 bits)",
+    "Mesa Intel(R) Iris(R) Xe Graphics (TGL GT2)",
+    "NV137",
+    "AMD Radeon RX 6600M (radeonsi, navi23, LLVM 17.0.6, DRM 3.57)",
+]
+
+
+def input_devices(count=64):
+    blocks = []
+    for i in range(count - 1):
+        blocks.append(
+            f"I: Bus=0003 Vendor=046d Product={0xc52b + i:04x} Version=0111\n"
+            f'N: Name="Logitech USB Receiver {i}"\n'
+            f"P: Phys=usb-0000:00:14.0-{i % 8}/input{i % 3}\n"
+            f"S: Sysfs=/devices/pci0000:00/0000:00:14.0/usb1/1-{i % 8}/input/input{i}\n"
+            "U: Uniq=\n"
+            f"H: Handlers=sysrq kbd event{i} leds\n"
+            "B: PROP=0\n"
+            "B: EV=120013\n"
+            "B: KEY=1000000000007 ff9f207ac14057ff febeffdfffefffff fffffffffffffffe\n"
+            "B: MSC=10\n"
+            "B: LED=7\n"
+        )
+    blocks.append(
+        "I: Bus=0018 Vendor=04f3 Product=2494 Version=0100\n"
+        'N: Name="ELAN2514:00 04F3:2494"\n'
+        "P: Phys=i2c-ELAN2514:00\n"
+        "H: Handlers=mouse2 event70\n"
+        "B: PROP=2\n"
+        "B: EV=1b\n"
+        "B: KEY=c00 0 0 0 0\n"
+        "B: ABS=3273800000000003\n"
+        "B: MSC=20\n"
+    )
+    return "\n".join(blocks)
+
+
+def cpuinfo(threads=128):
+    flags = " ".join(f"flag{i}" for i in range(140))
+    block = (
+        "processor\t: {n}\n"
+        "vendor_id\t: GenuineIntel\n"
+        "cpu family\t: 6\n"
+        "model\t\t: 85\n"
+        "model name\t: Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz\n"
+        "stepping\t: 7\n"
+        "cpu MHz\t\t: 2100.000\n"
+        "cache size\t: 28160 KB\n"
+        "physical id\t: {socket}\n"
+        "siblings\t: 40\n"
+        "core id\t\t: {core}\n"
+        "cpu cores\t: 20\n"
+        f"flags\t\t: {flags}\n"
+        "bogomips\t: 4200.00\n"
+        "clflush size\t: 64\n"
+        "address sizes\t: 46 bits physical, 48 bits virtual\n"
+        "power management:\n"
+    )
+    return "\n".join(
+        block.format(n=n, socket=n // 64, core=n % 20) for n in range(threads)
+    ) + "\n"
+
+
+KNUMBER_INPUTS = [
+    "k0104521", "K0104521", "104521", " k0104521 ", "TEST-123", "test-7",
+    "k-104521", "kk104521", "", "K01045210", "hello", "k000001",
+] * 20
+
+
+def _renderer_utils():
+    # _format_gpu_renderer needs no probed state; skip the hostnamectl probe
+    return Utils.__new__(Utils)
+
+
+# name -> (function, input, expected result); the result is checked once
+# before timing so the benchmark always exercises the real parsing path.
+def build_cases():
+    utils = _renderer_utils()
+    return {
+        "lspci_integrated": (
+            Utils._parse_lspci_integrated_gpu,
+            lspci_listing(),
+            ("03:00.0", "ASPEED Technology, Inc. ASPEED Graphics Family"),
+        ),
+        "lspci_discrete": (
+            Utils._parse_lspci_discrete_gpu,
+            lspci_listing(dual_gpu=True),
+            (True, True, "01:00.0", "NVIDIA Corporation TU116M [GeForce GTX 1660 Ti Mobile]"),
+        ),
+        "gpu_renderer": (
+            lambda renderers: [utils._format_gpu_renderer(r) for r in renderers],
+            RENDERERS,
+            None,
+        ),
+        "dimm_sizes_24": (
+            Utils._parse_dimm_sizes_mb,
+            dmidecode_memory_devices(24),
+            24 * 16 * 1024,
+        ),
+        "computrace_absent": (
+            Utils._parse_computrace_dmidecode,
+            dmidecode_server_dump(),
+            None,
+        ),
+        "computrace_late": (
+            Utils._parse_computrace_dmidecode,
+            dmidecode_server_dump("Computrace: Absolute Persistence"),
+            True,
+        ),
+        "input_devices_64": (
+            Utils._input_devices_have_touchscreen,
+            input_devices(),
+            True,
+        ),
+        "cpuinfo_128": (
+            Utils._parse_cpu_model,
+            cpuinfo(),
+            "Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz",
+        ),
+        "format_knumber": (
+            lambda values: [Utils.format_knumber(v) for v in values],
+            KNUMBER_INPUTS,
+            None,
+        ),
+    }
+
+
+def input_size(data):
+    if isinstance(data, str):
+        return len(data.encode())
+    return sum(len(item.encode()) for item in data)
+
+
+def measure(fn, data, min_time, repeats):
+    """Best seconds per call over repeats, each running at least min_time."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn(data)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn(data)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def run_benchmarks(cases, min_time, repeats):
+    results = {}
+    # has_touchscreen narrates every device; keep that out of the terminal
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, (fn, data, expected) in cases.items():
+            if expected is not None and fn(data) != expected:
+                raise AssertionError(f"{name}: parser returned an unexpected result")
+            seconds = measure(fn, data, min_time, repeats)
+            size = input_size(data)
+            results[name] = {
+                "input_bytes": size,
+                "us_per_call": round(seconds * 1e6, 2),
+                "calls_per_sec": round(1 / seconds, 1),
+                "mb_per_sec": round(size / seconds / 1e6, 2),
+            }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Annotate results with their ratio to the baseline. Returns regressions."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            result["baseline_ratio"] = None
+            continue
+        ratio = result["calls_per_sec"] / base["calls_per_sec"]
+        result["baseline_ratio"] = round(ratio, 3)
+        result["regressed"] = ratio < 1 - tolerance
+        if result["regressed"]:
+            regressions.append(name)
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if baseline.get("version") != BASELINE_VERSION:
+        print(f"parsers: ignoring baseline version {baseline.get('version')}", file=sys.stderr)
+        return {}
+    return baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the utils.py parsers.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed throughput drop before flagging (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per timing repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="benchmark only these parsers")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    cases = build_cases()
+    if args.only:
+        unknown = set(args.only) - set(cases)
+        if unknown:
+            parser.error(f"unknown parsers: {', '.join(sorted(unknown))}")
+        cases = {name: cases[name] for name in args.only}
+
+    results = run_benchmarks(cases, args.min_time, args.repeats)
+    report = {
+        "version": BASELINE_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        merged = dict(baseline.get("results", {}), **results)
+        with open(args.baseline, "w") as f:
+            json.dump(dict(report, results=merged), f, indent=2)
+            f.write("\n")
+        print(f"parsers: baseline written to {args.baseline}", file=sys.stderr)
+        regressions = []
+    else:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+
+    for name, result in results.items():
+        ratio = result.get("baseline_ratio")
+        flag = "  REGRESSION" if result.get("regressed") else ""
+        print(
+            f"{name:20} {result['us_per_call']:>10.1f} us/call "
+            f"{result['mb_per_sec']:>8.1f} MB/s"
+            + (f"  x{ratio:.2f} vs baseline" if ratio else "")
+            + flag,
+            file=sys.stderr,
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    if regressions and args.check:
+        print(f"parsers: regressions in {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Replays probe bundles through Utils without a display.
+
+Runs the record_probes.py probe suite against each bundle with the recorded
+latencies (scaled by --latency-scale) and reports the wall time of the whole
+suite, the sum of the recorded probe latencies and the Python time spent
+outside them. Good for seeing what a slow machine costs the gather pipeline
+and what a parser change saves, off the bench.
+
+    python3 benchmarks/probe_replay.py tests/probe_bundles/*.json
+    python3 benchmarks/probe_replay.py --latency-scale 0 --runs 50 bundle.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "src")
+sys.path.insert(1, SRC_DIR)
+
+import probe_io
+import record_probes
+
+
+def replay_once(bundle, latency_scale):
+    # The probe suite narrates with print(); keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.monotonic()
+        results, replay = record_probes.replay(
+            bundle, latency_scale=latency_scale, strict=False
+        )
+        elapsed = time.monotonic() - started
+    return elapsed * 1000, results == bundle.get("expected"), replay.misses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay probe bundles through Utils."
+    )
+    parser.add_argument("bundles", nargs="+")
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # Bundles are recorded as a workflow user, which queries Landscape
+    # through sudo
+    os.environ["USER"] = "osload"
+    report = {}
+    for path in args.bundles:
+        bundle = probe_io.load_bundle(path)
+        samples = []
+        matches = True
+        misses = 0
+        for _ in range(args.runs):
+            elapsed_ms, match, run_misses = replay_once(bundle, args.latency_scale)
+            samples.append(elapsed_ms)
+            matches = matches and match
+            misses = max(misses, len(run_misses))
+        recorded_ms = sum(p.get("latency_ms", 0) for p in bundle["probes"])
+        best = min(samples)
+        report[os.path.basename(path)] = {
+            "probes": len(bundle["probes"]),
+            "recorded_latency_ms": round(recorded_ms, 1),
+            "wall_ms": round(best, 1),
+            "overhead_ms": round(best - recorded_ms * args.latency_scale, 1),
+            "matches_expected": matches,
+            "misses": misses,
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
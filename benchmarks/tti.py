@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Time-to-interactive benchmark for the Spec, OS Load, Final Test and Device
+apps.
+
+Each app is launched through app_driver.py on a headless display (Xvfb or
+the GTK Broadway backend). Hardware probes are answered by the fixture
+commands in benchmarks/fixtures/bin, or replayed from a probe bundle
+recorded on a real machine (--bundle). Sortly is never contacted: the API
+key is removed from the environment. For every launch the time from exec
+to first frame, first page ready and SpecInfo/SysInfo gather complete is
+recorded, and cold and warm percentiles are reported as JSON.
+
+    python3 benchmarks/tti.py --runs 10 --output tti.json
+    python3 benchmarks/tti.py --backend broadway --apps spec osload
+    python3 benchmarks/tti.py --bundle tests/probe_bundles/lenovo-legion-dual-gpu.json
+
+"Cold" launches are the first --cold-runs launches of each app. Pass
+--drop-caches (needs passwordless sudo) to drop the page cache before each
+of them; otherwise they only miss the interpreter's bytecode and GTK
+caches of earlier launches in the same session.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+DRIVER = os.path.join(BENCH_DIR, "app_driver.py")
+SHIM_DIR = os.path.join(BENCH_DIR, "fixtures", "bin")
+DEFAULT_FIXTURES = os.path.join(BENCH_DIR, "fixtures", "default")
+
+APPS = ["spec", "osload", "finaltest", "deviceinfo"]
+METRICS = ["first-frame", "page-ready", "gather-complete"]
+RESULT_VERSION = 1
+
+
+def percentile(values, pct):
+    """Linearly interpolated percentile of values (0 <= pct <= 100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarise(samples):
+    """p50/p90/max in ms for each metric over a list of per-run samples."""
+    summary = {}
+    for metric in METRICS:
+        values = [s[metric] for s in samples if s.get(metric) is not None]
+        summary[metric] = {
+            "n": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "max": max(values) if values else None,
+        }
+    return summary
+
+
+def read_marks(path, exec_time):
+    """Milliseconds from exec_time to each mark written by app_driver."""
+    sample = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                sample[record["mark"]] = round((record["t"] - exec_time) * 1000, 1)
+    except FileNotFoundError:
+        pass
+    return sample
+
+
+def drop_caches():
+    try:
+        subprocess.run(["sync"], check=True)
+        subprocess.run(
+            ["sudo", "-n", "sh", "-c", "echo 3 > /proc/sys/vm/drop_caches"],
+            check=True,
+            capture_output=True,
+        )
+        return True
+    except (subprocess.CalledProcessError, OSError):
+        return False
+
+
+class Display:
+    """A headless display for the apps, or the caller's own with native."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.process = None
+        self.env = {}
+
+    def start(self):
+        if self.backend == "xvfb":
+            self._start_xvfb()
+        elif self.backend == "broadway":
+            self._start_broadway()
+
+    def _start_xvfb(self):
+        if not shutil.which("Xvfb"):
+            raise RuntimeError("Xvfb is not installed (apt install xvfb)")
+        read_fd, write_fd = os.pipe()
+        self.process = subprocess.Popen(
+            [
+                "Xvfb",
+                "-displayfd",
+                str(write_fd),
+                "-screen",
+                "0",
+                "1280x1024x24",
+                "-nolisten",
+                "tcp",
+            ],
+            pass_fds=(write_fd,),
+            stderr=subprocess.DEVNULL,
+        )
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            number = f.readline().strip()
+        if not number:
+            raise RuntimeError("Xvfb did not start")
+        self.env = {"DISPLAY": f":{number}", "GDK_BACKEND": "x11"}
+
+    def _start_broadway(self):
+        if not shutil.which("gtk4-broadwayd"):
+            raise RuntimeError("gtk4-broadwayd is not installed")
+        display = ":5"
+        self.process = subprocess.Popen(
+            ["gtk4-broadwayd", display],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # broadwayd has no readiness signal; give it a moment to listen
+        time.sleep(0.5)
+        self.env = {"GDK_BACKEND": "broadway", "BROADWAY_DISPLAY": display}
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+            self.process = None
+
+
+def app_environment(args, display_env, cache_dir):
+    env = dict(os.environ)
+    env.update(display_env)
+    env["PATH"] = SHIM_DIR + os.pathsep + env.get("PATH", "")
+    env["KRAMDEN_BENCH_FIXTURES"] = os.path.abspath(args.fixtures)
+    env["KRAMDEN_BENCH_PROBE_DELAY"] = str(args.probe_delay)
+    env["KRAMDEN_BENCH_TIMEOUT"] = str(args.timeout)
+    if args.bundle:
+        env["KRAMDEN_PROBE_BUNDLE"] = os.path.abspath(args.bundle)
+        env["KRAMDEN_PROBE_LATENCY"] = str(args.probe_latency)
+    else:
+        env.pop("KRAMDEN_PROBE_BUNDLE", None)
+    # No Sortly traffic, and no resume prompt from a real session checkpoint
+    env.pop("SORTLY_API_KEY", None)
+    env.pop("KRAMDEN_RESIDENT_HOST", None)
+    env["XDG_CACHE_HOME"] = cache_dir
+    env["USER"] = env.get("USER") or "benchmark"
+    env["NO_AT_BRIDGE"] = "1"
+    return env
+
+
+def launch(app, env, work_dir, index, verbose=False):
+    marks_path = os.path.join(work_dir, f"{app}-{index}.marks")
+    env = dict(env, KRAMDEN_BENCH_MARKS=marks_path)
+    output = None if verbose else subprocess.DEVNULL
+    exec_time = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, DRIVER, app], env=env, stdout=output, stderr=output
+    )
+    sample = read_marks(marks_path, exec_time)
+    sample["returncode"] = result.returncode
+    return sample
+
+
+def benchmark_app(app, args, env, work_dir):
+    cold, warm = [], []
+    for index in range(args.cold_runs + args.runs):
+        is_cold = index < args.cold_runs
+        if is_cold and args.drop_caches and not drop_caches():
+            print("tti: could not drop caches (needs sudo -n)", file=sys.stderr)
+        sample = launch(app, env, work_dir, index, args.verbose)
+        (cold if is_cold else warm).append(sample)
+        print(
+            f"tti: {app} {'cold' if is_cold else 'warm'} run {index + 1}: "
+            + ", ".join(f"{m} {sample.get(m)} ms" for m in METRICS),
+            file=sys.stderr,
+        )
+    return {
+        "cold": summarise(cold),
+        "warm": summarise(warm),
+        "runs": {"cold": cold, "warm": warm},
+    }
+
+
+def git_revision():
+    try:
+        result = subprocess.run(
+            ["git", "-C", BENCH_DIR, "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Time-to-interactive benchmark for the Kramden apps."
+    )
+    parser.add_argument("--apps", nargs="+", choices=APPS, default=APPS)
+    parser.add_argument(
+        "--backend", choices=["xvfb", "broadway", "native"], default="xvfb"
+    )
+    parser.add_argument("--runs", type=int, default=10, help="warm launches per app")
+    parser.add_argument("--cold-runs", type=int, default=1)
+    parser.add_argument("--drop-caches", action="store_true")
+    parser.add_argument(
+        "--fixtures", default=DEFAULT_FIXTURES, help="directory of probe outputs"
+    )
+    parser.add_argument(
+        "--probe-delay",
+        type=float,
+        default=0.0,
+        help="seconds each fixture command sleeps, to mimic slow firmware",
+    )
+    parser.add_argument(
+        "--bundle", help="replay probes from this bundle (see record_probes.py)"
+    )
+    parser.add_argument(
+        "--probe-latency",
+        type=float,
+        default=1.0,
+        help="scale for the bundle's recorded probe latencies (0 = instant)",
+    )
+    parser.add_argument("--timeout", type=int, default=60, help="seconds per launch")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="show app output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    display = Display(args.backend)
+    try:
+        display.start()
+    except RuntimeError as e:
+        print(f"tti: {e}", file=sys.stderr)
+        return 1
+
+    results = {
+        "version": RESULT_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "fixtures": os.path.abspath(args.fixtures),
+        "probe_delay": args.probe_delay,
+        "bundle": os.path.abspath(args.bundle) if args.bundle else None,
+        "probe_latency": args.probe_latency if args.bundle else None,
+        "apps": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="kramden-tti-") as work_dir:
+            env = app_environment(
+                args, display.env, os.path.join(work_dir, "cache")
+            )
+            for app in args.apps:
+                results["apps"][app] = benchmark_app(app, args, env, work_dir)
+    finally:
+        display.stop()
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
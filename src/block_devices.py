@@ -0,0 +1,247 @@
+"""
+Inventory of the machine's block devices, read in one sysfs/udev pass.
+
+Spec (Utils.get_disks) and Secure Erase both enumerate drives from here
+instead of each running lsblk/pyudev and opening per-disk files. For every
+disk under /sys/block the inventory gives its path, transport, rotational
+flag, size, model, serial, removable flag, the PCI controller it sits behind,
+the link it shares with other drives (bus) and which erase commands its
+transport can take. udev's database under
+/run/udev/data fills in what sysfs does not expose (e.g. SATA serials).
+
+The whole inventory is one probe_io value, so it is recorded and replayed
+with the other hardware probes.
+"""
+
+import os
+import re
+
+import probe_io
+
+SYS_ROOT = "/sys"
+UDEV_DATA_DIR = "/run/udev/data"
+MOUNTS_PATH = "/proc/mounts"
+SWAPS_PATH = "/proc/swaps"
+
+# Kernel block devices that are not drives
+VIRTUAL_PREFIXES = ("loop", "ram", "zram", "sr", "dm-", "md", "nbd", "fd")
+
+_PCI_ADDRESS_RE = re.compile(r"^[0-9a-f]{4}:[0-9a-f]{2}:[0-9a-f]{2}\.[0-7]$")
+
+# Erase commands each transport can carry; which of them the drive
+# actually supports is only known from the drive itself
+ERASE_METHODS = {
+    "nvme": ["nvme-format"],
+    "sata": ["ata-sanitize", "ata-security-erase"],
+}
+
+
+def _read(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _read_int(path):
+    try:
+        return int(_read(path))
+    except ValueError:
+        return None
+
+
+def _read_udev(udev_dir, devnum):
+    """E: properties of a device from udev's database."""
+    properties = {}
+    if not devnum:
+        return properties
+    for line in _read(os.path.join(udev_dir, f"b{devnum}")).splitlines():
+        if line.startswith("E:"):
+            key, _, value = line[2:].partition("=")
+            properties[key] = value
+    return properties
+
+
+def _transport(name, device_path):
+    parts = device_path.split("/")
+    if name.startswith("nvme"):
+        return "nvme"
+    if any(p.startswith("usb") for p in parts):
+        return "usb"
+    if any(re.match(r"^ata\d+$", p) for p in parts):
+        return "sata"
+    if name.startswith("mmcblk"):
+        return "mmc"
+    if any(p.startswith("virtio") for p in parts):
+        return "virtio"
+    if any(re.match(r"^host\d+$", p) for p in parts):
+        return "scsi"
+    return "unknown"
+
+
+def _controller(device_path):
+    """PCI address of the controller nearest the device, if any."""
+    for part in reversed(device_path.split("/")):
+        if _PCI_ADDRESS_RE.match(part):
+            return part
+    return None
+
+
+# sysfs path component where drives start sharing a link: the SATA port (a
+# port multiplier's drives share it), the USB bus, the SCSI host (HBA)
+_BUS_COMPONENTS = {
+    "sata": re.compile(r"^ata\d+$"),
+    "usb": re.compile(r"^usb\d+$"),
+    "scsi": re.compile(r"^host\d+$"),
+}
+
+
+def _bus(sys_root, transport, device_path):
+    """The sysfs path, relative to /sys/devices, of the link the device
+    shares with other drives; for NVMe its own PCI function."""
+    parts = device_path.split("/")
+    pattern = _BUS_COMPONENTS.get(transport)
+    end = None
+    for i, part in enumerate(parts):
+        if pattern is not None and pattern.match(part):
+            end = i
+            break
+        if _PCI_ADDRESS_RE.match(part):
+            end = i
+    path = "/".join(parts[: end + 1]) if end is not None else device_path
+    devices = os.path.realpath(os.path.join(sys_root, "devices")) + "/"
+    return path[len(devices) :] if path.startswith(devices) else path
+
+
+def _vpd_serial(path):
+    # VPD page 0x80: 4 header bytes, then the unit serial number
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return ""
+    return data[4:].decode("ascii", "replace").strip(" \x00")
+
+
+def _read_device(sys_root, udev_dir, name):
+    block_dir = os.path.join(sys_root, "block", name)
+    device_dir = os.path.join(block_dir, "device")
+    # The disk's own sysfs path for SATA/USB; for NVMe, device is the
+    # controller, whose path leads to the PCI function
+    device_path = os.path.realpath(device_dir if os.path.exists(device_dir) else block_dir)
+    udev = _read_udev(udev_dir, _read(os.path.join(block_dir, "dev")))
+
+    transport = _transport(name, device_path)
+    rotational = _read(os.path.join(block_dir, "queue", "rotational"))
+    sectors = _read_int(os.path.join(block_dir, "size")) or 0
+    serial = (
+        _read(os.path.join(device_dir, "serial"))
+        or udev.get("ID_SERIAL_SHORT", "")
+        or _vpd_serial(os.path.join(device_dir, "vpd_pg80"))
+    )
+    model = _read(os.path.join(device_dir, "model")) or udev.get("ID_MODEL", "").replace(
+        "_", " "
+    )
+    return {
+        "name": name,
+        "path": f"/dev/{name}",
+        "transport": transport,
+        "rotational": {"1": True, "0": False}.get(rotational),
+        # sysfs sizes are always in 512-byte sectors
+        "size": sectors * 512,
+        "logical_block_size": _read_int(
+            os.path.join(block_dir, "queue", "logical_block_size")
+        )
+        or 512,
+        "model": model,
+        "serial": serial,
+        "removable": _read(os.path.join(block_dir, "removable")) == "1",
+        "controller": _controller(device_path),
+        "bus": _bus(sys_root, transport, device_path),
+        "erase": {
+            "methods": list(ERASE_METHODS.get(transport, [])),
+            "discard": (
+                _read_int(os.path.join(block_dir, "queue", "discard_max_bytes")) or 0
+            )
+            > 0,
+            "write_zeroes": (
+                _read_int(os.path.join(block_dir, "queue", "write_zeroes_max_bytes"))
+                or 0
+            )
+            > 0,
+        },
+    }
+
+
+def scan(sys_root=SYS_ROOT, udev_dir=UDEV_DATA_DIR):
+    """Every disk under sys_root/block, sorted by name."""
+    try:
+        names = sorted(os.listdir(os.path.join(sys_root, "block")))
+    except OSError as e:
+        print(f"block_devices: cannot list block devices: {e}")
+        return []
+    devices = []
+    for name in names:
+        if name.startswith(VIRTUAL_PREFIXES):
+            continue
+        # Device-mapper targets (LVM, LUKS) are not drives
+        if os.path.exists(os.path.join(sys_root, "block", name, "dm", "name")):
+            continue
+        devices.append(_read_device(sys_root, udev_dir, name))
+    return devices
+
+
+def inventory():
+    """scan() of the machine, through probe_io."""
+    return probe_io.value("block-devices", scan, [])
+
+
+def _device_names(sys_root, name):
+    """name and its partitions' names."""
+    block_dir = os.path.join(sys_root, "block", name)
+    names = [name]
+    try:
+        entries = sorted(os.listdir(block_dir))
+    except OSError:
+        return names
+    for entry in entries:
+        if entry.startswith(name) and os.path.exists(
+            os.path.join(block_dir, entry, "partition")
+        ):
+            names.append(entry)
+    return names
+
+
+def _first_fields(path):
+    try:
+        with open(path, "r") as f:
+            return {line.split()[0] for line in f if line.strip()}
+    except OSError:
+        return set()
+
+
+def in_use(name, sys_root=SYS_ROOT, mounts_path=MOUNTS_PATH, swaps_path=SWAPS_PATH):
+    """True if disk name or one of its partitions is mounted, used as swap
+    or held by device-mapper/md (LVM, LUKS, RAID), e.g. the system disk."""
+    sources = _first_fields(mounts_path) | _first_fields(swaps_path)
+    block_dir = os.path.join(sys_root, "block", name)
+    for device in _device_names(sys_root, name):
+        if f"/dev/{device}" in sources:
+            return True
+        holders = os.path.join(block_dir, "" if device == name else device, "holders")
+        try:
+            if os.listdir(holders):
+                return True
+        except OSError:
+            pass
+    return False
+
+
+def drive_type(device):
+    """NVMe, SATA SSD, SATA HDD, or SATA if the media type is unknown."""
+    if device["transport"] == "nvme":
+        return "NVMe"
+    if device["rotational"] is None:
+        return "SATA"
+    return "SATA HDD" if device["rotational"] else "SATA SSD"
@@ -1,6 +1,7 @@
 import gi
 gi.require_version('Adw', '1')
 from gi.repository import Adw, Gtk
+from task_executor import get_executor
 from utils import Utils
 from constants import snap_packages, deb_packages
 
@@ -14,10 +15,12 @@ class CheckPackages(Adw.Bin):
         self.set_margin_end(20)
         self.title = "Check Software"
         self.skip = False
-        # Used to keep references to the Adw.ActionRow for each snap
+        # Used to keep references to the Adw.ActionRow for each package
         self.known_snap_rows = {}
-        # Used to keep references to the Adw.ActionRow for each deb
         self.known_deb_rows = {}
+        # Last result of each check ({package: installed}), reused when the
+        # page is shown again while a fresh check runs in the background
+        self._results = {"snaps": None, "debs": None}
 
         # Create vbox
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
@@ -39,63 +42,66 @@ class CheckPackages(Adw.Bin):
 
     # on_shown is called when the page is shown in the stack
     def on_shown(self):
-        passed = True
-        snaps_installed = self.utils.check_snaps(snap_packages)
-        for snap in snaps_installed.keys():
-            # If we have an ActionRow already, remove it
-            if snap in self.known_snap_rows.keys():
-                self.check_snaps_row.remove(self.known_snap_rows[snap])
-                del self.known_snap_rows[snap]
+        # The snap and deb checks run concurrently; each fills in its rows
+        # as soon as it finishes. Both are cached, so a re-check is cheap.
+        for kind, expander, check, packages in (
+            ("snaps", self.check_snaps_row, self.utils.check_snaps, snap_packages),
+            ("debs", self.check_debs_row, self.utils.check_debs, deb_packages),
+        ):
+            if self._results[kind] is None:
+                expander.set_subtitle("Checking...")
+            get_executor().submit(
+                f"check-{kind}",
+                lambda token, check=check, packages=packages: check(packages),
+                owner=self,
+                on_done=lambda result, kind=kind: self._on_checked(kind, result),
+                on_error=lambda exc, kind=kind, packages=packages: self._on_check_failed(
+                    kind, packages, exc
+                ),
+            )
 
-            row = Adw.ActionRow(title=snap)
-            # Keep track of ActionRows to prevent duplication
-            self.known_snap_rows[snap] = row
-            self.check_snaps_row.add_row(row)
+    def _on_check_failed(self, kind, packages, exc):
+        print(f"CheckPackages: {kind} check failed: {exc}")
+        self._on_checked(kind, {p: False for p in packages})
 
-            # If not installed flag
-            if not snaps_installed[snap]:
-                row.set_icon_name("emblem-important-symbolic")
-                row.add_css_class("text-error")
-                # FIXME: Disable fix button until implemented
-                # button = Gtk.Button(label='Fix')
-                # button.connect('clicked', self.on_fix_clicked, snap)
-                # row.add_suffix(button)
-                self.check_snaps_row.set_expanded(True)
-                passed = False
-            else:
-                row.set_icon_name("emblem-ok-symbolic")
-                if row.has_css_class("text-error"):
-                    row.remove_css_class("text-error")
-
-        debs_installed = self.utils.check_debs(deb_packages)
-        for deb in debs_installed.keys():
-            # If we have an ActionRow already, remove it
-            if deb in self.known_deb_rows.keys():
-                self.check_debs_row.remove(self.known_deb_rows[deb])
-                del self.known_deb_rows[deb]
+    def _on_checked(self, kind, installed):
+        if kind == "snaps":
+            expander, rows = self.check_snaps_row, self.known_snap_rows
+        else:
+            expander, rows = self.check_debs_row, self.known_deb_rows
+        previous = self._results[kind] or {}
+        self._results[kind] = installed
+        expander.set_subtitle("")
 
-            row = Adw.ActionRow(title=deb)
-            # Keep track of ActionRows to prevent duplication
-            self.known_deb_rows[deb] = row
-            self.check_debs_row.add_row(row)
+        for package, ok in installed.items():
+            row = rows.get(package)
+            if row is None:
+                row = Adw.ActionRow(title=package)
+                # Keep track of ActionRows to prevent duplication
+                rows[package] = row
+                expander.add_row(row)
+            elif previous.get(package) == ok:
+                continue
 
             # If not installed flag
-            if not debs_installed[deb]:
+            if not ok:
                 row.set_icon_name("emblem-important-symbolic")
                 row.add_css_class("text-error")
                 # FIXME: Disable fix button until implemented
-                # button = Gtk.Button(label="Fix")
-                # button.connect('clicked', self.on_fix_clicked, deb)
+                # button = Gtk.Button(label='Fix')
+                # button.connect('clicked', self.on_fix_clicked, package)
                 # row.add_suffix(button)
-                self.check_debs_row.set_expanded(True)
-                passed = False
+                expander.set_expanded(True)
             else:
                 row.set_icon_name("emblem-ok-symbolic")
                 if row.has_css_class("text-error"):
                     row.remove_css_class("text-error")
 
-        state = self.state.get_value()
-        state['CheckPackages'] = passed
+        if None in self._results.values():
+            return
+        passed = all(
+            all(result.values()) for result in self._results.values()
+        )
+        self.state.set('CheckPackages', passed)
         if passed:
             self.skip = True
-        print("check_packages:on_shown " + str(self.state.get_value()))
@@ -9,7 +9,9 @@ from gi.repository import Gdk, Gtk, Adw
 import os
 from sysinfo import SysInfo
 from guide import KramdenGuide
-from observable import ObservableProperty, StateObserver
+from observable import StateStore
+from task_executor import get_executor
+from stall_watchdog import install_from_env
 
 class KramdenDevice(Adw.ApplicationWindow):
     def __init__(self, app):
@@ -18,11 +20,8 @@ class KramdenDevice(Adw.ApplicationWindow):
         self.set_default_size(800, 800)
         self.connect('close-request', self.on_close)
 
-        # Initialize the observable property for tracking state
-        self.observable_property = ObservableProperty({"SysInfo": True})
-        # Create and add an observer
-        observer = StateObserver()
-        self.observable_property.add_observer(observer)
+        # Pass/fail state shared by the pages
+        self.wizard_state = StateStore({"SysInfo": True})
 
         # Create Adw.ToolbarView and add Adw.HeaderBar as the top bar
         toolbar_view = Adw.ToolbarView()
@@ -50,9 +49,9 @@ class KramdenDevice(Adw.ApplicationWindow):
         # View Stack
         self.stack = Adw.ViewStack()
         self.page1 = KramdenGuide()
-        self.page1.state = self.observable_property
+        self.page1.state = self.wizard_state
         self.page2 = SysInfo()
-        self.page2.state = self.observable_property
+        self.page2.state = self.wizard_state
 
         self.stack.add_named(self.page1, "page1")
         self.stack.add_named(self.page2, "page2")
@@ -86,12 +85,18 @@ class KramdenDevice(Adw.ApplicationWindow):
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
 
+        self._visible_page = self.stack.get_visible_child()
+
         # Set title_widget after page was set
         self.stack.connect("notify::visible-child", self.on_visible_page_changed)
 
     def on_visible_page_changed(self, stack, params):
         print("on_visible_page_changed")
         current = stack.get_visible_child()
+        # Background work owned by the page we just left is no longer wanted
+        if self._visible_page is not None and self._visible_page is not current:
+            get_executor().cancel_owner(self._visible_page)
+        self._visible_page = current
         current.on_shown()
 
     def on_guide_clicked(self, button):
@@ -121,10 +126,17 @@ class Application(Adw.Application):
         style_manager = Adw.StyleManager.get_default()
         style_manager.set_color_scheme(Adw.ColorScheme.PREFER_DARK)
 
+        self.stall_watchdog = install_from_env("deviceinfo")
+
     def do_activate(self):
         window = KramdenDevice(self)
         self.add_window(window)
         window.present()
 
-app = Application()
-app.run([])
+def main():
+    app = Application()
+    return app.run([])
+
+
+if __name__ == "__main__":
+    main()
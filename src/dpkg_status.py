@@ -0,0 +1,102 @@
+"""
+Installed Debian packages, read straight from dpkg's status database.
+
+Streams /var/lib/dpkg/status once into a name -> version map instead of
+opening the full apt cache, and keeps the result until dpkg rewrites the
+file, so repeat checks cost a stat().
+"""
+
+import os
+import threading
+
+STATUS_PATH = "/var/lib/dpkg/status"
+
+# dpkg states apt reports as installed (a current version exists)
+INSTALLED_STATES = frozenset(
+    {
+        "installed",
+        "half-installed",
+        "unpacked",
+        "half-configured",
+        "triggers-awaited",
+        "triggers-pending",
+    }
+)
+
+
+def parse_status(lines):
+    """Map installed package names to versions from dpkg status lines.
+
+    Each package is listed under its name and under name:arch, so foreign
+    architecture packages can be asked for either way.
+    """
+    installed = {}
+    package = version = arch = None
+    state_ok = False
+    for line in lines:
+        if line[0:1] in ("\n", ""):
+            if package and state_ok:
+                installed.setdefault(package, version)
+                if arch:
+                    installed[f"{package}:{arch}"] = version
+            package = version = arch = None
+            state_ok = False
+        elif line.startswith("Package:"):
+            package = line[8:].strip()
+        elif line.startswith("Status:"):
+            state_ok = line.split()[-1] in INSTALLED_STATES
+        elif line.startswith("Version:"):
+            version = line[8:].strip()
+        elif line.startswith("Architecture:"):
+            arch = line[13:].strip()
+    if package and state_ok:
+        installed.setdefault(package, version)
+        if arch:
+            installed[f"{package}:{arch}"] = version
+    return installed
+
+
+class DpkgStatus:
+    def __init__(self, path=STATUS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._installed = {}
+
+    def installed(self):
+        """Installed packages as {name: version}, reparsed only after dpkg writes."""
+        try:
+            st = os.stat(self.path)
+        except OSError as e:
+            print(f"dpkg_status: cannot read {self.path}: {e}")
+            return {}
+        # dpkg replaces the file by rename, so the inode changes too
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if stamp != self._stamp:
+                with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                    self._installed = parse_status(f)
+                self._stamp = stamp
+            return self._installed
+
+    def versions(self, packages):
+        """{package: installed version or None}"""
+        installed = self.installed()
+        return {p: installed.get(p) for p in packages}
+
+    def check(self, packages):
+        """{package: True if installed}"""
+        installed = self.installed()
+        return {p: p in installed for p in packages}
+
+
+_status = None
+_status_lock = threading.Lock()
+
+
+def get_status():
+    global _status
+    with _status_lock:
+        if _status is None:
+            _status = DpkgStatus()
+        return _status
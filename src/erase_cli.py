@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Headless secure erase, for scripted batch erasure (e.g. from a PXE image).
+
+Usage:
+    kramden-secure-erase-cli                    erase every drive, after confirming
+    kramden-secure-erase-cli --yes --json       no prompts, JSON Lines on stdout
+    kramden-secure-erase-cli --yes /dev/sdb     erase only /dev/sdb
+    kramden-secure-erase-cli --test             simulate, nothing is erased
+
+Drives are detected, planned, erased and verified through erase_engine, as
+in the Secure Erase window. Drives that are mounted or assembled (the
+system disk) are never erased. With --json every line on stdout is one
+event: "drives", "frozen", "progress", "result" and finally "summary"; log
+messages go to stderr.
+
+Exit status: 0 when every drive was erased, 1 when any failed, 2 when there
+was nothing to erase or the erase was not confirmed.
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+import block_devices
+import erase_engine
+import erase_scheduler
+
+# Seconds between progress events for one drive
+PROGRESS_INTERVAL = 1.0
+FROZEN_POLICIES = ("ask", "suspend", "overwrite", "skip")
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_NOTHING_DONE = 2
+
+
+class Reporter:
+    """Writes events to stream, as JSON Lines or as text for a terminal."""
+
+    def __init__(self, stream, json_lines=False, clock=time.time):
+        self._stream = stream
+        self._json = json_lines
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_progress = {}
+
+    def event(self, kind, **fields):
+        if self._json:
+            record = {"event": kind, "time": round(self._clock(), 3), **fields}
+            line = json.dumps(record)
+        else:
+            line = self._text(kind, fields)
+            if line is None:
+                return
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def progress(self, path, fraction, eta, text):
+        """A progress event, at most one per PROGRESS_INTERVAL per drive."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_progress.get(path)
+            if last is not None and now - last < PROGRESS_INTERVAL and fraction != 1.0:
+                return
+            self._last_progress[path] = now
+        self.event("progress", path=path, fraction=fraction, eta=eta, text=text)
+
+    def _text(self, kind, fields):
+        if kind == "drives":
+            lines = [f"Found {len(fields['drives'])} drive(s) to erase:"]
+            lines += [
+                f"  {d['path']}  {d['type']}  {d['size']}  {d['model']}  {d['serial']}"
+                for d in fields["drives"]
+            ]
+            lines += [f"  {path}: skipped, in use" for path in fields["in_use"]]
+            return "\n".join(lines)
+        if kind == "frozen":
+            return f"Frozen drives: {', '.join(fields['paths'])} ({fields['action']})"
+        if kind == "progress":
+            return f"{fields['path']}: {fields['text']}"
+        if kind == "result":
+            status = "OK" if fields["success"] else "FAILED"
+            text = f"{fields['path']}: {status}: {fields['message']}"
+            if fields["detail"]:
+                text += "\n    " + fields["detail"].replace("\n", "\n    ")
+            return text
+        if kind == "summary":
+            return (
+                f"{fields['succeeded']} of {fields['total']} drives erased, "
+                f"{fields['failed']} failed ({round(fields['elapsed'])} s)"
+            )
+        return None
+
+
+def _confirm(drives, stdin):
+    """Ask the operator to type ERASE."""
+    if not stdin.isatty():
+        print(
+            "erase_cli: not confirmed; pass --yes to erase without a prompt",
+            file=sys.stderr,
+        )
+        return False
+    print(
+        f"\nAbout to permanently erase {len(drives)} drive(s). This CANNOT be undone.",
+        file=sys.stderr,
+    )
+    print('Type "ERASE" to confirm: ', end="", file=sys.stderr, flush=True)
+    return stdin.readline().strip() == "ERASE"
+
+
+def _frozen_action(policy, stdin):
+    """suspend, overwrite or skip for frozen drives under policy."""
+    if policy != "ask":
+        return policy
+    if not stdin.isatty():
+        return "overwrite"
+    print(
+        "Suspend for 5 seconds to unfreeze them? "
+        "Otherwise they are overwritten. [Y/n] ",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+    answer = stdin.readline().strip().lower()
+    return "overwrite" if answer.startswith("n") else "suspend"
+
+
+def select_drives(drives, paths):
+    """(drives, in_use_paths): drives matching paths (all if empty), less
+    the ones in use. Raises ValueError for a path that is not a drive."""
+    if paths:
+        known = {d["path"] for d in drives}
+        unknown = [p for p in paths if p not in known]
+        if unknown:
+            raise ValueError(f"not an erasable drive: {', '.join(unknown)}")
+        drives = [d for d in drives if d["path"] in paths]
+    busy = [
+        d["path"] for d in drives if block_devices.in_use(os.path.basename(d["path"]))
+    ]
+    return [d for d in drives if d["path"] not in busy], busy
+
+
+def erase_one(drive, drive_plan, args, reporter, cancel, scheduler, skip=False):
+    """Erase (and verify) one drive and report its result. Returns success."""
+    path = drive["path"]
+    started = time.monotonic()
+
+    def on_progress(fraction, eta, text):
+        reporter.progress(path, fraction, eta, text)
+
+    host_io = scheduler.for_drive(drive, on_progress)
+    if skip:
+        success, message, detail = False, f"Skipped {path}", "The drive is frozen."
+    else:
+        success, message, detail, method = erase_engine.erase_drive(
+            drive, args.test, on_progress, cancel, drive_plan, host_io
+        )
+        if success and args.verify:
+            success, message, detail = erase_engine.verify_drive(
+                drive, args.test, message, on_progress, host_io, method
+            )
+    reporter.event(
+        "result",
+        path=path,
+        model=drive["model"],
+        serial=drive["serial"],
+        success=success,
+        message=message,
+        detail=detail,
+        elapsed=round(time.monotonic() - started, 1),
+    )
+    return success
+
+
+def run(args, reporter, stdin=sys.stdin, cancel=None):
+    cancel = cancel or threading.Event()
+    started = time.monotonic()
+    try:
+        drives, busy = select_drives(erase_engine.detect_drives(), args.devices)
+    except ValueError as e:
+        print(f"erase_cli: {e}", file=sys.stderr)
+        return EXIT_NOTHING_DONE
+    reporter.event("drives", drives=drives, in_use=busy)
+    if not drives:
+        return EXIT_NOTHING_DONE
+    if not args.yes and not _confirm(drives, stdin):
+        return EXIT_NOTHING_DONE
+
+    jobs = args.jobs or len(drives)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        plans = dict(
+            zip(
+                [d["path"] for d in drives],
+                executor.map(lambda d: erase_engine.preflight(d, args.test), drives),
+            )
+        )
+        frozen = [p for p, plan in plans.items() if erase_engine.needs_unfreeze(plan)]
+        skipped = set()
+        if frozen:
+            action = _frozen_action(args.frozen, stdin)
+            reporter.event("frozen", paths=frozen, action=action)
+            if action == "suspend":
+                erase_engine.suspend_to_unfreeze()
+                for drive in drives:
+                    if drive["path"] in frozen:
+                        plans[drive["path"]] = erase_engine.preflight(drive, args.test)
+            elif action == "skip":
+                skipped = set(frozen)
+        # In-drive erases start first; overwrites and verifies take turns
+        # on each shared bus
+        scheduler = erase_scheduler.BusScheduler(args.per_bus)
+        results = list(
+            executor.map(
+                lambda d: erase_one(
+                    d,
+                    plans[d["path"]],
+                    args,
+                    reporter,
+                    cancel,
+                    scheduler,
+                    d["path"] in skipped,
+                ),
+                erase_scheduler.order(drives, plans),
+            )
+        )
+    succeeded = sum(results)
+    reporter.event(
+        "summary",
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        elapsed=round(time.monotonic() - started, 1),
+    )
+    return EXIT_OK if all(results) else EXIT_FAILED
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Securely erase this machine's drives")
+    parser.add_argument("devices", nargs="*", help="drives to erase (default: all)")
+    parser.add_argument("--yes", action="store_true", help="erase without confirming")
+    parser.add_argument("--test", action="store_true", help="simulate; erase nothing")
+    parser.add_argument(
+        "--json", action="store_true", help="JSON Lines events on stdout"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=0, help="drives erased at once (default: all)"
+    )
+    parser.add_argument(
+        "--per-bus",
+        type=int,
+        default=erase_scheduler.DEFAULT_MAX_PER_BUS,
+        help="drives overwritten or verified at once per SATA port, USB bus "
+        "or HBA (0: no limit)",
+    )
+    parser.add_argument(
+        "--frozen",
+        choices=FROZEN_POLICIES,
+        default="ask",
+        help="frozen SATA drives: suspend to unfreeze them, overwrite or skip "
+        "them (ask: prompt on a terminal, otherwise overwrite)",
+    )
+    parser.add_argument(
+        "--no-verify",
+        dest="verify",
+        action="store_false",
+        help="skip the read-back check",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cancel = threading.Event()
+    # Overwrites stop at their checkpoint; a sanitize in the drive cannot be
+    # stopped
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: cancel.set())
+    reporter = Reporter(sys.stdout, json_lines=args.json)
+    if not args.json:
+        return run(args, reporter, cancel=cancel)
+    # Keep stdout for events only
+    with contextlib.redirect_stdout(sys.stderr):
+        return run(args, reporter, cancel=cancel)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Secure erase engine: detect, plan, erase and verify drives, without GTK.
+
+The Secure Erase window (secureerase) and the headless CLI (erase_cli) both
+erase through here. Every function reports progress through
+on_progress(fraction, eta_seconds, text) (see erase_progress) and returns
+(success, short_message, detail) so the caller decides how to show it;
+erase_drive() also returns the method that erased the drive.
+"""
+
+import contextlib
+import subprocess
+import time
+
+import block_devices
+import erase_overwrite
+import erase_planner
+import erase_progress
+import erase_verify
+
+FROZEN_DETAIL = "The drive is frozen; suspend and resume the computer to unfreeze it."
+
+
+def detect_drives():
+    """Detect non-removable SATA and NVMe drives from the block-device inventory."""
+    drives = []
+    for device in block_devices.inventory():
+        if device["removable"]:
+            continue
+        drives.append(
+            {
+                "path": device["path"],
+                "type": "NVMe" if device["transport"] == "nvme" else "SATA",
+                "size": _format_size(device["size"]),
+                "size_bytes": device["size"],
+                "model": device["model"],
+                "serial": device["serial"],
+                "transport": device["transport"],
+                "controller": device["controller"],
+                "bus": device.get("bus"),
+                "erase": device["erase"],
+            }
+        )
+    return drives
+
+
+def _format_size(size_bytes):
+    """Drive size in human-readable format."""
+    if not size_bytes:
+        return "Unknown"
+    size_gb = round(size_bytes / (1024**3), 1)
+    return f"{size_gb} GB"
+
+
+def erase_drive(
+    drive, test_mode, on_progress=None, cancel=None, plan=None, host_io=None
+):
+    """Erase a single drive. Returns (success, short_message, detail,
+    method), method being the erase_planner method that erased the drive
+    (None if none did, or in test mode); pass it on to verify_drive().
+
+    The methods the drive supports are tried fastest first (see
+    erase_planner); drives behind USB bridges, and drives that take none of
+    them, are overwritten. on_progress(fraction, eta_seconds, text) is
+    called from this thread while the erase runs; see erase_progress.
+    Setting cancel stops an overwrite at its checkpoint. plan is the
+    (methods, caps) from erase_planner.plan_drive(), planned here if None.
+    host_io() is entered around work that moves the drive's data over its
+    bus (see erase_scheduler).
+    """
+    path = drive["path"]
+    drive_type = drive["type"]
+
+    if test_mode:
+        estimate = erase_progress.ProgressEstimate(2)
+        for _ in range(10):
+            time.sleep(0.2)
+            if on_progress:
+                fraction, eta = estimate.update()
+                text = f"[TEST] Erasing  —  {int(fraction * 100)}%"
+                on_progress(fraction, eta, text)
+        return True, f"[TEST] Would erase {drive_type} drive {path}", None, None
+
+    if drive.get("transport") == "usb":
+        # USB bridges rarely pass ATA/NVMe erase commands through
+        print(f"erase_engine: {path}: behind a USB bridge, overwriting")
+        return _overwritten(
+            overwrite_drive(drive, test_mode, on_progress, cancel, host_io)
+        )
+
+    methods, caps = plan or erase_planner.plan_drive(drive)
+    print(f"erase_engine: {path}: erase plan: {', '.join(methods) or 'none'}")
+
+    failures = []
+    for method in methods:
+        label = erase_planner.METHOD_LABELS[method]
+        print(f"erase_engine: {path}: erasing with {label}")
+        progress = None
+        if on_progress:
+            on_progress(None, None, f"{label}  —  starting")
+
+            def progress(fraction, eta, text, label=label):
+                on_progress(fraction, eta, f"{label}: {text}")
+
+        try:
+            ok, detail = ERASE_METHODS[method](path, caps, progress)
+        except OSError as e:
+            ok, detail = False, str(e)
+        if ok:
+            print(f"erase_engine: {path}: erased with {label}")
+            return True, f"Erased {path} with {label}", None, method
+        print(f"erase_engine: {path}: {label} failed")
+        failures.append(f"{label} failed:\n{detail}" if detail else f"{label} failed")
+    if not methods:
+        failures.append("The drive supports no allowed erase method.")
+
+    success, short_message, detail = overwrite_drive(
+        drive, test_mode, on_progress, cancel, host_io
+    )
+    if not success:
+        failures.append(detail)
+        detail = "\n\n".join(f for f in failures if f)
+    return _overwritten((success, short_message, detail))
+
+
+def _overwritten(result):
+    """An overwrite_drive() result with the method, as erase_drive returns."""
+    success, short_message, detail = result
+    return success, short_message, detail, (
+        erase_planner.OVERWRITE_METHOD if success else None
+    )
+
+
+def overwrite_drive(drive, test_mode, on_progress=None, cancel=None, host_io=None):
+    """Overwrite a drive with zeros (see erase_overwrite). Returns (success,
+    short_message, detail). A cancelled overwrite resumes on the next try."""
+    path = drive["path"]
+    label = erase_planner.METHOD_LABELS[erase_planner.OVERWRITE_METHOD]
+    if test_mode:
+        return True, f"[TEST] Would overwrite {drive['type']} drive {path}", None
+    try:
+        with (host_io or contextlib.nullcontext)():
+            print(f"erase_engine: {path}: erasing with {label}")
+            result = erase_overwrite.overwrite_privileged(
+                path,
+                on_progress=on_progress,
+                cancel=cancel,
+                checkpoint_path=erase_overwrite.checkpoint_path_for(drive),
+            )
+    except OSError as e:
+        return False, f"Failed to erase {path}", f"{label} failed:\n{e}"
+    summary = erase_overwrite.describe(result)
+    print(f"erase_engine: {path}: {summary}")
+    if result["complete"]:
+        return True, f"Erased {path} with {label}", None
+    return False, f"Failed to erase {path}", f"{label} failed:\n{summary}"
+
+
+def _output(result):
+    return (result.stdout.strip() + "\n" + result.stderr.strip()).strip()
+
+
+def _ata_sanitize(path, option, on_progress):
+    result = subprocess.run(
+        erase_planner.as_root(
+            ["hdparm", "--yes-i-know-what-i-am-doing", option, path]
+        ),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return False, _output(result) or None
+    # The command only starts the sanitize; the drive reports when it has
+    # finished
+    return erase_progress.wait_for_sanitize(
+        erase_planner.as_root(["hdparm", "--sanitize-status", path]),
+        erase_progress.parse_hdparm_sanitize_status,
+        on_progress,
+    )
+
+
+def _ata_security_erase(path, caps, on_progress, enhanced=False):
+    # Security commands will fail on frozen drives
+    if caps["security"]["frozen"]:
+        return False, FROZEN_DETAIL
+
+    # Set a temporary password (required before security erase)
+    result = subprocess.run(
+        erase_planner.as_root(["hdparm", "--security-set-pass", "p", path]),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        detail = _output(result)
+        return False, f"Could not set security password:\n{detail}" if detail else None
+
+    # Issue ATA Security Erase, showing progress against the drive's own
+    # estimate ("NNmin for SECURITY ERASE UNIT")
+    option = "--security-erase-enhanced" if enhanced else "--security-erase"
+    result = erase_progress.run_with_estimate(
+        erase_planner.as_root(["hdparm", option, "p", path]),
+        "Erasing",
+        caps["security"]["times"].get("enhanced" if enhanced else "normal"),
+        on_progress,
+    )
+    if result.returncode == 0:
+        return True, None
+
+    # Erase failed — try to clear the password so the drive isn't left locked
+    subprocess.run(
+        erase_planner.as_root(["hdparm", "--security-disable", "p", path]),
+        capture_output=True,
+        text=True,
+    )
+    return False, _output(result) or None
+
+
+def _nvme_sanitize(path, caps, on_progress, method):
+    controller = erase_planner.nvme_controller(path)
+    sanact = 4 if method == "nvme-sanitize-crypto" else 2
+    result = subprocess.run(
+        erase_planner.as_root(
+            ["nvme", "sanitize", controller, f"--sanact={sanact}"]
+        ),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return False, _output(result) or None
+    return erase_progress.wait_for_sanitize(
+        erase_planner.as_root(["nvme", "sanitize-log", controller, "-o", "json"]),
+        erase_progress.parse_nvme_sanitize_log,
+        on_progress,
+        caps["times"].get(method),
+    )
+
+
+def _nvme_format(path, caps, on_progress, ses):
+    args = erase_planner.as_root(["nvme", "format", "--force", f"--ses={ses}"])
+    # Keep the current LBA format; older nvme-cli defaults to format 0
+    if caps["lbaf"] is not None:
+        args.append(f"--lbaf={caps['lbaf']}")
+    # FORMAT returns when the drive is done; it reports no progress
+    result = erase_progress.run_with_estimate(
+        args + [path], "Formatting", on_progress=on_progress
+    )
+    if result.returncode == 0:
+        return True, None
+    return False, _output(result) or None
+
+
+ERASE_METHODS = {
+    "sanitize-crypto": lambda path, caps, progress: _ata_sanitize(
+        path, "--sanitize-crypto-scramble", progress
+    ),
+    "sanitize-block": lambda path, caps, progress: _ata_sanitize(
+        path, "--sanitize-block-erase", progress
+    ),
+    "ata-enhanced-security-erase": lambda path, caps, progress: _ata_security_erase(
+        path, caps, progress, enhanced=True
+    ),
+    "ata-security-erase": _ata_security_erase,
+    "nvme-sanitize-crypto": lambda path, caps, progress: _nvme_sanitize(
+        path, caps, progress, "nvme-sanitize-crypto"
+    ),
+    "nvme-sanitize-block": lambda path, caps, progress: _nvme_sanitize(
+        path, caps, progress, "nvme-sanitize-block"
+    ),
+    "nvme-format-crypto": lambda path, caps, progress: _nvme_format(
+        path, caps, progress, 2
+    ),
+    "nvme-format-user-data": lambda path, caps, progress: _nvme_format(
+        path, caps, progress, 1
+    ),
+}
+
+
+def preflight(drive, test_mode):
+    """(methods, caps) for drive from erase_planner, or None when the drive
+    is not planned (test mode, drives behind USB bridges)."""
+    if test_mode or drive.get("transport") == "usb":
+        return None
+    return erase_planner.plan_drive(drive)
+
+
+def needs_unfreeze(drive_plan):
+    """True if a preflight() result can only run after a suspend/resume."""
+    return drive_plan is not None and erase_planner.needs_unfreeze(*drive_plan)
+
+
+def suspend_to_unfreeze():
+    """Suspend for 5 seconds; drives come back from resume unfrozen."""
+    subprocess.run(
+        erase_planner.as_root(["rtcwake", "-m", "mem", "-s", "5"]), capture_output=True
+    )
+
+
+def verify_drive(
+    drive, test_mode, erase_message, on_progress=None, host_io=None, method=None
+):
+    """Sample an erased drive (see erase_verify). Returns (success,
+    short_message, detail). host_io is as for erase_drive(); method is the
+    one erase_drive() returned. After a crypto erase the drive reads back
+    as random data, so there is nothing to verify by sampling."""
+    path = drive["path"]
+    if test_mode:
+        return True, f"{erase_message} [TEST] Would verify {path}", None
+    if method in erase_planner.CRYPTO_METHODS:
+        print(f"erase_engine: {path}: crypto erase, read-back check not applicable")
+        return (
+            True,
+            f"{erase_message}. Read-back check not applicable after a crypto erase",
+            None,
+        )
+
+    def progress(fraction):
+        if on_progress:
+            on_progress(fraction, None, f"Verifying  —  {int(fraction * 100)}%")
+
+    try:
+        with (host_io or contextlib.nullcontext)():
+            result = erase_verify.verify_privileged(path, progress)
+    except OSError as e:
+        return False, f"Could not verify {path}", str(e)
+    summary = erase_verify.describe(result)
+    print(f"erase_engine: {path}: {summary}")
+    if result["verified"]:
+        return True, f"{erase_message}. {summary}", None
+    offsets = ", ".join(f"{o:#x}" for o in result["mismatches"])
+    return (
+        False,
+        f"{path} erased but failed verification",
+        f"{summary}\nData found at offsets: {offsets}",
+    )
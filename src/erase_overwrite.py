@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Overwrite erase, the fallback for drives that take no sanitize or security
+erase command (frozen drives when suspend is declined, drives behind USB
+bridges, drives that reject both).
+
+Each pass writes the whole device with large aligned O_DIRECT writes from
+one reusable buffer (zeros, or pseudo-random bytes regenerated from a seed
+per pass), with several writers in flight per device. The contiguous
+written offset is checkpointed, so a cancelled or interrupted overwrite
+resumes where it stopped. A checkpoint is only resumed on the boot that
+wrote it: after a reboot the drive may have been written again (reimaged)
+below the checkpointed offset, so the overwrite starts over. An optional verify pass compares a sample of
+blocks (see erase_verify) with what was written.
+
+Run as a script (usually through sudo) it overwrites one device and prints
+progress lines and a JSON result, like erase_verify.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import erase_progress
+import erase_verify
+import session_checkpoint
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_WRITERS = 4
+# O_DIRECT writes must be multiples of the device's block size; 4 KiB
+# covers 512-byte and 4Kn drives
+DIRECT_ALIGNMENT = 4096
+CHECKPOINT_VERSION = 2
+CHECKPOINT_INTERVAL = 5.0
+PROGRESS_INTERVAL = 0.5
+PATTERNS = ("zero", "random")
+
+
+def _save_json(path, data):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class OverwriteEngine:
+    def __init__(
+        self,
+        path,
+        pattern="zero",
+        passes=1,
+        block_size=DEFAULT_BLOCK_SIZE,
+        writers=DEFAULT_WRITERS,
+        verify=False,
+        checkpoint_path=None,
+        on_progress=None,
+        cancel=None,
+        boot_id=None,
+    ):
+        if pattern not in PATTERNS:
+            raise ValueError(f"unknown pattern {pattern!r}")
+        if block_size % DIRECT_ALIGNMENT:
+            raise ValueError(f"block size must be a multiple of {DIRECT_ALIGNMENT}")
+        self.path = path
+        self.pattern = pattern
+        self.passes = passes
+        self.block_size = block_size
+        self.writers = writers
+        self.verify = verify
+        self.checkpoint_path = checkpoint_path
+        if boot_id is None:
+            boot_id = session_checkpoint.read_boot_id()
+        self.boot_id = boot_id
+        self.on_progress = on_progress
+        self.cancel = cancel or threading.Event()
+        self.seed = random.SystemRandom().getrandbits(64)
+        self._lock = threading.Lock()
+        self._error = None
+
+    # Checkpoints
+
+    def _load_checkpoint(self, size):
+        """(pass, offset) to resume from, or (0, 0)."""
+        # Without a boot id a checkpoint could be resumed after a reboot
+        if not self.checkpoint_path or not self.boot_id:
+            return 0, 0
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0, 0
+        except (OSError, ValueError) as e:
+            print(f"erase_overwrite: ignoring unreadable {self.checkpoint_path}: {e}")
+            return 0, 0
+        if not isinstance(data, dict) or any(
+            data.get(key) != value
+            for key, value in (
+                ("version", CHECKPOINT_VERSION),
+                ("boot_id", self.boot_id),
+                ("size", size),
+                ("pattern", self.pattern),
+                ("passes", self.passes),
+                ("block_size", self.block_size),
+            )
+        ):
+            print(
+                "erase_overwrite: checkpoint is for another overwrite or boot, "
+                "starting over"
+            )
+            return 0, 0
+        self.seed = data["seed"]
+        return data["pass"], data["offset"]
+
+    def _save_checkpoint(self, size, pass_index, offset):
+        if not self.checkpoint_path or not self.boot_id:
+            return
+        try:
+            _save_json(
+                self.checkpoint_path,
+                {
+                    "version": CHECKPOINT_VERSION,
+                    "boot_id": self.boot_id,
+                    "path": self.path,
+                    "size": size,
+                    "pattern": self.pattern,
+                    "passes": self.passes,
+                    "block_size": self.block_size,
+                    "seed": self.seed,
+                    "pass": pass_index,
+                    "offset": offset,
+                },
+            )
+        except OSError as e:
+            print(f"erase_overwrite: could not write {self.checkpoint_path}: {e}")
+
+    def _clear_checkpoint(self):
+        if self.checkpoint_path:
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
+
+    # Writing
+
+    def _buffer(self, pass_index):
+        buf = mmap.mmap(-1, self.block_size)
+        if self.pattern == "random":
+            rng = random.Random(f"{self.seed}:{pass_index}")
+            buf[:] = rng.randbytes(self.block_size)
+        return buf
+
+    def _writer(self, fds, buf, size, start, state):
+        view = memoryview(buf)
+        while not self.cancel.is_set():
+            with self._lock:
+                if self._error is not None:
+                    return
+                index = state["next"]
+                state["next"] += 1
+            offset = start + index * self.block_size
+            if offset >= size:
+                return
+            length = min(self.block_size, size - offset)
+            direct_fd, buffered_fd = fds
+            # A tail shorter than the direct alignment goes through the cache
+            fd = direct_fd if length % DIRECT_ALIGNMENT == 0 else buffered_fd
+            try:
+                written = 0
+                while written < length:
+                    written += os.pwritev(
+                        fd, [view[written:length]], offset + written
+                    )
+            except OSError as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = f"write at {offset:#x} failed: {e}"
+                return
+            with self._lock:
+                state["done"].add(index)
+                while state["low"] in state["done"]:
+                    state["done"].discard(state["low"])
+                    state["low"] += 1
+                state["bytes"] += length
+
+    def _report(self, size, pass_index, pass_offset, session_bytes, started):
+        if self.on_progress is None:
+            return
+        total = size * self.passes
+        done = size * pass_index + pass_offset
+        fraction = done / total if total else 1.0
+        elapsed = time.monotonic() - started
+        rate = session_bytes / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        text = f"Overwriting pass {pass_index + 1}/{self.passes}  —  {int(fraction * 100)}%"
+        if rate:
+            text += f"  —  {rate / 1e6:.0f} MB/s"
+        if eta is not None:
+            text += f"  —  {erase_progress.format_eta(eta)}"
+        self.on_progress(fraction, eta, text)
+
+    def _open(self):
+        try:
+            return os.open(self.path, os.O_WRONLY | os.O_DIRECT), True
+        except OSError:
+            return os.open(self.path, os.O_WRONLY), False
+
+    def run(self):
+        """Overwrite the device. Returns a result dict."""
+        started = time.monotonic()
+        direct_fd, direct = self._open()
+        buffered_fd = os.open(self.path, os.O_WRONLY)
+        session_bytes = 0
+        verified = None
+        try:
+            size = os.lseek(direct_fd, 0, os.SEEK_END)
+            start_pass, start_offset = self._load_checkpoint(size)
+            resumed = (
+                {"pass": start_pass, "offset": start_offset}
+                if start_pass or start_offset
+                else None
+            )
+            if resumed:
+                print(
+                    f"erase_overwrite: resuming {self.path} at pass {start_pass + 1}, "
+                    f"offset {start_offset:#x}"
+                )
+            last_checkpoint = time.monotonic()
+            for pass_index in range(start_pass, self.passes):
+                start = start_offset if pass_index == start_pass else 0
+                buf = self._buffer(pass_index)
+                state = {"next": 0, "low": 0, "done": set(), "bytes": 0}
+                threads = [
+                    threading.Thread(
+                        target=self._writer,
+                        args=((direct_fd, buffered_fd), buf, size, start, state),
+                        daemon=True,
+                    )
+                    for _ in range(self.writers)
+                ]
+                for thread in threads:
+                    thread.start()
+                while any(t.is_alive() for t in threads):
+                    threads[0].join(PROGRESS_INTERVAL)
+                    with self._lock:
+                        offset = min(size, start + state["low"] * self.block_size)
+                        pass_bytes = state["bytes"]
+                    self._report(
+                        size, pass_index, offset, session_bytes + pass_bytes, started
+                    )
+                    if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                        self._save_checkpoint(size, pass_index, offset)
+                        last_checkpoint = time.monotonic()
+                for thread in threads:
+                    thread.join()
+                session_bytes += state["bytes"]
+                offset = min(size, start + state["low"] * self.block_size)
+                self._report(size, pass_index, offset, session_bytes, started)
+                os.fsync(direct_fd)
+                os.fsync(buffered_fd)
+                if self._error is not None or self.cancel.is_set():
+                    self._save_checkpoint(size, pass_index, offset)
+                    break
+                self._save_checkpoint(size, pass_index + 1, 0)
+            complete = self._error is None and not self.cancel.is_set()
+            if complete and self.verify:
+                verified = self._verify(size)
+            if complete:
+                self._clear_checkpoint()
+        finally:
+            os.close(direct_fd)
+            os.close(buffered_fd)
+        elapsed = time.monotonic() - started
+        return {
+            "path": self.path,
+            "complete": complete,
+            "error": self._error,
+            "pattern": self.pattern,
+            "passes": self.passes,
+            "size": size,
+            "bytes_written": session_bytes,
+            "elapsed": round(elapsed, 3),
+            "throughput": session_bytes / elapsed if elapsed > 0 else 0.0,
+            "direct": direct,
+            "resumed_from": resumed,
+            "verified": verified,
+        }
+
+    def _verify(self, size):
+        """Compare a sample of blocks with the last pass's buffer."""
+        buf = self._buffer(self.passes - 1)
+        if self.on_progress:
+            self.on_progress(None, None, "Verifying overwrite")
+        offsets = erase_verify.sample_offsets(
+            size, self.block_size, erase_verify.samples_needed(), seed=self.seed
+        )
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            for offset in offsets:
+                length = min(self.block_size, size - offset)
+                if os.pread(fd, length, offset) != buf[:length]:
+                    print(f"erase_overwrite: {self.path}: mismatch at {offset:#x}")
+                    return False
+        finally:
+            os.close(fd)
+        return True
+
+
+def checkpoint_path_for(drive):
+    """Checkpoint file for drive, keyed by serial so that a resumed
+    overwrite finds it even if the device node changed."""
+    key = drive.get("serial") or os.path.basename(drive["path"])
+    key = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+    return os.path.join(
+        session_checkpoint.default_checkpoint_dir(), f"overwrite-{key}.json"
+    )
+
+
+def describe(result):
+    """One-line summary of an overwrite result."""
+    if result["error"]:
+        return f"Overwrite failed: {result['error']}"
+    if not result["complete"]:
+        return "Overwrite cancelled; it resumes from its checkpoint"
+    text = (
+        f"Overwritten with {result['pattern']} x{result['passes']} "
+        f"({result['throughput'] / 1e6:.0f} MB/s)"
+    )
+    if result["verified"] is not None:
+        text += ", verified" if result["verified"] else ", VERIFY FAILED"
+    return text
+
+
+def overwrite_privileged(path, on_progress=None, cancel=None, **kwargs):
+    """OverwriteEngine(path, ...).run(), through sudo when the device is not
+    writable by us. Setting cancel stops the overwrite at its checkpoint."""
+    if os.access(path, os.W_OK):
+        return OverwriteEngine(
+            path, on_progress=on_progress, cancel=cancel, **kwargs
+        ).run()
+    if kwargs.get("checkpoint_path"):
+        # Created as us, not root, so that the session checkpoints kept in
+        # the same directory can still be written
+        os.makedirs(os.path.dirname(kwargs["checkpoint_path"]), exist_ok=True)
+    args = ["sudo", sys.executable, os.path.realpath(__file__), "--json", path]
+    for name, value in kwargs.items():
+        if value is True:
+            args.append(f"--{name.replace('_', '-')}")
+        elif value not in (None, False):
+            args += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if cancel is not None:
+
+        def watch_cancel():
+            while process.poll() is None:
+                if cancel.wait(1):
+                    # sudo relays the signal; the engine saves its checkpoint
+                    process.terminate()
+                    return
+
+        threading.Thread(target=watch_cancel, daemon=True).start()
+    result = None
+    for line in process.stdout:
+        kind, _, value = line.strip().partition(" ")
+        if kind == "progress" and on_progress:
+            progress = json.loads(value)
+            on_progress(progress["fraction"], progress["eta"], progress["text"])
+        elif kind == "result":
+            result = json.loads(value)
+    stderr = process.stderr.read()
+    process.wait()
+    if result is None:
+        raise OSError(f"overwrite of {path} failed: {stderr.strip()}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Overwrite a drive")
+    parser.add_argument("path")
+    parser.add_argument("--pattern", choices=PATTERNS, default="zero")
+    parser.add_argument("--passes", type=int, default=1)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS)
+    parser.add_argument("--verify", action="store_true")
+    parser.add_argument("--checkpoint-path", default=None)
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    cancel = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: cancel.set())
+
+    def on_progress(fraction, eta, text):
+        if args.json:
+            progress = {"fraction": fraction, "eta": eta, "text": text}
+            print("progress " + json.dumps(progress), flush=True)
+        else:
+            print(text, flush=True)
+
+    result = OverwriteEngine(
+        args.path,
+        pattern=args.pattern,
+        passes=args.passes,
+        block_size=args.block_size,
+        writers=args.writers,
+        verify=args.verify,
+        checkpoint_path=args.checkpoint_path,
+        on_progress=on_progress,
+        cancel=cancel,
+    ).run()
+    if args.json:
+        print("result " + json.dumps(result), flush=True)
+    else:
+        print(describe(result))
+    return 0 if result["complete"] and result["verified"] is not False else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Choice of erase method per drive.
+
+The drive's own capabilities (`hdparm -I` for SATA, `nvme id-ctrl`,
+`nvme id-ns` and the sanitize log for NVMe) decide which erase commands it
+accepts. plan() orders the ones our policy allows fastest first: a crypto
+erase replaces the media encryption key in seconds, while a block erase or
+ATA Security Erase can take minutes to hours. The erase is tried in that
+order, so later methods are fallbacks when the drive rejects the first.
+"""
+
+import json
+import os
+import re
+import subprocess
+
+import erase_progress
+
+# Methods that meet our sanitization policy (NIST SP 800-88 purge).
+# Overwrite sanitize and NVMe format without secure erase are not used.
+# Drives none of these work on are overwritten instead (OVERWRITE_METHOD,
+# see erase_overwrite).
+ALLOWED_METHODS = (
+    "sanitize-crypto",
+    "sanitize-block",
+    "ata-enhanced-security-erase",
+    "ata-security-erase",
+    "nvme-sanitize-crypto",
+    "nvme-format-crypto",
+    "nvme-sanitize-block",
+    "nvme-format-user-data",
+)
+
+METHOD_LABELS = {
+    "sanitize-crypto": "Sanitize (crypto scramble)",
+    "sanitize-block": "Sanitize (block erase)",
+    "ata-enhanced-security-erase": "Enhanced Security Erase",
+    "ata-security-erase": "Security Erase",
+    "nvme-sanitize-crypto": "NVMe sanitize (crypto erase)",
+    "nvme-format-crypto": "NVMe format (crypto erase)",
+    "nvme-sanitize-block": "NVMe sanitize (block erase)",
+    "nvme-format-user-data": "NVMe format (user data erase)",
+    "overwrite": "Overwrite (zeros)",
+}
+
+OVERWRITE_METHOD = "overwrite"
+
+# Methods that only replace the media encryption key. The old ciphertext
+# then reads back as random data, so there is no pattern to verify.
+CRYPTO_METHODS = ("sanitize-crypto", "nvme-sanitize-crypto", "nvme-format-crypto")
+
+# Typical durations, used to order methods the drive gives no estimate for
+TYPICAL_SECONDS = {
+    "sanitize-crypto": 5,
+    "nvme-sanitize-crypto": 5,
+    "nvme-format-crypto": 5,
+    "nvme-format-user-data": 60,
+    "nvme-sanitize-block": 120,
+    "sanitize-block": 600,
+    "ata-enhanced-security-erase": 3600,
+    "ata-security-erase": 7200,
+}
+
+# Sanitize log estimates are in seconds; all ones means not reported
+_NVME_NO_ESTIMATE = 0xFFFFFFFF
+_NVME_SANITIZE_LOG_TIMES = {
+    "nvme-sanitize-crypto": ("time_for_crypto_erase", "etce"),
+    "nvme-sanitize-block": ("time_for_block_erase", "etbe"),
+}
+
+# Security-frozen drives still accept SANITIZE; only these are blocked
+_SECURITY_METHODS = ("ata-enhanced-security-erase", "ata-security-erase")
+
+_NVME_NAMESPACE_RE = re.compile(r"^(/dev/nvme\d+)n\d+$")
+
+
+def parse_hdparm_capabilities(text):
+    """SATA erase capabilities from `hdparm -I` output."""
+    features = set()
+    for line in text.splitlines():
+        line = line.strip().lstrip("*").strip()
+        features.add(line)
+    security = {
+        "supported": False,
+        "enhanced": False,
+        # Security commands fail on frozen drives; without a "not frozen"
+        # line the drive cannot be assumed to accept them
+        "frozen": not re.search(r"not\s+frozen", text),
+        "locked": False,
+    }
+    in_security = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("Security:"):
+            in_security = True
+            continue
+        if in_security:
+            # The Security section ends at the next unindented heading
+            if line and not line[0].isspace():
+                break
+            words = stripped.split()
+            if words == ["supported"]:
+                security["supported"] = True
+            elif words == ["locked"]:
+                security["locked"] = True
+            elif stripped == "supported: enhanced erase":
+                security["enhanced"] = True
+    security["times"] = erase_progress.parse_security_erase_times(text)
+    return {
+        "transport": "sata",
+        "sanitize": {
+            "crypto": "CRYPTO_SCRAMBLE_EXT command" in features,
+            "block": "BLOCK_ERASE_EXT command" in features,
+            "overwrite": "OVERWRITE_EXT command" in features,
+        },
+        "security": security,
+    }
+
+
+def _json(output):
+    try:
+        data = json.loads(output)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def parse_nvme_capabilities(id_ctrl, id_ns="", sanitize_log=""):
+    """NVMe erase capabilities from `nvme id-ctrl -o json`, `nvme id-ns -o
+    json` and `nvme sanitize-log -o json` output."""
+    ctrl = _json(id_ctrl)
+    oacs = int(ctrl.get("oacs", 0))
+    sanicap = int(ctrl.get("sanicap", 0))
+    fna = int(ctrl.get("fna", 0))
+    flbas = _json(id_ns).get("flbas")
+
+    log = _json(sanitize_log)
+    # nvme-cli 2.x nests the log under the device name
+    if len(log) == 1 and isinstance(next(iter(log.values())), dict):
+        log = next(iter(log.values()))
+    times = {}
+    for method, keys in _NVME_SANITIZE_LOG_TIMES.items():
+        for key in keys:
+            value = log.get(key)
+            if isinstance(value, int) and 0 < value < _NVME_NO_ESTIMATE:
+                times[method] = value
+                break
+    return {
+        "transport": "nvme",
+        "format": {
+            # OACS bit 1: Format NVM; FNA bit 2: crypto erase on format
+            "supported": bool(oacs & 0x2),
+            "crypto": bool(fna & 0x4),
+        },
+        "sanitize": {
+            "crypto": bool(sanicap & 0x1),
+            "block": bool(sanicap & 0x2),
+            "overwrite": bool(sanicap & 0x4),
+        },
+        "lbaf": None if flbas is None else int(flbas) & 0xF,
+        "times": times,
+    }
+
+
+def _supported_methods(caps):
+    methods = []
+    if caps["transport"] == "sata":
+        if caps["sanitize"]["crypto"]:
+            methods.append("sanitize-crypto")
+        if caps["sanitize"]["block"]:
+            methods.append("sanitize-block")
+        security = caps["security"]
+        if security["supported"] and not security["locked"]:
+            if security["enhanced"]:
+                methods.append("ata-enhanced-security-erase")
+            methods.append("ata-security-erase")
+    elif caps["transport"] == "nvme":
+        if caps["sanitize"]["crypto"]:
+            methods.append("nvme-sanitize-crypto")
+        if caps["format"]["supported"] and caps["format"]["crypto"]:
+            methods.append("nvme-format-crypto")
+        if caps["sanitize"]["block"]:
+            methods.append("nvme-sanitize-block")
+        if caps["format"]["supported"]:
+            methods.append("nvme-format-user-data")
+    return methods
+
+
+def estimated_seconds(method, caps):
+    """The drive's estimate for method, else a typical duration."""
+    if caps["transport"] == "sata":
+        times = caps["security"]["times"]
+        if method == "ata-enhanced-security-erase" and "enhanced" in times:
+            return times["enhanced"]
+        if method == "ata-security-erase" and "normal" in times:
+            return times["normal"]
+    else:
+        if method in caps.get("times", {}):
+            return caps["times"][method]
+    return TYPICAL_SECONDS[method]
+
+
+def plan(caps, allowed=ALLOWED_METHODS):
+    """Allowed methods the drive supports, fastest first."""
+    methods = [m for m in _supported_methods(caps) if m in allowed]
+    return sorted(
+        methods,
+        key=lambda m: (estimated_seconds(m, caps), ALLOWED_METHODS.index(m)),
+    )
+
+
+def nvme_controller(path):
+    """/dev/nvme0 for /dev/nvme0n1; sanitize acts on the controller."""
+    match = _NVME_NAMESPACE_RE.match(path)
+    return match.group(1) if match else path
+
+
+def as_root(args):
+    """args, through sudo unless we already run as root (e.g. from a PXE
+    image, which may not have sudo at all)."""
+    return list(args) if os.geteuid() == 0 else ["sudo", *args]
+
+
+def _run(args):
+    try:
+        return subprocess.run(args, capture_output=True, text=True).stdout
+    except OSError as e:
+        print(f"erase_planner: {' '.join(args)} failed: {e}")
+        return ""
+
+
+def probe_capabilities(drive):
+    """Read the capabilities of drive ({"path", "type", ...})."""
+    path = drive["path"]
+    if drive["type"] == "NVMe":
+        controller = nvme_controller(path)
+        return parse_nvme_capabilities(
+            _run(as_root(["nvme", "id-ctrl", controller, "-o", "json"])),
+            _run(as_root(["nvme", "id-ns", path, "-o", "json"])),
+            _run(as_root(["nvme", "sanitize-log", controller, "-o", "json"])),
+        )
+    return parse_hdparm_capabilities(_run(as_root(["hdparm", "-I", path])))
+
+
+def fallback_methods(drive):
+    """Methods to try when the capabilities could not be read: what the
+    tool did before capability planning."""
+    if drive["type"] == "NVMe":
+        return ["nvme-format-user-data"]
+    return ["sanitize-block", "ata-security-erase"]
+
+
+def plan_drive(drive, allowed=ALLOWED_METHODS):
+    """(methods, caps) for drive, fastest allowed method first."""
+    caps = probe_capabilities(drive)
+    methods = plan(caps, allowed)
+    if not methods:
+        methods = [m for m in fallback_methods(drive) if m in allowed]
+    return methods, caps
+
+
+def needs_unfreeze(methods, caps):
+    """True if every planned method is a security command that the drive's
+    frozen state blocks, so it needs a suspend/resume before the erase."""
+    security = caps.get("security") or {}
+    return bool(
+        security.get("frozen")
+        and methods
+        and all(m in _SECURITY_METHODS for m in methods)
+    )
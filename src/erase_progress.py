@@ -0,0 +1,213 @@
+"""
+Progress and completion of drive erases.
+
+SANITIZE runs inside the drive after hdparm/nvme return, so completion is
+only known from the drive's sanitize status. ATA SECURITY ERASE and NVMe
+FORMAT block until they finish but report no progress; for those the
+estimate from `hdparm -I` (or none) drives an estimated progress bar.
+
+Progress is reported through on_progress(fraction, eta_seconds, text):
+fraction is 0..1 or None when unknown, eta_seconds is None when unknown.
+"""
+
+import json
+import re
+import subprocess
+import threading
+import time
+
+POLL_INTERVAL = 5.0
+# Consecutive failed status queries before giving up on a sanitize
+MAX_QUERY_FAILURES = 5
+
+_ERASE_TIME_RE = re.compile(
+    r"(\d+)\s*min for (ENHANCED )?SECURITY ERASE UNIT", re.IGNORECASE
+)
+_PROGRESS_RE = re.compile(r"Progress:\s*0x([0-9a-f]+)\s*\((\d+)%\)", re.IGNORECASE)
+
+# NVMe sanitize status (SSTAT bits 2:0)
+NVME_SANITIZE_NEVER = 0
+NVME_SANITIZE_COMPLETED = 1
+NVME_SANITIZE_IN_PROGRESS = 2
+NVME_SANITIZE_FAILED = 3
+NVME_SANITIZE_COMPLETED_NO_DEALLOC = 4
+
+
+def parse_security_erase_times(hdparm_info):
+    """{"normal": seconds, "enhanced": seconds} from `hdparm -I` output,
+    for the estimates the drive reports."""
+    times = {}
+    for match in _ERASE_TIME_RE.finditer(hdparm_info):
+        key = "enhanced" if match.group(2) else "normal"
+        times.setdefault(key, int(match.group(1)) * 60)
+    return times
+
+
+def parse_hdparm_sanitize_status(output):
+    """{"state": ..., "progress": fraction or None} from
+    `hdparm --sanitize-status`. state is "in_progress", "complete",
+    "failed", "frozen" or "unknown"."""
+    text = output.lower()
+    progress = None
+    match = _PROGRESS_RE.search(output)
+    if match:
+        progress = int(match.group(1), 16) / 0xFFFF
+    if "in process" in text or "in progress" in text:
+        state = "in_progress"
+    elif "completed with error" in text or "failed" in text:
+        state = "failed"
+    elif "completed without error" in text:
+        state = "complete"
+    elif "frozen" in text:
+        state = "frozen"
+    else:
+        state = "unknown"
+    if state == "complete":
+        progress = 1.0
+    return {"state": state, "progress": progress}
+
+
+def parse_nvme_sanitize_log(output):
+    """Same shape as parse_hdparm_sanitize_status, from
+    `nvme sanitize-log -o json`."""
+    try:
+        data = json.loads(output)
+    except ValueError:
+        return {"state": "unknown", "progress": None}
+    # nvme-cli 2.x nests the log under the device name
+    if isinstance(data, dict) and len(data) == 1:
+        if isinstance(next(iter(data.values())), dict):
+            data = next(iter(data.values()))
+    if not isinstance(data, dict) or "sstat" not in data:
+        return {"state": "unknown", "progress": None}
+    sstat = data["sstat"]
+    if isinstance(sstat, dict):
+        sstat = sstat.get("status", 0)
+    status = int(sstat) & 0x7
+    progress = None
+    if "sprog" in data:
+        progress = int(data["sprog"]) / 65536
+    if status == NVME_SANITIZE_IN_PROGRESS:
+        state = "in_progress"
+    elif status in (NVME_SANITIZE_COMPLETED, NVME_SANITIZE_COMPLETED_NO_DEALLOC):
+        state, progress = "complete", 1.0
+    elif status == NVME_SANITIZE_FAILED:
+        state = "failed"
+    else:
+        state = "unknown"
+    return {"state": state, "progress": progress}
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return ""
+    if seconds < 90:
+        return "less than 2 min left"
+    minutes = round(seconds / 60)
+    if minutes < 120:
+        return f"about {minutes} min left"
+    return f"about {minutes // 60} h {minutes % 60} min left"
+
+
+class ProgressEstimate:
+    """ETA from measured progress, or from the drive's own time estimate
+    while no progress is known."""
+
+    def __init__(self, estimate_seconds=None, clock=time.monotonic):
+        self.estimate = estimate_seconds
+        self._clock = clock
+        self.started = clock()
+
+    def elapsed(self):
+        return self._clock() - self.started
+
+    def update(self, fraction=None):
+        """(fraction, eta_seconds) for measured progress fraction."""
+        elapsed = self.elapsed()
+        if fraction is not None and fraction > 0:
+            return fraction, elapsed * (1 - fraction) / fraction
+        if self.estimate:
+            # Never show done before the drive says so
+            return (
+                min(0.99, elapsed / self.estimate),
+                max(0.0, self.estimate - elapsed),
+            )
+        return None, None
+
+
+def _report(on_progress, estimate, fraction, verb):
+    if on_progress is None:
+        return
+    fraction, eta = estimate.update(fraction)
+    text = verb
+    if fraction is not None:
+        text += f"  —  {int(fraction * 100)}%"
+    if eta is not None:
+        text += f"  —  {format_eta(eta)}"
+    on_progress(fraction, eta, text)
+
+
+def wait_for_sanitize(
+    status_args,
+    parse,
+    on_progress=None,
+    estimate_seconds=None,
+    poll_interval=POLL_INTERVAL,
+    cancel=None,
+):
+    """Poll a sanitize status command until the drive reports the sanitize
+    finished. Returns (success, detail)."""
+    estimate = ProgressEstimate(estimate_seconds)
+    cancel = cancel or threading.Event()
+    failures = 0
+    while True:
+        try:
+            result = subprocess.run(status_args, capture_output=True, text=True)
+            status = parse(result.stdout)
+        except OSError as e:
+            result, status = None, {"state": "unknown", "progress": None}
+            print(f"erase_progress: {' '.join(status_args)} failed: {e}")
+        if status["state"] == "complete":
+            _report(on_progress, estimate, 1.0, "Sanitize complete")
+            return True, None
+        if status["state"] in ("failed", "frozen"):
+            detail = result.stdout.strip() if result else ""
+            return False, f"Sanitize {status['state']}:\n{detail}".strip()
+        if status["state"] == "in_progress":
+            failures = 0
+        else:
+            failures += 1
+            if failures >= MAX_QUERY_FAILURES:
+                detail = (result.stdout + result.stderr).strip() if result else ""
+                return (
+                    False,
+                    "Sanitize status could not be read:\n" + detail
+                    if detail
+                    else "Sanitize status could not be read",
+                )
+        _report(on_progress, estimate, status["progress"], "Sanitizing")
+        if cancel.wait(poll_interval):
+            return False, "Cancelled while waiting for sanitize to finish"
+
+
+def run_with_estimate(args, verb, estimate_seconds=None, on_progress=None, poll_interval=1.0):
+    """subprocess.run(args, capture_output=True, text=True) that reports
+    estimated progress while the command runs."""
+    estimate = ProgressEstimate(estimate_seconds)
+    process = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    done = threading.Event()
+    output = {}
+
+    def communicate():
+        output["stdout"], output["stderr"] = process.communicate()
+        done.set()
+
+    threading.Thread(target=communicate, daemon=True).start()
+    _report(on_progress, estimate, None, verb)
+    while not done.wait(poll_interval):
+        _report(on_progress, estimate, None, verb)
+    return subprocess.CompletedProcess(
+        args, process.returncode, output["stdout"], output["stderr"]
+    )
@@ -0,0 +1,83 @@
+"""
+Bus-aware scheduling of a batch of erases.
+
+Drives that share a link (a SATA port multiplier, a USB bus, an HBA; see
+the "bus" of block_devices) slow each other down when they all move data
+at once. Erases that run inside the drive (sanitize, crypto erase, NVMe
+format, ATA Security Erase) only send a command and wait, so they start
+first and all together. Host-bound work (overwrite, verify reads) holds
+one of its bus's max_per_bus slots and otherwise queues behind the other
+drives on that bus; the largest host-bound drives start first so the
+longest transfer is not left for last.
+"""
+
+import contextlib
+import threading
+
+DEFAULT_MAX_PER_BUS = 1
+WAITING_TEXT = "Waiting for other drives on the same bus"
+
+
+def bus_key(drive):
+    """The link drive shares with other drives."""
+    return drive.get("bus") or drive.get("controller") or drive["path"]
+
+
+def host_bound(drive, plan):
+    """True if drive's erase moves its data over the bus (an overwrite):
+    drives behind USB bridges, and planned drives with no erase method."""
+    if drive.get("transport") == "usb":
+        return True
+    return plan is not None and not plan[0]
+
+
+def order(drives, plans):
+    """drives in the order to start them: in-drive erases first, then
+    host-bound ones, largest first. plans maps path to erase_engine.preflight()."""
+    in_drive = [d for d in drives if not host_bound(d, plans.get(d["path"]))]
+    host = [d for d in drives if host_bound(d, plans.get(d["path"]))]
+    host.sort(key=lambda d: d.get("size_bytes") or 0, reverse=True)
+    return in_drive + host
+
+
+class BusScheduler:
+    """Per-bus slots for host-bound I/O; max_per_bus 0 means no limit."""
+
+    def __init__(self, max_per_bus=DEFAULT_MAX_PER_BUS):
+        self.max_per_bus = max_per_bus
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def _slot(self, key):
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.Semaphore(self.max_per_bus)
+            return self._slots[key]
+
+    @contextlib.contextmanager
+    def host_io(self, drive, on_wait=None):
+        """Hold one of drive's bus slots; on_wait() is called first if the
+        bus is busy."""
+        if not self.max_per_bus:
+            yield
+            return
+        slot = self._slot(bus_key(drive))
+        if not slot.acquire(blocking=False):
+            print(f"erase_scheduler: {drive['path']}: waiting for {bus_key(drive)}")
+            if on_wait:
+                on_wait()
+            slot.acquire()
+        try:
+            yield
+        finally:
+            slot.release()
+
+    def for_drive(self, drive, on_progress=None):
+        """A host_io callable for erase_engine that shows the wait through
+        on_progress(fraction, eta, text)."""
+
+        def on_wait():
+            if on_progress:
+                on_progress(None, None, WAITING_TEXT)
+
+        return lambda: self.host_io(drive, on_wait)
@@ -0,0 +1,110 @@
+"""
+Erase station mode: Secure Erase on a bench where bare drives are swapped
+through docks all day.
+
+The window follows udev block events instead of detecting drives once
+(see probe_fingerprints.HotplugMonitor); changes() tells it which drives
+came and went since the last scan. A QueuePolicy decides which inserted
+drives start erasing without a click, and StationResults keeps the rolling
+table of finished drives.
+"""
+
+import time
+
+import block_devices
+
+# manual: inserted drives wait for "Erase Selected Drives"
+# new: inserted drives are erased unless erased successfully this session
+# all: every inserted drive is erased
+QUEUE_POLICIES = ("manual", "new", "all")
+DEFAULT_QUEUE_POLICY = "manual"
+MAX_RESULTS = 200
+
+
+def drive_key(drive):
+    """Identity of a drive in a slot: a different drive inserted where one
+    was removed gets the same path but not the same key."""
+    return (drive["path"], drive.get("serial") or "")
+
+
+def changes(current, scanned):
+    """(added, removed) drives between the drives shown and a new scan."""
+    current_keys = {drive_key(d) for d in current}
+    scanned_keys = {drive_key(d) for d in scanned}
+    added = [d for d in scanned if drive_key(d) not in current_keys]
+    removed = [d for d in current if drive_key(d) not in scanned_keys]
+    return added, removed
+
+
+def parse_queue_policy(argv):
+    """--auto-queue=POLICY from argv, DEFAULT_QUEUE_POLICY if absent."""
+    for arg in argv:
+        if arg.startswith("--auto-queue="):
+            policy = arg.split("=", 1)[1]
+            if policy in QUEUE_POLICIES:
+                return policy
+            print(f"erase_station: unknown queue policy {policy!r}, using manual")
+    return DEFAULT_QUEUE_POLICY
+
+
+class QueuePolicy:
+    def __init__(self, mode=DEFAULT_QUEUE_POLICY, in_use=block_devices.in_use):
+        if mode not in QUEUE_POLICIES:
+            raise ValueError(f"unknown queue policy {mode!r}")
+        self.mode = mode
+        self._in_use = in_use
+
+    def should_queue(self, drive, results):
+        """True if inserted drive should start erasing without a click."""
+        if self.mode == "manual":
+            return False
+        # Never start on a drive something has mounted or assembled
+        if self._in_use(drive["path"].rsplit("/", 1)[-1]):
+            return False
+        if self.mode == "new":
+            return not results.erased(drive.get("serial"))
+        return True
+
+
+class StationResults:
+    """Results of the drives erased this session, newest first, keeping
+    at most max_entries."""
+
+    def __init__(self, max_entries=MAX_RESULTS, clock=time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self.records = []
+        self._erased_serials = set()
+
+    def add(self, drive, success, message, elapsed):
+        record = {
+            "time": self._clock(),
+            "path": drive["path"],
+            "model": drive.get("model", ""),
+            "serial": drive.get("serial", ""),
+            "size": drive.get("size", ""),
+            "success": success,
+            "message": message,
+            "elapsed": elapsed,
+        }
+        self.records.insert(0, record)
+        del self.records[self.max_entries :]
+        if success and record["serial"]:
+            self._erased_serials.add(record["serial"])
+        return record
+
+    def erased(self, serial):
+        """True if the drive with serial was erased successfully."""
+        return bool(serial) and serial in self._erased_serials
+
+    def summary(self):
+        succeeded = sum(1 for r in self.records if r["success"])
+        return f"{succeeded} erased, {len(self.records) - succeeded} failed"
+
+
+def describe(record):
+    """Subtitle for a results table row."""
+    when = time.strftime("%H:%M:%S", time.localtime(record["time"]))
+    minutes = round(record["elapsed"] / 60)
+    took = f"{minutes} min" if minutes else f"{round(record['elapsed'])} s"
+    return f"{when}  —  {took}  —  {record['message']}"
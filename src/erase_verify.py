@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Post-erase verification by sampled direct reads.
+
+Reading a whole drive back takes hours, so verify() reads a random sample
+of blocks spread over the entire device instead. The device is cut into
+equal strata with one aligned read in each (plus the first and last block,
+where partition tables live), and the number of strata is chosen so that if
+more than max_unerased of the device still held data, at least one read
+would land on it with the given confidence.
+
+A block passes when its content is a deterministic pattern: the same byte
+throughout (0x00 after most erases, 0xFF on some drives) or a short
+sequence repeated. Reads use O_DIRECT into page-aligned buffers so the page
+cache cannot answer for the drive; files on filesystems without O_DIRECT
+support (e.g. tmpfs) are read through the cache.
+
+Run as a script (usually through sudo) it verifies one device and prints
+progress lines and a JSON result.
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+DEFAULT_CONFIDENCE = 0.99
+DEFAULT_MAX_UNERASED = 0.001
+DEFAULT_READ_SIZE = 64 * 1024
+# Offsets of the first mismatching reads kept in the report
+MAX_REPORTED_MISMATCHES = 10
+# Repeating patterns up to one sector long count as deterministic
+_PATTERN_PERIODS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def samples_needed(confidence=DEFAULT_CONFIDENCE, max_unerased=DEFAULT_MAX_UNERASED):
+    """Reads needed to hit an un-erased fraction max_unerased at least once
+    with probability confidence."""
+    return math.ceil(math.log(1 - confidence) / math.log(1 - max_unerased))
+
+
+def sample_offsets(size, read_size, samples, seed=None):
+    """Sorted, read_size-aligned offsets: one random read per stratum, plus
+    the first and last read of the device."""
+    slots = size // read_size
+    if slots <= 0:
+        return []
+    if samples >= slots:
+        return [i * read_size for i in range(slots)]
+    rng = random.Random(seed)
+    chosen = {0, slots - 1}
+    for i in range(samples):
+        start = i * slots // samples
+        end = max(start + 1, (i + 1) * slots // samples)
+        chosen.add(rng.randrange(start, end))
+    return [slot * read_size for slot in sorted(chosen)]
+
+
+def is_deterministic(data):
+    """True if data is one byte value or a short sequence repeated."""
+    if not data:
+        return True
+    if data.count(data[:1]) == len(data):
+        return True
+    for period in _PATTERN_PERIODS[1:]:
+        if len(data) % period == 0 and data == data[:period] * (len(data) // period):
+            return True
+    return False
+
+
+def _device_size(fd):
+    return os.lseek(fd, 0, os.SEEK_END)
+
+
+def _open(path):
+    """(fd, direct) for path, with O_DIRECT where the filesystem allows it."""
+    try:
+        return os.open(path, os.O_RDONLY | os.O_DIRECT), True
+    except OSError:
+        return os.open(path, os.O_RDONLY), False
+
+
+def verify(
+    path,
+    confidence=DEFAULT_CONFIDENCE,
+    max_unerased=DEFAULT_MAX_UNERASED,
+    read_size=DEFAULT_READ_SIZE,
+    seed=None,
+    on_progress=None,
+    cancel=None,
+):
+    """Sample path and report how much of it reads back as a pattern.
+
+    on_progress(fraction) is called as reads complete. Returns a dict with
+    "verified", sample and mismatch counts, bytes read, coverage (fraction
+    of the device read), throughput in bytes/s and whether O_DIRECT was used.
+    """
+    cancel = cancel or threading.Event()
+    started = time.monotonic()
+    fd, direct = _open(path)
+    try:
+        size = _device_size(fd)
+        offsets = sample_offsets(size, read_size, samples_needed(confidence, max_unerased), seed)
+        buf = mmap.mmap(-1, read_size)
+        mismatches = []
+        mismatch_count = 0
+        bytes_read = 0
+        for i, offset in enumerate(offsets):
+            if cancel.is_set():
+                break
+            n = os.preadv(fd, [buf], offset)
+            bytes_read += n
+            if not is_deterministic(buf[:n]):
+                mismatch_count += 1
+                if len(mismatches) < MAX_REPORTED_MISMATCHES:
+                    mismatches.append(offset)
+            if on_progress and (i % 64 == 0 or i == len(offsets) - 1):
+                on_progress((i + 1) / len(offsets))
+        buf.close()
+    finally:
+        os.close(fd)
+    elapsed = time.monotonic() - started
+    complete = not cancel.is_set()
+    return {
+        "path": path,
+        "verified": complete and mismatch_count == 0 and bool(offsets),
+        "complete": complete,
+        "size": size,
+        "samples": len(offsets),
+        "mismatch_count": mismatch_count,
+        "mismatches": mismatches,
+        "bytes_read": bytes_read,
+        "coverage": bytes_read / size if size else 0.0,
+        "confidence": confidence,
+        "max_unerased": max_unerased,
+        "elapsed": round(elapsed, 3),
+        "throughput": bytes_read / elapsed if elapsed > 0 else 0.0,
+        "direct": direct,
+    }
+
+
+def verify_privileged(path, on_progress=None, **kwargs):
+    """verify(), through sudo when the device is not readable by us."""
+    if os.access(path, os.R_OK):
+        return verify(path, on_progress=on_progress, **kwargs)
+    args = ["sudo", sys.executable, os.path.realpath(__file__), "--json", path]
+    for name in ("confidence", "max_unerased", "read_size", "seed"):
+        if kwargs.get(name) is not None:
+            args += [f"--{name.replace('_', '-')}", str(kwargs[name])]
+    process = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    result = None
+    for line in process.stdout:
+        kind, _, value = line.strip().partition(" ")
+        if kind == "progress" and on_progress:
+            on_progress(float(value))
+        elif kind == "result":
+            result = json.loads(value)
+    stderr = process.stderr.read()
+    process.wait()
+    if result is None:
+        raise OSError(f"verification of {path} failed: {stderr.strip()}")
+    return result
+
+
+def describe(result):
+    """One-line summary of a verify() result for the UI and logs."""
+    mb_s = result["throughput"] / 1e6
+    coverage = result["coverage"] * 100
+    if result["verified"]:
+        status = "Verified"
+    elif not result["complete"]:
+        status = "Verification cancelled"
+    else:
+        status = f"Verification FAILED: {result['mismatch_count']} of {result['samples']} samples hold data"
+    return (
+        f"{status} ({result['samples']} samples, {coverage:.3g}% of drive, "
+        f"{mb_s:.0f} MB/s)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify an erased drive by sampled reads")
+    parser.add_argument("path")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--max-unerased", type=float, default=DEFAULT_MAX_UNERASED)
+    parser.add_argument("--read-size", type=int, default=DEFAULT_READ_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    def on_progress(fraction):
+        if args.json:
+            print(f"progress {fraction:.4f}", flush=True)
+
+    result = verify(
+        args.path,
+        confidence=args.confidence,
+        max_unerased=args.max_unerased,
+        read_size=args.read_size,
+        seed=args.seed,
+        on_progress=on_progress,
+    )
+    if args.json:
+        print("result " + json.dumps(result), flush=True)
+    else:
+        print(describe(result))
+    return 0 if result["verified"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,9 @@ from sysinfo import SysInfo
 from check_packages import CheckPackages
 from manualtest import ManualTest
 from finaltestcomplete import FinalTestComplete
-from observable import ObservableProperty, StateObserver
+from observable import StateStore
+from task_executor import get_executor
+from stall_watchdog import install_from_env
 
 
 class WizardWindow(Gtk.ApplicationWindow):
@@ -29,13 +31,10 @@ class WizardWindow(Gtk.ApplicationWindow):
             else:
                 monitors.connect("items-changed", self._on_monitors_changed)
 
-        # Initialize the observable property for tracking state
-        self.observable_property = ObservableProperty(
-            {"SysInfo": False, "CheckPackages": False, "ManualTest": False}
-        )
-        # Create and add an observer
-        observer = StateObserver()
-        self.observable_property.add_observer(observer)
+        # Pass/fail state shared by all pages. Only the last page's
+        # Complete button depends on it, so re-evaluate on change only.
+        self.wizard_state = StateStore({"SysInfo": False, "CheckPackages": False, "ManualTest": False})
+        self.wizard_state.subscribe_all(self._on_state_changed)
 
         # Create Gtk.HeaderBar
         header_bar = Gtk.HeaderBar()
@@ -69,13 +68,13 @@ class WizardWindow(Gtk.ApplicationWindow):
         self.page3 = ManualTest()
         self.page4 = FinalTestComplete()
 
-        self.page1.state = self.observable_property
+        self.page1.state = self.wizard_state
         self.page1.on_loading_changed = self._on_sysinfo_loading_changed
         self._sysinfo_loading = False
-        self.page2.state = self.observable_property
-        self.page3.state = self.observable_property
+        self.page2.state = self.wizard_state
+        self.page3.state = self.wizard_state
         self.page4.manual_test = self.page3
-        self.page4.state = self.observable_property
+        self.page4.state = self.wizard_state
 
         self.stack.add_named(self.page1, "page1")
         self.stack.add_named(self.page2, "page2")
@@ -104,6 +103,8 @@ class WizardWindow(Gtk.ApplicationWindow):
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
         )
 
+        self._visible_page = self.stack.get_visible_child()
+
         # Set title_widget after page was set
         self.stack.connect("notify::visible-child", self.on_visible_page_changed)
         self.title_widget.set_label(self.stack.get_visible_child().title)
@@ -125,6 +126,10 @@ class WizardWindow(Gtk.ApplicationWindow):
     def on_visible_page_changed(self, stack, params):
         print("on_visible_page_changed")
         current = stack.get_visible_child()
+        # Background work owned by the page we just left is no longer wanted
+        if self._visible_page is not None and self._visible_page is not current:
+            get_executor().cancel_owner(self._visible_page)
+        self._visible_page = current
         self.title_widget.set_label(current.title)
         current.on_shown()
 
@@ -156,8 +161,7 @@ class WizardWindow(Gtk.ApplicationWindow):
         if self.current_page == 3:
             self.next_button.set_label("Complete")
             self.next_button.add_css_class("button-next-last-page")
-            state = self.observable_property.get_value()
-            self.next_button.set_sensitive(all(state.values()))
+            self.next_button.set_sensitive(self.wizard_state.all_passed())
         else:
             self.next_button.remove_css_class("button-next-last-page")
             self.next_button.set_label("Next")
@@ -175,6 +179,10 @@ class WizardWindow(Gtk.ApplicationWindow):
         self._sysinfo_loading = loading
         self.update_buttons()
 
+    def _on_state_changed(self, key, value):
+        if self.current_page == 3:
+            self.next_button.set_sensitive(self.wizard_state.all_passed())
+
     def complete(self):
         print("Complete Clicked")
         current = self.stack.get_visible_child()
@@ -191,11 +199,18 @@ class Application(Adw.Application):
         style_manager = Adw.StyleManager.get_default()
         style_manager.set_color_scheme(Adw.ColorScheme.PREFER_DARK)
 
+        self.stall_watchdog = install_from_env("finaltest")
+
     def do_activate(self):
         window = WizardWindow(self)
         self.add_window(window)
         window.present()
 
 
-app = Application()
-app.run([])
+def main():
+    app = Application()
+    return app.run([])
+
+
+if __name__ == "__main__":
+    main()
@@ -38,8 +38,8 @@ class FinalTestComplete(Adw.Bin):
     # on_shown is called when the page is shown in the stack
     def on_shown(self):
         print("FinalTestComplete: on_shown")
-        state = self.state.get_value()
-        if all(state.values()):
+        state = self.state.values()
+        if self.state.all_passed():
             print("FinalTestComplete: All passed")
             self.complete_row.set_title("Final Test Complete: <b>PASSED</b>!")
             self.complete_row.set_subtitle(str(state))
@@ -0,0 +1,219 @@
+"""
+Index of the kernel's firmware-attributes interface.
+
+Dell (dell-wmi-sysman), HP (hp-bioscfg) and Lenovo (think-lmi) expose BIOS
+settings under /sys/class/firmware-attributes/<driver>/attributes and the
+BIOS passwords under .../authentication. The directory layout and the
+authentication state are read once; attribute values are read on first use
+and kept. Values the current user cannot read (some drivers make
+current_value root-only) are fetched with a single sudo call per batch.
+
+All reads go through probe_io, so the index can be recorded, replayed and
+built from a fixture tree by passing another base directory.
+"""
+
+import os
+import re
+import subprocess
+import threading
+
+import probe_io
+
+FIRMWARE_ATTRS_DIR = "/sys/class/firmware-attributes"
+
+# Attributes ending in "Activation" use Enable/Disable to indicate activation
+# state; the others use Activate/Activated
+COMPUTRACE_ACTIVATION_ATTRS = [
+    "AbsolutePersistenceModuleActivation",
+    "ComputraceModuleActivation",
+]
+COMPUTRACE_STANDARD_ATTRS = ["Computrace", "Absolute"]
+_DISABLED_VALUES = ["disable", "disabled", "permanentlydisable", "permanently disable"]
+
+# hp-bioscfg creates corrupted authentication entries (e.g. names containing
+# \r) on some HP firmware, where is_enabled cannot be trusted. Other drivers
+# are not known to, so their entries are taken as they are.
+HP_DRIVER = "hp-bioscfg"
+_AUTH_NAME_RE = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+def parse_dmi_admin_password(output):
+    """Administrator password state from `dmidecode -t 24` (the SMBIOS
+    Hardware Security table lshw reads): True, False or None."""
+    for line in output.splitlines():
+        key, sep, value = line.strip().partition(":")
+        if sep and key == "Administrator Password Status":
+            value = value.strip().lower()
+            if value == "enabled":
+                return True
+            if value == "disabled":
+                return False
+    return None
+
+
+class FirmwareAttributes:
+    def __init__(self, base=FIRMWARE_ATTRS_DIR):
+        self.base = base
+        self._lock = threading.RLock()
+        self._scanned = False
+        # attribute name -> [driver, ...] providing it
+        self._attributes = {}
+        # driver -> {auth name: {"is_enabled": str or None, "role": str or None}}
+        self._authentication = {}
+        self._values = {}
+
+    def _scan(self):
+        with self._lock:
+            if self._scanned:
+                return
+            self._scanned = True
+            try:
+                if not probe_io.isdir(self.base):
+                    return
+                drivers = sorted(probe_io.listdir(self.base))
+            except OSError as e:
+                print(f"firmware-attributes: cannot list {self.base}: {e}")
+                return
+            for driver in drivers:
+                attrs_dir = os.path.join(self.base, driver, "attributes")
+                if probe_io.isdir(attrs_dir):
+                    try:
+                        for name in probe_io.listdir(attrs_dir):
+                            self._attributes.setdefault(name, []).append(driver)
+                    except OSError as e:
+                        print(f"firmware-attributes: cannot list {attrs_dir}: {e}")
+                auth_dir = os.path.join(self.base, driver, "authentication")
+                if probe_io.isdir(auth_dir):
+                    self._authentication[driver] = self._read_authentication(auth_dir)
+
+    def _read_authentication(self, auth_dir):
+        entries = {}
+        try:
+            names = sorted(probe_io.listdir(auth_dir))
+        except OSError as e:
+            print(f"firmware-attributes: cannot list {auth_dir}: {e}")
+            return entries
+        for name in names:
+            entry = {}
+            for field in ("is_enabled", "role"):
+                try:
+                    entry[field] = probe_io.read_text(
+                        os.path.join(auth_dir, name, field)
+                    ).strip()
+                except OSError:
+                    entry[field] = None
+            entries[name] = entry
+        return entries
+
+    @property
+    def drivers(self):
+        self._scan()
+        return sorted(
+            set(d for ds in self._attributes.values() for d in ds)
+            | set(self._authentication)
+        )
+
+    def has(self, name):
+        self._scan()
+        return name in self._attributes
+
+    def _value_path(self, driver, name):
+        return os.path.join(self.base, driver, "attributes", name, "current_value")
+
+    def prefetch(self, names):
+        """Read the values of names that are not known yet, with at most one
+        sudo call for the ones the current user cannot read."""
+        self._scan()
+        with self._lock:
+            privileged = {}
+            for name in names:
+                if name in self._values or name not in self._attributes:
+                    continue
+                path = self._value_path(self._attributes[name][0], name)
+                try:
+                    self._values[name] = probe_io.read_text(path).strip()
+                except PermissionError:
+                    privileged[path] = name
+                except OSError as e:
+                    print(f"firmware-attributes: cannot read {path}: {e}")
+                    self._values[name] = None
+            if privileged:
+                read = self._sudo_read(list(privileged))
+                for path, name in privileged.items():
+                    self._values[name] = read.get(path)
+
+    def _sudo_read(self, paths):
+        """{path: first line} for each path, read as root in one process."""
+        values = {}
+        try:
+            result = probe_io.run(
+                ["sudo", "grep", "-sH", "", *paths], capture_output=True, text=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"firmware-attributes: sudo read failed: {e}")
+            return values
+        for line in result.stdout.splitlines():
+            for path in paths:
+                if line.startswith(path + ":") and path not in values:
+                    values[path] = line[len(path) + 1 :].strip()
+                    break
+        return values
+
+    def value(self, name):
+        """Current value of an attribute, or None if absent or unreadable."""
+        self.prefetch([name])
+        return self._values.get(name)
+
+    def invalidate(self, name):
+        """Forget a cached value, e.g. after the setting was changed."""
+        with self._lock:
+            self._values.pop(name, None)
+
+    def computrace(self):
+        """Computrace/Absolute activation: True, False or None if no driver
+        reports it."""
+        self.prefetch(COMPUTRACE_ACTIVATION_ATTRS + COMPUTRACE_STANDARD_ATTRS)
+        # Check activation-style attributes first (Enable = activated)
+        for name in COMPUTRACE_ACTIVATION_ATTRS:
+            value = (self._values.get(name) or "").lower()
+            if value == "enabled":
+                return True
+            if value in _DISABLED_VALUES:
+                return False
+        # Check standard attributes (Activate = activated)
+        for name in COMPUTRACE_STANDARD_ATTRS:
+            value = (self._values.get(name) or "").lower()
+            if value in ["activate", "activated"]:
+                return True
+            if value in ["enable", "enabled"] + _DISABLED_VALUES:
+                return False
+        return None
+
+    def admin_password(self):
+        """BIOS password state from the authentication entries.
+
+        Returns (state, unreliable): state is True if any password is
+        enabled, False if every entry says disabled and None if no driver
+        exposes authentication. unreliable is set when an hp-bioscfg entry
+        is malformed or unreadable, in which case a False state cannot be
+        trusted.
+        """
+        self._scan()
+        entries = [
+            (driver, name, entry)
+            for driver, driver_entries in self._authentication.items()
+            for name, entry in driver_entries.items()
+        ]
+        if not entries:
+            return None, False
+        unreliable = False
+        for driver, name, entry in entries:
+            if entry["is_enabled"] == "1":
+                return True, False
+            if driver == HP_DRIVER and (
+                entry["is_enabled"] is None
+                or entry["role"] is None
+                or not _AUTH_NAME_RE.match(name)
+            ):
+                unreliable = True
+        return False, unreliable
@@ -2,55 +2,136 @@
 """
 Generate a PDF tracking sheet with system hardware information.
 
-Usage: python3 generate_tracking_sheet.py <item_name> [output_path]
+Usage: python3 generate_tracking_sheet.py [--from-snapshot] <item_name> [output_path]
+
+The sheet is built from a snapshot of raw probe results. The Spec wizard
+passes the values SpecInfo already gathered, and SpecInfo also saves them
+to a snapshot file that --from-snapshot reads; only fields missing from the
+snapshot are probed again.
 """
 
-import sys
+import argparse
+import json
 import os
+import sys
+import tempfile
+import time
 from datetime import date
 
-try:
-    from reportlab.lib.pagesizes import letter, landscape
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.platypus import (
-        SimpleDocTemplate,
-        Table,
-        TableStyle,
-        Paragraph,
-        Spacer,
-        Image,
-        HRFlowable,
-    )
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_LEFT
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-except ImportError:
-    print(
-        "Error: reportlab is required. Install with: sudo apt install python3-reportlab"
-    )
-    sys.exit(1)
-
+import session_checkpoint
 from utils import Utils
 
+SNAPSHOT_VERSION = 1
+
+# Snapshot field -> the Utils probe that fills it when it is missing
+SNAPSHOT_PROBES = {
+    "vendor": "get_vendor",
+    "model": "get_model",
+    "cpu": "get_cpu_info",
+    "mem": "get_mem",
+    "disks": "get_disks",
+    "discrete_gpu": "get_discrete_gpu",
+    "serial": "get_serial",
+    "batteries": "get_battery_capacities",
+    "chassis_type": "get_chassis_type",
+    "bios_password": "has_bios_password",
+    "asset_info": "has_asset_info",
+    "computrace": "has_computrace_enabled",
+}
+
+
+def default_snapshot_path():
+    return os.path.join(
+        session_checkpoint.default_checkpoint_dir(), "system-snapshot.json"
+    )
 
-def get_system_info():
-    """Retrieve system hardware information using Utils."""
-    utils = Utils()
 
-    brand = utils.get_vendor()
-    model = utils.get_model()
-    cpu = utils.get_cpu_info()
-    ram = utils.get_mem()
-    disks = utils.get_disks()
-    gpu = utils.get_discrete_gpu()
-    serial = utils.get_serial()
-    batteries = utils.get_battery_capacities()
-    device_type = utils.get_chassis_type()
-    bios_password = utils.has_bios_password()
-    asset_info = utils.has_asset_info()
-    computrace = utils.has_computrace_enabled()
+def save_snapshot(snapshot, path=None, boot_id=None):
+    """Atomically write snapshot for this boot. Returns True if written."""
+    path = path or default_snapshot_path()
+    if boot_id is None:
+        boot_id = session_checkpoint.read_boot_id()
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "boot_id": boot_id,
+        "saved_at": time.time(),
+        "snapshot": snapshot,
+    }
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        print(f"generate_tracking_sheet: could not write {path}: {e}")
+        return False
+    return True
+
+
+def load_snapshot(path=None, boot_id=None):
+    """The snapshot saved at path, or {} if it is missing, unreadable or
+    from another boot (firmware results may have changed since)."""
+    path = path or default_snapshot_path()
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"generate_tracking_sheet: no snapshot at {path}")
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"generate_tracking_sheet: ignoring unreadable {path}: {e}")
+        return {}
+    if boot_id is None:
+        boot_id = session_checkpoint.read_boot_id()
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != SNAPSHOT_VERSION
+        or not isinstance(data.get("snapshot"), dict)
+    ):
+        print(f"generate_tracking_sheet: ignoring unrecognised {path}")
+        return {}
+    if data.get("boot_id") != boot_id:
+        print(f"generate_tracking_sheet: {path} is from another boot")
+        return {}
+    return data["snapshot"]
+
+
+def complete_snapshot(snapshot=None):
+    """snapshot with every SNAPSHOT_PROBES field, probing only the missing
+    ones."""
+    values = {k: v for k, v in (snapshot or {}).items() if k in SNAPSHOT_PROBES}
+    missing = [field for field in SNAPSHOT_PROBES if field not in values]
+    if missing:
+        if values:
+            print(f"Probing fields missing from the snapshot: {', '.join(missing)}")
+        utils = Utils()
+        for field in missing:
+            values[field] = getattr(utils, SNAPSHOT_PROBES[field])()
+    return values
+
+
+def get_system_info(snapshot=None):
+    """Retrieve system hardware information, from snapshot where it has the
+    raw value (see SNAPSHOT_PROBES) and from Utils otherwise."""
+    values = complete_snapshot(snapshot)
+    brand = values["vendor"]
+    model = values["model"]
+    cpu = values["cpu"]
+    ram = values["mem"]
+    disks = values["disks"]
+    gpu = values["discrete_gpu"]
+    serial = values["serial"]
+    batteries = values["batteries"]
+    device_type = values["chassis_type"]
+    bios_password = values["bios_password"]
+    asset_info = values["asset_info"]
+    computrace = values["computrace"]
 
     # Format storage with type
     if disks:
@@ -111,19 +192,50 @@ def get_system_info():
     return info
 
 
-def generate_tracking_sheet(item_name, output_path=None, spec_passed=None, manual_test_results=None):
+def generate_tracking_sheet(
+    item_name,
+    output_path=None,
+    spec_passed=None,
+    manual_test_results=None,
+    snapshot=None,
+):
     """Generate a landscape PDF tracking sheet for a computer.
 
     Layout: two-column landscape page. Left half contains system info
     (header, logo, specs, QC workflow). Right half contains manual test
     results and notes. When folded in half, the logo appears on the
-    right side of the left half-sheet.
+    right side of the left half-sheet. snapshot holds raw probe results
+    already gathered (see get_system_info).
     """
+    # reportlab pulls in all of platypus, so load it only when a sheet is
+    # actually generated rather than whenever this module is imported.
+    try:
+        from reportlab.lib.pagesizes import letter, landscape
+        from reportlab.lib.units import inch
+        from reportlab.lib import colors
+        from reportlab.platypus import (
+            SimpleDocTemplate,
+            Table,
+            TableStyle,
+            Paragraph,
+            Spacer,
+            Image,
+            HRFlowable,
+        )
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.enums import TA_LEFT
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+    except ImportError as e:
+        raise ImportError(
+            "reportlab is required. Install with: sudo apt install python3-reportlab"
+        ) from e
+
     if output_path is None:
         output_path = f"/tmp/{item_name}_tracking_sheet.pdf"
 
     print("Gathering system information...")
-    system_info = get_system_info()
+    system_info = get_system_info(snapshot)
 
     print("\nSystem information:")
     for key, value in system_info.items():
@@ -507,15 +619,34 @@ def generate_tracking_sheet(item_name, output_path=None, spec_passed=None, manua
     return output_path
 
 
-def main():
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <item_name> [output_path]")
-        sys.exit(1)
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate a PDF tracking sheet")
+    parser.add_argument("item_name", help="K-number printed on the sheet")
+    parser.add_argument("output_path", nargs="?", help="PDF to write")
+    parser.add_argument(
+        "--from-snapshot",
+        action="store_true",
+        help="reuse the system info the Spec wizard saved on this boot; "
+        "fields missing from it are probed",
+    )
+    parser.add_argument(
+        "--snapshot-path",
+        default=default_snapshot_path(),
+        metavar="PATH",
+        help="snapshot file for --from-snapshot (default: %(default)s)",
+    )
+    return parser.parse_args(argv)
+
 
-    item_name = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+def main(argv=None):
+    args = parse_args(argv)
+    snapshot = load_snapshot(args.snapshot_path) if args.from_snapshot else None
 
-    generate_tracking_sheet(item_name, output_path)
+    try:
+        generate_tracking_sheet(args.item_name, args.output_path, snapshot=snapshot)
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
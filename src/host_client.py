@@ -0,0 +1,59 @@
+"""
+Launcher side of the optional resident host (see kramden_host.py).
+
+With KRAMDEN_RESIDENT_HOST=1 the launchers ask the host over D-Bus to open
+their workflow instead of starting a new process. D-Bus activation starts
+the host on first use. Only Gio is imported here so a warm launch never
+loads GTK in the launcher process.
+"""
+
+import os
+import sys
+
+ENV_RESIDENT_HOST = "KRAMDEN_RESIDENT_HOST"
+HOST_APP_ID = "org.kramden.provision"
+HOST_OBJECT_PATH = "/org/kramden/provision"
+
+
+def resident_host_enabled():
+    return os.environ.get(ENV_RESIDENT_HOST, "") not in ("", "0")
+
+
+def open_in_host(workflow, timeout_ms=10000):
+    """Open workflow in the resident host. Returns False to run standalone."""
+    if not resident_host_enabled():
+        return False
+    # Command-line options (e.g. secure erase --test) are only handled by
+    # the standalone apps.
+    if len(sys.argv) > 1:
+        return False
+    try:
+        from gi.repository import Gio, GLib
+
+        platform_data = {}
+        for env, key in (
+            ("XDG_ACTIVATION_TOKEN", "activation-token"),
+            ("DESKTOP_STARTUP_ID", "desktop-startup-id"),
+        ):
+            if os.environ.get(env):
+                platform_data[key] = GLib.Variant("s", os.environ[env])
+
+        bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+        bus.call_sync(
+            HOST_APP_ID,
+            HOST_OBJECT_PATH,
+            "org.freedesktop.Application",
+            "ActivateAction",
+            GLib.Variant(
+                "(sava{sv})",
+                ("open-workflow", [GLib.Variant("s", workflow)], platform_data),
+            ),
+            None,
+            Gio.DBusCallFlags.NONE,
+            timeout_ms,
+            None,
+        )
+        return True
+    except Exception as e:
+        print(f"Resident host unavailable, starting {workflow} standalone: {e}")
+        return False
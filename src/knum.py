@@ -1,11 +1,11 @@
 import gi
-import threading
 
 gi.require_version("Adw", "1")
 gi.require_version("Gtk", "4.0")
-from gi.repository import Adw, Gtk, GLib
+from gi.repository import Adw, Gtk
 
 from utils import Utils
+from task_executor import get_executor
 from sortly import (
     get_api_key,
     get_stage_folder_ids,
@@ -34,6 +34,7 @@ class KramdenNumber(Adw.Bin):
         self._existing_item = None
         self._system_info = None
         self._user_edited = False
+        self.on_checkpoint = None
 
         # Main vertical layout
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
@@ -84,12 +85,7 @@ class KramdenNumber(Adw.Bin):
     def on_shown(self):
         utils = Utils()
         hostname = utils.get_hostname()
-        state = self.state.get_value()
-        if hostname.lower().startswith("k"):
-            state["KramdenNumber"] = True
-        else:
-            state["KramdenNumber"] = False
-        print("knum:on_shown " + str(self.state.get_value()))
+        self.state.set("KramdenNumber", hostname.lower().startswith("k"))
 
         if self._lookup_done:
             return
@@ -124,21 +120,79 @@ class KramdenNumber(Adw.Bin):
             "Automatic serial lookup is temporarily disabled. Enter a K-number to continue."
         )
 
-    def _lookup_serial_thread(self, api_key, serial):
-        try:
-            GLib.idle_add(self._set_status, "Discovering subfolders...")
-            folder_ids = []
-            for fid in get_stage_folder_ids("osload"):
-                folder_ids.extend(list_subfolders(api_key, fid))
-            GLib.idle_add(
-                self._set_status,
-                f"Searching {len(folder_ids)} folder(s) for serial '{serial}'...",
-            )
-            results = search_by_serial(api_key, folder_ids, serial)
-        except Exception as e:
-            GLib.idle_add(self._on_lookup_complete, None, sortly_error_message(e))
-            return
-        GLib.idle_add(self._on_lookup_complete, results, None)
+    def checkpoint_data(self):
+        return {
+            "knumber": self.knumber_entry.get_text().strip(),
+            "existing_item": self._existing_item,
+            "system_info": self._system_info,
+            "submitted": self._submitted,
+        }
+
+    def restore_checkpoint(self, data):
+        """Restore a saved session instead of re-probing system info.
+
+        System info missing from the checkpoint and the hostname are read
+        on the task executor; the page stays locked until they arrive. The
+        task has no owner so moving to the saved page doesn't cancel it.
+        """
+        self._lookup_done = True
+        knumber = data.get("knumber", "")
+        self.knumber_entry.set_text(knumber)
+        self._existing_item = data.get("existing_item")
+        self._submitted = data.get("submitted", False)
+        self._system_info = data.get("system_info")
+        self._populate_system_info()
+        self.skip = self._submitted
+        self.knumber_entry.set_sensitive(False)
+        self.register_button.set_sensitive(False)
+        self._set_status("Resuming session...")
+
+        get_executor().submit(
+            "knum-restore",
+            self._restore_thread,
+            self._system_info,
+            on_done=lambda result: self._on_restore_complete(knumber, *result),
+            on_error=lambda e: self._on_restore_complete(knumber, None, None),
+        )
+
+    def _restore_thread(self, token, system_info):
+        """(system info if it had to be probed, else None, hostname)."""
+        probed = None if system_info else get_system_info()
+        return probed, Utils().get_hostname()
+
+    def _on_restore_complete(self, knumber, system_info, hostname):
+        if system_info:
+            self._system_info = system_info
+            self._populate_system_info()
+        hostname = hostname or ""
+        self.state.set("KramdenNumber", hostname.lower().startswith("k"))
+        # The hostname may not have been applied before the interruption
+        if self._submitted and (
+            Utils.format_knumber(hostname) != Utils.format_knumber(knumber)
+        ):
+            self._submitted = False
+        self.skip = self._submitted
+
+        if self._submitted:
+            self._set_status(f"Resumed session: K-number set to {knumber}.")
+        else:
+            self.knumber_entry.set_sensitive(True)
+            self._on_knumber_changed(self.knumber_entry)
+            self._set_status("Resumed session. Enter a K-number to continue.")
+        if self.on_checkpoint:
+            self.on_checkpoint()
+
+    def _lookup_serial_thread(self, token, api_key, serial):
+        token.post(self._set_status, "Discovering subfolders...")
+        folder_ids = []
+        for fid in get_stage_folder_ids("osload"):
+            token.raise_if_cancelled()
+            folder_ids.extend(list_subfolders(api_key, fid))
+        token.post(
+            self._set_status,
+            f"Searching {len(folder_ids)} folder(s) for serial '{serial}'...",
+        )
+        return search_by_serial(api_key, folder_ids, serial)
 
     def _on_lookup_complete(self, results, error):
         self.spinner.stop()
@@ -222,50 +276,46 @@ class KramdenNumber(Adw.Bin):
         else:
             self._set_status(f"Registering {formatted}...")
 
-        thread = threading.Thread(
-            target=self._register_thread,
-            args=(api_key, formatted, is_update),
-            daemon=True,
+        get_executor().submit(
+            "knumber-register",
+            self._register_thread,
+            api_key,
+            formatted,
+            is_update,
+            on_done=lambda result: self._on_register_complete(*result),
+            on_error=lambda e: self._on_register_complete(
+                False, sortly_error_message(e)
+            ),
         )
-        thread.start()
 
-    def _register_thread(self, api_key, knumber, is_update):
-        try:
-            if is_update:
-                item = self._existing_item
+    def _register_thread(self, token, api_key, knumber, is_update):
+        if is_update:
+            item = self._existing_item
+        else:
+            # Search for existing item by name
+            token.post(self._set_status, "Discovering subfolders...")
+            folder_ids = []
+            for fid in get_stage_folder_ids("osload"):
+                folder_ids.extend(list_subfolders(api_key, fid))
+            token.post(
+                self._set_status,
+                f"Searching {len(folder_ids)} folder(s) for '{knumber}'...",
+            )
+            results = search_item_by_name(api_key, folder_ids, knumber)
+            if results:
+                item = results[0]
             else:
-                # Search for existing item by name
-                GLib.idle_add(self._set_status, "Discovering subfolders...")
-                folder_ids = []
-                for fid in get_stage_folder_ids("osload"):
-                    folder_ids.extend(list_subfolders(api_key, fid))
-                GLib.idle_add(
-                    self._set_status,
-                    f"Searching {len(folder_ids)} folder(s) for '{knumber}'...",
-                )
-                results = search_item_by_name(api_key, folder_ids, knumber)
-                if results:
-                    item = results[0]
-                else:
-                    # No existing record — skip Sortly update and proceed
-                    GLib.idle_add(self._on_register_complete, True, knumber)
-                    return
-
-            item_id = item["id"]
-            info = self._system_info or {}
-            if info:
-                success, error = update_item(api_key, item_id, info)
-                if not success:
-                    GLib.idle_add(
-                        self._on_register_complete,
-                        False,
-                        error or "Failed to update item.",
-                    )
-                    return
-
-            GLib.idle_add(self._on_register_complete, True, knumber)
-        except Exception as e:
-            GLib.idle_add(self._on_register_complete, False, sortly_error_message(e))
+                # No existing record — skip Sortly update and proceed
+                return True, knumber
+
+        item_id = item["id"]
+        info = self._system_info or {}
+        if info:
+            success, error = update_item(api_key, item_id, info)
+            if not success:
+                return False, error or "Failed to update item."
+
+        return True, knumber
 
     def _on_register_complete(self, success, result):
         self.spinner.stop()
@@ -279,10 +329,12 @@ class KramdenNumber(Adw.Bin):
             # Set hostname and advance
             utils = Utils()
             utils.set_hostname(knumber)
-            state = self.state.get_value()
-            state["KramdenNumber"] = Utils.format_knumber(knumber) is not None
-            print("knum:on_register_complete " + str(self.state.get_value()))
-            if state["KramdenNumber"]:
+            self.state.set(
+                "KramdenNumber", Utils.format_knumber(knumber) is not None
+            )
+            if self.on_checkpoint:
+                self.on_checkpoint()
+            if self.state.get("KramdenNumber"):
                 self.next()
                 self.skip = True
         else:
@@ -0,0 +1,115 @@
+"""
+Optional resident host for the Kramden workflow apps.
+
+One Adw.Application (org.kramden.provision) that stays running and opens
+each workflow as a window through its "open-workflow" action. GTK, the
+workflow modules and the hardware identity probed by Utils are loaded once
+and shared, so switching workflows does not pay for a new process.
+
+Started by D-Bus activation (data/org.kramden.provision.service) when a
+launcher runs with KRAMDEN_RESIDENT_HOST=1; see host_client.py.
+"""
+
+import importlib
+import sys
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Adw, Gio, GLib
+
+from host_client import HOST_APP_ID
+from stall_watchdog import install_from_env
+from utils import Utils
+
+# Workflow name -> (module, window class). Names match the launchers.
+WORKFLOWS = {
+    "spec": ("spec", "WizardWindow"),
+    "osload": ("osload", "WizardWindow"),
+    "finaltest": ("finaltest", "WizardWindow"),
+    "device": ("deviceinfo", "KramdenDevice"),
+    "secure-erase": ("secureerase", "SecureEraseWindow"),
+}
+
+
+class KramdenHost(Adw.Application):
+    def __init__(self):
+        super().__init__(application_id=HOST_APP_ID)
+        self._windows = {}
+
+        open_action = Gio.SimpleAction.new("open-workflow", GLib.VariantType.new("s"))
+        open_action.connect("activate", self._on_open_workflow)
+        self.add_action(open_action)
+
+        quit_action = Gio.SimpleAction.new("quit", None)
+        quit_action.connect("activate", lambda action, param: self.quit())
+        self.add_action(quit_action)
+
+    def do_startup(self):
+        Adw.Application.do_startup(self)
+
+        # Set Adwaita dark theme preference using Adw.StyleManager
+        style_manager = Adw.StyleManager.get_default()
+        style_manager.set_color_scheme(Adw.ColorScheme.PREFER_DARK)
+
+        self.stall_watchdog = install_from_env("host")
+        Utils.enable_identity_cache()
+
+        # Stay resident after the last workflow window closes
+        self.hold()
+        GLib.idle_add(self._prewarm, list(WORKFLOWS))
+
+    def do_activate(self):
+        # Workflows are opened through the open-workflow action
+        print("KramdenHost: activated without a workflow")
+
+    def _prewarm(self, pending):
+        """Import one workflow module per idle pass so the first open is warm."""
+        if not pending:
+            # Probe the shared hardware identity once
+            Utils()
+            return False
+        name = pending.pop(0)
+        try:
+            importlib.import_module(WORKFLOWS[name][0])
+        except ImportError as e:
+            print(f"KramdenHost: {name} not available: {e}")
+        return True
+
+    def _on_open_workflow(self, action, param):
+        name = param.get_string()
+        window = self._windows.get(name)
+        if window is not None:
+            window.present()
+            return
+
+        if name not in WORKFLOWS:
+            print(f"KramdenHost: unknown workflow {name}")
+            return
+        module_name, class_name = WORKFLOWS[name]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"KramdenHost: cannot open {name}: {e}")
+            return
+
+        window = getattr(module, class_name)(self)
+        window.connect("close-request", self._on_window_close_request, name)
+        self._windows[name] = window
+        self.add_window(window)
+        window.present()
+
+    def _on_window_close_request(self, window, name):
+        if self._windows.get(name) is window:
+            del self._windows[name]
+        return False
+
+
+def main(argv=None):
+    app = KramdenHost()
+    return app.run(sys.argv if argv is None else argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -87,7 +87,5 @@ class Landscape(Adw.Bin):
             self.info_label.set_visible(True)
             self.register_button.set_sensitive(False)
         
-        state = self.state.get_value()
-        state['Landscape'] = True
+        self.state.set('Landscape', True)
         self.hostname_label.set_label(f"K-Number: {hostname}")
-        print("landscape:on_shown " + str(self.state.get_value()))
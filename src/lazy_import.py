@@ -0,0 +1,38 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+    apt = LazyModule("apt")
+
+binds a proxy that imports the real module on first attribute access, so
+importing a module that only *might* need apt, dbus or reportlab stays
+cheap. Attribute writes go to the real module, which keeps
+unittest.mock.patch("utils.dbus.SystemBus") working.
+"""
+
+import importlib
+
+
+class LazyModule:
+    def __init__(self, name):
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_lazy_name"])
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] else "not loaded"
+        return f"<LazyModule {self.__dict__['_lazy_name']} ({state})>"
@@ -4,7 +4,8 @@ import os
 
 gi.require_version("Adw", "1")
 gi.require_version("Gdk", "4.0")
-from gi.repository import Adw, Gdk, GLib, GObject, Gtk
+from gi.repository import Adw, Gdk, GObject, Gtk
+from task_executor import get_executor
 from utils import Utils
 
 # Fixed display order for all tests
@@ -50,6 +51,7 @@ class ManualTest(Adw.Bin):
         self.utils = Utils()
         self.show_battery_test = show_battery_test
         self.skip = False
+        self.on_checkpoint = None
 
         # Detect chassis type to determine which tests are required
         chassis_type = Utils.get_chassis_type()
@@ -440,42 +442,41 @@ class ManualTest(Adw.Bin):
         # device is unplugged; isolating the test in its own process
         # means such a crash only fails the test rather than killing the
         # provisioning app.
-        import os
-        import subprocess
-        import sys
-        import threading
-
         button.set_sensitive(False)
         self.touchscreen_button.set_sensitive(False)
 
+        get_executor().submit(
+            "touchscreen-test",
+            self._run_touchscreen_test,
+            on_done=lambda passed: self._on_touchscreen_test_complete(
+                passed, button
+            ),
+        )
+
+    def _run_touchscreen_test(self, token):
+        import subprocess
+        import sys
+
         runner = os.path.join(
             os.path.dirname(os.path.realpath(__file__)),
             "touchscreen_test_runner.py",
         )
-
-        def _run():
-            try:
-                result = subprocess.run(
-                    [sys.executable, runner],
-                    capture_output=True,
-                    text=True,
-                    timeout=600,
-                )
-                if result.returncode != 0:
-                    print(
-                        f"Touchscreen test subprocess exited rc={result.returncode}"
-                    )
-                    if result.stderr:
-                        print(result.stderr)
-                    passed = False
-                else:
-                    passed = result.stdout.strip().endswith("pass")
-            except Exception as exc:
-                print(f"Touchscreen test subprocess error: {exc}")
-                passed = False
-            GLib.idle_add(self._on_touchscreen_test_complete, passed, button)
-
-        threading.Thread(target=_run, daemon=True).start()
+        try:
+            result = subprocess.run(
+                [sys.executable, runner],
+                capture_output=True,
+                text=True,
+                timeout=600,
+            )
+            if result.returncode != 0:
+                print(f"Touchscreen test subprocess exited rc={result.returncode}")
+                if result.stderr:
+                    print(result.stderr)
+                return False
+            return result.stdout.strip().endswith("pass")
+        except Exception as exc:
+            print(f"Touchscreen test subprocess error: {exc}")
+            return False
 
     def _on_touchscreen_test_complete(self, passed, click_button=None):
         self.touchscreen_button.set_active(passed)
@@ -554,9 +555,36 @@ class ManualTest(Adw.Bin):
 
     def check_status(self):
         print("ManualTest:check_status")
-        state = self.state.get_value()
-        state["ManualTest"] = all(self.required_tests.values())
-        print("manualtest:check_status State:" + str(state))
+        self.state.set("ManualTest", all(self.required_tests.values()))
+        if self.on_checkpoint:
+            self.on_checkpoint()
+
+    def checkpoint_data(self):
+        return {"results": self.get_all_test_results()}
+
+    def restore_checkpoint(self, data):
+        """Re-apply manual test results from a saved session."""
+        buttons = {
+            "USB": self.usb_button,
+            "Browser": self.browser_button,
+            "WiFi": self.wifi_button,
+            "Touchpad": self.touchpad_button,
+            "ScreenTest": self.screentest_button,
+            "Touchscreen": getattr(self, "touchscreen_button", None),
+            "Battery": getattr(self, "battery_button", None),
+        }
+        webcam_indexes = {"Untested": 0, "Pass": 1, "Fail": 2, "N/A": 3}
+        all_tests = {**self.required_tests, **self.optional_tests}
+        for name, value in (data.get("results") or {}).items():
+            if name not in all_tests:
+                continue
+            if name == "WebCam":
+                self.webcam_dropdown.set_selected(webcam_indexes.get(value, 0))
+            elif name == "Keyboard":
+                if value:
+                    self.update_text_highlighting(self.original_text)
+            elif buttons.get(name) is not None:
+                buttons[name].set_active(bool(value))
 
     def get_all_test_results(self):
         """Return a dict of all test names to their status for the tracking sheet.
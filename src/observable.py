@@ -1,41 +1,69 @@
-class Observable:
-    def __init__(self):
-        self._observers = []
+class StateStore:
+    """Typed wizard state with per-key subscriptions.
 
-    def add_observer(self, observer):
-        self._observers.append(observer)
+    Each key is declared up front with its initial value; the value's type
+    becomes the key's type and set() rejects anything else. Subscribers are
+    only called when a value actually changes, so pages can push their
+    pass/fail result on every render without triggering redundant redraws.
+    """
 
-    def notify_observers(self, property_name):
-        for observer in self._observers:
-            observer.update(property_name)
+    def __init__(self, initial):
+        self._values = dict(initial)
+        self._types = {key: type(value) for key, value in self._values.items()}
+        self._subscribers = {key: [] for key in self._values}
+        self._any_subscribers = []
 
+    def get(self, key):
+        return self._values[key]
 
-class ObservableProperty:
-    def __init__(self, initial_value=None):
-        self._value = initial_value
-        self._observers = []
+    def set(self, key, value):
+        """Set a key's value. Returns True if the value changed."""
+        if key not in self._types:
+            raise KeyError(f"Unknown state key: {key}")
+        expected = self._types[key]
+        if not isinstance(value, expected):
+            raise TypeError(
+                f"State key {key} expects {expected.__name__}, "
+                f"got {type(value).__name__}"
+            )
+        if self._values[key] == value:
+            return False
+        self._values[key] = value
+        print(f"StateStore: {key} = {value}")
+        for callback in list(self._subscribers[key]):
+            callback(key, value)
+        for callback in list(self._any_subscribers):
+            callback(key, value)
+        return True
 
-    def set_value(self, new_value):
-        print("ObservableProperty:set_value " + str(new_value))
-        if new_value != self._value:
-            self._value = new_value
-            self.notify_observers()
+    def subscribe(self, key, callback):
+        """Call callback(key, value) whenever key changes."""
+        if key not in self._subscribers:
+            raise KeyError(f"Unknown state key: {key}")
+        self._subscribers[key].append(callback)
+        return callback
 
-    def get_value(self):
-        print("ObservableProperty:get_value " + str(self._value))
-        return self._value
+    def subscribe_all(self, callback):
+        """Call callback(key, value) whenever any key changes."""
+        self._any_subscribers.append(callback)
+        return callback
 
-    def add_observer(self, observer):
-        self._observers.append(observer)
+    def unsubscribe(self, callback):
+        for callbacks in self._subscribers.values():
+            if callback in callbacks:
+                callbacks.remove(callback)
+        if callback in self._any_subscribers:
+            self._any_subscribers.remove(callback)
 
-    def notify_observers(self):
-        for observer in self._observers:
-            observer.update(self)
+    def values(self):
+        """Return a snapshot copy of all key/value pairs."""
+        return dict(self._values)
 
-class Observer:
-    def update(self, observable):
-        raise NotImplementedError("Subclass must implement the update method")
+    def all_passed(self):
+        return all(self._values.values())
 
-class StateObserver(Observer):
-    def update(self, observable):
-        print(f"Property changed to {observable.get_value()}")
+    def __contains__(self, key):
+        return key in self._values
+
+    def __repr__(self):
+        return f"StateStore({self._values})"
@@ -37,8 +37,8 @@ class OSLoadComplete(Adw.Bin):
     # on_shown is called when the page is shown in the stack
     def on_shown(self):
         print("OSLoadComplete: on_shown")
-        state = self.state.get_value()
-        if all(state.values()):
+        state = self.state.values()
+        if self.state.all_passed():
             print("OSLoadComplete: All passed")
             self.complete_row.set_title("OS Load Complete: <b>PASSED</b>!")
             self.complete_row.set_subtitle(str(state))
@@ -0,0 +1,172 @@
+"""
+Cheap fingerprints of the hardware behind each probe, and a udev hotplug
+monitor.
+
+A fingerprint hashes the few sysfs/procfs values a probe's answer depends
+on, so a page can tell which of its gathered results are stale (a swapped
+drive, battery or DIMM) and re-run only those probes. Taking every
+fingerprint costs a handful of file reads.
+"""
+
+import hashlib
+import threading
+
+import block_devices
+import probe_io
+from lazy_import import LazyModule
+
+pyudev = LazyModule("pyudev")
+
+# Battery fields that identify the pack, not its charge level
+_BATTERY_IDENTITY_FIELDS = (
+    "TYPE",
+    "MANUFACTURER",
+    "MODEL_NAME",
+    "SERIAL_NUMBER",
+    "ENERGY_FULL_DESIGN",
+    "CHARGE_FULL_DESIGN",
+)
+
+# udev subsystems whose events can change a fingerprint
+HOTPLUG_SUBSYSTEMS = ("block", "power_supply", "pci", "memory")
+
+
+def _digest(parts):
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+def _read(path):
+    try:
+        return probe_io.read_text(path).strip()
+    except OSError:
+        return ""
+
+
+def memory_fingerprint():
+    """Installed memory as the kernel sees it."""
+    for line in _read("/proc/meminfo").splitlines():
+        if line.startswith("MemTotal:"):
+            return _digest([line])
+    return None
+
+
+def disks_fingerprint():
+    """Non-removable drives with their size: the ones Utils.get_disks()
+    reports, so plugging in a USB stick or a disc does not change it."""
+    try:
+        names = sorted(probe_io.listdir("/sys/block"))
+    except OSError:
+        return None
+    parts = []
+    for name in names:
+        if name.startswith(block_devices.VIRTUAL_PREFIXES):
+            continue
+        if _read(f"/sys/block/{name}/removable") == "1":
+            continue
+        parts.append(f"{name} {_read(f'/sys/block/{name}/size')}")
+    return _digest(parts)
+
+
+def batteries_fingerprint():
+    """power_supply entries and the identity of each battery pack."""
+    try:
+        names = sorted(probe_io.listdir("/sys/class/power_supply"))
+    except OSError:
+        return None
+    parts = []
+    for name in names:
+        parts.append(name)
+        for line in _read(f"/sys/class/power_supply/{name}/uevent").splitlines():
+            key = line.partition("=")[0][len("POWER_SUPPLY_") :]
+            if key in _BATTERY_IDENTITY_FIELDS:
+                parts.append(line)
+    return _digest(parts)
+
+
+def pci_fingerprint():
+    """PCI devices by address and vendor:device id."""
+    try:
+        addresses = sorted(probe_io.listdir("/sys/bus/pci/devices"))
+    except OSError:
+        return None
+    return _digest(
+        f"{address} {_read(f'/sys/bus/pci/devices/{address}/vendor')}:"
+        f"{_read(f'/sys/bus/pci/devices/{address}/device')}"
+        for address in addresses
+    )
+
+
+FINGERPRINTS = {
+    "memory": memory_fingerprint,
+    "disks": disks_fingerprint,
+    "batteries": batteries_fingerprint,
+    "pci": pci_fingerprint,
+}
+
+
+def take(names):
+    """{name: fingerprint} for the given fingerprint names."""
+    return {name: FINGERPRINTS[name]() for name in names}
+
+
+def changed(previous, current):
+    """Names whose fingerprint differs between two take() results."""
+    return sorted(name for name in current if previous.get(name) != current[name])
+
+
+class HotplugMonitor:
+    """Calls callback(subsystems) from a background thread after udev
+    reports add/remove/change events, coalescing bursts over settle
+    seconds. Does nothing if udev cannot be monitored."""
+
+    def __init__(self, callback, subsystems=HOTPLUG_SUBSYSTEMS, settle=1.0):
+        self._callback = callback
+        self._subsystems = subsystems
+        self._settle = settle
+        self._observer = None
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timer = None
+
+    def start(self):
+        if self._observer is not None:
+            return True
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            for subsystem in self._subsystems:
+                monitor.filter_by(subsystem)
+            self._observer = pyudev.MonitorObserver(
+                monitor, callback=self._on_event, name="hotplug-monitor"
+            )
+            self._observer.start()
+        except Exception as e:
+            print(f"HotplugMonitor: udev monitoring unavailable: {e}")
+            self._observer = None
+            return False
+        return True
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.send_stop()
+            self._observer = None
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
+
+    def _on_event(self, device):
+        with self._lock:
+            self._pending.add(device.subsystem)
+            if self._timer is None:
+                self._timer = threading.Timer(self._settle, self._fire)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            subsystems = self._pending
+            self._pending = set()
+            self._timer = None
+        if subsystems:
+            self._callback(subsystems)
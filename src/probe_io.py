@@ -0,0 +1,467 @@
+"""
+Hardware probe I/O for Utils, with record and replay.
+
+Every probe Utils makes (commands, sysfs/procfs reads, directory listings,
+path checks and UPower/udev lookups) goes through the active backend:
+
+  LiveBackend       the real machine (the default)
+  RecordingBackend  the real machine, capturing each result and its latency
+  ReplayBackend     answers from a recorded bundle, optionally sleeping for
+                    the recorded latencies
+
+Set KRAMDEN_PROBE_BUNDLE to a bundle file to replay it in any app, and
+KRAMDEN_PROBE_LATENCY to a scale factor (1 = as recorded) to simulate the
+original probe latencies. Bundles are recorded with record_probes.py.
+"""
+
+import base64
+import contextlib
+import errno
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+BUNDLE_FORMAT = "kramden-probe-bundle"
+BUNDLE_VERSION = 1
+
+ENV_BUNDLE = "KRAMDEN_PROBE_BUNDLE"
+ENV_LATENCY = "KRAMDEN_PROBE_LATENCY"
+
+PATH_CHECKS = {
+    "exists": os.path.exists,
+    "isdir": os.path.isdir,
+    "isfile": os.path.isfile,
+    "readable": lambda path: os.access(path, os.R_OK),
+    "executable": lambda path: os.access(path, os.X_OK),
+}
+
+
+class ProbeNotRecorded(LookupError):
+    """A strict replay was asked for a probe that is not in the bundle."""
+
+
+class ReplayedProbeError(Exception):
+    """Stands in for a non-OS error raised while the bundle was recorded."""
+
+
+def _env_delta(env):
+    # Only the variables a probe changed matter for telling calls apart
+    # (e.g. glxinfo with and without DRI_PRIME).
+    if not env:
+        return {}
+    return {k: v for k, v in env.items() if os.environ.get(k) != v}
+
+
+def _completed(args, returncode, stdout, stderr, check):
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+def _encode_output(output):
+    if isinstance(output, bytes):
+        return output.decode("utf-8", "surrogateescape")
+    return output
+
+
+def _decode_output(output, text):
+    if output is None or text:
+        return output
+    return output.encode("utf-8", "surrogateescape")
+
+
+def _error_record(exc):
+    record = {"type": type(exc).__name__, "message": str(exc)}
+    if isinstance(exc, OSError) and exc.errno is not None:
+        record["errno"] = exc.errno
+        record["strerror"] = exc.strerror
+        record["filename"] = exc.filename
+    elif isinstance(exc, subprocess.TimeoutExpired):
+        record["timeout"] = exc.timeout
+    return record
+
+
+def _raise_recorded(record, args=None):
+    if "errno" in record:
+        # OSError picks the matching subclass (FileNotFoundError, ...)
+        raise OSError(record["errno"], record["strerror"], record.get("filename"))
+    if record["type"] == "TimeoutExpired":
+        raise subprocess.TimeoutExpired(args, record.get("timeout"))
+    raise ReplayedProbeError(f"{record['type']}: {record['message']}")
+
+
+class LiveBackend:
+    def run(self, args, kwargs):
+        # Looked up on every call so tests patching subprocess.run still work
+        return subprocess.run(args, **kwargs)
+
+    def read(self, path, binary=False):
+        with open(path, "rb" if binary else "r") as f:
+            return f.read()
+
+    def listdir(self, path):
+        return os.listdir(path)
+
+    def check(self, op, path):
+        return PATH_CHECKS[op](path)
+
+    def value(self, name, fn, default=None):
+        return fn()
+
+
+class RecordingBackend(LiveBackend):
+    """Probes the real machine and keeps every result in call order."""
+
+    def __init__(self):
+        self.probes = []
+        self._lock = threading.Lock()
+
+    def _record(self, entry, started):
+        entry["latency_ms"] = round((time.monotonic() - started) * 1000, 2)
+        with self._lock:
+            self.probes.append(entry)
+
+    def run(self, args, kwargs):
+        kwargs = dict(kwargs)
+        check = kwargs.pop("check", False)
+        text = bool(kwargs.get("text") or kwargs.get("universal_newlines"))
+        entry = {
+            "kind": "run",
+            "args": list(args),
+            "env": _env_delta(kwargs.get("env")),
+            "text": text,
+        }
+        started = time.monotonic()
+        try:
+            result = LiveBackend.run(self, args, kwargs)
+        except (OSError, subprocess.SubprocessError) as e:
+            entry["error"] = _error_record(e)
+            self._record(entry, started)
+            raise
+        entry["returncode"] = result.returncode
+        entry["stdout"] = _encode_output(result.stdout)
+        entry["stderr"] = _encode_output(result.stderr)
+        self._record(entry, started)
+        return _completed(
+            args, result.returncode, result.stdout, result.stderr, check
+        )
+
+    def read(self, path, binary=False):
+        entry = {"kind": "read", "path": path, "binary": binary}
+        started = time.monotonic()
+        try:
+            data = LiveBackend.read(self, path, binary)
+        except (OSError, ValueError) as e:
+            entry["error"] = _error_record(e)
+            self._record(entry, started)
+            raise
+        if binary:
+            entry["data_b64"] = base64.b64encode(data).decode("ascii")
+        else:
+            entry["data"] = data
+        self._record(entry, started)
+        return data
+
+    def listdir(self, path):
+        entry = {"kind": "listdir", "path": path}
+        started = time.monotonic()
+        try:
+            entries = LiveBackend.listdir(self, path)
+        except OSError as e:
+            entry["error"] = _error_record(e)
+            self._record(entry, started)
+            raise
+        entry["entries"] = sorted(entries)
+        self._record(entry, started)
+        return entries
+
+    def check(self, op, path):
+        started = time.monotonic()
+        result = LiveBackend.check(self, op, path)
+        entry = {"kind": "check", "op": op, "path": path, "result": result}
+        self._record(entry, started)
+        return result
+
+    def value(self, name, fn, default=None):
+        entry = {"kind": "value", "name": name}
+        started = time.monotonic()
+        try:
+            result = LiveBackend.value(self, name, fn, default)
+        except Exception as e:
+            entry["error"] = _error_record(e)
+            self._record(entry, started)
+            raise
+        # Normalise through JSON so replay returns exactly what was stored
+        result = json.loads(json.dumps(result))
+        entry["result"] = result
+        self._record(entry, started)
+        return result
+
+    def bundle(self, machine=None, expected=None, description=""):
+        with self._lock:
+            probes = list(self.probes)
+        return {
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "description": description,
+            "machine": machine or {},
+            "expected": expected or {},
+            "probes": probes,
+        }
+
+
+def _probe_key(entry):
+    kind = entry["kind"]
+    if kind == "run":
+        parts = [entry["args"], entry.get("env") or {}]
+    elif kind == "read":
+        parts = [entry["path"], bool(entry.get("binary"))]
+    elif kind == "check":
+        parts = [entry["op"], entry["path"]]
+    elif kind == "listdir":
+        parts = [entry["path"]]
+    else:
+        parts = [entry["name"]]
+    return json.dumps([kind] + parts, sort_keys=True)
+
+
+def load_bundle(path):
+    with open(path, "r") as f:
+        bundle = json.load(f)
+    if bundle.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"{path} is not a probe bundle")
+    if bundle.get("version") != BUNDLE_VERSION:
+        raise ValueError(
+            f"{path} is bundle version {bundle.get('version')}, "
+            f"expected {BUNDLE_VERSION}"
+        )
+    return bundle
+
+
+def save_bundle(bundle, path):
+    with open(path, "w") as f:
+        json.dump(bundle, f, indent=1)
+        f.write("\n")
+
+
+class ReplayBackend:
+    """Answers probes from a bundle.
+
+    Repeated probes are answered in recorded order and the last answer is
+    repeated after that. A probe missing from the bundle behaves as if the
+    tool or file is absent, or raises ProbeNotRecorded when strict.
+    latency_scale 1.0 sleeps for each recorded latency; 0 replays instantly.
+    """
+
+    def __init__(self, bundle, latency_scale=0.0, strict=False):
+        self.bundle = bundle
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.misses = []
+        self._lock = threading.Lock()
+        self._answers = {}
+        for entry in bundle.get("probes", []):
+            self._answers.setdefault(_probe_key(entry), deque()).append(entry)
+
+    @classmethod
+    def from_file(cls, path, latency_scale=0.0, strict=False):
+        return cls(load_bundle(path), latency_scale, strict)
+
+    def _answer(self, query):
+        key = _probe_key(query)
+        with self._lock:
+            answers = self._answers.get(key)
+            if not answers:
+                self.misses.append(query)
+                entry = None
+            elif len(answers) > 1:
+                entry = answers.popleft()
+            else:
+                entry = answers[0]
+        if entry is None:
+            if self.strict:
+                raise ProbeNotRecorded(key)
+            return None
+        if self.latency_scale > 0:
+            time.sleep(entry.get("latency_ms", 0) / 1000.0 * self.latency_scale)
+        return entry
+
+    def run(self, args, kwargs):
+        text = bool(kwargs.get("text") or kwargs.get("universal_newlines"))
+        entry = self._answer(
+            {"kind": "run", "args": list(args), "env": _env_delta(kwargs.get("env"))}
+        )
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "Not in probe bundle", args[0])
+        if "error" in entry:
+            _raise_recorded(entry["error"], args)
+        capture = kwargs.get("capture_output") or kwargs.get("stdout") is not None
+        stdout = _decode_output(entry.get("stdout"), text) if capture else None
+        stderr = _decode_output(entry.get("stderr"), text) if capture else None
+        return _completed(
+            args, entry["returncode"], stdout, stderr, kwargs.get("check", False)
+        )
+
+    def read(self, path, binary=False):
+        entry = self._answer({"kind": "read", "path": path, "binary": binary})
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "Not in probe bundle", path)
+        if "error" in entry:
+            _raise_recorded(entry["error"])
+        if binary:
+            return base64.b64decode(entry["data_b64"])
+        return entry["data"]
+
+    def listdir(self, path):
+        entry = self._answer({"kind": "listdir", "path": path})
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "Not in probe bundle", path)
+        if "error" in entry:
+            _raise_recorded(entry["error"])
+        return list(entry["entries"])
+
+    def check(self, op, path):
+        entry = self._answer({"kind": "check", "op": op, "path": path})
+        return bool(entry and entry["result"])
+
+    def value(self, name, fn, default=None):
+        entry = self._answer({"kind": "value", "name": name})
+        if entry is None:
+            return default
+        if "error" in entry:
+            _raise_recorded(entry["error"])
+        return entry["result"]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _backend_from_env()
+        return _backend
+
+
+def set_backend(backend):
+    """Install backend for all probes. Returns the previous one."""
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+    return previous
+
+
+def _backend_from_env():
+    path = os.environ.get(ENV_BUNDLE)
+    if not path:
+        return LiveBackend()
+    try:
+        latency_scale = float(os.environ.get(ENV_LATENCY) or 0)
+    except ValueError:
+        print(f"probe_io: ignoring invalid {ENV_LATENCY}")
+        latency_scale = 0.0
+    print(f"probe_io: replaying hardware probes from {path}")
+    return ReplayBackend.from_file(path, latency_scale)
+
+
+_local = threading.local()
+
+
+class TimeBox:
+    """A time_box() block. expired is set once a command in it is stopped
+    at the deadline, even if the probe caught the TimeoutExpired."""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.expired = False
+
+
+@contextlib.contextmanager
+def time_box(seconds):
+    """Limit every probe command run by this thread inside the block to a
+    total of seconds; a command still running at the deadline is killed and
+    raises subprocess.TimeoutExpired. None leaves commands unbounded.
+    Yields the TimeBox."""
+    previous = getattr(_local, "boxes", ())
+    box = TimeBox(None if seconds is None else time.monotonic() + seconds)
+    _local.boxes = previous + (box,)
+    try:
+        yield box
+    finally:
+        _local.boxes = previous
+
+
+def _expire(boxes, deadline):
+    for box in boxes:
+        if box.deadline is not None and box.deadline <= deadline:
+            box.expired = True
+
+
+def run(args, **kwargs):
+    """subprocess.run for probe commands."""
+    boxes = getattr(_local, "boxes", ())
+    deadlines = [box.deadline for box in boxes if box.deadline is not None]
+    boxed = False
+    if deadlines:
+        deadline = min(deadlines)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _expire(boxes, deadline)
+            raise subprocess.TimeoutExpired(args, 0)
+        if kwargs.get("timeout") is None or kwargs["timeout"] > remaining:
+            kwargs["timeout"] = remaining
+            boxed = True
+    try:
+        return get_backend().run(args, kwargs)
+    except subprocess.TimeoutExpired:
+        if boxed:
+            _expire(boxes, deadline)
+        raise
+
+
+def read_text(path):
+    return get_backend().read(path)
+
+
+def read_bytes(path):
+    return get_backend().read(path, binary=True)
+
+
+def listdir(path):
+    return get_backend().listdir(path)
+
+
+def exists(path):
+    return get_backend().check("exists", path)
+
+
+def isdir(path):
+    return get_backend().check("isdir", path)
+
+
+def isfile(path):
+    return get_backend().check("isfile", path)
+
+
+def readable(path):
+    return get_backend().check("readable", path)
+
+
+def executable(path):
+    return get_backend().check("executable", path)
+
+
+def value(name, fn, default=None):
+    """Result of fn(), a JSON-serialisable probe such as a UPower query.
+
+    default is returned when replaying a bundle that lacks the probe.
+    """
+    return get_backend().value(name, fn, default)
@@ -0,0 +1,212 @@
+"""
+Adaptive skipping and time-boxing of fallback probes.
+
+Some probes never answer on some platforms (cctk on a Dell with
+dell-wmi-sysman already loaded, glxinfo offload on nouveau) or take far longer
+than the alternatives. The planner keeps a small history of how long each
+probe took and whether it gave an answer, per vendor/model, and uses it to:
+
+  skip      leave out a probe that has not answered in its last runs, as long
+            as another probe can still answer (and retry it now and then)
+  time-box  kill a probe's commands once they run far longer than they ever
+            have when they answered
+
+Probes are always tried in the order the caller gives, which is the order of
+trust in their answers; the planner never lets a faster heuristic answer
+before a more authoritative source. Every decision is printed, so it shows
+up in the gather log. Only probes of the real machine feed the history;
+under a replayed probe bundle the planner runs everything and records
+nothing.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+import probe_io
+from session_checkpoint import default_checkpoint_dir
+
+HISTORY_VERSION = 1
+HISTORY_FILE = "probe-history.json"
+
+# Samples kept per probe and model
+MAX_SAMPLES = 20
+# Runs needed before a probe is skipped or time-boxed
+MIN_RUNS = 3
+# A skipped probe is run anyway after this many skips, in case a firmware
+# update or a new driver made it useful
+RETRY_AFTER_SKIPS = 10
+# Time box: this many times the slowest answered run, and never below
+TIME_BOX_FACTOR = 4
+MIN_TIME_BOX = 2.0
+
+
+def default_history_path():
+    return os.path.join(default_checkpoint_dir(), HISTORY_FILE)
+
+
+class ProbeHistory:
+    """Timing and outcome samples per model and probe, kept in a JSON file."""
+
+    def __init__(self, path=None):
+        self.path = path or default_history_path()
+        self._lock = threading.Lock()
+        self._models = None
+
+    def _load(self):
+        if self._models is not None:
+            return self._models
+        self._models = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self._models
+        except (OSError, ValueError) as e:
+            print(f"ProbeHistory: ignoring unreadable {self.path}: {e}")
+            return self._models
+        if isinstance(data, dict) and data.get("version") == HISTORY_VERSION:
+            models = data.get("models")
+            if isinstance(models, dict):
+                self._models = models
+        return self._models
+
+    def _save(self):
+        payload = {"version": HISTORY_VERSION, "models": self._models}
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"ProbeHistory: could not write {self.path}: {e}")
+
+    def stats(self, model_key, probe):
+        """{"samples": [[ms, answered], ...], "skipped": n} for a probe."""
+        with self._lock:
+            entry = self._load().get(model_key, {}).get(probe, {})
+            return {
+                "samples": [list(s) for s in entry.get("samples", [])],
+                "skipped": entry.get("skipped", 0),
+            }
+
+    def record(self, model_key, probe, elapsed_ms, answered):
+        with self._lock:
+            entry = self._load().setdefault(model_key, {}).setdefault(probe, {})
+            samples = entry.setdefault("samples", [])
+            samples.append([round(elapsed_ms, 1), bool(answered)])
+            del samples[:-MAX_SAMPLES]
+            entry["skipped"] = 0
+            self._save()
+
+    def record_skip(self, model_key, probe):
+        with self._lock:
+            entry = self._load().setdefault(model_key, {}).setdefault(probe, {})
+            entry["skipped"] = entry.get("skipped", 0) + 1
+            self._save()
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = ProbeHistory()
+        return _history
+
+
+class ProbePlanner:
+    """Plans the fallback probes of one machine model.
+
+    With active=False (no model to key on, or a replayed bundle) every probe
+    runs, without time boxes, and nothing is recorded.
+    """
+
+    def __init__(self, vendor, model, history=None, active=None):
+        self.vendor = vendor or ""
+        self.model = model or ""
+        self.model_key = f"{self.vendor}|{self.model}"
+        self.history = history or get_history()
+        if active is None:
+            active = bool(self.vendor or self.model) and not isinstance(
+                probe_io.get_backend(), probe_io.ReplayBackend
+            )
+        self.active = active
+
+    def _stats(self, probe):
+        return self.history.stats(self.model_key, probe)
+
+    def skip_reason(self, probe):
+        """Why probe should be skipped on this model, or None to run it."""
+        if not self.active:
+            return None
+        stats = self._stats(probe)
+        recent = stats["samples"][-MIN_RUNS:]
+        if len(recent) < MIN_RUNS or any(ok for _, ok in recent):
+            return None
+        if stats["skipped"] >= RETRY_AFTER_SKIPS:
+            return None
+        return f"no answer in its last {len(recent)} runs on this model"
+
+    def time_box(self, probe):
+        """Seconds probe's commands may run, or None for no limit."""
+        if not self.active:
+            return None
+        answered = [ms for ms, ok in self._stats(probe)["samples"] if ok]
+        if len(answered) < MIN_RUNS:
+            return None
+        return max(MIN_TIME_BOX, TIME_BOX_FACTOR * max(answered) / 1000.0)
+
+    def run(self, probe, fn, answered=lambda result: result is not None):
+        """Run fn() under probe's time box and record how it went.
+
+        A probe that overruns its time box returns None, whether or not fn
+        caught the TimeoutExpired itself.
+        """
+        limit = self.time_box(probe)
+        started = time.monotonic()
+        with probe_io.time_box(limit) as box:
+            try:
+                result = fn()
+            except subprocess.TimeoutExpired:
+                result = None
+        if box.expired:
+            print(f"probe planner: {probe} stopped at its {limit:.1f}s time box")
+            result = None
+        elapsed_ms = (time.monotonic() - started) * 1000
+        if self.active:
+            self.history.record(self.model_key, probe, elapsed_ms, answered(result))
+        return result
+
+    def attempt(self, probe, fn, can_skip=True):
+        """run(probe, fn) unless the planner skips it; None if skipped."""
+        reason = self.skip_reason(probe) if can_skip else None
+        if reason:
+            print(f"probe planner: skipping {probe} ({reason})")
+            self.history.record_skip(self.model_key, probe)
+            return None
+        return self.run(probe, fn)
+
+    def first_answer(self, probes, default=None):
+        """Run (name, fn) probes in the given order until one answers.
+
+        A probe is only skipped while a later probe can still answer, so the
+        last one left always runs.
+        """
+        for i, (name, fn) in enumerate(probes):
+            result = self.attempt(name, fn, can_skip=i < len(probes) - 1)
+            if result is not None:
+                return result
+        return default
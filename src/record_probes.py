@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Record every hardware probe Utils makes on this machine into a bundle.
+
+The bundle holds the raw outputs (hostnamectl, dmidecode, lspci, glxinfo,
+udev, UPower, sysfs/procfs reads, script exit codes) and how long each one
+took, plus what Utils made of them. Replay it anywhere with
+KRAMDEN_PROBE_BUNDLE=<bundle> or probe_io.ReplayBackend.
+
+Usage:
+    python3 record_probes.py hp-elitebook-840-g5.json
+    python3 record_probes.py dell.json --description "Latitude 5490, cctk"
+
+Only read-only probes are run; the clock sync, hostname and Landscape
+registration actions are not. The BIOS password and asset checks run in
+their read-only mode, so Dell tags are reported but never cleared and the
+cctk password probe, which writes a BIOS setting, is skipped.
+"""
+
+import argparse
+import json
+import sys
+
+import probe_io
+from utils import Utils
+
+# (name, probe) in the order the workflows run them
+PROBE_SUITE = [
+    ("disks", lambda utils: utils.get_disks()),
+    ("mem", lambda utils: utils.get_mem()),
+    ("cpu", lambda utils: utils.get_cpu_info()),
+    ("integrated_gpu", lambda utils: utils.get_integrated_gpu()),
+    ("discrete_gpu", lambda utils: utils.get_discrete_gpu()),
+    ("batteries", lambda utils: utils.get_battery_capacities()),
+    ("battery_details", lambda utils: utils.get_battery_details()),
+    ("bios_password", lambda utils: utils.has_bios_password(read_only=True)),
+    ("asset_info", lambda utils: utils.has_asset_info(read_only=True)),
+    ("computrace", lambda utils: utils.has_computrace_enabled()),
+    ("registered", lambda utils: utils.is_registered()),
+    ("asset_tags", lambda utils: utils.get_asset_tags()),
+    ("chassis_type", lambda utils: Utils.get_chassis_type()),
+    ("touchscreen", lambda utils: Utils.has_touchscreen()),
+    ("kramden_efivar", lambda utils: Utils.read_kramden_number_efivar()),
+]
+
+
+def identity(utils):
+    return {
+        "vendor": utils.vendor,
+        "model": utils.model,
+        "serial": utils.serial,
+        "hostname": utils.hostname,
+        "os": utils.os,
+    }
+
+
+def describe_error(e):
+    if isinstance(e, probe_io.ReplayedProbeError):
+        return str(e)
+    return f"{type(e).__name__}: {e}"
+
+
+def run_suite(suite=PROBE_SUITE):
+    """What Utils makes of the active probe backend, JSON-normalised."""
+    utils = Utils()
+    results = {"identity": identity(utils)}
+    for name, probe in suite:
+        print(f"Probing {name}...")
+        try:
+            results[name] = probe(utils)
+        except Exception as e:
+            print(f"  {name} failed: {e}")
+            results[name] = {"error": describe_error(e)}
+    # Tuples and the like compare as they will after loading
+    return json.loads(json.dumps(results))
+
+
+def record(suite=PROBE_SUITE, description=""):
+    """Run suite against this machine and return the bundle."""
+    recorder = probe_io.RecordingBackend()
+    previous = probe_io.set_backend(recorder)
+    try:
+        expected = run_suite(suite)
+    finally:
+        probe_io.set_backend(previous)
+    return recorder.bundle(
+        machine=expected["identity"], expected=expected, description=description
+    )
+
+
+def replay(bundle, suite=PROBE_SUITE, latency_scale=0.0, strict=True):
+    """Run suite against bundle. Returns (results, replay backend)."""
+    backend = probe_io.ReplayBackend(bundle, latency_scale, strict)
+    previous = probe_io.set_backend(backend)
+    try:
+        return run_suite(suite), backend
+    finally:
+        probe_io.set_backend(previous)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record this machine's hardware probes."
+    )
+    parser.add_argument("output", help="Bundle file to write")
+    parser.add_argument(
+        "--description", default="", help="Free text stored in the bundle"
+    )
+    args = parser.parse_args()
+
+    bundle = record(description=args.description)
+    probe_io.save_bundle(bundle, args.output)
+    total_ms = sum(p.get("latency_ms", 0) for p in bundle["probes"])
+    machine = bundle["machine"]
+    print(
+        f"Recorded {len(bundle['probes'])} probes ({total_ms:.0f} ms) from "
+        f"{machine['vendor']} {machine['model']} to {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
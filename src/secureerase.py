@@ -3,8 +3,6 @@
 import concurrent.futures
 import gi
 import os
-import re
-import subprocess
 import sys
 import threading
 import time
@@ -14,162 +12,20 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Gdk, Gtk, Adw, GLib
 
-TEST_MODE = "--test" in sys.argv
-
-_FROZEN_DETAIL = "DRIVE_FROZEN"
-
-
-def detect_drives():
-    """Detect non-removable SATA and NVMe drives using lsblk."""
-    drives = []
-
-    # SATA drives
-    try:
-        result = subprocess.run(
-            ["lsblk", "-n", "-d", "--output", "PATH,TYPE,RM"],
-            capture_output=True,
-            text=True,
-        )
-        for line in result.stdout.strip().splitlines():
-            parts = line.split()
-            if len(parts) >= 3 and parts[1] == "disk" and parts[2] == "0":
-                path = parts[0]
-                if "nvme" not in path:
-                    size = _get_drive_size(path)
-                    drives.append({"path": path, "type": "SATA", "size": size})
-    except (subprocess.CalledProcessError, OSError):
-        pass
-
-    # NVMe drives
-    try:
-        result = subprocess.run(
-            ["lsblk", "-n", "--nvme", "-d", "--output", "PATH,TYPE,RM"],
-            capture_output=True,
-            text=True,
-        )
-        for line in result.stdout.strip().splitlines():
-            parts = line.split()
-            if len(parts) >= 3 and parts[1] == "disk" and parts[2] == "0":
-                path = parts[0]
-                size = _get_drive_size(path)
-                drives.append({"path": path, "type": "NVMe", "size": size})
-    except (subprocess.CalledProcessError, OSError):
-        pass
-
-    return drives
-
-
-def _get_drive_size(path):
-    """Get drive size in human-readable format."""
-    try:
-        result = subprocess.run(
-            ["lsblk", "-n", "-d", "-b", "--output", "SIZE", path],
-            capture_output=True,
-            text=True,
-        )
-        size_bytes = int(result.stdout.strip())
-        size_gb = round(size_bytes / (1024**3), 1)
-        return f"{size_gb} GB"
-    except (subprocess.CalledProcessError, OSError, ValueError):
-        return "Unknown"
-
-
-def erase_drive(drive, test_mode):
-    """Erase a single drive. Returns (success, short_message, detail)."""
-    path = drive["path"]
-    drive_type = drive["type"]
-
-    if test_mode:
-        time.sleep(2)
-        return True, f"[TEST] Would erase {drive_type} drive {path}", None
-
-    try:
-        if drive_type == "SATA":
-            return _erase_sata(path)
-        else:  # NVMe
-            result = subprocess.run(
-                ["sudo", "nvme", "format", "--force", path],
-                capture_output=True,
-                text=True,
-            )
+import block_devices
+import erase_engine
+import erase_scheduler
+import erase_station
+from erase_engine import detect_drives, erase_drive
+from probe_fingerprints import HotplugMonitor
+from stall_watchdog import install_from_env
 
-        if result.returncode == 0:
-            return True, f"Successfully erased {path}", None
-        else:
-            detail = ""
-            if result.stdout.strip():
-                detail += result.stdout.strip()
-            if result.stderr.strip():
-                if detail:
-                    detail += "\n"
-                detail += result.stderr.strip()
-            return False, f"Failed to erase {path}", detail or None
-    except OSError as e:
-        return False, f"Failed to erase {path}", str(e)
-
-
-def _erase_sata(path):
-    """Erase a SATA drive, falling back to ATA Security Erase if SANITIZE is not supported."""
-    # Try SANITIZE block erase first (preferred, faster)
-    result = subprocess.run(
-        [
-            "sudo",
-            "hdparm",
-            "--yes-i-know-what-i-am-doing",
-            "--sanitize-block-erase",
-            path,
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        return True, f"Successfully erased {path}", None
-
-    # SANITIZE not supported, fall back to ATA Security Erase
-    # Check if drive is frozen (security commands will fail on frozen drives)
-    info_result = subprocess.run(
-        ["sudo", "hdparm", "-I", path],
-        capture_output=True,
-        text=True,
-    )
-    if not re.search(r"not\s+frozen", info_result.stdout):
-        return (False, f"Failed to erase {path}", _FROZEN_DETAIL)
-
-    # Set a temporary password (required before security erase)
-    result = subprocess.run(
-        ["sudo", "hdparm", "--security-set-pass", "p", path],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        detail = (result.stdout.strip() + "\n" + result.stderr.strip()).strip()
-        return (
-            False,
-            f"Failed to erase {path}",
-            f"Could not set security password:\n{detail}" if detail else None,
-        )
-
-    # Issue ATA Security Erase
-    result = subprocess.run(
-        ["sudo", "hdparm", "--security-erase", "p", path],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        return True, f"Successfully erased {path}", None
-
-    # Erase failed — try to clear the password so the drive isn't left locked
-    subprocess.run(
-        ["sudo", "hdparm", "--security-disable", "p", path],
-        capture_output=True,
-        text=True,
-    )
-    detail = (result.stdout.strip() + "\n" + result.stderr.strip()).strip()
-    return (
-        False,
-        f"Failed to erase {path}",
-        f"ATA Security Erase failed:\n{detail}" if detail else None,
-    )
+TEST_MODE = "--test" in sys.argv
+# Erase bench: follow drives as they are hotplugged (see erase_station)
+STATION_MODE = "--station" in sys.argv
+QUEUE_POLICY = erase_station.parse_queue_policy(sys.argv)
+# Drives erased at once in station mode
+STATION_WORKERS = 16
 
 
 class DriveRow(Adw.ActionRow):
@@ -179,10 +35,15 @@ class DriveRow(Adw.ActionRow):
         super().__init__()
         self.drive = drive
         self._default_subtitle = f"{drive['type']}  —  {drive['size']}"
+        if drive.get("model"):
+            self._default_subtitle += f"  —  {drive['model']}"
         self.set_title(drive["path"])
         self.set_subtitle(self._default_subtitle)
         self.succeeded = False
         self.error_detail = None
+        # Station mode: queued or erasing, and unplugged meanwhile
+        self.busy = False
+        self.removed = False
 
         self.check = Gtk.CheckButton()
         self.check.set_active(True)
@@ -200,6 +61,12 @@ class DriveRow(Adw.ActionRow):
         self.detail_button.connect("clicked", self._on_detail_clicked)
         self.add_suffix(self.detail_button)
 
+        self.progress_bar = Gtk.ProgressBar()
+        self.progress_bar.set_valign(Gtk.Align.CENTER)
+        self.progress_bar.set_size_request(120, -1)
+        self.progress_bar.set_visible(False)
+        self.add_suffix(self.progress_bar)
+
         self.spinner = Gtk.Spinner()
         self.spinner.set_visible(False)
         self.add_suffix(self.spinner)
@@ -212,6 +79,8 @@ class DriveRow(Adw.ActionRow):
         """Reset row to pre-erase state for retry."""
         self.spinner.stop()
         self.spinner.set_visible(False)
+        self.progress_bar.set_visible(False)
+        self.progress_bar.set_fraction(0)
         self._clear_status_classes()
         self.status_icon.set_visible(False)
         self.detail_button.set_visible(False)
@@ -227,9 +96,21 @@ class DriveRow(Adw.ActionRow):
         self.detail_button.set_visible(False)
         self.check.set_sensitive(False)
 
+    def set_progress(self, fraction, eta, text):
+        """Show erase progress; fraction None pulses the bar."""
+        self.spinner.stop()
+        self.spinner.set_visible(False)
+        self.progress_bar.set_visible(True)
+        if fraction is None:
+            self.progress_bar.pulse()
+        else:
+            self.progress_bar.set_fraction(fraction)
+        self.set_subtitle(text)
+
     def set_success(self, message):
         self.spinner.stop()
         self.spinner.set_visible(False)
+        self.progress_bar.set_visible(False)
         self._clear_status_classes()
         self.status_icon.set_from_icon_name("emblem-ok-symbolic")
         self.status_icon.add_css_class("success-icon")
@@ -240,6 +121,7 @@ class DriveRow(Adw.ActionRow):
     def set_failure(self, short_message, detail):
         self.spinner.stop()
         self.spinner.set_visible(False)
+        self.progress_bar.set_visible(False)
         self._clear_status_classes()
         self.status_icon.set_from_icon_name("dialog-error-symbolic")
         self.status_icon.add_css_class("error-icon")
@@ -268,13 +150,17 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
         self.set_icon_name("kramden")
         self.set_default_size(800, 600)
         self.erasing = False
-        self._suspend_lock = threading.Lock()
-        self._has_suspended = False
-        self._suspend_declined = False
+        # Stops overwrites at their checkpoint when the window closes
+        self._cancel = threading.Event()
+        # Overwrites and verifies take turns on drives sharing a bus
+        self._scheduler = erase_scheduler.BusScheduler()
+        self.connect("close-request", self._on_close_request)
 
         # Header bar
         header_bar = Gtk.HeaderBar()
         title_text = "Kramden - Secure Erase"
+        if STATION_MODE:
+            title_text += "  —  Station"
         if TEST_MODE:
             title_text += "  [TEST MODE]"
         header_bar_title = Gtk.Label(label=title_text)
@@ -340,6 +226,20 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
         self.status_label.set_visible(False)
         content_box.append(self.status_label)
 
+        # Rolling table of finished drives (station mode)
+        if STATION_MODE:
+            results_label = Gtk.Label(label="Results")
+            results_label.add_css_class("title-2")
+            results_label.set_xalign(0)
+            content_box.append(results_label)
+
+            self.results_list = Gtk.ListBox()
+            self.results_list.set_selection_mode(Gtk.SelectionMode.NONE)
+            self.results_list.add_css_class("boxed-list")
+            content_box.append(self.results_list)
+            self.result_rows = []
+            self.station_results = erase_station.StationResults()
+
         scrolled.set_child(content_box)
         main_box.append(scrolled)
 
@@ -351,6 +251,11 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
         button_box.set_margin_end(20)
         button_box.set_halign(Gtk.Align.END)
 
+        # Sampled read-back after each successful erase
+        self.verify_check = Gtk.CheckButton(label="Verify after erase")
+        self.verify_check.set_active(True)
+        button_box.append(self.verify_check)
+
         self.erase_button = Gtk.Button(label="Erase Selected Drives")
         self.erase_button.add_css_class("destructive-action")
         self.erase_button.connect("clicked", self._on_erase_clicked)
@@ -361,6 +266,11 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
 
         # Detect drives
         self.drive_rows = []
+        self.no_drives_row = Adw.ActionRow()
+        self.no_drives_row.set_title("No drives detected")
+        if STATION_MODE:
+            self._start_station()
+            return
         drives = detect_drives()
         if drives:
             for drive in drives:
@@ -368,11 +278,156 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
                 self.drive_rows.append(row)
                 self.list_box.append(row)
         else:
-            no_drives_row = Adw.ActionRow()
-            no_drives_row.set_title("No drives detected")
-            self.list_box.append(no_drives_row)
+            self.list_box.append(self.no_drives_row)
             self.erase_button.set_sensitive(False)
 
+    def _start_station(self):
+        self.queue_policy = erase_station.QueuePolicy(QUEUE_POLICY)
+        self._station_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=STATION_WORKERS
+        )
+        # Drives present at startup (the ones a batch was left in) are never
+        # queued automatically
+        for drive in self._station_drives():
+            self._add_row(drive).check.set_active(False)
+        if not self.drive_rows:
+            self.list_box.append(self.no_drives_row)
+        self._hotplug = HotplugMonitor(
+            self._on_hotplug, subsystems=("block",), settle=2.0
+        )
+        if not self._hotplug.start():
+            self.status_label.set_text(
+                "Drive hotplug cannot be followed; restart to see new drives."
+            )
+            self.status_label.add_css_class("text-error")
+            self.status_label.set_visible(True)
+
+    def _station_drives(self):
+        """Drives to show in station mode: all but the ones in use (the
+        system disk)."""
+        return [
+            d
+            for d in detect_drives()
+            if not block_devices.in_use(os.path.basename(d["path"]))
+        ]
+
+    def _add_row(self, drive):
+        if not self.drive_rows:
+            self.list_box.remove(self.no_drives_row)
+        row = DriveRow(drive)
+        self.drive_rows.append(row)
+        self.list_box.append(row)
+        return row
+
+    def _remove_row(self, row):
+        self.drive_rows.remove(row)
+        self.list_box.remove(row)
+        if not self.drive_rows:
+            self.list_box.append(self.no_drives_row)
+
+    def _on_hotplug(self, subsystems):
+        # Called from the monitor thread; sysfs is read here, rows are
+        # changed on the UI thread
+        GLib.idle_add(self._apply_hotplug, self._station_drives())
+
+    def _apply_hotplug(self, drives):
+        added, removed = erase_station.changes(
+            [row.drive for row in self.drive_rows], drives
+        )
+        removed_keys = {erase_station.drive_key(d) for d in removed}
+        for row in list(self.drive_rows):
+            if erase_station.drive_key(row.drive) not in removed_keys:
+                continue
+            print(f"secureerase: {row.drive['path']}: removed")
+            if row.busy:
+                # Its erase fails and the row goes when the job finishes
+                row.removed = True
+            else:
+                self._remove_row(row)
+        queue = []
+        for drive in added:
+            print(
+                f"secureerase: {drive['path']}: inserted "
+                f"({drive['model']} {drive['serial']})"
+            )
+            row = self._add_row(drive)
+            if self.queue_policy.should_queue(drive, self.station_results):
+                queue.append(row)
+            else:
+                row.check.set_active(False)
+        if queue:
+            self._queue_rows(queue)
+        return False
+
+    def _queue_rows(self, rows):
+        """Start erasing rows' drives alongside any already erasing."""
+        self._verify = self.verify_check.get_active()
+        for row in rows:
+            row.reset()
+            row.busy = True
+            row.check.set_active(False)
+            row.check.set_sensitive(False)
+            row.set_progress(None, None, "Queued")
+            self._station_executor.submit(self._station_job, row)
+
+    def _station_job(self, row):
+        started = time.monotonic()
+        plan = self._preflight([row])[row]
+        if erase_engine.needs_unfreeze(plan):
+            # No suspend while other drives are erasing; hotplugged drives
+            # are rarely frozen anyway
+            print(f"secureerase: {row.drive['path']}: frozen, will be overwritten")
+        success, short_message = self._erase_drive_worker(row, plan)
+        GLib.idle_add(
+            self._station_job_done,
+            row,
+            success,
+            short_message,
+            time.monotonic() - started,
+        )
+
+    def _station_job_done(self, row, success, short_message, elapsed):
+        record = self.station_results.add(row.drive, success, short_message, elapsed)
+        result_row = Adw.ActionRow()
+        drive = row.drive
+        parts = (drive["model"], drive["serial"], drive["size"])
+        result_row.set_title("  —  ".join(p for p in parts if p) or drive["path"])
+        result_row.set_subtitle(erase_station.describe(record))
+        icon = Gtk.Image.new_from_icon_name(
+            "emblem-ok-symbolic" if success else "dialog-error-symbolic"
+        )
+        icon.add_css_class("success-icon" if success else "error-icon")
+        result_row.add_suffix(icon)
+        self.results_list.prepend(result_row)
+        self.result_rows.insert(0, result_row)
+        for old_row in self.result_rows[erase_station.MAX_RESULTS :]:
+            self.results_list.remove(old_row)
+        del self.result_rows[erase_station.MAX_RESULTS :]
+
+        self.status_label.remove_css_class("text-error")
+        self.status_label.set_text(self.station_results.summary())
+        self.status_label.set_visible(True)
+
+        row.busy = False
+        if row.removed:
+            self._remove_row(row)
+            # The drive may have been put back while it was erasing; its
+            # busy row hid it from the scans since
+            threading.Thread(
+                target=self._on_hotplug, args=({"block"},), daemon=True
+            ).start()
+        else:
+            # A failed drive can be selected and retried
+            row.check.set_sensitive(True)
+        return False
+
+    def _on_close_request(self, window):
+        self._cancel.set()
+        if STATION_MODE:
+            self._hotplug.stop()
+            self._station_executor.shutdown(wait=False)
+        return False
+
     def _on_erase_clicked(self, button):
         selected = [r for r in self.drive_rows if r.check.get_active()]
         if not selected:
@@ -417,9 +472,13 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
         if response != "erase":
             return
 
+        if STATION_MODE:
+            self._queue_rows(selected_rows)
+            return
+
         self.erasing = True
-        self._has_suspended = False
-        self._suspend_declined = False
+        self._verify = self.verify_check.get_active()
+        self.verify_check.set_sensitive(False)
         self.erase_button.set_sensitive(False)
         # Reset selected rows and disable all checkboxes during erase
         for row in selected_rows:
@@ -438,86 +497,112 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
         )
         thread.start()
 
-    def _erase_drive_worker(self, row):
-        """Erase a single drive and update its row. Returns success bool."""
+    def _erase_drive_worker(self, row, plan):
+        """Erase a single drive and update its row. Returns (success,
+        short_message)."""
         GLib.idle_add(row.set_in_progress)
-        success, short_message, detail = erase_drive(row.drive, TEST_MODE)
 
-        # Handle frozen SATA drives — prompt user to suspend/resume
-        if not success and detail == _FROZEN_DETAIL:
-            if self._handle_frozen_drive(row.drive["path"]):
-                success, short_message, detail = erase_drive(row.drive, TEST_MODE)
-            else:
-                detail = "Skipped — drive is frozen and suspend was declined."
+        def on_progress(fraction, eta, text):
+            GLib.idle_add(row.set_progress, fraction, eta, text)
+
+        # Drives still frozen after the pre-flight fail their security
+        # erase at once and are overwritten instead
+        host_io = self._scheduler.for_drive(row.drive, on_progress)
+        success, short_message, detail, method = erase_drive(
+            row.drive, TEST_MODE, on_progress, self._cancel, plan, host_io
+        )
+
+        if success and self._verify:
+            success, short_message, detail = erase_engine.verify_drive(
+                row.drive, TEST_MODE, short_message, on_progress, host_io, method
+            )
 
         if success:
             GLib.idle_add(row.set_success, short_message)
         else:
             GLib.idle_add(row.set_failure, short_message, detail)
-        return success
-
-    def _handle_frozen_drive(self, path):
-        """Prompt user to suspend/resume to unfreeze a drive. Returns True if suspend was performed."""
-        with self._suspend_lock:
-            if self._has_suspended:
-                return True
-            if self._suspend_declined:
-                return False
-
-            event = threading.Event()
-            confirmed = [False]
-
-            def show_dialog():
-                dialog = Adw.MessageDialog(
-                    transient_for=self,
-                    heading="Drive Frozen",
-                    body=(
-                        f"Drive {path} is frozen and cannot be securely erased.\n\n"
-                        "The system must briefly suspend and resume to unfreeze "
-                        "the drive. This will take about 5 seconds.\n\n"
-                        "Suspend now?"
-                    ),
-                )
-                dialog.add_response("skip", "Skip")
-                dialog.add_response("suspend", "Suspend & Resume")
-                dialog.set_response_appearance(
-                    "suspend", Adw.ResponseAppearance.SUGGESTED
-                )
-                dialog.set_default_response("suspend")
-                dialog.set_close_response("skip")
-
-                def on_response(d, response):
-                    confirmed[0] = response == "suspend"
-                    event.set()
-
-                dialog.connect("response", on_response)
-                dialog.present()
-
-            GLib.idle_add(show_dialog)
-            event.wait()
-
-            if confirmed[0]:
-                subprocess.run(
-                    ["sudo", "rtcwake", "-m", "mem", "-s", "5"],
-                    capture_output=True,
-                )
-                self._has_suspended = True
-                return True
-
-            self._suspend_declined = True
-            return False
+        return success, short_message
+
+    def _preflight(self, rows):
+        """Plan every selected drive in parallel before any erase starts.
+        Returns {row: (methods, caps)}, None for drives that are not planned
+        (test mode, USB bridges)."""
+
+        def plan(row):
+            GLib.idle_add(row.set_progress, None, None, "Checking drive state")
+            return erase_engine.preflight(row.drive, TEST_MODE)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(rows)) as executor:
+            return dict(zip(rows, executor.map(plan, rows)))
+
+    def _frozen_rows(self, plans):
+        return [row for row, plan in plans.items() if erase_engine.needs_unfreeze(plan)]
+
+    def _confirm_suspend(self, rows):
+        """Ask once whether to suspend/resume to unfreeze rows' drives.
+        Blocks the calling (non-UI) thread; returns True to suspend."""
+        event = threading.Event()
+        confirmed = [False]
+        paths = "\n".join(row.drive["path"] for row in rows)
+
+        def show_dialog():
+            dialog = Adw.MessageDialog(
+                transient_for=self,
+                heading="Drives Frozen",
+                body=(
+                    f"These drives are frozen and cannot be securely erased:\n{paths}\n\n"
+                    "The system must briefly suspend and resume to unfreeze "
+                    "them. This will take about 5 seconds. If you skip, they "
+                    "will be overwritten instead, which takes much longer.\n\n"
+                    "Suspend now?"
+                ),
+            )
+            dialog.add_response("skip", "Skip")
+            dialog.add_response("suspend", "Suspend & Resume")
+            dialog.set_response_appearance(
+                "suspend", Adw.ResponseAppearance.SUGGESTED
+            )
+            dialog.set_default_response("suspend")
+            dialog.set_close_response("skip")
+
+            def on_response(d, response):
+                confirmed[0] = response == "suspend"
+                event.set()
+
+            dialog.connect("response", on_response)
+            dialog.present()
+
+        GLib.idle_add(show_dialog)
+        event.wait()
+        return confirmed[0]
 
     def _erase_thread(self, selected_rows):
+        # Check every drive first so that a single suspend/resume, before any
+        # erase is running, unfreezes all frozen drives
+        plans = self._preflight(selected_rows)
+        frozen = self._frozen_rows(plans)
+        if frozen and self._confirm_suspend(frozen):
+            erase_engine.suspend_to_unfreeze()
+            plans.update(self._preflight(frozen))
+            for row in self._frozen_rows(plans):
+                print(f"secureerase: {row.drive['path']}: still frozen after resume")
+
         results = []
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=len(selected_rows)
         ) as executor:
-            futures = {
-                executor.submit(self._erase_drive_worker, row): row
-                for row in selected_rows
-            }
+            # In-drive erases start first, overwrites queue per bus
+            rows = {row.drive["path"]: row for row in selected_rows}
+            ordered = erase_scheduler.order(
+                [row.drive for row in selected_rows],
+                {path: plans[row] for path, row in rows.items()},
+            )
+            futures = []
+            for drive in ordered:
+                row = rows[drive["path"]]
+                futures.append(executor.submit(self._erase_drive_worker, row, plans[row]))
             for future in concurrent.futures.as_completed(futures):
-                results.append(future.result())
+                results.append(future.result()[0])
 
         GLib.idle_add(self._erase_complete, results)
 
@@ -546,6 +631,7 @@ class SecureEraseWindow(Gtk.ApplicationWindow):
 
         # Re-enable erase button and checkboxes on failed rows for retry
         self.erase_button.set_sensitive(True)
+        self.verify_check.set_sensitive(True)
         for row in self.drive_rows:
             if row.succeeded:
                 row.check.set_active(False)
@@ -564,11 +650,18 @@ class Application(Adw.Application):
         style_manager = Adw.StyleManager.get_default()
         style_manager.set_color_scheme(Adw.ColorScheme.PREFER_DARK)
 
+        self.stall_watchdog = install_from_env("secureerase")
+
     def do_activate(self):
         window = SecureEraseWindow(self)
         self.add_window(window)
         window.present()
 
 
-app = Application()
-app.run([])
+def main():
+    app = Application()
+    return app.run([])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Crash-safe session checkpoints for the Spec and OS Load wizards.
+
+Each wizard writes a small JSON file describing where the technician got to
+(gathered data, K-number, Sortly record, overrides, manual-test results and
+current page). A checkpoint is only offered back for the same machine serial
+and the same boot, so hardware and firmware results in it can be trusted and
+only the values that can change at runtime need re-checking.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+CHECKPOINT_VERSION = 1
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+def default_checkpoint_dir():
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_dir, "kramden-provision")
+
+
+def read_boot_id(path=BOOT_ID_PATH):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+class SessionCheckpoint:
+    def __init__(self, workflow, serial, boot_id=None, directory=None):
+        self.workflow = workflow
+        self.serial = serial
+        self.boot_id = boot_id if boot_id is not None else read_boot_id()
+        self.path = os.path.join(
+            directory or default_checkpoint_dir(), f"session-{workflow}.json"
+        )
+        self._last_saved = None
+
+    @property
+    def enabled(self):
+        # Without a serial and boot id a checkpoint could be resumed on the
+        # wrong machine or after a firmware change, so don't keep one.
+        return bool(self.serial and self.boot_id)
+
+    def load(self):
+        """Return the saved session for this serial and boot, or None."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"SessionCheckpoint: ignoring unreadable {self.path}: {e}")
+            return None
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != CHECKPOINT_VERSION
+            or data.get("workflow") != self.workflow
+            or data.get("serial") != self.serial
+            or data.get("boot_id") != self.boot_id
+        ):
+            print("SessionCheckpoint: checkpoint is from another machine or boot")
+            return None
+        session = data.get("session")
+        return session if isinstance(session, dict) else None
+
+    def save(self, session):
+        """Atomically write session. Returns True if the file was written."""
+        if not self.enabled:
+            return False
+        # Compare against what was last written, normalised through JSON so
+        # tuples and lists compare equal.
+        normalised = json.loads(json.dumps(session))
+        if normalised == self._last_saved:
+            return False
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "workflow": self.workflow,
+            "serial": self.serial,
+            "boot_id": self.boot_id,
+            "saved_at": time.time(),
+            "session": normalised,
+        }
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(payload, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"SessionCheckpoint: could not write {self.path}: {e}")
+            return False
+        self._last_saved = normalised
+        return True
+
+    def clear(self):
+        self._last_saved = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"SessionCheckpoint: could not remove {self.path}: {e}")
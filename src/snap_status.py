@@ -0,0 +1,104 @@
+"""
+Installed snaps, read from snapd's REST API on its unix socket.
+
+One GET /v2/snaps returns every installed snap. The result is kept until
+the snaps directory changes (a snap was installed, refreshed or removed),
+so repeat checks cost a stat(). Safe to call from worker threads; no GLib
+main loop is needed.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+
+SNAPD_SOCKET = "/run/snapd.socket"
+SNAPS_DIR = "/var/lib/snapd/snaps"
+DEFAULT_TIMEOUT = 10
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def query_snaps(socket_path=SNAPD_SOCKET, timeout=DEFAULT_TIMEOUT):
+    """{name: version} for every installed snap. Raises OSError on failure."""
+    conn = _UnixHTTPConnection(socket_path, timeout)
+    try:
+        conn.request("GET", "/v2/snaps")
+        response = conn.getresponse()
+        body = json.loads(response.read())
+    except (http.client.HTTPException, ValueError) as e:
+        raise OSError(f"snapd: bad response: {e}") from e
+    finally:
+        conn.close()
+    if response.status != 200:
+        message = (body.get("result") or {}).get("message", response.reason)
+        raise OSError(f"snapd: {response.status} {message}")
+    return {snap["name"]: snap.get("version") for snap in body["result"]}
+
+
+class SnapStatus:
+    def __init__(self, socket_path=SNAPD_SOCKET, snaps_dir=SNAPS_DIR):
+        self.socket_path = socket_path
+        self.snaps_dir = snaps_dir
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._installed = {}
+
+    def _dir_stamp(self):
+        try:
+            st = os.stat(self.snaps_dir)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns)
+
+    def installed(self):
+        """Installed snaps as {name: version}, re-queried only after a change."""
+        stamp = self._dir_stamp()
+        with self._lock:
+            if stamp is not None and stamp == self._stamp:
+                return self._installed
+            try:
+                installed = query_snaps(self.socket_path)
+            except OSError as e:
+                print(f"snap_status: cannot query snapd: {e}")
+                return {}
+            self._installed = installed
+            self._stamp = stamp
+            return installed
+
+    def versions(self, packages):
+        """{snap: installed version or None}"""
+        installed = self.installed()
+        return {p: installed.get(p) for p in packages}
+
+    def check(self, packages):
+        """{snap: True if installed}"""
+        installed = self.installed()
+        return {p: p in installed for p in packages}
+
+
+_status = None
+_status_lock = threading.Lock()
+
+
+def get_status():
+    global _status
+    with _status_lock:
+        if _status is None:
+            _status = SnapStatus()
+        return _status
@@ -9,11 +9,13 @@ import os
 import reprlib
 import time
 
-import requests
-
 from constants import Brand
+from lazy_import import LazyModule
 from utils import Utils
 
+# Imported on first API call, which happens on a worker thread
+requests = LazyModule("requests")
+
 SORTLY_API_BASE_URL = "https://api.sortly.co/api/v1"
 OSLOAD_FOLDER_IDS = [
     "106345033",
@@ -1,5 +1,4 @@
 import gi
-import threading
 
 gi.require_version("Adw", "1")
 gi.require_version("Gdk", "4.0")
@@ -7,6 +6,7 @@ gi.require_version("Gtk", "4.0")
 from gi.repository import Adw, Gdk, Gtk, GLib
 
 from utils import Utils
+from task_executor import get_executor
 from sortly import (
     EXPANDED_FOLDER_IDS,
     INCOMING_FOLDER_ID,
@@ -39,6 +39,7 @@ class SortlyRegister(Adw.Bin):
         self._system_info = None
         self._user_edited = False
         self._folder_ids = []
+        self.on_checkpoint = None
 
         # Main vertical layout
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
@@ -143,22 +144,78 @@ class SortlyRegister(Adw.Bin):
             "Automatic serial lookup is temporarily disabled. Enter a K-number and search."
         )
 
-    def _lookup_serial_thread(self, api_key, serial):
-        try:
-            GLib.idle_add(self._set_status, "Discovering subfolders...")
-            folder_ids = []
-            for fid in get_stage_folder_ids("spec"):
-                folder_ids.extend(list_subfolders(api_key, fid))
-            self._folder_ids = folder_ids
-            GLib.idle_add(
-                self._set_status,
-                f"Searching {len(folder_ids)} folder(s) for serial '{serial}'...",
-            )
-            results = search_by_serial(api_key, folder_ids, serial)
-        except Exception as e:
-            GLib.idle_add(self._on_lookup_complete, None, sortly_error_message(e))
+    def checkpoint_data(self):
+        return {
+            "knumber": self.knumber_entry.get_text().strip(),
+            "existing_item": self._existing_item,
+            "system_info": self._system_info,
+            "submitted": self._submitted,
+        }
+
+    def restore_checkpoint(self, data):
+        """Restore a saved session instead of re-probing and re-searching.
+
+        System info missing from the checkpoint is read on the task
+        executor; the page stays locked until it arrives. The task has no
+        owner so moving to the saved page doesn't cancel it.
+        """
+        self._lookup_done = True
+        self.search_button.set_visible(True)
+        knumber = data.get("knumber", "")
+        self.knumber_entry.set_text(knumber)
+
+        self._system_info = data.get("system_info")
+        self._populate_system_info()
+        self._existing_item = data.get("existing_item")
+        self._submitted = data.get("submitted", False)
+        self.skip = self._submitted
+        self.knumber_entry.set_sensitive(False)
+        self.search_button.set_sensitive(False)
+        self._set_status("Resuming session...")
+
+        if self._system_info:
+            self._on_restore_complete(knumber, None)
             return
-        GLib.idle_add(self._on_lookup_complete, results, None)
+        get_executor().submit(
+            "sortly-restore",
+            lambda token: get_system_info(),
+            on_done=lambda result: self._on_restore_complete(knumber, result),
+            on_error=lambda e: self._on_restore_complete(knumber, None),
+        )
+
+    def _on_restore_complete(self, knumber, system_info):
+        if system_info:
+            self._system_info = system_info
+            self._populate_system_info()
+            if self.on_checkpoint:
+                self.on_checkpoint()
+
+        if self._submitted:
+            self._set_status(f"Resumed session: {knumber} already updated in Sortly.")
+            return
+        self.knumber_entry.set_sensitive(True)
+        value = self.knumber_entry.get_text().strip()
+        if value and Utils.format_knumber(value):
+            self.search_button.set_sensitive(True)
+        if self._existing_item:
+            self.register_button.set_visible(True)
+            self.register_button.set_sensitive(True)
+            self._set_status(f"Resumed session: found existing record {knumber}.")
+        else:
+            self._set_status("Resumed session. Enter a K-number and search.")
+
+    def _lookup_serial_thread(self, token, api_key, serial):
+        token.post(self._set_status, "Discovering subfolders...")
+        folder_ids = []
+        for fid in get_stage_folder_ids("spec"):
+            token.raise_if_cancelled()
+            folder_ids.extend(list_subfolders(api_key, fid))
+        self._folder_ids = folder_ids
+        token.post(
+            self._set_status,
+            f"Searching {len(folder_ids)} folder(s) for serial '{serial}'...",
+        )
+        return search_by_serial(api_key, folder_ids, serial)
 
     def _on_lookup_complete(self, results, error):
         self.spinner.stop()
@@ -255,27 +312,35 @@ class SortlyRegister(Adw.Bin):
         self.spinner.set_visible(True)
         self.spinner.start()
         self._set_status(f"Searching for '{formatted}' in Sortly...")
-
-        thread = threading.Thread(
-            target=self._search_knumber_thread,
-            args=(api_key, formatted),
-            daemon=True,
+        self._submit_search(self._search_knumber_thread, api_key, formatted)
+
+    def _submit_search(self, worker, api_key, knumber):
+        # Searches are dropped if the technician leaves the page mid-search
+        get_executor().submit(
+            "sortly-search",
+            worker,
+            api_key,
+            knumber,
+            owner=self,
+            on_done=lambda results: self._on_search_complete(results, knumber, None),
+            on_error=lambda e: self._on_search_complete(
+                None, knumber, sortly_error_message(e)
+            ),
+            on_cancelled=lambda: self._on_search_complete(
+                None, knumber, "Search cancelled"
+            ),
         )
-        thread.start()
 
-    def _search_knumber_thread(self, api_key, knumber):
-        try:
-            folder_ids = self._folder_ids
-            if not folder_ids:
-                folder_ids = []
-                for fid in get_stage_folder_ids("spec"):
-                    folder_ids.extend(list_subfolders(api_key, fid))
-                self._folder_ids = folder_ids
-            results = search_item_by_name(api_key, folder_ids, knumber)
-        except Exception as e:
-            GLib.idle_add(self._on_search_complete, None, knumber, sortly_error_message(e))
-            return
-        GLib.idle_add(self._on_search_complete, results, knumber, None)
+    def _search_knumber_thread(self, token, api_key, knumber):
+        folder_ids = self._folder_ids
+        if not folder_ids:
+            folder_ids = []
+            for fid in get_stage_folder_ids("spec"):
+                token.raise_if_cancelled()
+                folder_ids.extend(list_subfolders(api_key, fid))
+            self._folder_ids = folder_ids
+        token.raise_if_cancelled()
+        return search_item_by_name(api_key, folder_ids, knumber)
 
     def _on_search_complete(self, results, knumber, error):
         self.spinner.stop()
@@ -294,6 +359,8 @@ class SortlyRegister(Adw.Bin):
             self.expanded_search_button.set_visible(False)
             self.expanded_search_button.set_sensitive(False)
             self.search_button.set_visible(True)
+            if self.on_checkpoint:
+                self.on_checkpoint()
         else:
             self._existing_item = None
             self._set_status(f"No record found for {knumber}.")
@@ -324,29 +391,19 @@ class SortlyRegister(Adw.Bin):
         self.spinner.set_visible(True)
         self.spinner.start()
         self._set_status(f"Expanded search for '{formatted}' in Sortly...")
-
-        thread = threading.Thread(
-            target=self._expanded_search_knumber_thread,
-            args=(api_key, formatted),
-            daemon=True,
+        self._submit_search(self._expanded_search_knumber_thread, api_key, formatted)
+
+    def _expanded_search_knumber_thread(self, token, api_key, knumber):
+        token.post(self._set_status, "Discovering expanded folders...")
+        folder_ids = []
+        for fid in EXPANDED_FOLDER_IDS:
+            token.raise_if_cancelled()
+            folder_ids.extend(list_subfolders(api_key, fid))
+        token.post(
+            self._set_status,
+            f"Searching {len(folder_ids)} expanded folder(s) for '{knumber}'...",
         )
-        thread.start()
-
-    def _expanded_search_knumber_thread(self, api_key, knumber):
-        try:
-            GLib.idle_add(self._set_status, "Discovering expanded folders...")
-            folder_ids = []
-            for fid in EXPANDED_FOLDER_IDS:
-                folder_ids.extend(list_subfolders(api_key, fid))
-            GLib.idle_add(
-                self._set_status,
-                f"Searching {len(folder_ids)} expanded folder(s) for '{knumber}'...",
-            )
-            results = search_item_by_name(api_key, folder_ids, knumber)
-        except Exception as e:
-            GLib.idle_add(self._on_search_complete, None, knumber, sortly_error_message(e))
-            return
-        GLib.idle_add(self._on_search_complete, results, knumber, None)
+        return search_item_by_name(api_key, folder_ids, knumber)
 
     def _on_register_clicked(self, button):
         if self._submitted:
@@ -383,40 +440,35 @@ class SortlyRegister(Adw.Bin):
         else:
             self._set_status(f"Registering {formatted}...")
 
-        thread = threading.Thread(
-            target=self._register_thread,
-            args=(api_key, formatted, is_update),
-            daemon=True,
+        # Not owned by the page: once the write starts it must report back
+        get_executor().submit(
+            "sortly-register",
+            self._register_thread,
+            api_key,
+            formatted,
+            is_update,
+            on_done=lambda result: self._on_register_complete(*result),
+            on_error=lambda e: self._on_register_complete(
+                False, sortly_error_message(e)
+            ),
         )
-        thread.start()
 
-    def _register_thread(self, api_key, knumber, is_update):
-        try:
-            if is_update:
-                item = self._existing_item
-            else:
-                item = create_item(api_key, INCOMING_FOLDER_ID, knumber)
-                if not item:
-                    GLib.idle_add(
-                        self._on_register_complete, False, "Failed to create item."
-                    )
-                    return
-
-            item_id = item["id"]
-            info = self._system_info or {}
-            if info:
-                success, error = update_item(api_key, item_id, info)
-                if not success:
-                    GLib.idle_add(
-                        self._on_register_complete,
-                        False,
-                        error or "Failed to update item.",
-                    )
-                    return
-
-            GLib.idle_add(self._on_register_complete, True, None)
-        except Exception as e:
-            GLib.idle_add(self._on_register_complete, False, sortly_error_message(e))
+    def _register_thread(self, token, api_key, knumber, is_update):
+        if is_update:
+            item = self._existing_item
+        else:
+            item = create_item(api_key, INCOMING_FOLDER_ID, knumber)
+            if not item:
+                return False, "Failed to create item."
+
+        item_id = item["id"]
+        info = self._system_info or {}
+        if info:
+            success, error = update_item(api_key, item_id, info)
+            if not success:
+                return False, error or "Failed to update item."
+
+        return True, None
 
     def _on_register_complete(self, success, error):
         self.spinner.stop()
@@ -429,6 +481,8 @@ class SortlyRegister(Adw.Bin):
             if knumber:
                 Utils.write_kramden_number_efivar(knumber)
             self._set_status("Update successful!")
+            if self.on_checkpoint:
+                self.on_checkpoint()
             if self.next:
                 self.next()
                 self.skip = True
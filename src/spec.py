@@ -5,14 +5,18 @@ import gi
 gi.require_version("Gdk", "4.0")
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gdk, Gtk, Adw
+from gi.repository import Gdk, Gtk, Adw, GLib
 
 import os
 from sortly_register import SortlyRegister
 from specinfo import SpecInfo
 from manualtest import ManualTest
 from speccomplete import SpecComplete
-from observable import ObservableProperty, StateObserver
+from observable import StateStore
+from session_checkpoint import SessionCheckpoint
+from task_executor import get_executor
+from stall_watchdog import install_from_env
+from utils import Utils
 
 
 class WizardWindow(Gtk.ApplicationWindow):
@@ -34,13 +38,10 @@ class WizardWindow(Gtk.ApplicationWindow):
                     self._apply_monitor_size(self._monitors_model.get_item(0))
         self.connect("close-request", self._on_close_request)
 
-        # Initialize the observable property for tracking state
-        self.observable_property = ObservableProperty(
-            {"SpecInfo": False, "ManualTest": False}
-        )
-        # Create and add an observer
-        observer = StateObserver()
-        self.observable_property.add_observer(observer)
+        # Pass/fail state shared by all pages. Only the last page's
+        # Complete button depends on it, so re-evaluate on change only.
+        self.wizard_state = StateStore({"SpecInfo": False, "ManualTest": False})
+        self.wizard_state.subscribe_all(self._on_state_changed)
 
         # Create Gtk.HeaderBar
         header_bar = Gtk.HeaderBar()
@@ -75,16 +76,22 @@ class WizardWindow(Gtk.ApplicationWindow):
         self.page4 = SpecComplete()
 
         self.page1.next = self.on_next_clicked
-        self.page1.state = self.observable_property
+        self.page1.state = self.wizard_state
         self.page2.sortly_register = self.page1
-        self.page2.state = self.observable_property
+        self.page2.state = self.wizard_state
         self.page2.on_loading_changed = self._on_specinfo_loading_changed
         self._specinfo_loading = False
-        self.page3.state = self.observable_property
+        self.page3.state = self.wizard_state
         self.page4.sortly_register = self.page1
         self.page4.specinfo = self.page2
         self.page4.manual_test = self.page3
-        self.page4.state = self.observable_property
+        self.page4.state = self.wizard_state
+
+        # Session checkpoint so a crash or accidental close can resume
+        self.checkpoint = SessionCheckpoint("spec", Utils().get_serial())
+        self._resume_pending = False
+        for page in (self.page1, self.page2, self.page3):
+            page.on_checkpoint = self.save_checkpoint
 
         self.stack.add_named(self.page1, "page1")
         self.stack.add_named(self.page2, "page2")
@@ -113,12 +120,20 @@ class WizardWindow(Gtk.ApplicationWindow):
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
         )
 
+        self._visible_page = self.stack.get_visible_child()
+
         # Set title_widget after page was set
         self.stack.connect("notify::visible-child", self.on_visible_page_changed)
         self.title_widget.set_label(self.stack.get_visible_child().title)
 
-        # Fake visible change to set state info
-        self.page1.on_shown()
+        saved = self.checkpoint.load()
+        if saved:
+            # Ask once the window is up; the first page waits for the answer
+            self._resume_pending = True
+            GLib.idle_add(self._offer_resume, saved)
+        else:
+            # Fake visible change to set state info
+            self.page1.on_shown()
 
     def _apply_monitor_size(self, monitor):
         geo = monitor.get_geometry()
@@ -133,6 +148,7 @@ class WizardWindow(Gtk.ApplicationWindow):
 
     def _on_close_request(self, window):
         self._cleanup_monitor_signal()
+        self.page2.stop_monitoring()
         return False
 
     def _cleanup_monitor_signal(self):
@@ -146,8 +162,13 @@ class WizardWindow(Gtk.ApplicationWindow):
     def on_visible_page_changed(self, stack, params):
         print("on_visible_page_changed")
         current = stack.get_visible_child()
+        # Background work owned by the page we just left is no longer wanted
+        if self._visible_page is not None and self._visible_page is not current:
+            get_executor().cancel_owner(self._visible_page)
+        self._visible_page = current
         self.title_widget.set_label(current.title)
         current.on_shown()
+        self.save_checkpoint()
 
     def on_prev_clicked(self, button=None):
         if self.current_page > 0:
@@ -202,8 +223,7 @@ class WizardWindow(Gtk.ApplicationWindow):
         if self.current_page == 3:
             self.next_button.set_label("Complete")
             self.next_button.add_css_class("button-next-last-page")
-            state = self.observable_property.get_value()
-            self.next_button.set_sensitive(all(state.values()))
+            self.next_button.set_sensitive(self.wizard_state.all_passed())
         else:
             self.next_button.remove_css_class("button-next-last-page")
             self.next_button.set_label("Next")
@@ -220,9 +240,70 @@ class WizardWindow(Gtk.ApplicationWindow):
     def _on_specinfo_loading_changed(self, loading):
         self._specinfo_loading = loading
         self.update_buttons()
+        if not loading and self.current_page == 3:
+            # A resumed session can land on the summary before SpecInfo
+            # has finished re-checking.
+            self.page4.on_shown()
+
+    def save_checkpoint(self):
+        if self._resume_pending:
+            return
+        self.checkpoint.save(
+            {
+                "page": self.current_page,
+                "sortly": self.page1.checkpoint_data(),
+                "specinfo": self.page2.checkpoint_data(),
+                "manualtest": self.page3.checkpoint_data(),
+            }
+        )
+
+    def _offer_resume(self, saved):
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            modal=True,
+            message_type=Gtk.MessageType.QUESTION,
+            buttons=Gtk.ButtonsType.NONE,
+            text="Resume previous session?",
+            secondary_text="Spec was interrupted on this computer. Resume where you left off, or start over?",
+        )
+        dialog.add_buttons(
+            "Start Over", Gtk.ResponseType.REJECT, "Resume", Gtk.ResponseType.ACCEPT
+        )
+        dialog.connect("response", self._on_resume_response, saved)
+        dialog.present()
+        return False
+
+    def _on_resume_response(self, dialog, response, saved):
+        dialog.close()
+        self._resume_pending = False
+        if response == Gtk.ResponseType.ACCEPT:
+            self._resume(saved)
+        else:
+            self.checkpoint.clear()
+            self.page1.on_shown()
+
+    def _resume(self, saved):
+        print("Resuming saved Spec session")
+        self.page1.restore_checkpoint(saved.get("sortly") or {})
+        self.page2.restore_checkpoint(saved.get("specinfo") or {})
+        self.page3.restore_checkpoint(saved.get("manualtest") or {})
+        page = min(max(int(saved.get("page", 0)), 0), 3)
+        self.current_page = page
+        # Earlier pages publish their pass/fail state when shown; replay
+        # that so later pages see the same state as an uninterrupted run.
+        for index in range(1, page):
+            getattr(self, f"page{index + 1}").on_shown()
+        self.stack.set_visible_child_name(f"page{page + 1}")
+        self.update_buttons()
+
+    def _on_state_changed(self, key, value):
+        if self.current_page == 3:
+            self.next_button.set_sensitive(self.wizard_state.all_passed())
 
     def complete(self):
         print("Complete Clicked")
+        # The reset may end the session, so drop the checkpoint first
+        self.checkpoint.clear()
         current = self.stack.get_visible_child()
         if hasattr(current, "complete"):
             current.complete()
@@ -237,11 +318,18 @@ class Application(Adw.Application):
         style_manager = Adw.StyleManager.get_default()
         style_manager.set_color_scheme(Adw.ColorScheme.PREFER_DARK)
 
+        self.stall_watchdog = install_from_env("spec")
+
     def do_activate(self):
         window = WizardWindow(self)
         self.add_window(window)
         window.present()
 
 
-app = Application()
-app.run([])
+def main():
+    app = Application()
+    return app.run([])
+
+
+if __name__ == "__main__":
+    main()
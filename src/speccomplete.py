@@ -1,10 +1,10 @@
 import gi
 import os
 import subprocess
-import threading
 
 gi.require_version("Adw", "1")
 from gi.repository import Adw, Gtk, GLib
+from task_executor import get_executor
 from utils import Utils
 from generate_tracking_sheet import generate_tracking_sheet
 
@@ -21,6 +21,9 @@ class SpecComplete(Adw.Bin):
         self.sortly_register = None
         self.manual_test = None
         self.specinfo = None
+        # Inputs the failure lists were last built from; they are only
+        # rebuilt when this changes.
+        self._rendered_signature = None
 
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
 
@@ -131,35 +134,39 @@ class SpecComplete(Adw.Bin):
             self.tracking_status.add_css_class("text-error")
             return
 
-        state = self.state.get_value()
-        spec_passed = all(state.values())
+        spec_passed = self.state.all_passed()
 
         manual_test_results = None
         if self.manual_test:
             manual_test_results = self.manual_test.get_all_test_results()
 
+        snapshot = self.specinfo.snapshot() if self.specinfo else None
+
         self.tracking_button.set_sensitive(False)
         self.tracking_status.set_label("Generating tracking sheet...")
         if self.tracking_status.has_css_class("text-error"):
             self.tracking_status.remove_css_class("text-error")
 
-        thread = threading.Thread(
-            target=self._generate_thread,
-            args=(knumber, spec_passed, manual_test_results),
-            daemon=True,
+        get_executor().submit(
+            "tracking-sheet",
+            self._generate_thread,
+            knumber,
+            spec_passed,
+            manual_test_results,
+            snapshot,
+            on_done=lambda path: self._on_generate_complete(path, None),
+            on_error=lambda e: self._on_generate_complete(None, str(e)),
         )
-        thread.start()
 
-    def _generate_thread(self, knumber, spec_passed, manual_test_results):
-        try:
-            output_path = generate_tracking_sheet(
-                knumber,
-                spec_passed=spec_passed,
-                manual_test_results=manual_test_results,
-            )
-            GLib.idle_add(self._on_generate_complete, output_path, None)
-        except Exception as e:
-            GLib.idle_add(self._on_generate_complete, None, str(e))
+    def _generate_thread(
+        self, token, knumber, spec_passed, manual_test_results, snapshot
+    ):
+        return generate_tracking_sheet(
+            knumber,
+            spec_passed=spec_passed,
+            manual_test_results=manual_test_results,
+            snapshot=snapshot,
+        )
 
     def _on_generate_complete(self, output_path, error):
         self.tracking_button.set_sensitive(True)
@@ -187,12 +194,23 @@ class SpecComplete(Adw.Bin):
     # on_shown is called when the page is shown in the stack
     def on_shown(self):
         print("SpecComplete: on_shown")
-        state = self.state.get_value()
+        state = self.state.values()
+        specinfo_reasons = None
+        if not state.get("SpecInfo", True) and self.specinfo:
+            specinfo_reasons = tuple(self.specinfo.get_failure_reasons())
+        manualtest_reasons = None
+        if not state.get("ManualTest", True) and self.manual_test:
+            manualtest_reasons = tuple(self.manual_test.get_failure_reasons())
+
+        signature = (tuple(state.items()), specinfo_reasons, manualtest_reasons)
+        if signature == self._rendered_signature:
+            return
+        self._rendered_signature = signature
 
         self._clear_list(self.specinfo_list)
         self._clear_list(self.manualtest_list)
 
-        if all(state.values()):
+        if self.state.all_passed():
             print("SpecComplete: All passed")
             self.complete_row.set_title("Kramden Spec Complete: <b>PASSED</b>!")
         else:
@@ -200,15 +218,15 @@ class SpecComplete(Adw.Bin):
             self.complete_row.set_title("Kramden Spec Complete: <b>FAILED</b>!")
 
         # System Info column
-        if not state.get("SpecInfo", True) and self.specinfo:
-            for reason in self.specinfo.get_failure_reasons():
+        if specinfo_reasons is not None:
+            for reason in specinfo_reasons:
                 self.specinfo_list.append(self._failure_row(reason))
         else:
             self.specinfo_list.append(self._passed_row())
 
         # Manual Tests column
-        if not state.get("ManualTest", True) and self.manual_test:
-            for reason in self.manual_test.get_failure_reasons():
+        if manualtest_reasons is not None:
+            for reason in manualtest_reasons:
                 self.manualtest_list.append(self._failure_row(reason))
         else:
             self.manualtest_list.append(self._passed_row())
@@ -1,13 +1,29 @@
-import threading
-
 import gi
 
 gi.require_version("Adw", "1")
 gi.require_version("Gtk", "4.0")
 from gi.repository import Adw, GLib, Gtk
+import generate_tracking_sheet
 from loading_capture import StdoutCapture
+import probe_fingerprints
+from task_executor import PRIORITY_HIGH, get_executor
 from utils import Utils
 
+# Gathered fields that cannot change without a reboot. A session resumed on
+# the same boot reuses them and only re-probes the rest.
+BOOT_STABLE_FIELDS = ("mem", "bios_password", "bios_password_warning", "computrace")
+
+# Gathered fields that follow swappable hardware, with the fingerprint that
+# tells when they are stale. Only these are re-probed when the page is
+# shown again or udev reports a hotplug event.
+REFRESHABLE_FIELDS = {
+    "mem": "memory",
+    "disks": "disks",
+    "batteries": "batteries",
+    "integrated_gpu": "pci",
+    "discrete_gpu": "pci",
+}
+
 
 class SpecInfo(Adw.Bin):
     def __init__(self):
@@ -25,6 +41,7 @@ class SpecInfo(Adw.Bin):
         self.asset_info_override = False
         self.has_disks = False
         self._disk_error_widgets = []
+        self._battery_rows = []
         self._bios_password_override_button = None
         self._asset_info_override_button = None
         self.sortly_register = None
@@ -37,7 +54,11 @@ class SpecInfo(Adw.Bin):
         self._gather_in_progress = False
         self._gathered = {}
         self._stdout_capture = None
+        self._restored = None
+        self._fingerprints = {}
+        self._hotplug = None
         self.on_loading_changed = None
+        self.on_checkpoint = None
 
         utils = Utils()
 
@@ -56,12 +77,20 @@ class SpecInfo(Adw.Bin):
 
         vendor_row = Adw.ActionRow()
         vendor_row.set_title("Manufacturer")
-        vendor_row.set_subtitle(utils.get_vendor())
+        # Probed once here; kept for the tracking sheet snapshot
+        self._identity = {
+            "vendor": utils.get_vendor(),
+            "model": utils.get_model(),
+            "cpu": utils.get_cpu_info(),
+            "serial": utils.get_serial(),
+            "chassis_type": utils.get_chassis_type(),
+        }
+        vendor_row.set_subtitle(self._identity["vendor"])
         vendor_row.set_icon_name("emblem-ok-symbolic")
 
         model_row = Adw.ActionRow()
         model_row.set_title("Model")
-        model_row.set_subtitle(utils.get_model())
+        model_row.set_subtitle(self._identity["model"])
         model_row.set_icon_name("emblem-ok-symbolic")
 
         self.bios_password_row = Adw.ActionRow()
@@ -89,24 +118,25 @@ class SpecInfo(Adw.Bin):
 
         cpu_row = Adw.ActionRow()
         cpu_row.set_title("CPU")
-        cpu_row.set_subtitle(utils.get_cpu_info())
+        cpu_row.set_subtitle(self._identity["cpu"])
         cpu_row.set_icon_name("emblem-ok-symbolic")
 
         self.mem_row = Adw.ActionRow()
         self.mem_row.set_title("Memory")
         self.mem_row.set_subtitle(utils.get_mem() + " GB")
 
-        igpu_row = Adw.ActionRow()
-        igpu_row.set_title("Integrated Graphics")
+        self.igpu_row = Adw.ActionRow()
+        self.igpu_row.set_title("Integrated Graphics")
         igpu = utils.get_integrated_gpu()
-        igpu_row.set_subtitle(igpu if igpu else "Unknown")
-        igpu_row.set_icon_name("emblem-ok-symbolic")
+        self.igpu_row.set_subtitle(igpu if igpu else "Unknown")
+        self.igpu_row.set_icon_name("emblem-ok-symbolic")
 
-        dgpu_row = Adw.ActionRow()
-        dgpu_row.set_title("Discrete Graphics")
+        self.dgpu_row = Adw.ActionRow()
+        self.dgpu_row.set_title("Discrete Graphics")
         discrete_gpu = utils.get_discrete_gpu()
-        dgpu_row.set_subtitle(discrete_gpu if discrete_gpu else "None")
-        dgpu_row.set_icon_name("emblem-ok-symbolic")
+        self._identity["discrete_gpu"] = discrete_gpu
+        self.dgpu_row.set_subtitle(discrete_gpu if discrete_gpu else "None")
+        self.dgpu_row.set_icon_name("emblem-ok-symbolic")
 
         self.disks_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
 
@@ -116,8 +146,8 @@ class SpecInfo(Adw.Bin):
 
         right_list_box.append(cpu_row)
         right_list_box.append(self.mem_row)
-        right_list_box.append(igpu_row)
-        right_list_box.append(dgpu_row)
+        right_list_box.append(self.igpu_row)
+        right_list_box.append(self.dgpu_row)
         right_list_box.append(self.disks_box)
         right_list_box.append(self.battery_row)
 
@@ -193,6 +223,7 @@ class SpecInfo(Adw.Bin):
             self._start_gather()
             return
         self._render()
+        self._start_refresh()
 
     def _start_gather(self):
         self._gather_in_progress = True
@@ -206,15 +237,18 @@ class SpecInfo(Adw.Bin):
         self._stdout_capture = StdoutCapture(self._on_stdout_line)
         self._stdout_capture.start()
 
-        threading.Thread(target=self._gather_thread, daemon=True).start()
+        get_executor().submit(
+            "specinfo-gather",
+            self._gather_thread,
+            priority=PRIORITY_HIGH,
+            on_done=lambda result: self._on_gather_complete(),
+        )
 
-    def _gather_thread(self):
+    def _gather_thread(self, token):
         try:
             self.gather()
         except Exception as exc:
             print(f"Error gathering system info: {exc}")
-        finally:
-            GLib.idle_add(self._on_gather_complete)
 
     def gather(self):
         """Heavy data collection. Runs on a background thread. Stores
@@ -222,20 +256,30 @@ class SpecInfo(Adw.Bin):
         see progress in the loading TextView while subprocess scripts run.
         """
         utils = Utils()
-        print("Syncing system clock...")
-        utils.sync_clock()
-        print("Reading memory size...")
-        mem = utils.get_mem()
-        print("Checking BIOS password (this can be slow)...")
-        bios_password = utils.has_bios_password()
-        bios_password_warning = getattr(utils, "bios_password_warning", None)
-        print(f"  BIOS password: {bios_password}")
+        # Taken before probing so a change mid-gather is caught next time
+        fingerprints = probe_fingerprints.take(set(REFRESHABLE_FIELDS.values()))
+        if self._restored:
+            print("Resuming saved session from this boot.")
+            print("  Reusing memory, BIOS password and Computrace results.")
+            mem = self._restored["mem"]
+            bios_password = self._restored["bios_password"]
+            bios_password_warning = self._restored.get("bios_password_warning")
+            computrace = self._restored["computrace"]
+        else:
+            print("Syncing system clock...")
+            utils.sync_clock()
+            print("Reading memory size...")
+            mem = utils.get_mem()
+            print("Checking BIOS password (this can be slow)...")
+            bios_password = utils.has_bios_password()
+            bios_password_warning = getattr(utils, "bios_password_warning", None)
+            print(f"  BIOS password: {bios_password}")
+            print("Checking Computrace/Absolute status...")
+            computrace = utils.has_computrace_enabled()
+            print(f"  Computrace: {computrace}")
         print("Checking asset info...")
         asset_info = utils.has_asset_info()
         print(f"  Asset info: {asset_info}")
-        print("Checking Computrace/Absolute status...")
-        computrace = utils.has_computrace_enabled()
-        print(f"  Computrace: {computrace}")
         print("Enumerating disks...")
         disks = utils.get_disks()
         print(f"  Found {len(disks)} disk(s)")
@@ -244,6 +288,7 @@ class SpecInfo(Adw.Bin):
         print(f"  Found {len(batteries)} batter(y/ies)")
         print("System information gathering complete.")
 
+        self._fingerprints = fingerprints
         self._gathered = {
             "mem": mem,
             "bios_password": bios_password,
@@ -281,8 +326,140 @@ class SpecInfo(Adw.Bin):
         finally:
             if self.on_loading_changed:
                 self.on_loading_changed(False)
+        if self._hotplug is None:
+            self._hotplug = probe_fingerprints.HotplugMonitor(
+                lambda subsystems: GLib.idle_add(self._on_hotplug, subsystems)
+            )
+            self._hotplug.start()
+        generate_tracking_sheet.save_snapshot(self.snapshot())
+        if self.on_checkpoint:
+            self.on_checkpoint()
+        return False
+
+    def _on_hotplug(self, subsystems):
+        print(f"SpecInfo: hotplug event ({', '.join(sorted(subsystems))})")
+        # Hidden pages catch up from their fingerprints when shown again
+        if self._data_ready and self.get_mapped():
+            self._start_refresh()
         return False
 
+    def _start_refresh(self):
+        if self._gather_in_progress:
+            return
+        get_executor().submit(
+            "specinfo-refresh",
+            self._refresh_thread,
+            owner=self,
+            on_done=self._on_refresh_complete,
+        )
+
+    def _refresh_thread(self, token):
+        """Re-run only the probes whose hardware fingerprint changed.
+        Returns (fingerprints, {field: new value})."""
+        current = probe_fingerprints.take(set(REFRESHABLE_FIELDS.values()))
+        stale = probe_fingerprints.changed(self._fingerprints, current)
+        fields = [f for f, name in REFRESHABLE_FIELDS.items() if name in stale]
+        updated = {}
+        if not fields:
+            return current, updated
+        print(f"SpecInfo: hardware changed, re-probing {', '.join(fields)}")
+        utils = Utils()
+        probes = {
+            "mem": utils.get_mem,
+            "disks": utils.get_disks,
+            "batteries": utils.get_battery_capacities,
+            "integrated_gpu": utils.get_integrated_gpu,
+            "discrete_gpu": utils.get_discrete_gpu,
+        }
+        for field in fields:
+            token.raise_if_cancelled()
+            updated[field] = probes[field]()
+        return current, updated
+
+    def _on_refresh_complete(self, result):
+        fingerprints, updated = result
+        self._fingerprints = fingerprints
+        # A fingerprint can change without the probe's answer changing
+        changed = {
+            field
+            for field, value in updated.items()
+            if field not in self._gathered or self._gathered[field] != value
+        }
+        self._gathered.update(updated)
+        if not changed:
+            return
+        if "disks" in changed:
+            self._clear_disks()
+        if "batteries" in changed:
+            self._clear_batteries()
+        try:
+            self._render()
+        except Exception as exc:
+            print(f"SpecInfo._render failed: {exc}")
+        generate_tracking_sheet.save_snapshot(self.snapshot())
+        if self.on_checkpoint:
+            self.on_checkpoint()
+
+    def stop_monitoring(self):
+        """Stop watching for hotplug events; call when the window closes."""
+        if self._hotplug is not None:
+            self._hotplug.stop()
+            self._hotplug = None
+
+    def _clear_disks(self):
+        child = self.disks_box.get_first_child()
+        while child is not None:
+            next_child = child.get_next_sibling()
+            self.disks_box.remove(child)
+            child = next_child
+        self._disk_error_widgets = []
+        self.has_disks = False
+        # An override applied to the disks that were there before
+        self.disk_override = False
+        self.disks_populated = False
+
+    def _clear_batteries(self):
+        for row in self._battery_rows:
+            self.battery_row.remove(row)
+        self._battery_rows = []
+        self.battery_row.set_title("Batteries")
+        self.battery_row.set_visible(False)
+        self.batteries_populated = False
+
+    def snapshot(self):
+        """Raw probe results for generate_tracking_sheet, so the sheet does
+        not probe them again. Fields not gathered yet are left out."""
+        snapshot = dict(self._identity)
+        if self._data_ready:
+            for field in generate_tracking_sheet.SNAPSHOT_PROBES:
+                if field in self._gathered:
+                    snapshot[field] = self._gathered[field]
+        return snapshot
+
+    def checkpoint_data(self):
+        return {
+            "gathered": self._gathered if self._data_ready else self._restored,
+            "overrides": {
+                "disk": self.disk_override,
+                "bios_password": self.bios_password_override,
+                "asset_info": self.asset_info_override,
+            },
+        }
+
+    def restore_checkpoint(self, data):
+        """Restore overrides and boot-stable results from a saved session.
+
+        Data is still gathered on first show, but only the fields that can
+        change at runtime are probed again.
+        """
+        overrides = data.get("overrides") or {}
+        self.disk_override = overrides.get("disk", False)
+        self.bios_password_override = overrides.get("bios_password", False)
+        self.asset_info_override = overrides.get("asset_info", False)
+        gathered = data.get("gathered") or {}
+        if all(key in gathered for key in BOOT_STABLE_FIELDS):
+            self._restored = {key: gathered[key] for key in BOOT_STABLE_FIELDS}
+
     def _render(self):
         # Widget update only; reads from self._gathered. Runs on main thread.
         passed = True
@@ -305,6 +482,12 @@ class SpecInfo(Adw.Bin):
             self.knumber_row.add_css_class("text-error")
 
         # Set Memory row to emblem-ok-symbolic if memory is greater than or equal to 7 GB, else set row to emblem-important-symbolic
+        self.mem_row.set_subtitle(f"{self._gathered['mem']} GB")
+        # GPUs are probed when the page is built and only re-probed here
+        if "integrated_gpu" in self._gathered:
+            self.igpu_row.set_subtitle(self._gathered["integrated_gpu"] or "Unknown")
+        if "discrete_gpu" in self._gathered:
+            self.dgpu_row.set_subtitle(self._gathered["discrete_gpu"] or "None")
         mem = int(self._gathered["mem"])
         if mem >= 7:
             self.mem_row.set_icon_name("emblem-ok-symbolic")
@@ -434,6 +617,10 @@ class SpecInfo(Adw.Bin):
                 if disk_row.has_css_class("text-error"):
                     disk_row.remove_css_class("text-error")
                 self.disks_box.append(disk_row)
+            if self.disk_override and self._disk_error_widgets:
+                # Override restored from a saved session
+                self._on_disk_override_accepted()
+                self._disk_override_button.set_visible(False)
             # Ensure we only create disk info once
             self.disks_populated = True
 
@@ -452,6 +639,7 @@ class SpecInfo(Adw.Bin):
                 row.set_title(str(battery))
                 row.set_subtitle(f"Capacity: {str(batteries[battery])}%")
                 self.battery_row.add_row(row)
+                self._battery_rows.append(row)
                 self.battery_row.set_expanded(True)
                 # Set Battery row to emblem-ok-symbolic if battery capacity is greater than 70%, else set row to emblem-important-symbolic
                 if int(batteries[battery]) >= 70:
@@ -462,9 +650,7 @@ class SpecInfo(Adw.Bin):
             # Ensure we only create battery info once
             self.batteries_populated = True
 
-        state = self.state.get_value()
-        state["SpecInfo"] = passed
-        print("specinfo:_render " + str(self.state.get_value()))
+        self.state.set("SpecInfo", passed)
 
     def get_failure_reasons(self):
         if not self._data_ready:
@@ -572,6 +758,8 @@ class SpecInfo(Adw.Bin):
             override_button.set_visible(False)
             dialog.close()
             self.on_shown()
+            if self.on_checkpoint:
+                self.on_checkpoint()
         else:
             error_label.set_label("Incorrect password")
             entry.set_text("")
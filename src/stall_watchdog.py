@@ -0,0 +1,133 @@
+"""
+Opt-in detector for GTK main-loop stalls.
+
+Set KRAMDEN_STALL_WATCHDOG to a threshold in milliseconds (for example
+KRAMDEN_STALL_WATCHDOG=250) to enable it. A GLib timeout on the main loop
+bumps a heartbeat; a watchdog thread notices when the heartbeat goes stale,
+captures the main thread's Python stack at that moment and, once the loop
+recovers, appends the stall duration and stack to the log file
+(KRAMDEN_STALL_LOG, default ~/.cache/kramden-provision/stalls.log).
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+ENV_THRESHOLD = "KRAMDEN_STALL_WATCHDOG"
+ENV_LOG = "KRAMDEN_STALL_LOG"
+
+
+def default_log_path():
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_dir, "kramden-provision", "stalls.log")
+
+
+class StallWatchdog:
+    def __init__(self, app_name, threshold_ms, log_path=None, clock=time.monotonic):
+        self.app_name = app_name
+        self.threshold = threshold_ms / 1000.0
+        # Beat often enough that a stall is detected close to the threshold
+        self.interval = max(self.threshold / 4, 0.01)
+        self.log_path = log_path or default_log_path()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_beat = clock()
+        self._stall = None
+        self._main_ident = threading.main_thread().ident
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        from gi.repository import GLib
+
+        GLib.timeout_add(int(self.interval * 1000), self.beat)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(
+            f"StallWatchdog: {self.app_name} watching for stalls over "
+            f"{int(self.threshold * 1000)} ms, logging to {self.log_path}"
+        )
+
+    def stop(self):
+        self._stopped.set()
+
+    def beat(self):
+        """Main-loop heartbeat. Returns True to keep the GLib timeout alive."""
+        now = self._clock()
+        with self._lock:
+            self._last_beat = now
+            if self._stall is not None and "resumed" not in self._stall:
+                self._stall["resumed"] = now
+        return not self._stopped.is_set()
+
+    def check(self):
+        """Run one watchdog pass. Returns a finished stall record, if any."""
+        finished = None
+        with self._lock:
+            if self._stall is not None:
+                if "resumed" not in self._stall:
+                    return None
+                finished = self._stall
+                self._stall = None
+            elif self._clock() - self._last_beat > self.threshold:
+                self._stall = {
+                    "start": self._last_beat,
+                    "wall": datetime.now().isoformat(timespec="seconds"),
+                    "stack": self._capture_main_stack(),
+                }
+                return None
+        if finished is not None:
+            finished["duration_ms"] = int(
+                (finished["resumed"] - finished["start"]) * 1000
+            )
+            self._log(finished)
+        return finished
+
+    def _capture_main_stack(self):
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    def _log(self, stall):
+        print(
+            f"StallWatchdog: {self.app_name} main loop stalled "
+            f"{stall['duration_ms']} ms"
+        )
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(
+                    f"{stall['wall']} {self.app_name}: main loop stalled "
+                    f"{stall['duration_ms']} ms\n"
+                )
+                f.writelines(stall["stack"])
+                f.write("\n")
+        except OSError as e:
+            print(f"StallWatchdog: could not write {self.log_path}: {e}")
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+
+def install_from_env(app_name):
+    """Start a watchdog if KRAMDEN_STALL_WATCHDOG is set. Returns it or None."""
+    value = os.environ.get(ENV_THRESHOLD)
+    if not value:
+        return None
+    try:
+        threshold_ms = int(value)
+    except ValueError:
+        print(f"StallWatchdog: ignoring invalid {ENV_THRESHOLD}={value!r}")
+        return None
+    if threshold_ms <= 0:
+        return None
+    watchdog = StallWatchdog(app_name, threshold_ms, os.environ.get(ENV_LOG))
+    watchdog.start()
+    return watchdog
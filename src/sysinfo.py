@@ -1,13 +1,16 @@
-import threading
-
 import gi
 
 gi.require_version("Adw", "1")
 gi.require_version("Gtk", "4.0")
 from gi.repository import Adw, GLib, Gtk
 from loading_capture import StdoutCapture
+from task_executor import PRIORITY_HIGH, get_executor
 from utils import Utils
 
+# Gathered fields that cannot change without a reboot. A session resumed on
+# the same boot reuses them; hostname and Landscape state are always re-read.
+BOOT_STABLE_FIELDS = ("mem",)
+
 
 class SysInfo(Adw.Bin):
     def __init__(self):
@@ -29,7 +32,9 @@ class SysInfo(Adw.Bin):
         self._gather_in_progress = False
         self._gathered = {}
         self._stdout_capture = None
+        self._restored = None
         self.on_loading_changed = None
+        self.on_checkpoint = None
 
         utils = Utils()
 
@@ -153,15 +158,18 @@ class SysInfo(Adw.Bin):
         self._stdout_capture = StdoutCapture(self._on_stdout_line)
         self._stdout_capture.start()
 
-        threading.Thread(target=self._gather_thread, daemon=True).start()
+        get_executor().submit(
+            "sysinfo-gather",
+            self._gather_thread,
+            priority=PRIORITY_HIGH,
+            on_done=lambda result: self._on_gather_complete(),
+        )
 
-    def _gather_thread(self):
+    def _gather_thread(self, token):
         try:
             self.gather()
         except Exception as exc:
             print(f"Error gathering system info: {exc}")
-        finally:
-            GLib.idle_add(self._on_gather_complete)
 
     def gather(self):
         """Heavy data collection. Runs on a background thread. Stores
@@ -175,8 +183,12 @@ class SysInfo(Adw.Bin):
         print("Checking Landscape registration...")
         registered = utils.is_registered()
         print(f"  registered: {registered}")
-        print("Reading memory size...")
-        mem = utils.get_mem()
+        if self._restored:
+            print("Reusing memory size from the resumed session.")
+            mem = self._restored["mem"]
+        else:
+            print("Reading memory size...")
+            mem = utils.get_mem()
         print("Enumerating disks...")
         disks = utils.get_disks()
         print(f"  Found {len(disks)} disk(s)")
@@ -219,8 +231,19 @@ class SysInfo(Adw.Bin):
         finally:
             if self.on_loading_changed:
                 self.on_loading_changed(False)
+        if self.on_checkpoint:
+            self.on_checkpoint()
         return False
 
+    def checkpoint_data(self):
+        return {"gathered": self._gathered if self._data_ready else self._restored}
+
+    def restore_checkpoint(self, data):
+        """Reuse boot-stable results from a saved session on the next gather."""
+        gathered = data.get("gathered") or {}
+        if all(key in gathered for key in BOOT_STABLE_FIELDS):
+            self._restored = {key: gathered[key] for key in BOOT_STABLE_FIELDS}
+
     def _render(self):
         passed = True
         self.hostname_row.set_subtitle(self._gathered["hostname"])
@@ -311,6 +334,4 @@ class SysInfo(Adw.Bin):
                 self.battery_row.set_visible(True)
             self.batteries_populated = True
 
-        state = self.state.get_value()
-        state["SysInfo"] = passed
-        print("sysinfo:_render " + str(self.state.get_value()))
+        self.state.set("SysInfo", passed)
@@ -0,0 +1,221 @@
+"""
+App-wide executor for wizard background work.
+
+Pages submit named tasks instead of starting their own threads. The
+executor caps concurrency, ignores a task whose name is already queued or
+running, and delivers results to the GTK main loop. Each task gets a
+CancellationToken; tasks submitted with an owner are cancelled when the
+wizard hides that owner page, and their results are then dropped.
+"""
+
+import itertools
+import queue
+import threading
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def _main_loop_dispatch(callback, *args):
+    from gi.repository import GLib
+
+    def _run():
+        callback(*args)
+        return False
+
+    GLib.idle_add(_run)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task to abandon work after its token was cancelled."""
+
+
+class CancellationToken:
+    """Cooperative cancellation flag handed to every task."""
+
+    def __init__(self, dispatch):
+        self._event = threading.Event()
+        self._dispatch = dispatch
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def post(self, callback, *args):
+        """Run callback(*args) on the main loop unless cancelled by then.
+
+        Use for progress updates from inside a task.
+        """
+
+        def _deliver(*inner_args):
+            if not self.cancelled:
+                callback(*inner_args)
+
+        self._dispatch(_deliver, *args)
+
+
+class TaskHandle:
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+    def __init__(self, name, fn, args, priority, owner, callbacks, dispatch):
+        self.name = name
+        self.priority = priority
+        self.owner = owner
+        self.token = CancellationToken(dispatch)
+        self.status = TaskHandle.PENDING
+        self._fn = fn
+        self._args = args
+        self._on_done, self._on_error, self._on_cancelled = callbacks
+        self._finished = threading.Event()
+
+    def cancel(self):
+        self.token.cancel()
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def wait(self, timeout=None):
+        """Block until the task has run (or been skipped). For tests/CLI."""
+        return self._finished.wait(timeout)
+
+
+class TaskExecutor:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, dispatch=None):
+        self._max_workers = max_workers
+        self._dispatch = dispatch or _main_loop_dispatch
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._active = {}
+        self._workers = []
+
+    def submit(
+        self,
+        name,
+        fn,
+        *args,
+        priority=PRIORITY_NORMAL,
+        owner=None,
+        on_done=None,
+        on_error=None,
+        on_cancelled=None,
+    ):
+        """Queue fn(token, *args) under a unique name.
+
+        If a task with the same name is still queued or running, that task's
+        handle is returned and nothing new is queued. on_done(result),
+        on_error(exc) and on_cancelled() are called on the main loop.
+        """
+        with self._lock:
+            existing = self._active.get(name)
+            if existing is not None and not existing.cancelled:
+                print(f"TaskExecutor: {name} already {existing.status}, not queued")
+                return existing
+            handle = TaskHandle(
+                name,
+                fn,
+                args,
+                priority,
+                owner,
+                (on_done, on_error, on_cancelled),
+                self._dispatch,
+            )
+            self._active[name] = handle
+            self._ensure_workers()
+        self._queue.put((priority, next(self._counter), handle))
+        return handle
+
+    def cancel(self, name):
+        with self._lock:
+            handle = self._active.get(name)
+        if handle is not None:
+            handle.cancel()
+
+    def cancel_owner(self, owner):
+        """Cancel every queued or running task submitted with this owner."""
+        with self._lock:
+            handles = [h for h in self._active.values() if h.owner is owner]
+        for handle in handles:
+            print(f"TaskExecutor: cancelling {handle.name}")
+            handle.cancel()
+
+    def is_active(self, name):
+        with self._lock:
+            handle = self._active.get(name)
+        return handle is not None and not handle.cancelled
+
+    def _ensure_workers(self):
+        # Called with self._lock held
+        if len(self._workers) >= self._max_workers:
+            return
+        pending = sum(
+            1 for h in self._active.values() if h.status == TaskHandle.PENDING
+        )
+        busy = sum(1 for h in self._active.values() if h.status == TaskHandle.RUNNING)
+        if busy + pending > len(self._workers):
+            worker = threading.Thread(target=self._worker, daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker(self):
+        while True:
+            _, _, handle = self._queue.get()
+            result = None
+            error = None
+            if not handle.cancelled:
+                handle.status = TaskHandle.RUNNING
+                try:
+                    result = handle._fn(handle.token, *handle._args)
+                except TaskCancelled:
+                    handle.cancel()
+                except Exception as exc:
+                    error = exc
+            self._finish(handle, result, error)
+
+    def _finish(self, handle, result, error):
+        with self._lock:
+            handle.status = TaskHandle.FINISHED
+            if self._active.get(handle.name) is handle:
+                del self._active[handle.name]
+        handle._finished.set()
+        self._dispatch(self._deliver, handle, result, error)
+
+    def _deliver(self, handle, result, error):
+        # Runs on the main loop. Cancellation is re-checked here so a page
+        # hidden after the task finished still never sees the result.
+        if handle.cancelled:
+            if handle._on_cancelled:
+                handle._on_cancelled()
+        elif error is not None:
+            if handle._on_error:
+                handle._on_error(error)
+            else:
+                print(f"TaskExecutor: {handle.name} failed: {error}")
+        elif handle._on_done:
+            handle._on_done(result)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide TaskExecutor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = TaskExecutor()
+        return _executor
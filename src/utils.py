@@ -1,31 +1,72 @@
-import psutil
 import subprocess
-import threading
 import os
+import socket
 import tempfile
 from constants import snap_packages, deb_packages, CHASSIS_TYPE_MAP, Brand
-import gi
-
-gi.require_version("Snapd", "2")
-from gi.repository import Snapd, GLib
-import apt
-import dbus
-import pyudev
+from lazy_import import LazyModule
+import block_devices
+import dpkg_status
+import firmware_attrs
+import probe_io
+import probe_planner
+import snap_status
+from task_executor import get_executor
 import re
 import json
 import math
 
+# Heavy bindings are imported on first use so that pages and CLI scripts
+# which only need e.g. format_knumber don't pay for them.
+dbus = LazyModule("dbus")
+
+# lspci -nn format: "slot Class [class_id]: Vendor Device [vendor:device] (rev XX)"
+_LSPCI_SLOT_RE = re.compile(r"([0-9a-f:.]+)")
+_LSPCI_NAME_RE = re.compile(r"\[[0-9a-f]{4}\]:\s*(.+?)\s*\[[0-9a-f]{4}:[0-9a-f]{4}\]")
+_DIMM_SIZE_RE = re.compile(r"Size:\s+(\d+)\s+(MB|GB)", re.IGNORECASE)
+
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+HP_TAGS_EFIVAR_PATH = (
+    "/sys/firmware/efi/efivars/HP_TAGS-fb3b9ece-4aba-4933-b49d-b4d67d892351"
+)
+# UPower.Device State, named as the kernel reports status
+UPOWER_STATES = {
+    1: "Charging",
+    2: "Discharging",
+    3: "Empty",
+    4: "Full",
+    5: "Not charging",
+    6: "Discharging",
+}
+
 
 # Utility class for functions used throughout the app
 class Utils:
+    # Hardware identity shared by all Utils instances in this process. Only
+    # the resident host turns this on; standalone apps probe per instance.
+    _cache_identity = False
+    _identity_cache = None
+
+    @classmethod
+    def enable_identity_cache(cls):
+        cls._cache_identity = True
+
     def __init__(self):
+        cached = Utils._identity_cache
+        if cached is not None:
+            self.model = cached["model"]
+            self.vendor = cached["vendor"]
+            self.serial = cached["serial"]
+            self.os = cached["os"]
+            # The hostname changes during OS Load; read it fresh
+            self.hostname = socket.gethostname()
+            return
         self.model = ""
         self.vendor = ""
         self.serial = ""
         self.hostname = ""
         self.os = ""
         try:
-            result = subprocess.run(
+            result = probe_io.run(
                 ["sudo", "hostnamectl", "status", "--json=pretty"],
                 capture_output=True,
                 text=True,
@@ -53,7 +94,7 @@ class Utils:
             serial_files = ["chassis_serial", "product_serial", "board_serial"]
             for serial_file in serial_files:
                 try:
-                    result = subprocess.run(
+                    result = probe_io.run(
                         [
                             "sudo",
                             "cat",
@@ -70,50 +111,27 @@ class Utils:
                 except subprocess.CalledProcessError:
                     # If reading this serial file fails, try the next one
                     continue
+        if Utils._cache_identity and self.serial:
+            Utils._identity_cache = {
+                "model": self.model,
+                "vendor": self.vendor,
+                "serial": self.serial,
+                "os": self.os,
+            }
 
     # Return the size of all detected necessary drives
     def get_disks(self):
-        context = pyudev.Context()
         disks = {}
-        for device in context.list_devices(subsystem="block", DEVTYPE="disk"):
-            devname = device["DEVNAME"]
-
-            if "loop" in devname or re.search(r"sr[0-9]", devname):
-                continue
-
-            if device.attributes.asint("removable") == 1:
+        for device in block_devices.inventory():
+            if device["removable"]:
                 continue
-
-            if devname.startswith("/dev/dm-") or "/mapper/" in devname:
-                continue
-
-            if device.get("DM_NAME"):
-                continue
-
-            size_gb = int(round(device.attributes.asint("size") * 512 / 1024**3, 0))
-
-            # Determine drive type
-            drive_type = self._get_drive_type(devname)
-
-            disks[str(devname)] = {"size": size_gb, "type": drive_type}
-
+            size_gb = int(round(device["size"] / 1024**3, 0))
+            disks[device["path"]] = {
+                "size": size_gb,
+                "type": block_devices.drive_type(device),
+            }
         return disks
 
-    def _get_drive_type(self, devname):
-        """Determine if drive is NVMe, SATA SSD, or SATA HDD."""
-        if "nvme" in devname:
-            return "NVMe"
-
-        # Check rotational attribute for SATA drives
-        try:
-            # Extract device name (e.g., "sda" from "/dev/sda")
-            dev = devname.split("/")[-1]
-            with open(f"/sys/block/{dev}/queue/rotational", "r") as f:
-                is_rotational = f.read().strip() == "1"
-                return "SATA HDD" if is_rotational else "SATA SSD"
-        except (FileNotFoundError, OSError):
-            return "SATA"
-
     # Return host name
     def get_hostname(self):
         return self.hostname
@@ -132,147 +150,217 @@ class Utils:
     def sync_clock(self):
         clock_sh = "/usr/share/kramden-provision/scripts/clock.sh"
         if self.file_exists_and_executable(clock_sh):
-            result = subprocess.run(["sudo", clock_sh])
+            result = probe_io.run(["sudo", clock_sh])
             return result.returncode == 0
         return False
 
-    # Check if BIOS Password is set, returns True if set.
+    # Firmware-attributes index, read once per Utils instance and shared by
+    # the BIOS password, asset tag and Computrace checks
+    def firmware_attributes(self):
+        if getattr(self, "_firmware_attrs", None) is None:
+            if "hp" in self.vendor.lower():
+                self._load_hp_bioscfg()
+            self._firmware_attrs = firmware_attrs.FirmwareAttributes()
+        return self._firmware_attrs
+
+    # hp-bioscfg is not autoloaded on every HP model; without it there is no
+    # authentication directory and the password check would say "disabled"
+    def _load_hp_bioscfg(self):
+        driver_dir = os.path.join(
+            firmware_attrs.FIRMWARE_ATTRS_DIR, firmware_attrs.HP_DRIVER
+        )
+        if probe_io.isdir(driver_dir):
+            return
+        try:
+            probe_io.run(
+                ["sudo", "modprobe", firmware_attrs.HP_DRIVER],
+                capture_output=True,
+                text=True,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"modprobe {firmware_attrs.HP_DRIVER} failed: {e}")
+
+    # Planner for this machine's fallback probes, created once the vendor
+    # and model are known
+    def probe_planner(self):
+        if getattr(self, "_probe_planner", None) is None:
+            self._probe_planner = probe_planner.ProbePlanner(self.vendor, self.model)
+        return self._probe_planner
+
     # Detect whether a BIOS password is set.
     #
     # Returns:
-    #   True  – password is set (script exited non-zero)
-    #   False – no password (script exited 0, no warning)
-    #   None  – indeterminate: script exited 0 but emitted a WARNING on stderr
-    #           (e.g. buggy HP firmware via hp-bioscfg).  The warning text is
-    #           stored on self.bios_password_warning for the UI to display.
+    #   True  – a password is set
+    #   False – no password
+    #   None  – indeterminate: HP firmware exposed malformed hp-bioscfg
+    #           authentication entries and the SMBIOS table did not say
+    #           otherwise. The warning text is stored on
+    #           self.bios_password_warning for the UI to display.
     #
     # Callers that only consume the boolean must treat None as unverified, not
-    # as "no password".
-    def has_bios_password(self):
+    # as "no password". read_only skips the Dell cctk probe, which writes a
+    # BIOS setting.
+    def has_bios_password(self, read_only=False):
         self.bios_password_warning = None
-        bios_password_sh = "/usr/share/kramden-provision/scripts/bios_password.sh"
-        if self.file_exists_and_executable(bios_password_sh):
-            result = subprocess.run(
-                ["sudo", bios_password_sh], capture_output=True, text=True
+        print("Checking for BIOS Password")
+        auth_state, unreliable = self.firmware_attributes().admin_password()
+        if auth_state:
+            print("BIOS Password enabled (firmware-attributes)")
+            return True
+
+        # SMBIOS Hardware Security table, what lshw reports as
+        # administrator_password, without probing the whole bus
+        dmi_state = None
+        try:
+            result = probe_io.run(
+                ["sudo", "dmidecode", "-t", "24"], capture_output=True, text=True
             )
-            for line in (result.stderr or "").splitlines():
-                if line.startswith("WARNING:"):
-                    self.bios_password_warning = line[len("WARNING:") :].strip()
-                    break
-            if result.returncode != 0:
-                return True
-            return None if self.bios_password_warning else False
+            if result.returncode == 0:
+                dmi_state = firmware_attrs.parse_dmi_admin_password(result.stdout)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"dmidecode -t 24 failed: {e}")
+        if dmi_state:
+            print("BIOS Password enabled (SMBIOS)")
+            return True
+
+        # Without dell-wmi-sysman, ask cctk. It has no read-only password
+        # query; probing with a write reveals whether an admin password is
+        # required: exit 65 means a password is set, 0 or 43 means none.
+        if not read_only and auth_state is None and "dell" in self.vendor.lower():
+            cctk_path = "/opt/dell/dcc/cctk"
+            if probe_io.executable(cctk_path):
+                try:
+                    result = probe_io.run(
+                        ["sudo", cctk_path, "--tpmppiclearoverride=enable"],
+                        capture_output=True,
+                        text=True,
+                    )
+                    if result.returncode == 65:
+                        print("BIOS Password enabled (cctk)")
+                        return True
+                except (OSError, subprocess.SubprocessError) as e:
+                    print(f"cctk password probe failed: {e}")
+
+        # An authoritative "disabled" from SMBIOS overrides the malformed
+        # hp-bioscfg entries heuristic
+        if unreliable and dmi_state is not False:
+            self.bios_password_warning = (
+                "HP BIOS password state could not be determined reliably on "
+                "this firmware (hp-bioscfg exposed malformed authentication "
+                "entries). Verify manually via F10 Setup."
+            )
+            print(f"WARNING: {self.bios_password_warning}")
+            return None
+        print("BIOS Password disabled")
         return False
 
-    # Check if BIOS has Asset info, returns True if set
-    def has_asset_info(self):
-        asset_sh = "/usr/share/kramden-provision/scripts/asset.sh"
-        if self.file_exists_and_executable(asset_sh):
-            result = subprocess.run(["sudo", asset_sh])
-            return result.returncode != 0
+    # Check if BIOS has Asset info, returns True if set. Dell asset and
+    # ownership tags are cleared; True means one could not be cleared.
+    # read_only reports Dell tags without clearing them.
+    def has_asset_info(self, read_only=False):
+        print("Checking for Asset Info")
+        vendor = self.vendor.lower()
+        if "hp" in vendor:
+            print("Checking for HP Asset Tags")
+            tags = self._read_hp_tags()
+            if tags:
+                print("HP Tags found")
+                print(f"Tag: {tags}")
+                return True
+            print("HP Tags not found")
+        elif "dell" in vendor:
+            found = False
+            for option, label in (("Asset", "Asset Tag"), ("PropOwnTag", "Ownership Tag")):
+                print(f"Checking for Dell {label}")
+                tag = self._read_dell_tag(option)
+                if not tag:
+                    print(f"Dell {label} not found")
+                    continue
+                print(f"Dell {label} found")
+                print(f"{label}: {tag}")
+                if read_only:
+                    found = True
+                    continue
+                print(f"Clearing {label}")
+                if self._clear_dell_tag(option):
+                    continue
+                print(f"Failed to clear Dell {label}")
+                found = True
+            return found
         return False
 
+    def _read_hp_tags(self):
+        """HP asset tags from the HP_TAGS EFI variable, without the serial
+        number the firmware prefixes them with."""
+        try:
+            data = probe_io.read_bytes(HP_TAGS_EFIVAR_PATH)
+        except OSError:
+            return ""
+        # efivarfs prefixes the data with 4 bytes of attributes
+        tags = data[4:].decode("latin-1").replace("\0", "").strip()
+        if self.serial:
+            tags = tags.replace(self.serial, "", 1).strip()
+        return tags
+
+    def _read_dell_tag(self, option):
+        """A Dell tag from dell-wmi-sysman if it exposes it, else from cctk."""
+        index = self.firmware_attributes()
+        if index.has(option):
+            return index.value(option) or ""
+        cctk_path = "/opt/dell/dcc/cctk"
+        if not probe_io.executable(cctk_path):
+            return ""
+        try:
+            result = probe_io.run(
+                ["sudo", cctk_path, f"--{option}"], capture_output=True, text=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"cctk --{option} failed: {e}")
+            return ""
+        return result.stdout.partition("=")[2].strip()
+
+    def _clear_dell_tag(self, option):
+        cctk_path = "/opt/dell/dcc/cctk"
+        if not probe_io.executable(cctk_path):
+            return False
+        try:
+            probe_io.run(
+                ["sudo", cctk_path, f"--{option}="], capture_output=True, text=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"cctk --{option}= failed: {e}")
+            return False
+        self.firmware_attributes().invalidate(option)
+        return not self._read_dell_tag(option)
+
     # Check if Computrace/Absolute is activated in BIOS, returns True if activated
     def has_computrace_enabled(self):
-        # Check firmware attributes exposed by Linux kernel
-        # Works for Lenovo, Dell, and HP (with hp-bioscfg driver on Linux 6.x+)
-        result = self._check_computrace_firmware_attrs()
-        if result is not None:
-            return result
-
-        # Fallback to Dell-specific check using cctk tool
+        # Sources, in default order:
+        # - firmware attributes exposed by the Linux kernel; works for Lenovo,
+        #   Dell, and HP (with hp-bioscfg driver on Linux 6.x+)
+        # - Dell-specific check using the cctk tool
+        # - dmidecode Computrace/Absolute entries; works across all vendors
+        #   by reading SMBIOS tables
+        # They are tried in this order of trust; the planner only skips or
+        # time-boxes them per model.
+        probes = [("computrace:firmware-attrs", self._check_computrace_firmware_attrs)]
         if self.vendor.lower() == "dell":
-            result = self._check_computrace_dell_cctk()
-            if result is not None:
-                return result
-
-        # Fallback to check dmidecode for Computrace/Absolute entries
-        # This works across all vendors by reading SMBIOS tables
-        result = self._check_computrace_dmidecode()
-        if result is not None:
-            return result
-
-        return None  # Cannot determine
+            probes.append(("computrace:cctk", self._check_computrace_dell_cctk))
+        probes.append(("computrace:dmidecode", self._check_computrace_dmidecode))
+        return self.probe_planner().first_answer(probes)  # None: cannot determine
 
     def _check_computrace_firmware_attrs(self):
         """Check firmware-attributes sysfs interface (Lenovo, Dell, HP with proper drivers)."""
-        # Attributes ending in "Activation" use Enable/Disable to indicate activation state
-        # Other attributes use Activate/Activated to indicate activation state
-        activation_attrs = [
-            "AbsolutePersistenceModuleActivation",
-            "ComputraceModuleActivation",
-        ]
-        standard_attrs = [
-            "Computrace",
-            "Absolute",
-        ]
-        firmware_attrs_base = "/sys/class/firmware-attributes"
-        try:
-            if not os.path.isdir(firmware_attrs_base):
-                return None
-            for provider in os.listdir(firmware_attrs_base):
-                attrs_dir = os.path.join(firmware_attrs_base, provider, "attributes")
-                if not os.path.isdir(attrs_dir):
-                    continue
-                # Check activation-style attributes first (Enable = activated)
-                for attr_name in activation_attrs:
-                    current_value_path = os.path.join(
-                        attrs_dir, attr_name, "current_value"
-                    )
-                    if os.path.exists(current_value_path):
-                        result = subprocess.run(
-                            ["sudo", "cat", current_value_path],
-                            capture_output=True,
-                            text=True,
-                        )
-                        if result.returncode == 0:
-                            value = result.stdout.strip().lower()
-                            # For *Activation attributes, Enable means activated
-                            if value in ["enabled"]:
-                                return True
-                            elif value in [
-                                "disable",
-                                "disabled",
-                                "permanentlydisable",
-                                "permanently disable",
-                            ]:
-                                return False
-                # Check standard attributes (Activate = activated)
-                for attr_name in standard_attrs:
-                    current_value_path = os.path.join(
-                        attrs_dir, attr_name, "current_value"
-                    )
-                    if os.path.exists(current_value_path):
-                        result = subprocess.run(
-                            ["sudo", "cat", current_value_path],
-                            capture_output=True,
-                            text=True,
-                        )
-                        if result.returncode == 0:
-                            value = result.stdout.strip().lower()
-                            if value in ["activate", "activated"]:
-                                return True
-                            elif value in [
-                                "enable",
-                                "enabled",
-                                "disable",
-                                "disabled",
-                                "permanentlydisable",
-                                "permanently disable",
-                            ]:
-                                return False
-        except (OSError, subprocess.SubprocessError):
-            pass
-        return None
+        return self.firmware_attributes().computrace()
 
     def _check_computrace_dell_cctk(self):
         """Check Dell systems using cctk tool."""
         cctk_path = "/opt/dell/dcc/cctk"
-        if not os.path.exists(cctk_path):
+        if not probe_io.exists(cctk_path):
             return None
         try:
             # Check activation-style attribute first (Enable = activated)
-            result = subprocess.run(
+            result = probe_io.run(
                 ["sudo", cctk_path, "--AbsoluteEnable"],
                 capture_output=True,
                 text=True,
@@ -287,7 +375,7 @@ class Utils:
 
             # Check standard attributes (Activate = activated)
             for attr in ["Computrace", "Absolute"]:
-                result = subprocess.run(
+                result = probe_io.run(
                     ["sudo", cctk_path, f"--{attr}"],
                     capture_output=True,
                     text=True,
@@ -308,7 +396,7 @@ class Utils:
         try:
             # Check BIOS information (type 0) and System Configuration Options (type 12)
             # for Computrace-related strings
-            result = subprocess.run(
+            result = probe_io.run(
                 ["sudo", "dmidecode"],
                 capture_output=True,
                 text=True,
@@ -316,28 +404,38 @@ class Utils:
             if result.returncode != 0:
                 return None
 
-            output = result.stdout.lower()
-
-            # Look for Computrace/Absolute entries in dmidecode output
-            # Pattern: lines containing computrace or absolute followed by activated/disabled
-            lines = output.split("\n")
-            for i, line in enumerate(lines):
-                if "computrace" in line or "absolute" in line:
-                    # Check this line and nearby lines for status
-                    context = " ".join(lines[max(0, i - 2) : min(len(lines), i + 3)])
-                    if any(status in context for status in ["activated", "active"]):
-                        # Make sure it's not "disabled" or "deactivated"
-                        if "disabled" not in context and "deactivated" not in context:
-                            return True
-                    if any(
-                        status in context
-                        for status in ["disabled", "deactivated", "inactive"]
-                    ):
-                        return False
+            return self._parse_computrace_dmidecode(result.stdout)
         except (OSError, subprocess.SubprocessError):
             pass
         return None
 
+    @staticmethod
+    def _parse_computrace_dmidecode(output):
+        """Computrace state from a dmidecode dump: True, False or None."""
+        # Only lines mentioning Computrace/Absolute matter; skip the split
+        # entirely for the common dump that has neither.
+        output = output.lower()
+        if "computrace" not in output and "absolute" not in output:
+            return None
+
+        # Look for Computrace/Absolute entries in dmidecode output
+        # Pattern: lines containing computrace or absolute followed by activated/disabled
+        lines = output.split("\n")
+        for i, line in enumerate(lines):
+            if "computrace" in line or "absolute" in line:
+                # Check this line and nearby lines for status
+                context = " ".join(lines[max(0, i - 2) : min(len(lines), i + 3)])
+                if any(status in context for status in ["activated", "active"]):
+                    # Make sure it's not "disabled" or "deactivated"
+                    if "disabled" not in context and "deactivated" not in context:
+                        return True
+                if any(
+                    status in context
+                    for status in ["disabled", "deactivated", "inactive"]
+                ):
+                    return False
+        return None
+
     @staticmethod
     def _normalize_vendor(vendor):
         if not vendor:
@@ -377,11 +475,10 @@ class Utils:
         # If DMI fails, fall back on /proc/meminfo
         if mem_gib is None:
             mem_info = {}
-            with open("/proc/meminfo") as f:
-                for line in f:
-                    if line.strip():
-                        key, value = line.split(":", 1)
-                        mem_info[key.strip()] = value.strip()
+            for line in probe_io.read_text("/proc/meminfo").splitlines():
+                if line.strip():
+                    key, value = line.split(":", 1)
+                    mem_info[key.strip()] = value.strip()
             # MemTotal is in KiB (labeled as kB), convert to GiB
             mem_kib = int(mem_info["MemTotal"].split(" ")[0])
             mem_gib = mem_kib / 1024**2
@@ -390,35 +487,14 @@ class Utils:
 
     def _get_installed_ram_from_dmi(self):
         try:
-            result = subprocess.run(
+            result = probe_io.run(
                 ["sudo", "dmidecode", "-t", "17"],
                 capture_output=True,
                 text=True,
                 check=True,
             )
 
-            total_mb = 0
-            lines = result.stdout.split("\n")
-
-            for line in lines:
-                # Look for "Size:" lines under Memory Device sections
-                if "\tSize:" in line:
-                    # Skip lines that say "No Module Installed" or similar
-                    if "No Module Installed" in line or "Not Installed" in line:
-                        continue
-
-                    # Extract size - format is typically "Size: 8192 MB" or "Size: 8 GB"
-                    size_match = re.search(
-                        r"Size:\s+(\d+)\s+(MB|GB)", line, re.IGNORECASE
-                    )
-                    if size_match:
-                        size = int(size_match.group(1))
-                        unit = size_match.group(2).upper()
-
-                        if unit == "GB":
-                            total_mb += size * 1024
-                        else:  # MB
-                            total_mb += size
+            total_mb = self._parse_dimm_sizes_mb(result.stdout)
 
             # Require a reasonable minimum to avoid returning misleading near-zero values
             if total_mb >= 256:
@@ -432,6 +508,29 @@ class Utils:
 
         return None
 
+    @staticmethod
+    def _parse_dimm_sizes_mb(output):
+        """Total MB of the installed modules in dmidecode -t 17 output."""
+        total_mb = 0
+        for line in output.split("\n"):
+            # Look for "Size:" lines under Memory Device sections
+            if "\tSize:" in line:
+                # Skip lines that say "No Module Installed" or similar
+                if "No Module Installed" in line or "Not Installed" in line:
+                    continue
+
+                # Extract size - format is typically "Size: 8192 MB" or "Size: 8 GB"
+                size_match = _DIMM_SIZE_RE.search(line)
+                if size_match:
+                    size = int(size_match.group(1))
+                    unit = size_match.group(2).upper()
+
+                    if unit == "GB":
+                        total_mb += size * 1024
+                    else:  # MB
+                        total_mb += size
+        return total_mb
+
     def _round_to_standard_ram(self, mem_gib):
         """Round memory to nearest standard RAM size when within tolerance."""
         # Common RAM sizes in GiB
@@ -450,15 +549,84 @@ class Utils:
 
     # Return CPU model info
     def get_cpu_info(self):
+        return self._parse_cpu_model(probe_io.read_text("/proc/cpuinfo"))
+
+    @staticmethod
+    def _parse_cpu_model(cpuinfo):
+        """The model name from /proc/cpuinfo text."""
         cpu_info = {}
-        with open("/proc/cpuinfo") as f:
-            for line in f:
+        # Every processor repeats the same fields, so the first block is
+        # enough unless it lacks the model name.
+        first = cpuinfo.split("\n\n", 1)[0]
+        for block in (first, cpuinfo):
+            for line in block.splitlines():
                 if line.strip():
                     key, value = line.split(":", 1)
                     cpu_info[key.strip()] = value.strip()
+            if "model name" in cpu_info:
+                break
 
         return cpu_info["model name"]
 
+    @staticmethod
+    def _parse_lspci_integrated_gpu(output):
+        """(pci_slot, name) of the integrated GPU in lspci -nn output."""
+        display_controller_slot = None
+        display_controller_name = None
+        for line in output.splitlines():
+            line_lower = line.lower()
+            is_vga = "vga compatible controller" in line_lower
+            if not is_vga and (
+                display_controller_slot is not None
+                or "display controller" not in line_lower
+            ):
+                continue
+            pci_match = _LSPCI_SLOT_RE.match(line)
+            if not pci_match:
+                continue
+            name_match = _LSPCI_NAME_RE.search(line)
+            name = name_match.group(1).strip() if name_match else None
+            if is_vga:
+                return pci_match.group(1), name
+            display_controller_slot = pci_match.group(1)
+            display_controller_name = name
+        return display_controller_slot, display_controller_name
+
+    @staticmethod
+    def _parse_lspci_discrete_gpu(output):
+        """(has_discrete, has_nvidia, pci_slot, name) from lspci -nn output."""
+        # Treat "discrete GPU present" as "more than one VGA/3D controller detected".
+        # The first VGA controller is typically the iGPU; the second VGA or any
+        # 3D controller is the dGPU.
+        # Exception: if the iGPU is listed as a "Display controller" instead of
+        # "VGA compatible controller", the first VGA entry is the dGPU, not the iGPU.
+        output_lower = output.lower()
+        igpu_is_display_controller = "display controller" in output_lower
+        has_nvidia = False
+        discrete_pci_slot = None
+        lspci_name = None
+        vga_count = 0
+        for line, line_lower in zip(output.splitlines(), output_lower.splitlines()):
+            is_vga = "vga compatible controller" in line_lower
+            is_3d = "3d controller" in line_lower
+            if not (is_vga or is_3d):
+                continue
+            if is_vga:
+                vga_count += 1
+                if vga_count == 1 and not igpu_is_display_controller:
+                    # First VGA is the iGPU — skip it only when no Display
+                    # controller was found that already accounts for the iGPU.
+                    continue
+            pci_match = _LSPCI_SLOT_RE.match(line)
+            if pci_match and discrete_pci_slot is None:
+                name_match = _LSPCI_NAME_RE.search(line)
+                discrete_pci_slot = pci_match.group(1)
+                lspci_name = name_match.group(1).strip() if name_match else None
+            if "nvidia" in line_lower:
+                has_nvidia = True
+        has_discrete = vga_count > 1 or discrete_pci_slot is not None
+        return has_discrete, has_nvidia, discrete_pci_slot, lspci_name
+
     def get_integrated_gpu(self):
         """Return a friendly name for the integrated GPU, or None."""
         # Find the first VGA or Display controller from lspci (typically the iGPU).
@@ -468,38 +636,21 @@ class Utils:
         integrated_pci_slot = None
         lspci_name = None
         try:
-            result = subprocess.run(
+            result = probe_io.run(
                 ["lspci", "-nn"],
                 capture_output=True,
                 text=True,
                 check=True,
             )
-            display_controller_slot = None
-            display_controller_name = None
-            for line in result.stdout.splitlines():
-                line_lower = line.lower()
-                pci_match = re.match(r"([0-9a-f:.]+)", line)
-                if not pci_match:
-                    continue
-                # lspci -nn format: "slot Class [class_id]: Vendor Device [vendor:device] (rev XX)"
-                name_match = re.search(r"\[[0-9a-f]{4}\]:\s*(.+?)\s*\[[0-9a-f]{4}:[0-9a-f]{4}\]", line)
-                name = name_match.group(1).strip() if name_match else None
-                if "vga compatible controller" in line_lower:
-                    integrated_pci_slot = pci_match.group(1)
-                    lspci_name = name
-                    break
-                if "display controller" in line_lower and display_controller_slot is None:
-                    display_controller_slot = pci_match.group(1)
-                    display_controller_name = name
-            if integrated_pci_slot is None:
-                integrated_pci_slot = display_controller_slot
-                lspci_name = display_controller_name
+            integrated_pci_slot, lspci_name = self._parse_lspci_integrated_gpu(
+                result.stdout
+            )
         except (subprocess.CalledProcessError, OSError):
             pass
 
         # Try glxinfo without PRIME offload to get the integrated renderer
         try:
-            result = subprocess.run(
+            result = probe_io.run(
                 ["glxinfo"],
                 capture_output=True,
                 text=True,
@@ -529,42 +680,15 @@ class Utils:
         discrete_pci_slot = None
         lspci_name = None
         try:
-            result = subprocess.run(
+            result = probe_io.run(
                 ["lspci", "-nn"],
                 capture_output=True,
                 text=True,
                 check=True,
             )
-            # Treat "discrete GPU present" as "more than one VGA/3D controller detected".
-            # The first VGA controller is typically the iGPU; the second VGA or any
-            # 3D controller is the dGPU.
-            # Exception: if the iGPU is listed as a "Display controller" instead of
-            # "VGA compatible controller", the first VGA entry is the dGPU, not the iGPU.
-            lines = result.stdout.splitlines()
-            igpu_is_display_controller = any(
-                "display controller" in l.lower() for l in lines
+            has_discrete, has_nvidia, discrete_pci_slot, lspci_name = (
+                self._parse_lspci_discrete_gpu(result.stdout)
             )
-            vga_count = 0
-            for line in lines:
-                line_lower = line.lower()
-                is_vga = "vga compatible controller" in line_lower
-                is_3d = "3d controller" in line_lower
-                if not (is_vga or is_3d):
-                    continue
-                if is_vga:
-                    vga_count += 1
-                    if vga_count == 1 and not igpu_is_display_controller:
-                        # First VGA is the iGPU — skip it only when no Display
-                        # controller was found that already accounts for the iGPU.
-                        continue
-                pci_match = re.match(r"([0-9a-f:.]+)", line)
-                name_match = re.search(r"\[[0-9a-f]{4}\]:\s*(.+?)\s*\[[0-9a-f]{4}:[0-9a-f]{4}\]", line)
-                if pci_match and discrete_pci_slot is None:
-                    discrete_pci_slot = pci_match.group(1)
-                    lspci_name = name_match.group(1).strip() if name_match else None
-                if "nvidia" in line_lower:
-                    has_nvidia = True
-            has_discrete = vga_count > 1 or discrete_pci_slot is not None
         except (subprocess.CalledProcessError, OSError):
             pass
 
@@ -575,30 +699,17 @@ class Utils:
         has_nvidia_proprietary = False
         if has_nvidia:
             # Check for /proc/driver/nvidia/version which only exists with proprietary driver
-            has_nvidia_proprietary = os.path.exists("/proc/driver/nvidia/version")
-
-        # Get friendly name using glxinfo with appropriate PRIME settings
-        try:
-            env = os.environ.copy()
-            # For NVIDIA proprietary driver, use NVIDIA-specific PRIME offload variables
-            if has_nvidia_proprietary:
-                env["__NV_PRIME_RENDER_OFFLOAD"] = "1"
-                env["__GLX_VENDOR_LIBRARY_NAME"] = "nvidia"
-            # Generic DRI_PRIME works for nouveau and AMD
-            env["DRI_PRIME"] = "1"
-
-            result = subprocess.run(
-                ["glxinfo"],
-                capture_output=True,
-                text=True,
-                env=env,
-            )
-            for line in result.stdout.splitlines():
-                if "OpenGL renderer string:" in line:
-                    renderer = line.split(":", 1)[1].strip()
-                    return self._format_gpu_renderer(renderer, discrete_pci_slot)
-        except (subprocess.CalledProcessError, OSError):
-            pass
+            has_nvidia_proprietary = probe_io.exists("/proc/driver/nvidia/version")
+
+        # Get friendly name using glxinfo with appropriate PRIME settings.
+        # Offload hangs or fails on some drivers (nouveau); the planner skips
+        # or time-boxes it on models where it does.
+        renderer = self.probe_planner().attempt(
+            "dgpu:glxinfo",
+            lambda: self._get_offload_renderer(has_nvidia_proprietary),
+        )
+        if renderer:
+            return self._format_gpu_renderer(renderer, discrete_pci_slot)
 
         # Fall back to udev, then the name parsed directly from lspci output
         if discrete_pci_slot:
@@ -631,11 +742,35 @@ class Utils:
 
         return renderer
 
+    def _get_offload_renderer(self, has_nvidia_proprietary):
+        """OpenGL renderer string of the PRIME offload GPU, or None."""
+        try:
+            env = os.environ.copy()
+            # For NVIDIA proprietary driver, use NVIDIA-specific PRIME offload variables
+            if has_nvidia_proprietary:
+                env["__NV_PRIME_RENDER_OFFLOAD"] = "1"
+                env["__GLX_VENDOR_LIBRARY_NAME"] = "nvidia"
+            # Generic DRI_PRIME works for nouveau and AMD
+            env["DRI_PRIME"] = "1"
+
+            result = probe_io.run(
+                ["glxinfo"],
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+            for line in result.stdout.splitlines():
+                if "OpenGL renderer string:" in line:
+                    return line.split(":", 1)[1].strip()
+        except (subprocess.CalledProcessError, OSError):
+            pass
+        return None
+
     def _get_gpu_name_from_udev(self, pci_slot):
         """Get GPU name from udev ID_MODEL_FROM_DATABASE property."""
         try:
             pci_path = f"/sys/bus/pci/devices/0000:{pci_slot}"
-            result = subprocess.run(
+            result = probe_io.run(
                 ["udevadm", "info", "-q", "property", "-p", pci_path],
                 capture_output=True,
                 text=True,
@@ -652,33 +787,108 @@ class Utils:
         return None
 
     def check_snaps(self, packages):
-        result = {}
-        client = Snapd.Client()
-        snaps_installed = [
-            snap.get_name()
-            for snap in client.get_snaps_sync(Snapd.GetAppsFlags.NONE, packages, None)
-        ]
-        for p in packages:
-            if p in snaps_installed:
-                result[p] = True
-            else:
-                result[p] = False
-        return result
+        return snap_status.get_status().check(packages)
+
+    def get_snap_versions(self, packages):
+        return snap_status.get_status().versions(packages)
 
     def check_debs(self, packages):
-        result = {}
-        cache = apt.cache.Cache()
-        cache.open(None)
-        debs_installed = [p.name for p in cache if p.is_installed]
-        for p in packages:
-            if p in debs_installed:
-                result[p] = True
-            else:
-                result[p] = False
-        return result
+        return dpkg_status.get_status().check(packages)
+
+    def get_deb_versions(self, packages):
+        return dpkg_status.get_status().versions(packages)
 
     # Return battery capacity
     def get_battery_capacities(self):
+        return {
+            name: battery["capacity"]
+            for name, battery in self.get_battery_details().items()
+        }
+
+    # Return {name: {capacity, cycle_count, status, energy_full_wh,
+    # energy_full_design_wh}} for each system battery
+    def get_battery_details(self):
+        try:
+            batteries = self._read_sysfs_batteries()
+        except OSError as e:
+            print(f"Cannot read {POWER_SUPPLY_DIR}: {e}")
+            batteries = None
+        if batteries is None:
+            # No usable sysfs data, ask UPower instead
+            batteries = probe_io.value(
+                "upower-batteries", self._read_upower_batteries, {}
+            )
+        return batteries
+
+    @staticmethod
+    def _parse_power_supply_uevent(content):
+        """POWER_SUPPLY_* properties of a uevent file, without the prefix."""
+        props = {}
+        for line in content.splitlines():
+            key, sep, value = line.partition("=")
+            if sep and key.startswith("POWER_SUPPLY_"):
+                props[key[13:]] = value.strip()
+        return props
+
+    @staticmethod
+    def _battery_from_uevent(props):
+        """Battery details from uevent properties, or None if the design
+        and full capacities are not reported."""
+
+        def number(key):
+            try:
+                return int(props[key])
+            except (KeyError, ValueError):
+                return None
+
+        full = number("ENERGY_FULL")
+        design = number("ENERGY_FULL_DESIGN")
+        full_wh = design_wh = None
+        if full and design:
+            # µWh
+            full_wh, design_wh = full / 1e6, design / 1e6
+        else:
+            full = number("CHARGE_FULL")
+            design = number("CHARGE_FULL_DESIGN")
+            if not (full and design):
+                return None
+            # µAh; Wh needs the design voltage in µV
+            voltage = number("VOLTAGE_MIN_DESIGN")
+            if voltage:
+                full_wh = full * voltage / 1e12
+                design_wh = design * voltage / 1e12
+        return {
+            # Same figure UPower reports as Capacity
+            "capacity": int(round(min(100.0, full / design * 100), 0)),
+            "cycle_count": number("CYCLE_COUNT"),
+            "status": props.get("STATUS", "Unknown"),
+            "energy_full_wh": round(full_wh, 2) if full_wh is not None else None,
+            "energy_full_design_wh": (
+                round(design_wh, 2) if design_wh is not None else None
+            ),
+        }
+
+    def _read_sysfs_batteries(self):
+        """Read every system battery's uevent in one pass. Returns None when
+        a battery does not report its capacities, so UPower is asked."""
+        batteries = {}
+        for name in sorted(probe_io.listdir(POWER_SUPPLY_DIR)):
+            try:
+                content = probe_io.read_text(f"{POWER_SUPPLY_DIR}/{name}/uevent")
+            except OSError:
+                continue
+            props = self._parse_power_supply_uevent(content)
+            # Mice, keyboards and the like report a Device scope
+            if props.get("TYPE") != "Battery" or props.get("SCOPE") == "Device":
+                continue
+            battery = self._battery_from_uevent(props)
+            if battery is None:
+                print(f"{name} does not report its capacity in sysfs")
+                return None
+            batteries[name] = battery
+        return batteries
+
+    def _read_upower_batteries(self):
         bus = dbus.SystemBus()
         upower = bus.get_object("org.freedesktop.UPower", "/org/freedesktop/UPower")
         manager = dbus.Interface(upower, "org.freedesktop.UPower")
@@ -686,59 +896,54 @@ class Utils:
         # Get the list of all power devices
         devices = manager.EnumerateDevices()
 
-        capacities = {}
+        batteries = {}
         for device_path in devices:
             device = bus.get_object("org.freedesktop.UPower", device_path)
             device_properties = dbus.Interface(
                 device, "org.freedesktop.DBus.Properties"
             )
-            device_type = device_properties.Get("org.freedesktop.UPower.Device", "Type")
+            # One round trip for all properties of the device
+            props = device_properties.GetAll("org.freedesktop.UPower.Device")
 
             # UPower.DeviceType for battery is 2
-            if device_type == 2:
-                # display number should be an int, but float always has something after the decimal e.g. "80.0"
-                capacity = int(
-                    round(
-                        float(
-                            device_properties.Get(
-                                "org.freedesktop.UPower.Device", "Capacity"
-                            )
-                        ),
-                        0,
-                    )
+            if props.get("Type") != 2:
+                continue
+            # Use native name like BAT0/BAT1 instead of manufacturer model name
+            native_path = str(props.get("NativePath") or "")
+            if native_path:
+                # NativePath is typically /sys/devices/.../BAT0 or BAT1
+                battery_name = native_path.split("/")[-1]
+            else:
+                # Fallback to extracting from device_path
+                battery_name = (
+                    device_path.split("_")[-1] if "_" in device_path else "BAT"
                 )
-                # Extract battery name from device path (e.g., /org/freedesktop/UPower/devices/battery_BAT0)
-                # Use native name like BAT0/BAT1 instead of manufacturer model name
-                try:
-                    native_path = device_properties.Get(
-                        "org.freedesktop.UPower.Device", "NativePath"
-                    )
-                    # NativePath is typically /sys/devices/.../BAT0 or BAT1
-                    battery_name = native_path.split("/")[-1]
-                except Exception:
-                    # Fallback to extracting from device_path
-                    battery_name = (
-                        device_path.split("_")[-1] if "_" in device_path else "BAT"
-                    )
-
-                capacities[battery_name] = capacity
+            cycles = int(props.get("ChargeCycles", -1))
+            full_wh = float(props.get("EnergyFull", 0))
+            design_wh = float(props.get("EnergyFullDesign", 0))
+            batteries[battery_name] = {
+                # display number should be an int, but float always has something after the decimal e.g. "80.0"
+                "capacity": int(round(float(props.get("Capacity", 0)), 0)),
+                "cycle_count": cycles if cycles >= 0 else None,
+                "status": UPOWER_STATES.get(int(props.get("State", 0)), "Unknown"),
+                "energy_full_wh": round(full_wh, 2) if full_wh else None,
+                "energy_full_design_wh": round(design_wh, 2) if design_wh else None,
+            }
 
-        return capacities
+        return batteries
 
     # Checks to see if registered with Landscape
     def is_registered(self):
         val = False
         if not os.environ["USER"] in ["osload", "finaltest", "owner"]:
-            if os.path.isfile("/etc/landscape/client.conf") and os.access(
-                "/etc/landscape/client.conf", os.R_OK
-            ):
+            if self.file_exists_and_readable("/etc/landscape/client.conf"):
                 command = ["landscape-config", "--is-registered"]
             else:
                 command = ["pkexec", "landscape-config", "--is-registered"]
         else:
             command = ["sudo", "landscape-config", "--is-registered"]
         try:
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            result = probe_io.run(command, capture_output=True, text=True, check=True)
             val = result.returncode == 0
         except:
             pass
@@ -771,28 +976,29 @@ class Utils:
             "--script-users=ALL",
             "--access-group=global",
         ]
-        thread = threading.Thread(
-            target=self._run_subprocess,
-            args=(command, label, button, spinner, next_func),
+
+        def _on_done(result):
+            stdout, stderr, registered = result
+            self._update_label(label, stdout, stderr)
+            self._finish_run_subprocess(registered, label, button, spinner, next_func)
+
+        get_executor().submit(
+            "landscape-register", self._run_subprocess, command, on_done=_on_done
         )
-        thread.start()
 
-    def _run_subprocess(
-        self, command, label=None, button=None, spinner=None, next_func=None
-    ):
+    def _run_subprocess(self, token, command):
+        # Runs on an executor thread; the registration re-check runs here too
+        # so the main loop never blocks on landscape-config.
         print("Utils:_run_subprocess")
         try:
             process = subprocess.Popen(
                 command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
             )
             stdout, stderr = process.communicate()
-            GLib.idle_add(self._update_label, label, stdout.decode(), stderr.decode())
+            stdout, stderr = stdout.decode(), stderr.decode()
         except Exception as e:
-            GLib.idle_add(_update_label, label, f"Error: {e}", "")
-        finally:
-            GLib.idle_add(
-                self._finish_run_subprocess, label, button, spinner, next_func
-            )
+            stdout, stderr = f"Error: {e}", ""
+        return stdout, stderr, self.is_registered()
 
     def _update_label(self, label, stdout, stderr):
         print("Utils:_update_label: " + stdout)
@@ -806,11 +1012,11 @@ class Utils:
         return False
 
     def _finish_run_subprocess(
-        self, label=None, button=None, spinner=None, next_func=None
+        self, registered, label=None, button=None, spinner=None, next_func=None
     ):
         print("Utils:_finish_run_subprocess")
         if button:
-            if self.is_registered():
+            if registered:
                 button.set_sensitive(False)
                 if next_func:
                     next_func()
@@ -831,10 +1037,10 @@ class Utils:
             pass
 
     def file_exists_and_readable(self, filepath):
-        return os.path.isfile(filepath) and os.access(filepath, os.R_OK)
+        return probe_io.isfile(filepath) and probe_io.readable(filepath)
 
     def file_exists_and_executable(self, filepath):
-        return os.path.isfile(filepath) and os.access(filepath, os.X_OK)
+        return probe_io.isfile(filepath) and probe_io.executable(filepath)
 
     # Perform reset
     def complete_reset(self, stage):
@@ -862,20 +1068,20 @@ class Utils:
         if "hp" in self.vendor.lower():
             print("Vendor is HP")
             try:
-                with open(
-                    "/sys/firmware/efi/efivars/HP_TAGS-fb3b9ece-4aba-4933-b49d-b4d67d892351",
-                    "r",
-                ) as f:
-                    asset_tag = f.readline().strip()
+                hp_tags = probe_io.read_text(HP_TAGS_EFIVAR_PATH)
+                asset_tag = hp_tags.split("\n", 1)[0].strip()
             except Exception as e:
                 print(f"Could not read HP asset tag: {e}")
         elif "dell" in self.vendor.lower():
             print("Vendor is Dell")
-            if self.file_exists_and_executable("/opt/dell/dcc/cctk") and os.environ[
+            index = self.firmware_attributes()
+            if index.has("Asset"):
+                asset_tag = index.value("Asset")
+            elif self.file_exists_and_executable("/opt/dell/dcc/cctk") and os.environ[
                 "USER"
             ] in ["osload", "finaltest", "ubuntu"]:
                 try:
-                    result = subprocess.run(
+                    result = probe_io.run(
                         ["/opt/dell/dcc/cctk", "--Asset"],
                         capture_output=True,
                         text=True,
@@ -894,8 +1100,8 @@ class Utils:
     def get_chassis_type():
         """Read chassis type from DMI and map to device type."""
         try:
-            with open("/sys/devices/virtual/dmi/id/chassis_type", "r") as f:
-                chassis_num = int(f.read().strip())
+            chassis_type = probe_io.read_text("/sys/devices/virtual/dmi/id/chassis_type")
+            chassis_num = int(chassis_type.strip())
             return CHASSIS_TYPE_MAP.get(chassis_num)
         except (IOError, ValueError):
             return None
@@ -911,48 +1117,54 @@ class Utils:
         absolute axis bitmap, confirming multitouch capability.
         """
         try:
-            with open("/proc/bus/input/devices", "r") as f:
-                content = f.read()
-            for block in content.split("\n\n"):
-                lines = block.splitlines()
-
-                name_line = [l for l in lines if l.startswith("N: Name=")]
-                name = name_line[0] if name_line else ""
-                print(f"touchscreen detection: checking device: {name}")
-
-                # Check INPUT_PROP_DIRECT (bit 1) to distinguish
-                # touchscreens from touchpads
-                prop_lines = [l for l in lines if l.startswith("B: PROP=")]
-                if prop_lines:
-                    prop_val = int(
-                        prop_lines[0].split("=", 1)[1].strip(), 16
-                    )
-                else:
-                    prop_val = 0
-                is_direct = bool(prop_val & (1 << 1))
-
-                if not is_direct:
-                    continue
-
-                # Check for multitouch absolute axis (ABS_MT_POSITION_X = 53)
-                abs_lines = [l for l in lines if l.startswith("B: ABS=")]
-                if abs_lines:
-                    hex_parts = abs_lines[0].split("=", 1)[1].strip().split()
-                    # Bitmap is printed in chunks from high to low bits;
-                    # reconstruct full value
-                    abs_bitmap = int("".join(hex_parts), 16)
-                    if abs_bitmap & (1 << 53):
-                        print(
-                            f"touchscreen detection: matched by "
-                            f"INPUT_PROP_DIRECT + ABS_MT_POSITION_X: "
-                            f"{name}"
-                        )
-                        return True
+            content = probe_io.read_text("/proc/bus/input/devices")
+            if Utils._input_devices_have_touchscreen(content):
+                return True
         except OSError as e:
             print(f"touchscreen detection: error reading input devices: {e}")
         print("touchscreen detection: no touchscreen found")
         return False
 
+    @staticmethod
+    def _input_devices_have_touchscreen(content):
+        """True if /proc/bus/input/devices text lists a touchscreen."""
+        for block in content.split("\n\n"):
+            lines = block.splitlines()
+
+            name_line = [l for l in lines if l.startswith("N: Name=")]
+            name = name_line[0] if name_line else ""
+            print(f"touchscreen detection: checking device: {name}")
+
+            # Check INPUT_PROP_DIRECT (bit 1) to distinguish
+            # touchscreens from touchpads
+            prop_lines = [l for l in lines if l.startswith("B: PROP=")]
+            if prop_lines:
+                prop_val = int(
+                    prop_lines[0].split("=", 1)[1].strip(), 16
+                )
+            else:
+                prop_val = 0
+            is_direct = bool(prop_val & (1 << 1))
+
+            if not is_direct:
+                continue
+
+            # Check for multitouch absolute axis (ABS_MT_POSITION_X = 53)
+            abs_lines = [l for l in lines if l.startswith("B: ABS=")]
+            if abs_lines:
+                hex_parts = abs_lines[0].split("=", 1)[1].strip().split()
+                # Bitmap is printed in chunks from high to low bits;
+                # reconstruct full value
+                abs_bitmap = int("".join(hex_parts), 16)
+                if abs_bitmap & (1 << 53):
+                    print(
+                        f"touchscreen detection: matched by "
+                        f"INPUT_PROP_DIRECT + ABS_MT_POSITION_X: "
+                        f"{name}"
+                    )
+                    return True
+        return False
+
     KRAMDEN_EFIVAR_GUID = "9a8e2042-75d4-4d70-9890-6a8437367c1f"
     KRAMDEN_EFIVAR_PATH = (
         f"/sys/firmware/efi/efivars/KramdenNumber-{KRAMDEN_EFIVAR_GUID}"
@@ -962,8 +1174,7 @@ class Utils:
     def read_kramden_number_efivar():
         """Read the KramdenNumber EFI variable, if it exists."""
         try:
-            with open(Utils.KRAMDEN_EFIVAR_PATH, "rb") as f:
-                data = f.read()
+            data = probe_io.read_bytes(Utils.KRAMDEN_EFIVAR_PATH)
             # First 4 bytes are EFI variable attributes
             value = data[4:].decode("utf-8").strip("\x00").strip()
             return value if value else None
@@ -0,0 +1,189 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import block_devices
+
+
+class TestBlockDevices(unittest.TestCase):
+    """scan() against a fake /sys and udev database."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sys_root = os.path.join(self.tmpdir.name, "sys")
+        self.udev_dir = os.path.join(self.tmpdir.name, "udev")
+        os.makedirs(os.path.join(self.sys_root, "block"))
+        os.makedirs(self.udev_dir)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mode = "wb" if isinstance(content, bytes) else "w"
+        with open(path, mode) as f:
+            f.write(content)
+
+    def _add_disk(self, name, device_path, attrs=None, device_attrs=None, udev=None):
+        """Create /sys/devices/<device_path>/block/<name> and link it from
+        /sys/block, like the kernel does."""
+        device_dir = os.path.join(self.sys_root, "devices", device_path)
+        disk_dir = os.path.join(device_dir, "block", name)
+        defaults = {
+            "size": "1000215216",
+            "removable": "0",
+            "dev": f"8:{len(os.listdir(os.path.join(self.sys_root, 'block'))) * 16}",
+            "queue/rotational": "0",
+            "queue/logical_block_size": "512",
+            "queue/discard_max_bytes": "2147450880",
+            "queue/write_zeroes_max_bytes": "0",
+        }
+        defaults.update(attrs or {})
+        for attr, value in defaults.items():
+            self._write(os.path.join(disk_dir, attr), value + "\n")
+        os.symlink(device_dir, os.path.join(disk_dir, "device"))
+        for attr, value in (device_attrs or {}).items():
+            self._write(os.path.join(device_dir, attr), value)
+        if udev:
+            self._write(
+                os.path.join(self.udev_dir, f"b{defaults['dev']}"),
+                "".join(f"E:{k}={v}\n" for k, v in udev.items()),
+            )
+        os.symlink(disk_dir, os.path.join(self.sys_root, "block", name))
+
+    def _scan(self):
+        return {d["name"]: d for d in block_devices.scan(self.sys_root, self.udev_dir)}
+
+    def test_sata_disk(self):
+        self._add_disk(
+            "sda",
+            "pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0",
+            device_attrs={"model": "Samsung SSD 860 EVO 500GB\n"},
+            udev={"ID_SERIAL_SHORT": "S3Z1NB0K123456A", "ID_BUS": "ata"},
+        )
+        sda = self._scan()["sda"]
+        self.assertEqual(sda["path"], "/dev/sda")
+        self.assertEqual(sda["transport"], "sata")
+        self.assertFalse(sda["rotational"])
+        self.assertEqual(sda["size"], 1000215216 * 512)
+        self.assertEqual(sda["model"], "Samsung SSD 860 EVO 500GB")
+        self.assertEqual(sda["serial"], "S3Z1NB0K123456A")
+        self.assertFalse(sda["removable"])
+        self.assertEqual(sda["controller"], "0000:00:17.0")
+        self.assertEqual(sda["bus"], "pci0000:00/0000:00:17.0/ata1")
+        self.assertEqual(sda["erase"]["methods"], ["ata-sanitize", "ata-security-erase"])
+        self.assertTrue(sda["erase"]["discard"])
+        self.assertFalse(sda["erase"]["write_zeroes"])
+        self.assertEqual(block_devices.drive_type(sda), "SATA SSD")
+
+    def test_nvme_disk_reads_controller_attributes(self):
+        self._add_disk(
+            "nvme0n1",
+            "pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0",
+            attrs={"queue/write_zeroes_max_bytes": "131072"},
+            device_attrs={"model": "PC SN730 NVMe WDC 512GB\n", "serial": "20123A456789\n"},
+        )
+        nvme = self._scan()["nvme0n1"]
+        self.assertEqual(nvme["transport"], "nvme")
+        self.assertEqual(nvme["serial"], "20123A456789")
+        self.assertEqual(nvme["controller"], "0000:3d:00.0")
+        self.assertEqual(nvme["bus"], "pci0000:00/0000:00:1d.0/0000:3d:00.0")
+        self.assertEqual(nvme["erase"]["methods"], ["nvme-format"])
+        self.assertTrue(nvme["erase"]["write_zeroes"])
+        self.assertEqual(block_devices.drive_type(nvme), "NVMe")
+
+    def test_usb_disk(self):
+        self._add_disk(
+            "sdb",
+            "pci0000:00/0000:00:14.0/usb2/2-1/2-1:1.0/host2/target2:0:0/2:0:0:0",
+            attrs={"removable": "1", "queue/rotational": "1"},
+            udev={"ID_MODEL": "Ultra_USB_3.0"},
+        )
+        sdb = self._scan()["sdb"]
+        self.assertEqual(sdb["transport"], "usb")
+        self.assertEqual(sdb["bus"], "pci0000:00/0000:00:14.0/usb2")
+        self.assertTrue(sdb["removable"])
+        self.assertEqual(sdb["model"], "Ultra USB 3.0")
+        self.assertEqual(sdb["erase"]["methods"], [])
+        self.assertEqual(block_devices.drive_type(sdb), "SATA HDD")
+
+    def test_shared_bus(self):
+        # Two drives behind a port multiplier on ata3, two on one SAS HBA
+        ahci = "pci0000:00/0000:00:17.0"
+        hba = "pci0000:00/0000:00:01.0/0000:01:00.0/host5"
+        self._add_disk("sda", f"{ahci}/ata3/link3.0/host2/target2:0:0/2:0:0:0")
+        self._add_disk("sdb", f"{ahci}/ata3/link3.1/host2/target2:1:0/2:1:0:0")
+        self._add_disk("sdc", f"{ahci}/ata4/host3/target3:0:0/3:0:0:0")
+        self._add_disk("sdd", f"{hba}/port-5:0/end_device-5:0/target5:0:0/5:0:0:0")
+        self._add_disk("sde", f"{hba}/port-5:1/end_device-5:1/target5:0:1/5:0:1:0")
+        buses = {name: d["bus"] for name, d in self._scan().items()}
+        self.assertEqual(buses["sda"], buses["sdb"])
+        self.assertNotEqual(buses["sda"], buses["sdc"])
+        self.assertEqual(buses["sdd"], hba)
+        self.assertEqual(buses["sdd"], buses["sde"])
+
+    def test_vpd_serial_fallback(self):
+        self._add_disk(
+            "sda",
+            "pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0",
+            device_attrs={"vpd_pg80": b"\x00\x80\x00\x10    WD-WCC4N1234567\x00"},
+        )
+        self.assertEqual(self._scan()["sda"]["serial"], "WD-WCC4N1234567")
+
+    def test_unknown_media_type(self):
+        self._add_disk(
+            "sda",
+            "pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0",
+            attrs={"queue/rotational": ""},
+        )
+        sda = self._scan()["sda"]
+        self.assertIsNone(sda["rotational"])
+        self.assertEqual(block_devices.drive_type(sda), "SATA")
+
+    def test_skips_virtual_and_device_mapper(self):
+        self._add_disk("sda", "pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0")
+        for name in ("loop0", "zram0", "sr0", "dm-0", "md0"):
+            self._add_disk(name, f"virtual/block/{name}")
+        # A disk that device-mapper has claimed a name for
+        self._add_disk(
+            "sdc",
+            "pci0000:00/0000:00:17.0/ata3/host2/target2:0:0/2:0:0:0",
+            attrs={"dm/name": "vg-lv"},
+        )
+        self.assertEqual(list(self._scan()), ["sda"])
+
+    def test_in_use(self):
+        for name in ("sda", "sdb", "sdc", "sdd"):
+            self._add_disk(name, f"pci0000:00/0000:00:17.0/ata1/{name}")
+            disk_dir = os.path.join(self.sys_root, "block", name)
+            self._write(os.path.join(disk_dir, f"{name}1", "partition"), "1\n")
+            os.makedirs(os.path.join(disk_dir, "holders"))
+            os.makedirs(os.path.join(disk_dir, f"{name}1", "holders"))
+        # sda1 is mounted, sdb is swap, an LVM volume holds sdc1
+        mounts = os.path.join(self.tmpdir.name, "mounts")
+        swaps = os.path.join(self.tmpdir.name, "swaps")
+        self._write(mounts, "/dev/sda1 / ext4 rw 0 0\nproc /proc proc rw 0 0\n")
+        self._write(swaps, "Filename Type Size Used Priority\n/dev/sdb partition 8 0 -2\n")
+        os.makedirs(
+            os.path.join(self.sys_root, "block", "sdc", "sdc1", "holders", "dm-0")
+        )
+        in_use = {
+            name: block_devices.in_use(name, self.sys_root, mounts, swaps)
+            for name in ("sda", "sdb", "sdc", "sdd")
+        }
+        self.assertEqual(
+            in_use, {"sda": True, "sdb": True, "sdc": True, "sdd": False}
+        )
+
+    def test_missing_sys_block(self):
+        self.assertEqual(
+            block_devices.scan(os.path.join(self.tmpdir.name, "nope"), self.udev_dir),
+            [],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import dpkg_status
+
+STATUS = """\
+Package: git
+Status: install ok installed
+Priority: optional
+Architecture: amd64
+Version: 1:2.43.0-1ubuntu7
+Description: fast, scalable, distributed revision control system
+ Git is popular version control system designed to handle very large
+ Package: not-a-stanza
+
+Package: oldpkg
+Status: deinstall ok config-files
+Architecture: amd64
+Version: 1.0
+Conffiles:
+ /etc/oldpkg.conf 0123456789abcdef
+
+Package: libc6
+Status: install ok installed
+Architecture: i386
+Multi-Arch: same
+Version: 2.39-0ubuntu8
+
+Package: libc6
+Status: install ok installed
+Architecture: amd64
+Multi-Arch: same
+Version: 2.39-0ubuntu8.3
+
+Package: half
+Status: install reinstreq half-configured
+Architecture: all
+Version: 0.1
+"""
+
+
+class TestParseStatus(unittest.TestCase):
+    def test_installed_packages_and_versions(self):
+        installed = dpkg_status.parse_status(STATUS.splitlines(keepends=True))
+        self.assertEqual(installed["git"], "1:2.43.0-1ubuntu7")
+        self.assertEqual(installed["git:amd64"], "1:2.43.0-1ubuntu7")
+        self.assertNotIn("oldpkg", installed)
+        self.assertNotIn("not-a-stanza", installed)
+        # The last stanza has no trailing blank line
+        self.assertEqual(installed["half"], "0.1")
+
+    def test_multiarch(self):
+        installed = dpkg_status.parse_status(STATUS.splitlines(keepends=True))
+        self.assertEqual(installed["libc6"], "2.39-0ubuntu8")
+        self.assertEqual(installed["libc6:i386"], "2.39-0ubuntu8")
+        self.assertEqual(installed["libc6:amd64"], "2.39-0ubuntu8.3")
+
+
+class TestDpkgStatus(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+        self.write(STATUS)
+
+    def write(self, text, mtime=None):
+        with open(self.path, "w") as f:
+            f.write(text)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_check_and_versions(self):
+        status = dpkg_status.DpkgStatus(self.path)
+        self.assertEqual(
+            status.check(["git", "oldpkg", "vim"]),
+            {"git": True, "oldpkg": False, "vim": False},
+        )
+        self.assertEqual(
+            status.versions(["libc6:amd64", "vim"]),
+            {"libc6:amd64": "2.39-0ubuntu8.3", "vim": None},
+        )
+
+    def test_reparsed_only_when_file_changes(self):
+        status = dpkg_status.DpkgStatus(self.path)
+        with patch("dpkg_status.parse_status", wraps=dpkg_status.parse_status) as parse:
+            status.check(["git"])
+            status.check(["git"])
+            self.assertEqual(parse.call_count, 1)
+            self.write("Package: vim\nStatus: install ok installed\nVersion: 2\n", 1)
+            self.assertEqual(status.check(["git", "vim"]), {"git": False, "vim": True})
+            self.assertEqual(parse.call_count, 2)
+
+    def test_missing_status_file(self):
+        status = dpkg_status.DpkgStatus(self.path + ".missing")
+        self.assertEqual(status.check(["git"]), {"git": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
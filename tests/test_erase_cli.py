@@ -0,0 +1,195 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_cli
+import erase_engine
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "src")
+
+
+def _drive(path, serial):
+    return {
+        "path": path,
+        "type": "NVMe" if "nvme" in path else "SATA",
+        "size": "238.5 GB",
+        "model": "Test Drive",
+        "serial": serial,
+        "transport": "nvme" if "nvme" in path else "sata",
+        "controller": "0000:00:17.0",
+        "erase": {"methods": [], "discard": True, "write_zeroes": False},
+    }
+
+
+DRIVES = [
+    _drive("/dev/sda", "A1"),
+    _drive("/dev/sdb", "B2"),
+    _drive("/dev/nvme0n1", "N3"),
+]
+
+
+class NotATerminal(io.StringIO):
+    def isatty(self):
+        return False
+
+
+class TestEraseCli(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            patch.object(erase_engine, "detect_drives", return_value=list(DRIVES)),
+            # sda holds the running system
+            patch.object(
+                erase_cli.block_devices, "in_use", side_effect=lambda n: n == "sda"
+            ),
+            patch.object(erase_engine.time, "sleep"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, argv, stdin=None):
+        args = erase_cli.parse_args(argv)
+        out = io.StringIO()
+        reporter = erase_cli.Reporter(out, json_lines=args.json)
+        with redirect_stdout(io.StringIO()), patch("sys.stderr", io.StringIO()):
+            status = erase_cli.run(args, reporter, stdin=stdin or NotATerminal())
+        return status, out.getvalue()
+
+    def test_json_lines_test_mode(self):
+        status, out = self._run(["--yes", "--test", "--json"])
+        self.assertEqual(status, erase_cli.EXIT_OK)
+        events = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(events[0]["event"], "drives")
+        paths = [d["path"] for d in events[0]["drives"]]
+        self.assertEqual(paths, ["/dev/sdb", "/dev/nvme0n1"])
+        self.assertEqual(events[0]["in_use"], ["/dev/sda"])
+        results = {e["path"]: e for e in events if e["event"] == "result"}
+        self.assertEqual(set(results), {"/dev/sdb", "/dev/nvme0n1"})
+        self.assertTrue(all(r["success"] for r in results.values()))
+        self.assertIn("[TEST] Would verify", results["/dev/sdb"]["message"])
+        self.assertIn("progress", {e["event"] for e in events})
+        self.assertEqual(events[-1]["event"], "summary")
+        self.assertEqual(events[-1]["succeeded"], 2)
+
+    def test_selected_drive_and_text_output(self):
+        status, out = self._run(["--yes", "--test", "--no-verify", "/dev/nvme0n1"])
+        self.assertEqual(status, erase_cli.EXIT_OK)
+        self.assertIn("/dev/nvme0n1: OK: [TEST] Would erase NVMe drive", out)
+        self.assertNotIn("/dev/sdb", out)
+        self.assertIn("1 of 1 drives erased, 0 failed", out)
+
+    def test_unknown_or_busy_drive(self):
+        status, _ = self._run(["--yes", "/dev/sdz"])
+        self.assertEqual(status, erase_cli.EXIT_NOTHING_DONE)
+        status, out = self._run(["--yes", "--json", "/dev/sda"])
+        self.assertEqual(status, erase_cli.EXIT_NOTHING_DONE)
+        self.assertEqual(json.loads(out)["drives"], [])
+
+    def test_needs_confirmation_without_yes(self):
+        status, out = self._run(["--test", "--json"])
+        self.assertEqual(status, erase_cli.EXIT_NOTHING_DONE)
+        events = [json.loads(line)["event"] for line in out.splitlines()]
+        self.assertEqual(events, ["drives"])
+
+    def test_frozen_policies(self):
+        frozen_plan = (["ata-security-erase"], {"security": {"frozen": True}})
+        thawed_plan = (["ata-security-erase"], {"security": {"frozen": False}})
+        plans = {"/dev/sdb": [frozen_plan, thawed_plan], "/dev/nvme0n1": [None]}
+        calls = []
+
+        def preflight(drive, test_mode):
+            return plans[drive["path"]].pop(0)
+
+        def erase_drive(drive, test_mode, on_progress, cancel, plan, host_io):
+            calls.append((drive["path"], plan))
+            return True, f"Erased {drive['path']}", None, "ata-security-erase"
+
+        argv = ["--yes", "--json", "--no-verify", "--frozen=suspend"]
+        with patch.object(
+            erase_engine, "preflight", side_effect=preflight
+        ), patch.object(
+            erase_engine, "erase_drive", side_effect=erase_drive
+        ), patch.object(
+            erase_engine, "suspend_to_unfreeze"
+        ) as suspend:
+            status, out = self._run(argv)
+        self.assertEqual(status, erase_cli.EXIT_OK)
+        suspend.assert_called_once()
+        frozen = [json.loads(line) for line in out.splitlines() if '"frozen"' in line]
+        self.assertEqual(frozen[0]["paths"], ["/dev/sdb"])
+        # The erase runs with the plan re-read after resume
+        self.assertIn(("/dev/sdb", thawed_plan), calls)
+
+        with patch.object(erase_engine, "preflight", return_value=frozen_plan):
+            status, out = self._run(["--yes", "--json", "--frozen=skip"])
+        self.assertEqual(status, erase_cli.EXIT_FAILED)
+        results = [json.loads(line) for line in out.splitlines() if '"result"' in line]
+        self.assertTrue(all(r["message"].startswith("Skipped") for r in results))
+
+    def test_crypto_erase_not_pattern_verified(self):
+        # A crypto-erased drive reads back as random data
+        unverified = {
+            "verified": False,
+            "complete": True,
+            "samples": 4603,
+            "mismatch_count": 4603,
+            "mismatches": [0],
+            "coverage": 0.001,
+            "throughput": 1e9,
+        }
+        plans = {
+            "/dev/nvme0n1": (["nvme-sanitize-crypto"], {}),
+            "/dev/sdb": (["sanitize-block"], {}),
+        }
+        methods = {
+            "nvme-sanitize-crypto": lambda path, caps, progress: (True, None),
+            "sanitize-block": lambda path, caps, progress: (True, None),
+        }
+        with patch.object(
+            erase_engine, "preflight", side_effect=lambda d, t: plans[d["path"]]
+        ), patch.dict(erase_engine.ERASE_METHODS, methods), patch.object(
+            erase_engine.erase_verify, "verify_privileged", return_value=unverified
+        ) as verify:
+            status, out = self._run(["--yes", "--json"])
+        results = {
+            r["path"]: r
+            for r in map(json.loads, out.splitlines())
+            if r["event"] == "result"
+        }
+        self.assertTrue(results["/dev/nvme0n1"]["success"])
+        self.assertIn("not applicable", results["/dev/nvme0n1"]["message"])
+        # Block erases are still sampled, and random data there is a failure
+        verify.assert_called_once()
+        self.assertEqual(verify.call_args[0][0], "/dev/sdb")
+        self.assertFalse(results["/dev/sdb"]["success"])
+        self.assertEqual(status, erase_cli.EXIT_FAILED)
+
+    def test_progress_throttled(self):
+        out = io.StringIO()
+        reporter = erase_cli.Reporter(out, json_lines=True)
+        for i in range(10):
+            reporter.progress("/dev/sdb", i / 10, None, "Erasing")
+        reporter.progress("/dev/sdb", 1.0, None, "Done")
+        lines = out.getvalue().splitlines()
+        fractions = [json.loads(line)["fraction"] for line in lines]
+        self.assertEqual(fractions, [0.0, 1.0])
+
+    def test_importable_without_gtk(self):
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, erase_cli; print('gi' in sys.modules)"],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_overwrite
+import erase_verify
+from erase_overwrite import OverwriteEngine
+
+MIB = 1024 * 1024
+BLOCK = 256 * 1024
+
+
+class TestOverwriteEngine(unittest.TestCase):
+    """OverwriteEngine against image files standing in for drives."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.tmpdir.name, "cache", "overwrite.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _image(self, size, fill=b"\xaa"):
+        path = os.path.join(self.tmpdir.name, "drive.img")
+        with open(path, "wb") as f:
+            f.write(fill * size)
+        return path
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_zero_overwrite(self):
+        path = self._image(16 * MIB)
+        progress = []
+        with redirect_stdout(io.StringIO()):
+            result = OverwriteEngine(
+                path,
+                block_size=BLOCK,
+                writers=4,
+                on_progress=lambda *args: progress.append(args),
+            ).run()
+        self.assertTrue(result["complete"])
+        self.assertIsNone(result["error"])
+        self.assertEqual(result["bytes_written"], 16 * MIB)
+        self.assertEqual(self._read(path), bytes(16 * MIB))
+        fraction, eta, text = progress[-1]
+        self.assertEqual(fraction, 1.0)
+        self.assertIn("MB/s", text)
+        self.assertTrue(erase_verify.verify(path, seed=1)["verified"])
+
+    def test_unaligned_tail(self):
+        # Images need not be a whole number of blocks or direct-I/O aligned
+        path = self._image(3 * BLOCK + 4096 + 100)
+        result = OverwriteEngine(path, block_size=BLOCK).run()
+        self.assertTrue(result["complete"])
+        self.assertEqual(self._read(path), bytes(3 * BLOCK + 4096 + 100))
+
+    def test_random_passes_with_verify(self):
+        path = self._image(4 * MIB, fill=b"\x00")
+        with redirect_stdout(io.StringIO()):
+            result = OverwriteEngine(
+                path, pattern="random", passes=2, block_size=BLOCK, verify=True
+            ).run()
+        self.assertTrue(result["complete"])
+        self.assertTrue(result["verified"])
+        self.assertEqual(result["bytes_written"], 2 * 4 * MIB)
+        data = self._read(path)
+        self.assertFalse(erase_verify.is_deterministic(data[:BLOCK]))
+        # The reusable buffer is written to every block
+        self.assertEqual(data[BLOCK : 2 * BLOCK], data[:BLOCK])
+
+    def test_verify_detects_failed_write(self):
+        path = self._image(2 * MIB)
+        engine = OverwriteEngine(path, block_size=BLOCK, verify=True)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(engine.run()["verified"])
+            with open(path, "r+b") as f:
+                f.write(b"\xaa" * 512)
+            self.assertFalse(engine._verify(2 * MIB))
+
+    def test_cancel_and_resume(self):
+        path = self._image(16 * MIB)
+        cancel = threading.Event()
+
+        def on_progress(fraction, eta, text):
+            if fraction and fraction > 0.2:
+                cancel.set()
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            engine = OverwriteEngine(
+                path,
+                block_size=BLOCK,
+                writers=1,
+                checkpoint_path=self.checkpoint,
+                on_progress=on_progress,
+                cancel=cancel,
+            )
+            # Slow the writes down so the cancel lands mid-pass
+            original_pwritev = os.pwritev
+
+            def slow_pwritev(*args):
+                time.sleep(0.01)
+                return original_pwritev(*args)
+
+            with patch("os.pwritev", slow_pwritev), patch.object(
+                erase_overwrite, "PROGRESS_INTERVAL", 0.02
+            ):
+                first = engine.run()
+        self.assertFalse(first["complete"])
+        self.assertIn("cancelled", erase_overwrite.describe(first))
+        with open(self.checkpoint) as f:
+            checkpoint = json.load(f)
+        offset = checkpoint["offset"]
+        self.assertGreater(offset, 0)
+        self.assertLess(offset, 16 * MIB)
+        self.assertEqual(offset % BLOCK, 0)
+        data = self._read(path)
+        self.assertEqual(data[:offset], bytes(offset))
+        self.assertEqual(data[-BLOCK:], b"\xaa" * BLOCK)
+
+        with redirect_stdout(out):
+            second = OverwriteEngine(
+                path, block_size=BLOCK, checkpoint_path=self.checkpoint
+            ).run()
+        self.assertTrue(second["complete"])
+        self.assertEqual(second["resumed_from"], {"pass": 0, "offset": offset})
+        self.assertEqual(second["bytes_written"], 16 * MIB - offset)
+        self.assertIn("resuming", out.getvalue())
+        self.assertEqual(self._read(path), bytes(16 * MIB))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_mismatched_checkpoint_ignored(self):
+        path = self._image(2 * MIB)
+        os.makedirs(os.path.dirname(self.checkpoint))
+        with open(self.checkpoint, "w") as f:
+            json.dump({"version": 1, "size": 999, "pass": 0, "offset": MIB}, f)
+        with redirect_stdout(io.StringIO()):
+            result = OverwriteEngine(
+                path, block_size=BLOCK, checkpoint_path=self.checkpoint
+            ).run()
+        self.assertIsNone(result["resumed_from"])
+        self.assertEqual(result["bytes_written"], 2 * MIB)
+
+    def test_checkpoint_from_another_boot_ignored(self):
+        # The drive may have been reimaged since; nothing below the
+        # checkpointed offset can be trusted
+        path = self._image(2 * MIB)
+
+        def run(boot_id):
+            engine = OverwriteEngine(
+                path,
+                block_size=BLOCK,
+                checkpoint_path=self.checkpoint,
+                boot_id=boot_id,
+            )
+            engine._save_checkpoint(2 * MIB, 0, MIB)
+            with redirect_stdout(io.StringIO()):
+                return OverwriteEngine(
+                    path,
+                    block_size=BLOCK,
+                    checkpoint_path=self.checkpoint,
+                    boot_id="boot-b",
+                ).run()
+
+        self.assertIsNone(run("boot-a")["resumed_from"])
+        self.assertEqual(run("boot-b")["resumed_from"], {"pass": 0, "offset": MIB})
+
+    def test_privileged_creates_checkpoint_dir_first(self):
+        # Left to the root child, the directory would be owned by root
+        with patch("os.access", return_value=False), patch.object(
+            erase_overwrite.subprocess, "Popen", side_effect=OSError("no sudo")
+        ):
+            with self.assertRaises(OSError):
+                erase_overwrite.overwrite_privileged(
+                    "/dev/sdz", checkpoint_path=self.checkpoint
+                )
+        self.assertTrue(os.path.isdir(os.path.dirname(self.checkpoint)))
+
+    def test_rejects_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            OverwriteEngine("/dev/null", pattern="ones")
+        with self.assertRaises(ValueError):
+            OverwriteEngine("/dev/null", block_size=1000)
+
+    def test_checkpoint_path_for_drive(self):
+        path = erase_overwrite.checkpoint_path_for(
+            {"path": "/dev/sdb", "serial": "WD-ABC 123/4"}
+        )
+        self.assertTrue(path.endswith("overwrite-WD-ABC_123_4.json"))
+        path = erase_overwrite.checkpoint_path_for({"path": "/dev/sdb", "serial": ""})
+        self.assertTrue(path.endswith("overwrite-sdb.json"))
+
+    def test_cli_json_output(self):
+        path = self._image(2 * MIB)
+        out = io.StringIO()
+        with redirect_stdout(out), patch("signal.signal"):
+            status = erase_overwrite.main(
+                ["--json", "--block-size", str(BLOCK), "--verify", path]
+            )
+        self.assertEqual(status, 0)
+        kind, _, payload = out.getvalue().splitlines()[-1].partition(" ")
+        self.assertEqual(kind, "result")
+        result = json.loads(payload)
+        self.assertTrue(result["complete"])
+        self.assertTrue(result["verified"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_planner
+from erase_planner import parse_hdparm_capabilities, parse_nvme_capabilities, plan
+
+HDPARM_I = """\
+
+/dev/sda:
+
+ATA device, with non-removable media
+\tModel Number:       Samsung SSD 860 EVO 500GB
+Commands/features:
+\tEnabled\tSupported:
+\t   *\tSMART feature set
+\t   *\tSANITIZE feature set
+\t   *\tCRYPTO_SCRAMBLE_EXT command
+\t   *\tBLOCK_ERASE_EXT command
+Security:
+\tMaster password revision code = 65534
+\t\tsupported
+\tnot\tenabled
+\tnot\tlocked
+\tnot\tfrozen
+\tnot\texpired: security count
+\t\tsupported: enhanced erase
+\t2min for SECURITY ERASE UNIT. 8min for ENHANCED SECURITY ERASE UNIT.
+Logical Unit WWN Device Identifier: 5002538e40000000
+"""
+
+HDPARM_I_OLD_HDD = """\
+
+/dev/sda:
+Commands/features:
+\tEnabled\tSupported:
+\t   *\tSMART feature set
+Security:
+\tMaster password revision code = 65534
+\t\tsupported
+\tnot\tenabled
+\tnot\tlocked
+\t\tfrozen
+\tnot\texpired: security count
+\tnot\tsupported: enhanced erase
+\t104min for SECURITY ERASE UNIT.
+Checksum: correct
+"""
+
+
+def _nvme(oacs=0x17, sanicap=0x3, fna=0x4, flbas=0, log=None):
+    return parse_nvme_capabilities(
+        json.dumps({"oacs": oacs, "sanicap": sanicap, "fna": fna}),
+        json.dumps({"flbas": flbas}),
+        json.dumps(log or {}),
+    )
+
+
+class TestHdparmCapabilities(unittest.TestCase):
+    def test_sanitize_and_security(self):
+        caps = parse_hdparm_capabilities(HDPARM_I)
+        self.assertEqual(
+            caps["sanitize"], {"crypto": True, "block": True, "overwrite": False}
+        )
+        security = caps["security"]
+        self.assertTrue(security["supported"])
+        self.assertTrue(security["enhanced"])
+        self.assertFalse(security["frozen"])
+        self.assertFalse(security["locked"])
+        self.assertEqual(security["times"], {"normal": 120, "enhanced": 480})
+
+    def test_frozen_drive_without_sanitize(self):
+        caps = parse_hdparm_capabilities(HDPARM_I_OLD_HDD)
+        self.assertFalse(caps["sanitize"]["block"])
+        self.assertTrue(caps["security"]["frozen"])
+        self.assertFalse(caps["security"]["enhanced"])
+
+    def test_unreadable_drive_is_treated_as_frozen(self):
+        self.assertTrue(parse_hdparm_capabilities("")["security"]["frozen"])
+
+
+class TestNvmeCapabilities(unittest.TestCase):
+    def test_capabilities(self):
+        caps = _nvme(flbas=0x11, log={"time_for_block_erase": 90, "time_for_crypto_erase": 0xFFFFFFFF})
+        self.assertEqual(caps["format"], {"supported": True, "crypto": True})
+        self.assertEqual(
+            caps["sanitize"], {"crypto": True, "block": True, "overwrite": False}
+        )
+        self.assertEqual(caps["lbaf"], 1)
+        self.assertEqual(caps["times"], {"nvme-sanitize-block": 90})
+
+    def test_nested_sanitize_log(self):
+        caps = _nvme(log={"nvme0": {"sstat": 0, "etce": 12}})
+        self.assertEqual(caps["times"], {"nvme-sanitize-crypto": 12})
+
+    def test_unreadable_output(self):
+        caps = parse_nvme_capabilities("", "", "")
+        self.assertFalse(caps["format"]["supported"])
+        self.assertIsNone(caps["lbaf"])
+
+
+class TestPlan(unittest.TestCase):
+    def test_sata_crypto_first(self):
+        self.assertEqual(
+            plan(parse_hdparm_capabilities(HDPARM_I)),
+            [
+                "sanitize-crypto",
+                "ata-security-erase",
+                "ata-enhanced-security-erase",
+                "sanitize-block",
+            ],
+        )
+
+    def test_sata_security_erase_only(self):
+        self.assertEqual(
+            plan(parse_hdparm_capabilities(HDPARM_I_OLD_HDD)), ["ata-security-erase"]
+        )
+
+    def test_nvme_crypto_first(self):
+        self.assertEqual(
+            plan(_nvme()),
+            [
+                "nvme-sanitize-crypto",
+                "nvme-format-crypto",
+                "nvme-format-user-data",
+                "nvme-sanitize-block",
+            ],
+        )
+
+    def test_drive_estimates_reorder(self):
+        methods = plan(_nvme(sanicap=0x2, fna=0, log={"time_for_block_erase": 20}))
+        self.assertEqual(methods, ["nvme-sanitize-block", "nvme-format-user-data"])
+
+    def test_policy_filters_methods(self):
+        methods = plan(_nvme(), allowed=("nvme-format-user-data",))
+        self.assertEqual(methods, ["nvme-format-user-data"])
+
+    def test_needs_unfreeze(self):
+        frozen = parse_hdparm_capabilities(HDPARM_I_OLD_HDD)
+        self.assertTrue(erase_planner.needs_unfreeze(plan(frozen), frozen))
+        # Sanitize works on security-frozen drives
+        caps = parse_hdparm_capabilities(HDPARM_I.replace("not\tfrozen", "\tfrozen"))
+        self.assertTrue(caps["security"]["frozen"])
+        self.assertFalse(erase_planner.needs_unfreeze(plan(caps), caps))
+        # Unreadable drives fall back to sanitize first; NVMe never freezes
+        unreadable = parse_hdparm_capabilities("")
+        methods = erase_planner.fallback_methods({"path": "/dev/sda", "type": "SATA"})
+        self.assertFalse(erase_planner.needs_unfreeze(methods, unreadable))
+        self.assertFalse(erase_planner.needs_unfreeze(plan(_nvme()), _nvme()))
+
+    def test_nvme_controller(self):
+        self.assertEqual(erase_planner.nvme_controller("/dev/nvme0n1"), "/dev/nvme0")
+        self.assertEqual(erase_planner.nvme_controller("/dev/nvme12n3"), "/dev/nvme12")
+        self.assertEqual(erase_planner.nvme_controller("/dev/sda"), "/dev/sda")
+
+
+@patch("os.geteuid", return_value=1000)
+class TestPlanDrive(unittest.TestCase):
+    @patch("subprocess.run")
+    def test_sata(self, mock_run, geteuid):
+        mock_run.return_value = MagicMock(stdout=HDPARM_I)
+        methods, caps = erase_planner.plan_drive({"path": "/dev/sda", "type": "SATA"})
+        self.assertEqual(methods[0], "sanitize-crypto")
+        mock_run.assert_called_once_with(
+            ["sudo", "hdparm", "-I", "/dev/sda"], capture_output=True, text=True
+        )
+
+    @patch("subprocess.run")
+    def test_nvme_queries_controller_and_namespace(self, mock_run, geteuid):
+        outputs = {
+            "id-ctrl": json.dumps({"oacs": 0x2, "sanicap": 0, "fna": 0}),
+            "id-ns": json.dumps({"flbas": 0}),
+            "sanitize-log": "{}",
+        }
+        mock_run.side_effect = lambda args, **kwargs: MagicMock(stdout=outputs[args[2]])
+        methods, caps = erase_planner.plan_drive({"path": "/dev/nvme0n1", "type": "NVMe"})
+        self.assertEqual(methods, ["nvme-format-user-data"])
+        devices = [c.args[0][3] for c in mock_run.call_args_list]
+        self.assertEqual(devices, ["/dev/nvme0", "/dev/nvme0n1", "/dev/nvme0"])
+
+    @patch("subprocess.run", side_effect=FileNotFoundError("hdparm"))
+    def test_falls_back_when_capabilities_unreadable(self, mock_run, geteuid):
+        methods, _ = erase_planner.plan_drive({"path": "/dev/sda", "type": "SATA"})
+        self.assertEqual(methods, ["sanitize-block", "ata-security-erase"])
+
+    @patch("subprocess.run")
+    def test_no_sudo_as_root(self, mock_run, geteuid):
+        # PXE images run the CLI as root, often without sudo installed
+        geteuid.return_value = 0
+        mock_run.return_value = MagicMock(stdout=HDPARM_I)
+        erase_planner.plan_drive({"path": "/dev/sda", "type": "SATA"})
+        mock_run.assert_called_once_with(
+            ["hdparm", "-I", "/dev/sda"], capture_output=True, text=True
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_progress
+from erase_progress import (
+    ProgressEstimate,
+    parse_hdparm_sanitize_status,
+    parse_nvme_sanitize_log,
+    parse_security_erase_times,
+)
+
+HDPARM_I_SECURITY = """\
+Security:
+\tMaster password revision code = 65534
+\t\tsupported
+\tnot\tenabled
+\tnot\tlocked
+\tnot\tfrozen
+\tnot\texpired: security count
+\t\tsupported: enhanced erase
+\t118min for SECURITY ERASE UNIT. 2min for ENHANCED SECURITY ERASE UNIT.
+"""
+
+SANITIZE_IN_PROCESS = """\
+/dev/sda:
+Issuing SANITIZE_STATUS command
+Sanitize status:
+    State:    SD2 Sanitize operation In Process
+    Progress: 0x7fff (49%)
+"""
+
+SANITIZE_DONE = """\
+/dev/sda:
+Issuing SANITIZE_STATUS command
+Sanitize status:
+    State:    SD0 Sanitize Idle
+    Last Sanitize Operation Completed Without Error
+"""
+
+SANITIZE_FAILED = """\
+/dev/sda:
+Issuing SANITIZE_STATUS command
+Sanitize status:
+    State:    SD0 Sanitize Idle
+    Last Sanitize Operation Completed With Error
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParsers(unittest.TestCase):
+    def test_security_erase_times(self):
+        self.assertEqual(
+            parse_security_erase_times(HDPARM_I_SECURITY),
+            {"normal": 118 * 60, "enhanced": 120},
+        )
+        self.assertEqual(parse_security_erase_times("not\tsupported"), {})
+
+    def test_hdparm_sanitize_in_process(self):
+        status = parse_hdparm_sanitize_status(SANITIZE_IN_PROCESS)
+        self.assertEqual(status["state"], "in_progress")
+        self.assertAlmostEqual(status["progress"], 0.5, places=2)
+
+    def test_hdparm_sanitize_done_and_failed(self):
+        self.assertEqual(
+            parse_hdparm_sanitize_status(SANITIZE_DONE),
+            {"state": "complete", "progress": 1.0},
+        )
+        self.assertEqual(parse_hdparm_sanitize_status(SANITIZE_FAILED)["state"], "failed")
+        self.assertEqual(parse_hdparm_sanitize_status("")["state"], "unknown")
+
+    def test_nvme_sanitize_log(self):
+        log = {"sprog": 16384, "sstat": 2, "time_for_crypto_erase": 4294967295}
+        status = parse_nvme_sanitize_log(json.dumps(log))
+        self.assertEqual(status["state"], "in_progress")
+        self.assertAlmostEqual(status["progress"], 0.25)
+        # nvme-cli 2.x nests the log under the device name
+        nested = {"nvme0": {"sprog": 65535, "sstat": 0x101}}
+        self.assertEqual(
+            parse_nvme_sanitize_log(json.dumps(nested)),
+            {"state": "complete", "progress": 1.0},
+        )
+        self.assertEqual(
+            parse_nvme_sanitize_log(json.dumps({"sprog": 0, "sstat": 3}))["state"],
+            "failed",
+        )
+        self.assertEqual(parse_nvme_sanitize_log("not json")["state"], "unknown")
+
+    def test_format_eta(self):
+        self.assertEqual(erase_progress.format_eta(None), "")
+        self.assertEqual(erase_progress.format_eta(30), "less than 2 min left")
+        self.assertEqual(erase_progress.format_eta(600), "about 10 min left")
+        self.assertEqual(erase_progress.format_eta(7500), "about 2 h 5 min left")
+
+
+class TestProgressEstimate(unittest.TestCase):
+    def test_eta_from_measured_progress(self):
+        clock = FakeClock()
+        estimate = ProgressEstimate(clock=clock)
+        clock.now = 100
+        self.assertEqual(estimate.update(0.25), (0.25, 300))
+
+    def test_eta_from_drive_estimate_never_reaches_done(self):
+        clock = FakeClock()
+        estimate = ProgressEstimate(120, clock=clock)
+        clock.now = 60
+        self.assertEqual(estimate.update(), (0.5, 60))
+        clock.now = 500
+        self.assertEqual(estimate.update(), (0.99, 0.0))
+
+    def test_unknown_without_estimate(self):
+        self.assertEqual(ProgressEstimate().update(), (None, None))
+
+
+def _result(stdout, returncode=0):
+    result = MagicMock()
+    result.stdout = stdout
+    result.stderr = ""
+    result.returncode = returncode
+    return result
+
+
+class TestWaitForSanitize(unittest.TestCase):
+    ARGS = ["sudo", "hdparm", "--sanitize-status", "/dev/sda"]
+
+    @patch("subprocess.run")
+    def test_completes_only_when_drive_reports_done(self, mock_run):
+        mock_run.side_effect = [
+            _result(SANITIZE_IN_PROCESS),
+            _result(SANITIZE_IN_PROCESS),
+            _result(SANITIZE_DONE),
+        ]
+        reports = []
+        ok, detail = erase_progress.wait_for_sanitize(
+            self.ARGS,
+            parse_hdparm_sanitize_status,
+            lambda *args: reports.append(args),
+            poll_interval=0,
+        )
+        self.assertTrue(ok)
+        self.assertIsNone(detail)
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertEqual(reports[-1][0], 1.0)
+        self.assertIn("49%", reports[0][2])
+
+    @patch("subprocess.run")
+    def test_failed_sanitize(self, mock_run):
+        mock_run.return_value = _result(SANITIZE_FAILED)
+        ok, detail = erase_progress.wait_for_sanitize(
+            self.ARGS, parse_hdparm_sanitize_status, poll_interval=0
+        )
+        self.assertFalse(ok)
+        self.assertIn("Completed With Error", detail)
+
+    @patch("subprocess.run")
+    def test_gives_up_when_status_cannot_be_read(self, mock_run):
+        mock_run.return_value = _result("", returncode=1)
+        ok, detail = erase_progress.wait_for_sanitize(
+            self.ARGS, parse_hdparm_sanitize_status, poll_interval=0
+        )
+        self.assertFalse(ok)
+        self.assertEqual(mock_run.call_count, erase_progress.MAX_QUERY_FAILURES)
+
+
+class TestRunWithEstimate(unittest.TestCase):
+    def test_reports_while_running(self):
+        reports = []
+        result = erase_progress.run_with_estimate(
+            [sys.executable, "-c", "import time; time.sleep(0.3); print('done')"],
+            "Erasing",
+            estimate_seconds=60,
+            on_progress=lambda *args: reports.append(args),
+            poll_interval=0.05,
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), "done")
+        self.assertGreater(len(reports), 1)
+        self.assertTrue(all(0 <= r[0] < 1 for r in reports))
+        self.assertIn("Erasing", reports[0][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
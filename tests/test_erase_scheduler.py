@@ -0,0 +1,103 @@
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_scheduler
+from erase_scheduler import BusScheduler, bus_key, host_bound, order
+
+GB = 10**9
+
+
+def _drive(path, bus, transport="sata", size=500 * GB):
+    return {"path": path, "bus": bus, "transport": transport, "size_bytes": size}
+
+
+SANITIZE = (["sanitize-crypto"], {})
+
+
+class TestOrder(unittest.TestCase):
+    def test_bus_key_falls_back(self):
+        self.assertEqual(bus_key(_drive("/dev/sda", "pci/ata1")), "pci/ata1")
+        drive = {"path": "/dev/sda", "bus": None, "controller": "0000:00:17.0"}
+        self.assertEqual(bus_key(drive), "0000:00:17.0")
+        self.assertEqual(bus_key({"path": "/dev/sda"}), "/dev/sda")
+
+    def test_host_bound(self):
+        self.assertTrue(host_bound(_drive("/dev/sdc", "usb2", "usb"), None))
+        self.assertTrue(host_bound(_drive("/dev/sda", "ata1"), ([], {})))
+        self.assertFalse(host_bound(_drive("/dev/sda", "ata1"), SANITIZE))
+        # Test mode plans nothing
+        self.assertFalse(host_bound(_drive("/dev/sda", "ata1"), None))
+
+    def test_in_drive_first_then_largest_host_bound(self):
+        drives = [
+            _drive("/dev/sdc", "usb2", "usb", 250 * GB),
+            _drive("/dev/sda", "ata1"),
+            _drive("/dev/sdd", "usb2", "usb", 2000 * GB),
+            _drive("/dev/nvme0n1", "0000:3d:00.0", "nvme"),
+        ]
+        plans = {"/dev/sda": SANITIZE, "/dev/nvme0n1": SANITIZE}
+        self.assertEqual(
+            [d["path"] for d in order(drives, plans)],
+            ["/dev/sda", "/dev/nvme0n1", "/dev/sdd", "/dev/sdc"],
+        )
+
+
+class TestBusScheduler(unittest.TestCase):
+    def _run(self, scheduler, drives, hold=0.05):
+        """Run host_io for every drive at once; returns the most drives
+        seen inside a slot per bus, and the wait messages."""
+        inside = {}
+        peak = {}
+        waits = []
+        lock = threading.Lock()
+
+        def work(drive):
+            key = bus_key(drive)
+            def on_progress(fraction, eta, text):
+                waits.append((drive["path"], text))
+
+            with scheduler.for_drive(drive, on_progress)():
+                with lock:
+                    inside[key] = inside.get(key, 0) + 1
+                    peak[key] = max(peak.get(key, 0), inside[key])
+                time.sleep(hold)
+                with lock:
+                    inside[key] -= 1
+
+        threads = [threading.Thread(target=work, args=(d,)) for d in drives]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return peak, waits
+
+    def test_one_transfer_per_bus(self):
+        drives = [_drive(f"/dev/sd{c}", "usb2", "usb") for c in "abc"]
+        drives += [_drive("/dev/sdd", "ata1"), _drive("/dev/sde", "ata2")]
+        scheduler = BusScheduler()
+        with redirect_stdout(io.StringIO()):
+            peak, waits = self._run(scheduler, drives)
+        self.assertEqual(peak, {"usb2": 1, "ata1": 1, "ata2": 1})
+        # Two of the USB drives waited for the bus
+        self.assertEqual(len(waits), 2)
+        self.assertTrue(all(text == erase_scheduler.WAITING_TEXT for _, text in waits))
+
+    def test_higher_cap_and_no_limit(self):
+        drives = [_drive(f"/dev/sd{c}", "hba0") for c in "abcd"]
+        with redirect_stdout(io.StringIO()):
+            peak, _ = self._run(BusScheduler(max_per_bus=2), drives)
+        self.assertEqual(peak, {"hba0": 2})
+        peak, waits = self._run(BusScheduler(max_per_bus=0), drives)
+        self.assertEqual(peak, {"hba0": 4})
+        self.assertEqual(waits, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
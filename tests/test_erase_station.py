@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_station
+from erase_station import QueuePolicy, StationResults, changes
+
+
+def _drive(path, serial, model="WDC WD5000"):
+    return {"path": path, "serial": serial, "model": model, "size": "465.8 GB"}
+
+
+class TestChanges(unittest.TestCase):
+    def test_insert_and_remove(self):
+        sda, sdb, sdc = (_drive(f"/dev/sd{c}", c.upper()) for c in "abc")
+        added, removed = changes([sda, sdb], [sda, sdc])
+        self.assertEqual(added, [sdc])
+        self.assertEqual(removed, [sdb])
+
+    def test_swap_in_same_slot(self):
+        old, new = _drive("/dev/sdb", "B"), _drive("/dev/sdb", "D")
+        self.assertEqual(changes([old], [new]), ([new], [old]))
+
+    def test_unchanged(self):
+        drives = [_drive("/dev/sda", "A"), _drive("/dev/nvme0n1", "")]
+        self.assertEqual(changes(drives, list(drives)), ([], []))
+
+
+class TestQueuePolicy(unittest.TestCase):
+    def setUp(self):
+        self.results = StationResults(clock=lambda: 0)
+        self.in_use = set()
+
+    def _policy(self, mode):
+        return QueuePolicy(mode, in_use=lambda name: name in self.in_use)
+
+    def test_manual_never_queues(self):
+        policy = self._policy("manual")
+        self.assertFalse(policy.should_queue(_drive("/dev/sdb", "B"), self.results))
+
+    def test_new_skips_drives_erased_this_session(self):
+        policy = self._policy("new")
+        drive = _drive("/dev/sdb", "B")
+        self.assertTrue(policy.should_queue(drive, self.results))
+        self.results.add(drive, False, "Failed to erase /dev/sdb", 10)
+        self.assertTrue(policy.should_queue(drive, self.results))
+        self.results.add(drive, True, "Erased /dev/sdb", 10)
+        self.assertFalse(policy.should_queue(drive, self.results))
+        self.assertTrue(self._policy("all").should_queue(drive, self.results))
+        # Without a serial a drive cannot be recognised again
+        self.assertTrue(policy.should_queue(_drive("/dev/sdc", ""), self.results))
+
+    def test_drives_in_use_never_queued(self):
+        self.in_use.add("sdb")
+        policy = self._policy("all")
+        self.assertFalse(policy.should_queue(_drive("/dev/sdb", "B"), self.results))
+
+    def test_parse(self):
+        parse = erase_station.parse_queue_policy
+        self.assertEqual(parse(["secureerase", "--station"]), "manual")
+        self.assertEqual(parse(["--auto-queue=new"]), "new")
+        self.assertEqual(parse(["--auto-queue=bogus"]), "manual")
+        with self.assertRaises(ValueError):
+            QueuePolicy("bogus")
+
+
+class TestStationResults(unittest.TestCase):
+    def test_rolling_newest_first(self):
+        results = StationResults(max_entries=3, clock=lambda: 0)
+        for i in range(5):
+            results.add(_drive(f"/dev/sd{i}", str(i)), i != 2, f"drive {i}", 60)
+        self.assertEqual([r["serial"] for r in results.records], ["4", "3", "2"])
+        self.assertEqual(results.summary(), "2 erased, 1 failed")
+        # Successes that scrolled out of the table are still remembered
+        self.assertTrue(results.erased("0"))
+        self.assertFalse(results.erased("2"))
+
+    def test_describe(self):
+        results = StationResults(clock=lambda: 0)
+        record = results.add(_drive("/dev/sda", "A"), True, "Erased /dev/sda", 1500)
+        self.assertTrue(
+            erase_station.describe(record).endswith("25 min  —  Erased /dev/sda")
+        )
+        record["elapsed"] = 12
+        self.assertIn("12 s", erase_station.describe(record))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import concurrent.futures
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import erase_verify
+from erase_verify import is_deterministic, sample_offsets, samples_needed, verify
+
+MIB = 1024 * 1024
+
+
+class TestSampling(unittest.TestCase):
+    def test_samples_needed(self):
+        # 99% confidence of hitting 0.1% of un-erased media
+        self.assertEqual(samples_needed(0.99, 0.001), 4603)
+        self.assertEqual(samples_needed(0.95, 0.01), 299)
+
+    def test_offsets_aligned_and_spread(self):
+        size = 1000 * 64 * 1024
+        offsets = sample_offsets(size, 64 * 1024, 100, seed=1)
+        self.assertTrue(all(o % (64 * 1024) == 0 for o in offsets))
+        self.assertEqual(offsets, sorted(set(offsets)))
+        # First and last read, and one read per tenth of the device
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], size - 64 * 1024)
+        for tenth in range(10):
+            lo, hi = tenth * size // 10, (tenth + 1) * size // 10
+            self.assertTrue(any(lo <= o < hi for o in offsets))
+        self.assertLessEqual(len(offsets), 102)
+
+    def test_offsets_deterministic_with_seed(self):
+        self.assertEqual(
+            sample_offsets(10**9, 4096, 50, seed=7),
+            sample_offsets(10**9, 4096, 50, seed=7),
+        )
+
+    def test_small_device_read_completely(self):
+        self.assertEqual(sample_offsets(4 * 4096, 4096, 100), [0, 4096, 8192, 12288])
+        self.assertEqual(sample_offsets(100, 4096, 100), [])
+
+    def test_patterns(self):
+        self.assertTrue(is_deterministic(bytes(4096)))
+        self.assertTrue(is_deterministic(b"\xff" * 4096))
+        self.assertTrue(is_deterministic(b"\xde\xad\xbe\xef" * 1024))
+        self.assertTrue(is_deterministic(bytes(range(256)) * 16))
+        self.assertFalse(is_deterministic(os.urandom(4096)))
+        self.assertFalse(is_deterministic(bytes(4095) + b"\x01"))
+
+
+class TestVerify(unittest.TestCase):
+    """verify() against sparse image files standing in for drives."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _image(self, name, size, dirty=()):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "wb") as f:
+            f.truncate(size)
+            for offset, data in dirty:
+                f.seek(offset)
+                f.write(data)
+        return path
+
+    def test_zeroed_image_verifies(self):
+        path = self._image("zero.img", 256 * MIB)
+        progress = []
+        result = verify(path, seed=1, on_progress=progress.append)
+        self.assertTrue(result["verified"])
+        self.assertEqual(result["mismatch_count"], 0)
+        self.assertEqual(result["size"], 256 * MIB)
+        self.assertEqual(result["bytes_read"], result["samples"] * erase_verify.DEFAULT_READ_SIZE)
+        self.assertAlmostEqual(
+            result["coverage"], result["bytes_read"] / (256 * MIB)
+        )
+        self.assertGreater(result["throughput"], 0)
+        self.assertEqual(progress[-1], 1.0)
+
+    def test_leftover_data_is_found(self):
+        # A partition table at the start and data scattered over the image
+        dirty = [(0, b"\x55\xaa" + os.urandom(510))]
+        dirty += [(i * 4 * MIB, os.urandom(64 * 1024)) for i in range(1, 64)]
+        path = self._image("dirty.img", 256 * MIB, dirty)
+        result = verify(path, seed=1)
+        self.assertFalse(result["verified"])
+        self.assertGreater(result["mismatch_count"], 0)
+        self.assertIn(0, result["mismatches"])
+        self.assertIn("FAILED", erase_verify.describe(result))
+
+    def test_pattern_filled_image_verifies(self):
+        path = os.path.join(self.tmpdir.name, "ff.img")
+        with open(path, "wb") as f:
+            f.write(b"\xff" * (8 * MIB))
+        self.assertTrue(verify(path, seed=1)["verified"])
+
+    def test_concurrent_drives(self):
+        paths = [self._image(f"d{i}.img", 64 * MIB) for i in range(3)]
+        paths.append(self._image("bad.img", 64 * MIB, [(32 * MIB, os.urandom(MIB))]))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda p: verify(p, max_unerased=0.01, seed=3), paths))
+        self.assertEqual([r["verified"] for r in results], [True, True, True, False])
+
+    def test_cancel(self):
+        path = self._image("zero.img", 64 * MIB)
+
+        class Cancelled:
+            def is_set(self):
+                return True
+
+        result = verify(path, cancel=Cancelled())
+        self.assertFalse(result["verified"])
+        self.assertFalse(result["complete"])
+
+    def test_cli_json_output(self):
+        path = self._image("zero.img", 16 * MIB)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status = erase_verify.main(["--json", "--seed", "1", path])
+        self.assertEqual(status, 0)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("progress "))
+        kind, _, payload = lines[-1].partition(" ")
+        self.assertEqual(kind, "result")
+        self.assertTrue(json.loads(payload)["verified"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import firmware_attrs
+
+
+def make_tree(root, tree):
+    """Create files from a nested {name: dict or str} tree under root."""
+    for name, content in tree.items():
+        path = os.path.join(root, name)
+        if isinstance(content, dict):
+            os.makedirs(path, exist_ok=True)
+            make_tree(path, content)
+        else:
+            with open(path, "w") as f:
+                f.write(content)
+
+
+def attribute(value):
+    return {"current_value": value + "\n", "type": "enumeration\n"}
+
+
+def auth(is_enabled, role="bios-admin"):
+    return {"is_enabled": is_enabled + "\n", "role": role + "\n"}
+
+
+class FirmwareTreeTestCase(unittest.TestCase):
+    def index(self, tree):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        make_tree(tmp.name, tree)
+        return firmware_attrs.FirmwareAttributes(tmp.name)
+
+
+class TestFirmwareAttributes(FirmwareTreeTestCase):
+    def test_missing_interface(self):
+        index = firmware_attrs.FirmwareAttributes("/nonexistent/firmware-attributes")
+        self.assertEqual(index.drivers, [])
+        self.assertIsNone(index.computrace())
+        self.assertEqual(index.admin_password(), (None, False))
+        self.assertIsNone(index.value("Asset"))
+
+    def test_values_read_once(self):
+        index = self.index(
+            {"dell-wmi-sysman": {"attributes": {"Asset": attribute("KRAMDEN1")}}}
+        )
+        self.assertEqual(index.drivers, ["dell-wmi-sysman"])
+        with patch("probe_io.read_text", wraps=firmware_attrs.probe_io.read_text) as read:
+            self.assertEqual(index.value("Asset"), "KRAMDEN1")
+            self.assertEqual(index.value("Asset"), "KRAMDEN1")
+            self.assertEqual(read.call_count, 1)
+            index.invalidate("Asset")
+            index.value("Asset")
+            self.assertEqual(read.call_count, 2)
+
+    @patch("subprocess.run")
+    def test_unreadable_values_batched_through_sudo(self, mock_run):
+        index = self.index(
+            {
+                "thinklmi": {
+                    "attributes": {
+                        "ComputraceModuleActivation": attribute("Disable"),
+                        "Absolute": attribute("Activated"),
+                    }
+                }
+            }
+        )
+        base = os.path.join(index.base, "thinklmi", "attributes")
+        activation = os.path.join(base, "ComputraceModuleActivation", "current_value")
+        absolute = os.path.join(base, "Absolute", "current_value")
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout=f"{activation}:Disable\n{absolute}:Activated\n"
+        )
+        with patch("probe_io.read_text", side_effect=PermissionError):
+            self.assertFalse(index.computrace())
+        mock_run.assert_called_once()
+        args = mock_run.call_args[0][0]
+        self.assertEqual(args[:4], ["sudo", "grep", "-sH", ""])
+        self.assertEqual(sorted(args[4:]), sorted([activation, absolute]))
+        self.assertEqual(index.value("Absolute"), "Activated")
+
+    def test_computrace_standard_attribute(self):
+        index = self.index(
+            {"hp-bioscfg": {"attributes": {"Absolute": attribute("Activated")}}}
+        )
+        self.assertTrue(index.computrace())
+
+    def test_admin_password(self):
+        index = self.index(
+            {
+                "dell-wmi-sysman": {
+                    "authentication": {
+                        "Admin": auth("0"),
+                        "System": auth("1", "system"),
+                    }
+                }
+            }
+        )
+        self.assertEqual(index.admin_password(), (True, False))
+
+    def test_admin_password_malformed_hp_entries(self):
+        index = self.index(
+            {
+                "hp-bioscfg": {
+                    "authentication": {
+                        "Setup Password\r": {"is_enabled": "0\n"},
+                        "Power_On_Password": auth("0", "power-on"),
+                    }
+                }
+            }
+        )
+        self.assertEqual(index.admin_password(), (False, True))
+
+    def test_admin_password_other_drivers_not_second_guessed(self):
+        index = self.index(
+            {
+                "think-lmi": {
+                    "authentication": {
+                        "Admin": {"is_enabled": "0\n"},
+                        "System": auth("0", "system"),
+                    }
+                }
+            }
+        )
+        self.assertEqual(index.admin_password(), (False, False))
+
+
+class TestDmiAdminPassword(unittest.TestCase):
+    def test_parse(self):
+        table = (
+            "Handle 0x0019, DMI type 24, 5 bytes\nHardware Security\n"
+            "\tPower-On Password Status: Disabled\n"
+            "\tAdministrator Password Status: {}\n"
+        )
+        self.assertTrue(firmware_attrs.parse_dmi_admin_password(table.format("Enabled")))
+        self.assertFalse(firmware_attrs.parse_dmi_admin_password(table.format("Disabled")))
+        self.assertIsNone(
+            firmware_attrs.parse_dmi_admin_password(table.format("Not Implemented"))
+        )
+        self.assertIsNone(firmware_attrs.parse_dmi_admin_password(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import generate_tracking_sheet
+from generate_tracking_sheet import (
+    SNAPSHOT_PROBES,
+    get_system_info,
+    load_snapshot,
+    save_snapshot,
+)
+
+SNAPSHOT = {
+    "vendor": "Dell",
+    "model": "Latitude 7490",
+    "cpu": "Intel(R) Core(TM) i5-8350U CPU @ 1.70GHz",
+    "mem": "8",
+    "disks": {"nvme0n1": {"type": "NVMe", "size": 256}},
+    "discrete_gpu": None,
+    "serial": "ABC1234",
+    "batteries": {"BAT0": 87},
+    "chassis_type": "Laptop",
+    "bios_password": False,
+    "asset_info": False,
+    "computrace": False,
+}
+
+
+class TestGetSystemInfo(unittest.TestCase):
+    def test_full_snapshot_probes_nothing(self):
+        with mock.patch.object(generate_tracking_sheet, "Utils") as utils:
+            info = get_system_info(SNAPSHOT)
+        utils.assert_not_called()
+        self.assertEqual(info["Brand"], "Dell")
+        self.assertEqual(info["Storage"], "NVMe: 256 GB")
+        self.assertEqual(info["Battery Capacity"], "BAT0: 87%")
+        self.assertEqual(info["BIOS Password"], "No")
+        self.assertEqual(info["Computrace"], "Not Activated")
+        self.assertNotIn("Graphics", info)
+
+    def test_only_missing_fields_are_probed(self):
+        snapshot = {k: v for k, v in SNAPSHOT.items() if k != "chassis_type"}
+        with mock.patch.object(generate_tracking_sheet, "Utils") as utils:
+            utils.return_value.get_chassis_type.return_value = "Desktop"
+            info = get_system_info(snapshot)
+        self.assertEqual(info["Item Type"], "Desktop")
+        called = {name for name, _, _ in utils.return_value.method_calls}
+        self.assertEqual(called, {"get_chassis_type"})
+
+    def test_no_snapshot_probes_everything(self):
+        with mock.patch.object(generate_tracking_sheet, "Utils") as utils:
+            utils.return_value.get_disks.return_value = {}
+            utils.return_value.get_battery_capacities.return_value = {}
+            info = get_system_info()
+        called = {name for name, _, _ in utils.return_value.method_calls}
+        self.assertEqual(called, set(SNAPSHOT_PROBES.values()))
+        self.assertEqual(info["Storage"], "None")
+
+
+class TestSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "system-snapshot.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        self.assertTrue(save_snapshot(SNAPSHOT, self.path, boot_id="boot-a"))
+        self.assertEqual(load_snapshot(self.path, boot_id="boot-a"), SNAPSHOT)
+
+    def test_other_boot_is_ignored(self):
+        save_snapshot(SNAPSHOT, self.path, boot_id="boot-a")
+        self.assertEqual(load_snapshot(self.path, boot_id="boot-b"), {})
+
+    def test_missing_or_unreadable(self):
+        self.assertEqual(load_snapshot(self.path, boot_id="boot-a"), {})
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(load_snapshot(self.path, boot_id="boot-a"), {})
+
+    def test_cli_option(self):
+        args = generate_tracking_sheet.parse_args(["K-123456"])
+        self.assertFalse(args.from_snapshot)
+        args = generate_tracking_sheet.parse_args(["--from-snapshot", "K-123456"])
+        self.assertTrue(args.from_snapshot)
+        self.assertEqual(
+            args.snapshot_path, generate_tracking_sheet.default_snapshot_path()
+        )
+        args = generate_tracking_sheet.parse_args(
+            ["K-123456", "/tmp/sheet.pdf", "--snapshot-path", self.path]
+        )
+        self.assertEqual(args.snapshot_path, self.path)
+        self.assertEqual(args.output_path, "/tmp/sheet.pdf")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import host_client
+
+
+class TestHostClient(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertFalse(host_client.resident_host_enabled())
+            self.assertFalse(host_client.open_in_host("spec"))
+
+    def test_zero_disables(self):
+        with patch.dict(os.environ, {"KRAMDEN_RESIDENT_HOST": "0"}):
+            self.assertFalse(host_client.resident_host_enabled())
+
+    def test_command_line_options_run_standalone(self):
+        with patch.dict(os.environ, {"KRAMDEN_RESIDENT_HOST": "1"}), patch.object(
+            sys, "argv", ["kramden-secure-erase", "--test"]
+        ):
+            self.assertFalse(host_client.open_in_host("secure-erase"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Import-time budgets for startup-critical modules.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+and its cumulative import time is compared against a budget. The heavy
+optional dependencies must not be imported at all; they are loaded at the
+point of use.
+
+Run this file directly with ``report`` to print the measurements:
+
+    python3 tests/test_import_time.py report
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "src")
+
+# Cumulative import time budget in milliseconds (best of several cold
+# runs). Generous for slow bench hardware; a heavy dependency sneaking back
+# into module scope costs far more than the headroom.
+IMPORT_BUDGETS_MS = {
+    "utils": 150,
+    "sortly": 150,
+    "sortly_lookup_by_name": 150,
+    "generate_tracking_sheet": 150,
+    "session_checkpoint": 80,
+    "task_executor": 50,
+    "stall_watchdog": 80,
+    "observable": 20,
+    "host_client": 20,
+    "erase_cli": 80,
+}
+
+# Page modules import GTK, so only their dependencies are checked and only
+# where GTK is installed.
+GTK_MODULES = [
+    "specinfo",
+    "sysinfo",
+    "sortly_register",
+    "knum",
+    "speccomplete",
+    "check_packages",
+    "landscape",
+]
+
+# Must only ever be imported lazily.
+DEFERRED_MODULES = [
+    "apt",
+    "dbus",
+    "pyudev",
+    "psutil",
+    "reportlab",
+    "requests",
+    "gi.repository.Snapd",
+]
+
+RUNS = 3
+
+
+def measure_import(module):
+    """Import module in a fresh interpreter.
+
+    Returns (cumulative_us, {imported_module: cumulative_us}).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            # Header line
+            continue
+        imported[fields[2].strip()] = int(fields[1])
+    return imported.get(module, 0), imported
+
+
+def best_import_time(module, runs=RUNS):
+    best = None
+    imported = {}
+    for _ in range(runs):
+        cumulative, imported = measure_import(module)
+        if best is None or cumulative < best:
+            best = cumulative
+    return best, imported
+
+
+def _gtk_available():
+    try:
+        measure_import("gi")
+        return True
+    except ImportError:
+        return False
+
+
+class TestImportTime(unittest.TestCase):
+    def test_budgets(self):
+        for module, budget_ms in IMPORT_BUDGETS_MS.items():
+            with self.subTest(module=module):
+                best_us, _ = best_import_time(module)
+                self.assertLessEqual(
+                    best_us / 1000,
+                    budget_ms,
+                    f"import {module} took {best_us / 1000:.1f} ms "
+                    f"(budget {budget_ms} ms)",
+                )
+
+    def test_heavy_dependencies_are_deferred(self):
+        for module in IMPORT_BUDGETS_MS:
+            with self.subTest(module=module):
+                _, imported = measure_import(module)
+                self.assertEqual(
+                    [m for m in DEFERRED_MODULES if m in imported], []
+                )
+
+    @unittest.skipUnless(_gtk_available(), "GTK bindings not installed")
+    def test_page_modules_defer_heavy_dependencies(self):
+        for module in GTK_MODULES:
+            with self.subTest(module=module):
+                _, imported = measure_import(module)
+                self.assertEqual(
+                    [m for m in DEFERRED_MODULES if m in imported], []
+                )
+
+
+def report():
+    print(f"{'module':<28}{'best ms':>10}{'budget ms':>12}")
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        best_us, _ = best_import_time(module)
+        flag = "" if best_us / 1000 <= budget_ms else "  OVER"
+        print(f"{module:<28}{best_us / 1000:>10.1f}{budget_ms:>12}{flag}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["report"]:
+        report()
+    else:
+        unittest.main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+from lazy_import import LazyModule
+
+
+class TestLazyModule(unittest.TestCase):
+    def test_imports_on_first_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = LazyModule("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+        self.assertIn("colorsys", sys.modules)
+
+    def test_patch_through_proxy(self):
+        import json
+
+        proxy = LazyModule("json")
+        with patch.object(proxy, "dumps", return_value="patched"):
+            self.assertEqual(json.dumps({}), "patched")
+        self.assertEqual(json.dumps({}), "{}")
+
+    def test_missing_module_raises_on_use(self):
+        missing = LazyModule("kramden_no_such_module")
+        with self.assertRaises(ImportError):
+            missing.anything
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+from observable import StateStore
+
+
+class TestStateStore(unittest.TestCase):
+    def setUp(self):
+        self.store = StateStore({"SpecInfo": False, "ManualTest": False})
+
+    def test_get_initial_values(self):
+        self.assertFalse(self.store.get("SpecInfo"))
+        self.assertEqual(self.store.values(), {"SpecInfo": False, "ManualTest": False})
+
+    def test_set_notifies_key_subscribers_on_change(self):
+        calls = []
+        self.store.subscribe("SpecInfo", lambda k, v: calls.append((k, v)))
+        self.assertTrue(self.store.set("SpecInfo", True))
+        self.assertEqual(calls, [("SpecInfo", True)])
+
+    def test_set_same_value_does_not_notify(self):
+        calls = []
+        self.store.subscribe_all(lambda k, v: calls.append((k, v)))
+        self.assertFalse(self.store.set("SpecInfo", False))
+        self.assertEqual(calls, [])
+
+    def test_subscriber_only_sees_its_key(self):
+        calls = []
+        self.store.subscribe("ManualTest", lambda k, v: calls.append(k))
+        self.store.set("SpecInfo", True)
+        self.assertEqual(calls, [])
+
+    def test_subscribe_all_sees_every_change(self):
+        calls = []
+        self.store.subscribe_all(lambda k, v: calls.append(k))
+        self.store.set("SpecInfo", True)
+        self.store.set("ManualTest", True)
+        self.assertEqual(calls, ["SpecInfo", "ManualTest"])
+
+    def test_unsubscribe(self):
+        calls = []
+        callback = self.store.subscribe("SpecInfo", lambda k, v: calls.append(k))
+        self.store.unsubscribe(callback)
+        self.store.set("SpecInfo", True)
+        self.assertEqual(calls, [])
+
+    def test_set_wrong_type_raises(self):
+        with self.assertRaises(TypeError):
+            self.store.set("SpecInfo", "yes")
+
+    def test_set_unknown_key_raises(self):
+        with self.assertRaises(KeyError):
+            self.store.set("Landscape", True)
+
+    def test_all_passed(self):
+        self.assertFalse(self.store.all_passed())
+        self.store.set("SpecInfo", True)
+        self.store.set("ManualTest", True)
+        self.assertTrue(self.store.all_passed())
+
+    def test_values_is_a_copy(self):
+        values = self.store.values()
+        values["SpecInfo"] = True
+        self.assertFalse(self.store.get("SpecInfo"))
+
+
+if __name__ == "__main__":
+    unittest.main()
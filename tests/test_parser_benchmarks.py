@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../benchmarks/")
+
+import parsers
+
+
+class TestParserCases(unittest.TestCase):
+    def test_cases_parse_to_expected(self):
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                for name, (fn, data, expected) in parsers.build_cases().items():
+                    with self.subTest(parser=name):
+                        result = fn(data)
+                        if expected is not None:
+                            self.assertEqual(result, expected)
+            finally:
+                sys.stdout = stdout
+
+    def test_renderer_names(self):
+        names = parsers.build_cases()["gpu_renderer"][0](parsers.RENDERERS)
+        self.assertEqual(names[1], "NVIDIA GeForce GTX 1660 Ti")
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_drops_beyond_tolerance(self):
+        results = {
+            "fast": {"calls_per_sec": 90.0},
+            "slow": {"calls_per_sec": 70.0},
+            "new": {"calls_per_sec": 5.0},
+        }
+        baseline = {
+            "results": {"fast": {"calls_per_sec": 100.0}, "slow": {"calls_per_sec": 100.0}}
+        }
+        self.assertEqual(parsers.compare(results, baseline, 0.25), ["slow"])
+        self.assertFalse(results["fast"]["regressed"])
+        self.assertEqual(results["slow"]["baseline_ratio"], 0.7)
+        self.assertIsNone(results["new"]["baseline_ratio"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import probe_fingerprints
+import probe_io
+
+
+def fake_sysfs(files, dirs):
+    """Replay backend answering reads from files and listings from dirs."""
+    probes = [
+        {"kind": "read", "path": path, "binary": False, "data": data}
+        for path, data in files.items()
+    ] + [
+        {"kind": "listdir", "path": path, "entries": entries}
+        for path, entries in dirs.items()
+    ]
+    return probe_io.ReplayBackend(
+        {"format": probe_io.BUNDLE_FORMAT, "version": probe_io.BUNDLE_VERSION, "probes": probes}
+    )
+
+
+BATTERY = (
+    "POWER_SUPPLY_TYPE=Battery\nPOWER_SUPPLY_SERIAL_NUMBER={serial}\n"
+    "POWER_SUPPLY_ENERGY_FULL_DESIGN=56000000\nPOWER_SUPPLY_ENERGY_NOW={now}\n"
+)
+
+
+class TestFingerprints(unittest.TestCase):
+    def take(self, files, dirs, names):
+        previous = probe_io.set_backend(fake_sysfs(files, dirs))
+        try:
+            return probe_fingerprints.take(names)
+        finally:
+            probe_io.set_backend(previous)
+
+    def test_batteries_ignore_charge_level(self):
+        dirs = {"/sys/class/power_supply": ["AC", "BAT0"]}
+
+        def battery(serial, now):
+            files = {"/sys/class/power_supply/BAT0/uevent": BATTERY.format(serial=serial, now=now)}
+            return self.take(files, dirs, ["batteries"])
+
+        self.assertEqual(battery("1234", 40000000), battery("1234", 21000000))
+        self.assertNotEqual(battery("1234", 40000000), battery("9876", 40000000))
+
+    def test_disks(self):
+        def disks(names, size="1000215216", removable=()):
+            files = {}
+            for name in names:
+                files[f"/sys/block/{name}/size"] = size
+                flag = "1" if name in removable else "0"
+                files[f"/sys/block/{name}/removable"] = flag
+            return self.take(files, {"/sys/block": names}, ["disks"])["disks"]
+
+        self.assertEqual(disks(["nvme0n1", "loop0"]), disks(["nvme0n1", "loop7"]))
+        # get_disks() ignores USB sticks and optical drives
+        self.assertEqual(
+            disks(["nvme0n1"]), disks(["nvme0n1", "sdb", "sr0"], removable=("sdb",))
+        )
+        self.assertNotEqual(disks(["nvme0n1"]), disks(["nvme0n1", "sda"]))
+        self.assertNotEqual(disks(["sda"]), disks(["sda"], size="500118192"))
+
+    def test_memory_and_missing_sysfs(self):
+        result = self.take(
+            {"/proc/meminfo": "MemTotal:       16183656 kB\nMemFree: 1 kB\n"},
+            {},
+            ["memory", "pci"],
+        )
+        self.assertIsNotNone(result["memory"])
+        self.assertIsNone(result["pci"])
+
+    def test_changed(self):
+        self.assertEqual(
+            probe_fingerprints.changed(
+                {"memory": "a", "disks": "b"}, {"memory": "a", "disks": "c", "pci": None}
+            ),
+            ["disks"],
+        )
+
+
+class TestHotplugMonitor(unittest.TestCase):
+    def test_events_coalesced(self):
+        fired = []
+        done = threading.Event()
+
+        def callback(subsystems):
+            fired.append(subsystems)
+            done.set()
+
+        monitor = probe_fingerprints.HotplugMonitor(callback, settle=0.05)
+        for subsystem in ("block", "block", "power_supply"):
+            monitor._on_event(MagicMock(subsystem=subsystem))
+        self.assertTrue(done.wait(2))
+        self.assertEqual(fired, [{"block", "power_supply"}])
+
+    def test_start_without_udev(self):
+        udev = MagicMock()
+        udev.Monitor.from_netlink.side_effect = OSError("no netlink")
+        with patch("probe_fingerprints.pyudev", udev):
+            monitor = probe_fingerprints.HotplugMonitor(lambda s: None)
+            self.assertFalse(monitor.start())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock, mock_open, patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import probe_io
+import record_probes
+
+BUNDLE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "probe_bundles")
+
+
+def make_bundle(*probes):
+    return {
+        "format": probe_io.BUNDLE_FORMAT,
+        "version": probe_io.BUNDLE_VERSION,
+        "probes": list(probes),
+    }
+
+
+class ProbeBackendTestCase(unittest.TestCase):
+    def use(self, backend):
+        previous = probe_io.set_backend(backend)
+        self.addCleanup(probe_io.set_backend, previous)
+        return backend
+
+
+class TestLiveBackend(ProbeBackendTestCase):
+    def setUp(self):
+        self.use(probe_io.LiveBackend())
+
+    @patch("subprocess.run")
+    def test_run_uses_patched_subprocess(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="ok")
+        result = probe_io.run(["lspci", "-nn"], capture_output=True, text=True)
+        self.assertEqual(result.stdout, "ok")
+        mock_run.assert_called_once_with(
+            ["lspci", "-nn"], capture_output=True, text=True
+        )
+
+    @patch("builtins.open", mock_open(read_data="MemTotal: 1 kB\n"))
+    def test_read_uses_patched_open(self):
+        self.assertEqual(probe_io.read_text("/proc/meminfo"), "MemTotal: 1 kB\n")
+
+
+class TestRecordReplay(ProbeBackendTestCase):
+    def record(self, fn):
+        recorder = self.use(probe_io.RecordingBackend())
+        fn()
+        probe_io.set_backend(probe_io.LiveBackend())
+        return recorder.bundle()
+
+    @patch("subprocess.run")
+    def test_run_round_trip(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(
+            ["dmidecode"], 1, "partial", "denied"
+        )
+        bundle = self.record(
+            lambda: probe_io.run(["sudo", "dmidecode"], capture_output=True, text=True)
+        )
+        self.use(probe_io.ReplayBackend(bundle, strict=True))
+        result = probe_io.run(["sudo", "dmidecode"], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual((result.stdout, result.stderr), ("partial", "denied"))
+        with self.assertRaises(subprocess.CalledProcessError):
+            probe_io.run(
+                ["sudo", "dmidecode"], capture_output=True, text=True, check=True
+            )
+        self.assertEqual(
+            probe_io.run(["sudo", "dmidecode"], capture_output=True).stdout, b"partial"
+        )
+
+    @patch("subprocess.run")
+    def test_check_true_is_recorded_before_raising(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(["hostnamectl"], 1, "", "")
+        recorder = self.use(probe_io.RecordingBackend())
+        with self.assertRaises(subprocess.CalledProcessError):
+            probe_io.run(["hostnamectl"], capture_output=True, text=True, check=True)
+        self.assertEqual(recorder.probes[0]["returncode"], 1)
+
+    def test_read_errors_replay_as_os_errors(self):
+        def read_missing():
+            with self.assertRaises(FileNotFoundError):
+                probe_io.read_text("/nonexistent/kramden-probe")
+
+        bundle = self.record(read_missing)
+        self.use(probe_io.ReplayBackend(bundle, strict=True))
+        with self.assertRaises(FileNotFoundError):
+            probe_io.read_text("/nonexistent/kramden-probe")
+
+    def test_binary_read(self):
+        bundle = make_bundle(
+            {"kind": "read", "path": "/efivar", "binary": True, "data_b64": "BwAAAEsx"}
+        )
+        self.use(probe_io.ReplayBackend(bundle, strict=True))
+        self.assertEqual(probe_io.read_bytes("/efivar"), b"\x07\x00\x00\x00K1")
+
+    def test_repeated_probes_answer_in_order(self):
+        bundle = make_bundle(
+            {"kind": "read", "path": "/f", "binary": False, "data": "first"},
+            {"kind": "read", "path": "/f", "binary": False, "data": "second"},
+        )
+        self.use(probe_io.ReplayBackend(bundle))
+        answers = [probe_io.read_text("/f") for _ in range(3)]
+        self.assertEqual(answers, ["first", "second", "second"])
+
+    def test_env_changes_tell_commands_apart(self):
+        glxinfo = {"kind": "run", "args": ["glxinfo"], "returncode": 0, "stderr": ""}
+        bundle = make_bundle(
+            dict(glxinfo, env={}, stdout="igpu"),
+            dict(glxinfo, env={"DRI_PRIME": "1"}, stdout="dgpu"),
+        )
+        self.use(probe_io.ReplayBackend(bundle, strict=True))
+        with patch.dict(os.environ, {"DRI_PRIME": "0"}):
+            env = dict(os.environ, DRI_PRIME="1")
+            igpu = probe_io.run(["glxinfo"], capture_output=True, text=True)
+            dgpu = probe_io.run(["glxinfo"], capture_output=True, text=True, env=env)
+        self.assertEqual((igpu.stdout, dgpu.stdout), ("igpu", "dgpu"))
+
+    def test_missing_probes(self):
+        replay = self.use(probe_io.ReplayBackend(make_bundle()))
+        with self.assertRaises(FileNotFoundError):
+            probe_io.run(["cctk"], capture_output=True, text=True)
+        self.assertFalse(probe_io.exists("/opt/dell/dcc/cctk"))
+        batteries = probe_io.value("upower-batteries", lambda: {"BAT0": 1}, {})
+        self.assertEqual(batteries, {})
+        self.assertEqual(len(replay.misses), 3)
+
+        self.use(probe_io.ReplayBackend(make_bundle(), strict=True))
+        with self.assertRaises(probe_io.ProbeNotRecorded):
+            probe_io.exists("/opt/dell/dcc/cctk")
+
+    @patch("probe_io.time.sleep")
+    def test_latency_simulation(self, mock_sleep):
+        bundle = make_bundle(
+            {
+                "kind": "check",
+                "op": "exists",
+                "path": "/x",
+                "result": True,
+                "latency_ms": 400,
+            }
+        )
+        self.use(probe_io.ReplayBackend(bundle, latency_scale=0.5))
+        self.assertTrue(probe_io.exists("/x"))
+        mock_sleep.assert_called_once_with(0.2)
+
+    def test_rejects_other_versions(self):
+        bundle = make_bundle()
+        bundle["version"] = probe_io.BUNDLE_VERSION + 1
+        with patch("builtins.open", mock_open(read_data=json.dumps(bundle))):
+            with self.assertRaises(ValueError):
+                probe_io.load_bundle("future.json")
+
+
+class TestRecordedBundles(unittest.TestCase):
+    """Utils must still read each recorded machine the same way."""
+
+    def test_bundles_replay_to_expected(self):
+        paths = sorted(glob.glob(os.path.join(BUNDLE_DIR, "*.json")))
+        self.assertTrue(paths)
+        for path in paths:
+            with self.subTest(bundle=os.path.basename(path)):
+                bundle = probe_io.load_bundle(path)
+                # Landscape is queried with sudo for the workflow users
+                with patch.dict(os.environ, {"USER": "osload"}):
+                    results, replay = record_probes.replay(bundle)
+                self.assertEqual(replay.misses, [])
+                self.assertEqual(results, bundle["expected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
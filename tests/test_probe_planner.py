@@ -0,0 +1,202 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import probe_io
+import probe_planner
+from probe_planner import ProbeHistory, ProbePlanner
+
+
+class TestProbePlanner(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "probe-history.json")
+        self.history = ProbeHistory(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _planner(self, model="Latitude 5490"):
+        return ProbePlanner("Dell Inc.", model, history=self.history, active=True)
+
+    def _seed(self, probe, samples, model="Latitude 5490"):
+        for ms, answered in samples:
+            self.history.record(f"Dell Inc.|{model}", probe, ms, answered)
+
+    def test_history_persists_per_model(self):
+        self._seed("a", [(10, True)])
+        stats = ProbeHistory(self.path).stats("Dell Inc.|Latitude 5490", "a")
+        self.assertEqual(stats["samples"], [[10, True]])
+        self.assertEqual(
+            ProbeHistory(self.path).stats("Dell Inc.|Latitude 7490", "a")["samples"],
+            [],
+        )
+
+    def test_history_keeps_recent_samples(self):
+        self._seed("a", [(i, True) for i in range(probe_planner.MAX_SAMPLES + 5)])
+        samples = self.history.stats("Dell Inc.|Latitude 5490", "a")["samples"]
+        self.assertEqual(len(samples), probe_planner.MAX_SAMPLES)
+        self.assertEqual(samples[-1][0], probe_planner.MAX_SAMPLES + 4)
+
+    def test_unreadable_history_is_ignored(self):
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(ProbeHistory(self.path).stats("x", "a")["samples"], [])
+
+    def test_first_answer_keeps_priority_order(self):
+        # A faster heuristic never answers before the authoritative source
+        self._seed("fw", [(900, True)] * 3)
+        self._seed("dmi", [(20, True)] * 3)
+        calls = []
+        with redirect_stdout(io.StringIO()):
+            result = self._planner().first_answer(
+                [
+                    ("fw", lambda: calls.append("fw") or False),
+                    ("dmi", lambda: calls.append("dmi") or True),
+                ]
+            )
+        self.assertFalse(result)
+        self.assertEqual(calls, ["fw"])
+
+    def test_skip_after_repeated_non_answers(self):
+        planner = self._planner()
+        self.assertIsNone(planner.skip_reason("cctk"))
+        self._seed("cctk", [(300, False)] * probe_planner.MIN_RUNS)
+        self.assertIn("no answer", planner.skip_reason("cctk"))
+        # Other models keep running it
+        self.assertIsNone(self._planner("Latitude 7490").skip_reason("cctk"))
+
+    def test_skipped_probe_is_retried(self):
+        self._seed("cctk", [(300, False)] * probe_planner.MIN_RUNS)
+        for _ in range(probe_planner.RETRY_AFTER_SKIPS):
+            self.history.record_skip("Dell Inc.|Latitude 5490", "cctk")
+        self.assertIsNone(self._planner().skip_reason("cctk"))
+
+    def test_time_box_from_answered_runs(self):
+        planner = self._planner()
+        self._seed("glx", [(100, True), (900, True)])
+        self.assertIsNone(planner.time_box("glx"))
+        self._seed("glx", [(1000, True)])
+        self.assertEqual(planner.time_box("glx"), probe_planner.TIME_BOX_FACTOR)
+        self._seed("fw", [(1, True)] * 3)
+        self.assertEqual(planner.time_box("fw"), probe_planner.MIN_TIME_BOX)
+
+    def test_run_records_outcome(self):
+        planner = self._planner()
+        self.assertEqual(planner.run("a", lambda: False), False)
+        self.assertIsNone(planner.run("a", lambda: None))
+        samples = self.history.stats(planner.model_key, "a")["samples"]
+        self.assertEqual([ok for _, ok in samples], [True, False])
+
+    def test_run_stops_commands_at_time_box(self):
+        planner = self._planner()
+
+        def probe():
+            return probe_io.run(["sleep", "5"])
+
+        with patch.object(planner, "time_box", return_value=0.05):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                self.assertIsNone(planner.run("sleepy", probe))
+        self.assertIn("sleepy stopped at its 0.1s time box", out.getvalue())
+        samples = self.history.stats(planner.model_key, "sleepy")["samples"]
+        self.assertEqual(samples[0][1], False)
+        self.assertLess(samples[0][0], 2000)
+
+    def test_time_box_seen_when_probe_catches_timeout(self):
+        # Probes like the Computrace checks catch SubprocessError themselves
+        planner = self._planner()
+
+        def probe():
+            try:
+                probe_io.run(["sleep", "5"])
+            except subprocess.SubprocessError:
+                pass
+            return False
+
+        with patch.object(planner, "time_box", return_value=0.05):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                self.assertIsNone(planner.run("cctk", probe))
+        self.assertIn("cctk stopped at its 0.1s time box", out.getvalue())
+
+    def test_first_answer_skips_and_logs(self):
+        # Answered before, but not lately (e.g. after a BIOS update)
+        self._seed("cctk", [(300, True)] * 3 + [(300, False)] * 3)
+        calls = []
+
+        def probe(name, result):
+            return (name, lambda: calls.append(name) or result)
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            result = self._planner().first_answer(
+                [probe("fw", None), probe("cctk", True), probe("dmi", False)]
+            )
+        self.assertFalse(result)
+        self.assertEqual(calls, ["fw", "dmi"])
+        self.assertIn("skipping cctk", out.getvalue())
+
+    def test_first_answer_always_runs_last_probe(self):
+        self._seed("fw", [(5, False)] * 3)
+        self._seed("dmi", [(5, False)] * 3)
+        calls = []
+        with redirect_stdout(io.StringIO()):
+            self._planner().first_answer(
+                [
+                    ("fw", lambda: calls.append("fw")),
+                    ("dmi", lambda: calls.append("dmi")),
+                ]
+            )
+        self.assertEqual(calls, ["dmi"])
+
+    def test_inactive_planner_skips_nothing_and_records_nothing(self):
+        self._seed("cctk", [(300, False)] * 3)
+        planner = ProbePlanner(
+            "Dell Inc.", "Latitude 5490", history=self.history, active=False
+        )
+        self.assertIsNone(planner.skip_reason("cctk"))
+        planner.run("fw", lambda: True)
+        self.assertEqual(self.history.stats(planner.model_key, "fw")["samples"], [])
+
+    def test_replay_backend_disables_planner(self):
+        previous = probe_io.set_backend(probe_io.ReplayBackend({"probes": []}))
+        try:
+            planner = ProbePlanner("Dell Inc.", "Latitude 5490", history=self.history)
+        finally:
+            probe_io.set_backend(previous)
+        self.assertFalse(planner.active)
+
+
+class TestTimeBox(unittest.TestCase):
+    def test_passes_remaining_time_as_timeout(self):
+        with patch("subprocess.run") as mock_run:
+            with probe_io.time_box(30):
+                probe_io.run(["true"])
+            probe_io.run(["true"])
+        self.assertLessEqual(mock_run.call_args_list[0].kwargs["timeout"], 30)
+        self.assertNotIn("timeout", mock_run.call_args_list[1].kwargs)
+
+    def test_expired_box_raises(self):
+        with probe_io.time_box(0) as box:
+            with self.assertRaises(subprocess.TimeoutExpired):
+                probe_io.run(["true"])
+        self.assertTrue(box.expired)
+
+    def test_own_timeout_does_not_expire_box(self):
+        with probe_io.time_box(30) as box:
+            with self.assertRaises(subprocess.TimeoutExpired):
+                probe_io.run(["sleep", "5"], timeout=0.05)
+        self.assertFalse(box.expired)
+
+
+if __name__ == "__main__":
+    unittest.main()
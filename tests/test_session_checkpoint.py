@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+from session_checkpoint import SessionCheckpoint, read_boot_id
+
+
+class TestSessionCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _checkpoint(self, serial="SN123", boot_id="boot-a", workflow="spec"):
+        return SessionCheckpoint(
+            workflow, serial, boot_id=boot_id, directory=self.directory
+        )
+
+    def test_round_trip(self):
+        session = {
+            "page": 2,
+            "sortly": {"knumber": "K-123456", "existing_item": {"id": 7}},
+            "manualtest": {"results": {"USB": True, "WebCam": "N/A"}},
+        }
+        self.assertTrue(self._checkpoint().save(session))
+        self.assertEqual(self._checkpoint().load(), session)
+
+    def test_load_missing_returns_none(self):
+        self.assertIsNone(self._checkpoint().load())
+
+    def test_other_boot_is_ignored(self):
+        self._checkpoint(boot_id="boot-a").save({"page": 1})
+        self.assertIsNone(self._checkpoint(boot_id="boot-b").load())
+
+    def test_other_serial_is_ignored(self):
+        self._checkpoint(serial="SN123").save({"page": 1})
+        self.assertIsNone(self._checkpoint(serial="SN999").load())
+
+    def test_workflows_use_separate_files(self):
+        self._checkpoint(workflow="spec").save({"page": 1})
+        self.assertIsNone(self._checkpoint(workflow="osload").load())
+
+    def test_unchanged_session_is_not_rewritten(self):
+        checkpoint = self._checkpoint()
+        self.assertTrue(checkpoint.save({"page": 1, "disks": ("sda",)}))
+        self.assertFalse(checkpoint.save({"page": 1, "disks": ["sda"]}))
+        self.assertTrue(checkpoint.save({"page": 2, "disks": ["sda"]}))
+
+    def test_clear_removes_file(self):
+        checkpoint = self._checkpoint()
+        checkpoint.save({"page": 1})
+        checkpoint.clear()
+        self.assertFalse(os.path.exists(checkpoint.path))
+        self.assertIsNone(checkpoint.load())
+        # Clearing twice is harmless
+        checkpoint.clear()
+
+    def test_corrupt_file_is_ignored(self):
+        checkpoint = self._checkpoint()
+        with open(checkpoint.path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(checkpoint.load())
+
+    def test_disabled_without_serial(self):
+        checkpoint = self._checkpoint(serial="")
+        self.assertFalse(checkpoint.save({"page": 1}))
+        self.assertFalse(os.path.exists(checkpoint.path))
+        self.assertIsNone(checkpoint.load())
+
+    def test_file_records_identity(self):
+        checkpoint = self._checkpoint()
+        checkpoint.save({"page": 3})
+        with open(checkpoint.path) as f:
+            data = json.load(f)
+        self.assertEqual(data["serial"], "SN123")
+        self.assertEqual(data["boot_id"], "boot-a")
+        self.assertEqual(data["workflow"], "spec")
+
+    def test_read_boot_id(self):
+        path = os.path.join(self.directory, "boot_id")
+        with open(path, "w") as f:
+            f.write("abc-123\n")
+        self.assertEqual(read_boot_id(path), "abc-123")
+        self.assertIsNone(read_boot_id(os.path.join(self.directory, "missing")))
+
+
+if __name__ == "__main__":
+    unittest.main()
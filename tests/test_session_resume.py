@@ -0,0 +1,127 @@
+import os
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk
+
+from knum import KramdenNumber
+from observable import StateStore
+from osload import WizardWindow
+from sortly_register import SortlyRegister
+from task_executor import TaskExecutor
+
+
+@unittest.skipUnless(Gtk.init_check(), "needs a display")
+class TestOSLoadResume(unittest.TestCase):
+    def setUp(self):
+        # Main-loop callbacks are queued and run on the test thread
+        self.pending = []
+        self.executor = TaskExecutor(
+            max_workers=1, dispatch=lambda cb, *args: self.pending.append((cb, args))
+        )
+        for module in ("knum", "osload"):
+            patcher = patch(f"{module}.get_executor", return_value=self.executor)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _window(self):
+        state = StateStore({"KramdenNumber": False, "Landscape": False, "SysInfo": False})
+        page1 = KramdenNumber()
+        page1.state = state
+        pages = [page1] + [MagicMock(skip=False, title="") for _ in range(3)]
+        window = SimpleNamespace(
+            page1=pages[0],
+            page2=pages[1],
+            page3=pages[2],
+            page4=pages[3],
+            _visible_page=page1,
+            title_widget=MagicMock(),
+            save_checkpoint=MagicMock(),
+            update_buttons=MagicMock(),
+        )
+        visible = {"page": page1}
+
+        def set_visible_child_name(name):
+            visible["page"] = pages[int(name[-1]) - 1]
+            WizardWindow.on_visible_page_changed(window, window.stack, None)
+
+        window.stack = SimpleNamespace(
+            set_visible_child_name=set_visible_child_name,
+            get_visible_child=lambda: visible["page"],
+        )
+        return window
+
+    def test_resume_past_identify_unlocks_page(self):
+        window = self._window()
+        release = threading.Event()
+
+        def hostname(_self):
+            release.wait(5)
+            return "ubuntu"
+
+        saved = {
+            "page": 2,
+            "knumber": {"knumber": "K-123456", "system_info": {"Model": "X"}},
+        }
+        with patch("knum.Utils.get_hostname", hostname):
+            WizardWindow._resume(window, saved)
+            handle = self.executor._active.get("knum-restore")
+            release.set()
+            self.assertTrue(handle.wait(5))
+            for callback, args in self.pending:
+                callback(*args)
+
+        page1 = window.page1
+        self.assertTrue(page1.knumber_entry.get_sensitive())
+        self.assertTrue(page1.register_button.get_sensitive())
+        self.assertFalse(page1.skip)
+        self.assertNotEqual(page1.status_label.get_label(), "Resuming session...")
+
+
+@unittest.skipUnless(Gtk.init_check(), "needs a display")
+class TestSpecResume(unittest.TestCase):
+    def setUp(self):
+        self.pending = []
+        self.executor = TaskExecutor(
+            max_workers=1, dispatch=lambda cb, *args: self.pending.append((cb, args))
+        )
+        patcher = patch("sortly_register.get_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_missing_system_info_probed_off_main_thread(self):
+        page = SortlyRegister()
+        release = threading.Event()
+        main_thread = threading.current_thread()
+        probed_on = []
+
+        def probe():
+            probed_on.append(threading.current_thread())
+            release.wait(5)
+            return {"Brand": "Dell"}
+
+        with patch("sortly_register.get_system_info", probe):
+            page.restore_checkpoint({"knumber": "K-123456"})
+            self.assertFalse(page.knumber_entry.get_sensitive())
+            handle = self.executor._active.get("sortly-restore")
+            release.set()
+            self.assertTrue(handle.wait(5))
+            for callback, args in self.pending:
+                callback(*args)
+
+        self.assertNotIn(main_thread, probed_on)
+        self.assertEqual(page._system_info, {"Brand": "Dell"})
+        self.assertTrue(page.knumber_entry.get_sensitive())
+        self.assertTrue(page.search_button.get_sensitive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import http.server
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+import snap_status
+
+
+class FakeSnapd(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, snaps, status=200):
+        self.snaps = snaps
+        self.status = status
+        self.requests = []
+        super().__init__(path, FakeSnapdHandler)
+
+
+class FakeSnapdHandler(http.server.BaseHTTPRequestHandler):
+    def address_string(self):
+        return "snapd-client"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.server.status == 200:
+            body = {"type": "sync", "status-code": 200, "result": self.server.snaps}
+        else:
+            body = {"type": "error", "result": {"message": "access denied"}}
+        data = json.dumps(body).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestSnapStatus(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = os.path.join(tmp.name, "snapd.socket")
+        self.snaps_dir = os.path.join(tmp.name, "snaps")
+        os.mkdir(self.snaps_dir)
+
+    def serve(self, snaps, status=200):
+        server = FakeSnapd(self.socket_path, snaps, status)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_query_snaps(self):
+        self.serve([{"name": "firefox", "version": "131.0"}, {"name": "core22"}])
+        self.assertEqual(
+            snap_status.query_snaps(self.socket_path),
+            {"firefox": "131.0", "core22": None},
+        )
+
+    def test_error_response(self):
+        self.serve([], status=403)
+        with self.assertRaises(OSError):
+            snap_status.query_snaps(self.socket_path)
+
+    def test_check_cached_until_snaps_change(self):
+        server = self.serve([{"name": "firefox", "version": "131.0"}])
+        status = snap_status.SnapStatus(self.socket_path, self.snaps_dir)
+        self.assertEqual(
+            status.check(["firefox", "vlc"]), {"firefox": True, "vlc": False}
+        )
+        self.assertEqual(status.versions(["firefox"]), {"firefox": "131.0"})
+        self.assertEqual(len(server.requests), 1)
+
+        server.snaps.append({"name": "vlc", "version": "3.0.20"})
+        open(os.path.join(self.snaps_dir, "vlc_3777.snap"), "w").close()
+        os.utime(self.snaps_dir, ns=(0, 1))
+        self.assertEqual(status.check(["vlc"]), {"vlc": True})
+        self.assertEqual(len(server.requests), 2)
+
+    def test_snapd_unavailable(self):
+        status = snap_status.SnapStatus(self.socket_path, self.snaps_dir)
+        self.assertEqual(status.check(["firefox"]), {"firefox": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+from stall_watchdog import StallWatchdog, install_from_env
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStallWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "logs", "stalls.log")
+        self.clock = FakeClock()
+        self.watchdog = StallWatchdog(
+            "test", 200, log_path=self.log_path, clock=self.clock
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_no_stall_when_beating(self):
+        for _ in range(5):
+            self.clock.now += 0.05
+            self.watchdog.beat()
+            self.assertIsNone(self.watchdog.check())
+        self.assertFalse(os.path.exists(self.log_path))
+
+    def test_stall_is_logged_after_recovery(self):
+        self.watchdog.beat()
+        self.clock.now += 0.5
+        # Stalled: stack captured, nothing logged yet
+        self.assertIsNone(self.watchdog.check())
+        self.assertFalse(os.path.exists(self.log_path))
+        self.clock.now += 0.25
+        self.watchdog.beat()
+        stall = self.watchdog.check()
+        self.assertEqual(stall["duration_ms"], 750)
+        with open(self.log_path) as f:
+            log = f.read()
+        self.assertIn("test: main loop stalled 750 ms", log)
+        # The main thread is this test, so its stack names this method
+        self.assertIn("test_stall_is_logged_after_recovery", log)
+
+    def test_stall_logged_once(self):
+        self.watchdog.beat()
+        self.clock.now += 0.5
+        self.watchdog.check()
+        self.clock.now += 0.5
+        self.assertIsNone(self.watchdog.check())
+        self.watchdog.beat()
+        self.assertIsNotNone(self.watchdog.check())
+        self.assertIsNone(self.watchdog.check())
+
+    def test_install_from_env_disabled_by_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(install_from_env("test"))
+
+    def test_install_from_env_ignores_invalid_value(self):
+        with patch.dict(os.environ, {"KRAMDEN_STALL_WATCHDOG": "soon"}):
+            self.assertIsNone(install_from_env("test"))
+
+
+if __name__ == "__main__":
+    unittest.main()
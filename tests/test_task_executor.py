@@ -0,0 +1,139 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../src/")
+
+from task_executor import PRIORITY_HIGH, PRIORITY_LOW, TaskCancelled, TaskExecutor
+
+
+class TestTaskExecutor(unittest.TestCase):
+    def setUp(self):
+        # Deliver "main loop" callbacks inline so results are observable
+        self.delivered = []
+        self.executor = TaskExecutor(max_workers=1, dispatch=self._dispatch)
+
+    def _dispatch(self, callback, *args):
+        callback(*args)
+
+    def _wait_all(self, *handles):
+        for handle in handles:
+            self.assertTrue(handle.wait(5))
+
+    def test_result_delivered_to_on_done(self):
+        handle = self.executor.submit(
+            "add", lambda token, a, b: a + b, 2, 3, on_done=self.delivered.append
+        )
+        self._wait_all(handle)
+        self.assertEqual(self.delivered, [5])
+
+    def test_error_delivered_to_on_error(self):
+        def fail(token):
+            raise ValueError("boom")
+
+        handle = self.executor.submit(
+            "fail", fail, on_error=lambda e: self.delivered.append(str(e))
+        )
+        self._wait_all(handle)
+        self.assertEqual(self.delivered, ["boom"])
+
+    def test_duplicate_name_is_not_queued_twice(self):
+        release = threading.Event()
+        calls = []
+
+        def slow(token):
+            calls.append(1)
+            release.wait(5)
+
+        first = self.executor.submit("search", slow)
+        second = self.executor.submit("search", slow)
+        self.assertIs(first, second)
+        release.set()
+        self._wait_all(first)
+        self.assertEqual(calls, [1])
+
+    def test_name_can_be_reused_after_completion(self):
+        first = self.executor.submit("gather", lambda token: 1)
+        self._wait_all(first)
+        second = self.executor.submit("gather", lambda token: 2)
+        self.assertIsNot(first, second)
+        self._wait_all(second)
+
+    def test_cancel_owner_drops_result(self):
+        started = threading.Event()
+        release = threading.Event()
+        owner = object()
+        cancelled = []
+
+        def slow(token):
+            started.set()
+            release.wait(5)
+            return "late"
+
+        handle = self.executor.submit(
+            "lookup",
+            slow,
+            owner=owner,
+            on_done=self.delivered.append,
+            on_cancelled=lambda: cancelled.append(True),
+        )
+        started.wait(5)
+        self.executor.cancel_owner(owner)
+        release.set()
+        self._wait_all(handle)
+        self.assertEqual(self.delivered, [])
+        self.assertEqual(cancelled, [True])
+
+    def test_cancel_owner_leaves_other_owners(self):
+        handle = self.executor.submit(
+            "other", lambda token: "ok", owner=object(), on_done=self.delivered.append
+        )
+        self.executor.cancel_owner(object())
+        self._wait_all(handle)
+        self.assertEqual(self.delivered, ["ok"])
+
+    def test_raise_if_cancelled_stops_task(self):
+        started = threading.Event()
+        release = threading.Event()
+        steps = []
+
+        def steps_task(token):
+            started.set()
+            release.wait(5)
+            token.raise_if_cancelled()
+            steps.append("after")
+
+        handle = self.executor.submit("steps", steps_task)
+        started.wait(5)
+        handle.cancel()
+        release.set()
+        self._wait_all(handle)
+        self.assertEqual(steps, [])
+
+    def test_priority_order(self):
+        release = threading.Event()
+        order = []
+        blocker = self.executor.submit("blocker", lambda token: release.wait(5))
+        low = self.executor.submit("low", lambda token: order.append("low"), priority=PRIORITY_LOW)
+        high = self.executor.submit("high", lambda token: order.append("high"), priority=PRIORITY_HIGH)
+        release.set()
+        self._wait_all(blocker, low, high)
+        self.assertEqual(order, ["high", "low"])
+
+    def test_token_post_suppressed_after_cancel(self):
+        posted = []
+
+        def task(token):
+            token.post(posted.append, "first")
+            token.cancel()
+            token.post(posted.append, "second")
+            raise TaskCancelled()
+
+        handle = self.executor.submit("post", task)
+        self._wait_all(handle)
+        self.assertEqual(posted, ["first"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + "/../benchmarks/")
+
+import tti
+
+
+class TestPercentile(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(tti.percentile([], 50))
+
+    def test_single_value(self):
+        self.assertEqual(tti.percentile([42.0], 90), 42.0)
+
+    def test_interpolates(self):
+        values = [40, 10, 30, 20]
+        self.assertEqual(tti.percentile(values, 0), 10)
+        self.assertEqual(tti.percentile(values, 50), 25)
+        self.assertEqual(tti.percentile(values, 100), 40)
+        self.assertAlmostEqual(tti.percentile(values, 90), 37)
+
+
+class TestSummarise(unittest.TestCase):
+    def test_missing_marks_are_skipped(self):
+        samples = [
+            {"first-frame": 100.0, "page-ready": 150.0, "gather-complete": 900.0},
+            {"first-frame": 120.0, "page-ready": 170.0},
+        ]
+        summary = tti.summarise(samples)
+        self.assertEqual(summary["first-frame"]["n"], 2)
+        self.assertEqual(summary["first-frame"]["p50"], 110.0)
+        self.assertEqual(summary["first-frame"]["max"], 120.0)
+        self.assertEqual(summary["gather-complete"]["n"], 1)
+        self.assertEqual(summary["gather-complete"]["p90"], 900.0)
+
+    def test_no_samples(self):
+        summary = tti.summarise([])
+        self.assertEqual(
+            summary["page-ready"], {"n": 0, "p50": None, "p90": None, "max": None}
+        )
+
+
+class TestReadMarks(unittest.TestCase):
+    def test_relative_to_exec(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".marks", delete=False) as f:
+            f.write(json.dumps({"mark": "first-frame", "t": 10.25}) + "\n")
+            f.write(json.dumps({"mark": "page-ready", "t": 10.5}) + "\n")
+            path = f.name
+        try:
+            self.assertEqual(
+                tti.read_marks(path, 10.0),
+                {"first-frame": 250.0, "page-ready": 500.0},
+            )
+        finally:
+            os.unlink(path)
+
+    def test_missing_file(self):
+        self.assertEqual(tti.read_marks("/nonexistent/run.marks", 0.0), {})
+
+
+class TestFixtureCommands(unittest.TestCase):
+    def run_shim(self, *command):
+        env = dict(
+            os.environ,
+            PATH=tti.SHIM_DIR + os.pathsep + os.environ.get("PATH", ""),
+            KRAMDEN_BENCH_FIXTURES=tti.DEFAULT_FIXTURES,
+        )
+        return subprocess.run(command, env=env, capture_output=True, text=True)
+
+    def test_sudo_runs_fixture(self):
+        result = self.run_shim("sudo", "hostnamectl", "status", "--json=pretty")
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(json.loads(result.stdout)["HardwareSerial"], "BENCH01")
+
+    def test_dmidecode_type(self):
+        result = self.run_shim("sudo", "dmidecode", "-t", "17")
+        self.assertEqual(result.stdout.count("\tSize: 8 GB"), 2)
+
+    def test_missing_fixture_fails(self):
+        result = self.run_shim("dmidecode", "-t", "4")
+        self.assertNotEqual(result.returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,12 @@ import os
 import unittest
 import json
 import subprocess
+import tempfile
 from unittest.mock import patch, mock_open, MagicMock
 sys.path.insert(1, os.path.dirname(os.path.realpath(__file__))+"/../src/")
 from utils import Utils
+import firmware_attrs
+import probe_planner
 
 class TestUtils(unittest.TestCase):
     def setUp(self):
@@ -28,6 +31,10 @@ class TestUtils(unittest.TestCase):
 
         # Create a Utils instance
         self.utils = Utils()
+        # Keep these tests out of the real probe history
+        self.utils._probe_planner = probe_planner.ProbePlanner(
+            self.utils.vendor, self.utils.model, active=False
+        )
 
     def tearDown(self):
         patch.stopall()
@@ -144,105 +151,63 @@ class TestUtils(unittest.TestCase):
         # The DMI fallback also fails, so serial should be empty
         self.assertEqual(utils.get_serial(), "")
 
-    @patch('utils.Utils._get_drive_type')
-    @patch('utils.pyudev.Context')
-    def test_get_disks(self, mock_context, mock_get_drive_type):
-        # Create a mock device
-        mock_device = MagicMock()
-        mock_device.__getitem__ = MagicMock(side_effect=lambda key: '/dev/sda' if key == 'DEVNAME' else None)
-        mock_device.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device.get = MagicMock(return_value=None)
-
-        # Setup context to return our mock device
-        mock_context_instance = MagicMock()
-        mock_context_instance.list_devices.return_value = [mock_device]
-        mock_context.return_value = mock_context_instance
-        
-        # Mock drive type detection
-        mock_get_drive_type.return_value = 'SATA SSD'
+    @patch('utils.socket.gethostname', return_value='k-123456')
+    def test_identity_cache_shares_probe(self, mock_gethostname):
+        Utils.enable_identity_cache()
+        try:
+            first = Utils()
+            self.mock_subproc_run.reset_mock()
+            second = Utils()
+            self.mock_subproc_run.assert_not_called()
+            self.assertEqual(second.get_serial(), first.get_serial())
+            self.assertEqual(second.get_vendor(), first.get_vendor())
+            # Hostname is not cached
+            self.assertEqual(second.get_hostname(), 'k-123456')
+        finally:
+            Utils._cache_identity = False
+            Utils._identity_cache = None
+
+    def _block_device(self, name, transport="sata", rotational=False, removable=False):
+        return {
+            "name": name,
+            "path": f"/dev/{name}",
+            "transport": transport,
+            "rotational": rotational,
+            "size": 209715200 * 512,
+            "logical_block_size": 512,
+            "model": "",
+            "serial": "",
+            "removable": removable,
+            "controller": None,
+            "erase": {"methods": [], "discard": False, "write_zeroes": False},
+        }
 
+    @patch('utils.block_devices.inventory')
+    def test_get_disks(self, mock_inventory):
+        mock_inventory.return_value = [self._block_device("sda")]
         # 209715200 * 512 / 1024^3 = 100 GB
         result = self.utils.get_disks()
         self.assertEqual(result, {'/dev/sda': {'size': 100, 'type': 'SATA SSD'}})
 
-    @patch('utils.Utils._get_drive_type')
-    @patch('utils.pyudev.Context')
-    def test_get_disks_filters_dm_prefix(self, mock_context, mock_get_drive_type):
-        """Test that devices with /dev/dm- prefix are filtered out."""
-        # Create mock devices: one normal disk and one with dm- prefix
-        mock_device_sda = MagicMock()
-        mock_device_sda.__getitem__ = MagicMock(side_effect=lambda key: '/dev/sda' if key == 'DEVNAME' else None)
-        mock_device_sda.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device_sda.get = MagicMock(return_value=None)
-
-        mock_device_dm = MagicMock()
-        mock_device_dm.__getitem__ = MagicMock(side_effect=lambda key: '/dev/dm-0' if key == 'DEVNAME' else None)
-        mock_device_dm.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device_dm.get = MagicMock(return_value=None)
-
-        # Setup context to return both devices
-        mock_context_instance = MagicMock()
-        mock_context_instance.list_devices.return_value = [mock_device_sda, mock_device_dm]
-        mock_context.return_value = mock_context_instance
-        
-        # Mock drive type detection
-        mock_get_drive_type.return_value = 'SATA SSD'
-
-        # Only /dev/sda should be included, /dev/dm-0 should be filtered out
-        result = self.utils.get_disks()
-        self.assertEqual(result, {'/dev/sda': {'size': 100, 'type': 'SATA SSD'}})
-
-    @patch('utils.Utils._get_drive_type')
-    @patch('utils.pyudev.Context')
-    def test_get_disks_filters_mapper_path(self, mock_context, mock_get_drive_type):
-        """Test that devices with /mapper/ in the path are filtered out."""
-        # Create mock devices: one normal disk and one with /mapper/ in path
-        mock_device_sda = MagicMock()
-        mock_device_sda.__getitem__ = MagicMock(side_effect=lambda key: '/dev/sda' if key == 'DEVNAME' else None)
-        mock_device_sda.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device_sda.get = MagicMock(return_value=None)
-
-        mock_device_mapper = MagicMock()
-        mock_device_mapper.__getitem__ = MagicMock(side_effect=lambda key: '/dev/mapper/vg-lv' if key == 'DEVNAME' else None)
-        mock_device_mapper.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device_mapper.get = MagicMock(return_value=None)
-
-        # Setup context to return both devices
-        mock_context_instance = MagicMock()
-        mock_context_instance.list_devices.return_value = [mock_device_sda, mock_device_mapper]
-        mock_context.return_value = mock_context_instance
-        
-        # Mock drive type detection
-        mock_get_drive_type.return_value = 'SATA SSD'
-
-        # Only /dev/sda should be included, /dev/mapper/vg-lv should be filtered out
+    @patch('utils.block_devices.inventory')
+    def test_get_disks_drive_types(self, mock_inventory):
+        mock_inventory.return_value = [
+            self._block_device("nvme0n1", transport="nvme"),
+            self._block_device("sda", rotational=True),
+            self._block_device("sdb", rotational=None),
+        ]
         result = self.utils.get_disks()
-        self.assertEqual(result, {'/dev/sda': {'size': 100, 'type': 'SATA SSD'}})
-
-    @patch('utils.Utils._get_drive_type')
-    @patch('utils.pyudev.Context')
-    def test_get_disks_filters_dm_name_property(self, mock_context, mock_get_drive_type):
-        """Test that devices with DM_NAME property are filtered out."""
-        # Create mock devices: one normal disk and one with DM_NAME property
-        mock_device_sda = MagicMock()
-        mock_device_sda.__getitem__ = MagicMock(side_effect=lambda key: '/dev/sda' if key == 'DEVNAME' else None)
-        mock_device_sda.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device_sda.get = MagicMock(return_value=None)
-
-        mock_device_lvm = MagicMock()
-        mock_device_lvm.__getitem__ = MagicMock(side_effect=lambda key: '/dev/sdb' if key == 'DEVNAME' else None)
-        mock_device_lvm.attributes.asint = MagicMock(side_effect=lambda key: 0 if key == 'removable' else 209715200 if key == 'size' else 0)
-        mock_device_lvm.get = MagicMock(side_effect=lambda key: 'vg-lv' if key == 'DM_NAME' else None)
-
-        # Setup context to return both devices
-        mock_context_instance = MagicMock()
-        mock_context_instance.list_devices.return_value = [mock_device_sda, mock_device_lvm]
-        mock_context.return_value = mock_context_instance
-        
-        # Mock drive type detection
-        mock_get_drive_type.return_value = 'SATA SSD'
-
-        # Only /dev/sda should be included, device with DM_NAME should be filtered out
+        self.assertEqual(result['/dev/nvme0n1']['type'], 'NVMe')
+        self.assertEqual(result['/dev/sda']['type'], 'SATA HDD')
+        self.assertEqual(result['/dev/sdb']['type'], 'SATA')
+
+    @patch('utils.block_devices.inventory')
+    def test_get_disks_filters_removable(self, mock_inventory):
+        """Test that removable drives (USB sticks, card readers) are filtered out."""
+        mock_inventory.return_value = [
+            self._block_device("sda"),
+            self._block_device("sdb", transport="usb", removable=True),
+        ]
         result = self.utils.get_disks()
         self.assertEqual(result, {'/dev/sda': {'size': 100, 'type': 'SATA SSD'}})
 
@@ -1281,8 +1246,9 @@ Memory Device
         """Test TEST- with mixed content returns None."""
         self.assertIsNone(Utils.format_knumber("TEST-12a"))
 
+    @patch('probe_io.listdir', side_effect=FileNotFoundError)
     @patch('dbus.SystemBus')
-    def test_get_battery_capacities_single_battery(self, mock_bus):
+    def test_get_battery_capacities_single_battery(self, mock_bus, mock_listdir):
         """Test battery capacity returns BAT0/BAT1 names instead of model."""
         # Mock UPower device
         mock_device = MagicMock()
@@ -1298,7 +1264,9 @@ Memory Device
                 return "/sys/devices/LNXSYSTM:00/LNXSYBUS:00/PNP0A08:00/device:00/PNP0C09:00/PNP0C0A:00/power_supply/BAT0"
             return None
         
-        mock_properties.Get = MagicMock(side_effect=get_property)
+        mock_properties.GetAll = MagicMock(
+            return_value={p: get_property(None, p) for p in ("Type", "Capacity", "NativePath")}
+        )
         
         # Setup dbus mocks
         mock_bus_instance = MagicMock()
@@ -1320,8 +1288,9 @@ Memory Device
             result = self.utils.get_battery_capacities()
             self.assertEqual(result, {"BAT0": 87})
 
+    @patch('probe_io.listdir', side_effect=FileNotFoundError)
     @patch('dbus.SystemBus')
-    def test_get_battery_capacities_multiple_batteries(self, mock_bus):
+    def test_get_battery_capacities_multiple_batteries(self, mock_bus, mock_listdir):
         """Test multiple batteries return BAT0 and BAT1 names."""
         mock_device1 = MagicMock()
         mock_device2 = MagicMock()
@@ -1348,8 +1317,9 @@ Memory Device
                 return "/sys/devices/.../BAT1"
             return None
         
-        mock_properties1.Get = MagicMock(side_effect=get_property1)
-        mock_properties2.Get = MagicMock(side_effect=get_property2)
+        props = ("Type", "Capacity", "NativePath")
+        mock_properties1.GetAll = MagicMock(return_value={p: get_property1(None, p) for p in props})
+        mock_properties2.GetAll = MagicMock(return_value={p: get_property2(None, p) for p in props})
         
         # Setup dbus mocks
         mock_bus_instance = MagicMock()
@@ -1391,8 +1361,72 @@ Memory Device
             result = self.utils.get_battery_capacities()
             self.assertEqual(result, {"BAT0": 87, "BAT1": 78})
 
+    def _power_supplies(self, supplies):
+        """Patch sysfs power_supply with {name: uevent content}."""
+        def read_text(path):
+            name = path.split("/")[-2]
+            if name not in supplies:
+                raise FileNotFoundError(path)
+            return supplies[name]
+        listdir = patch('probe_io.listdir', return_value=list(supplies))
+        read = patch('probe_io.read_text', side_effect=read_text)
+        listdir.start()
+        read.start()
+        self.addCleanup(listdir.stop)
+        self.addCleanup(read.stop)
+
+    def test_get_battery_details_from_sysfs(self):
+        """Energy and charge batteries are read from sysfs without UPower."""
+        self._power_supplies({
+            "AC": "POWER_SUPPLY_NAME=AC\nPOWER_SUPPLY_TYPE=Mains\nPOWER_SUPPLY_ONLINE=1\n",
+            "BAT0": (
+                "POWER_SUPPLY_NAME=BAT0\nPOWER_SUPPLY_TYPE=Battery\n"
+                "POWER_SUPPLY_STATUS=Discharging\nPOWER_SUPPLY_CYCLE_COUNT=312\n"
+                "POWER_SUPPLY_ENERGY_FULL_DESIGN=56000000\nPOWER_SUPPLY_ENERGY_FULL=48720000\n"
+            ),
+            "BAT1": (
+                "POWER_SUPPLY_TYPE=Battery\nPOWER_SUPPLY_STATUS=Full\n"
+                "POWER_SUPPLY_VOLTAGE_MIN_DESIGN=11400000\n"
+                "POWER_SUPPLY_CHARGE_FULL_DESIGN=4000000\nPOWER_SUPPLY_CHARGE_FULL=4100000\n"
+            ),
+            "hidpp_battery_0": (
+                "POWER_SUPPLY_TYPE=Battery\nPOWER_SUPPLY_SCOPE=Device\n"
+                "POWER_SUPPLY_ENERGY_FULL_DESIGN=1\nPOWER_SUPPLY_ENERGY_FULL=1\n"
+            ),
+        })
+        upower_patch = patch.object(self.utils, "_read_upower_batteries")
+        upower = upower_patch.start()
+        self.addCleanup(upower_patch.stop)
+        details = self.utils.get_battery_details()
+        self.assertEqual(details["BAT0"], {
+            "capacity": 87,
+            "cycle_count": 312,
+            "status": "Discharging",
+            "energy_full_wh": 48.72,
+            "energy_full_design_wh": 56.0,
+        })
+        # Capacity is capped at 100% like UPower does
+        self.assertEqual(details["BAT1"]["capacity"], 100)
+        self.assertEqual(details["BAT1"]["energy_full_design_wh"], 45.6)
+        self.assertIsNone(details["BAT1"]["cycle_count"])
+        self.assertEqual(self.utils.get_battery_capacities(), {"BAT0": 87, "BAT1": 100})
+        upower.assert_not_called()
+
+    def test_get_battery_details_falls_back_to_upower(self):
+        """A battery without capacity figures in sysfs defers to UPower."""
+        self._power_supplies({"BAT0": "POWER_SUPPLY_TYPE=Battery\nPOWER_SUPPLY_CAPACITY=80\n"})
+        upower = {"BAT0": {"capacity": 80}}
+        with patch.object(self.utils, "_read_upower_batteries", return_value=upower):
+            self.assertEqual(self.utils.get_battery_capacities(), {"BAT0": 80})
+
 
 class TestHasBiosPassword(unittest.TestCase):
+    HP_WARNING = (
+        "HP BIOS password state could not be determined reliably on this "
+        "firmware (hp-bioscfg exposed malformed authentication entries). "
+        "Verify manually via F10 Setup."
+    )
+
     def setUp(self):
         hostnamectl_json = {
             "StaticHostname": "testhost",
@@ -1407,76 +1441,172 @@ class TestHasBiosPassword(unittest.TestCase):
         mock_result.returncode = 0
         self.mock_subproc_run.return_value = mock_result
         self.utils = Utils()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = firmware_attrs.FirmwareAttributes(self.tmp.name)
+        patch.object(self.utils, "firmware_attributes", return_value=self.index).start()
+        self.commands = {}
+        self.mock_subproc_run.side_effect = self.run_command
 
     def tearDown(self):
         patch.stopall()
+        self.tmp.cleanup()
+
+    def run_command(self, args, **kwargs):
+        returncode, stdout = self.commands.get(tuple(args), (1, ""))
+        return MagicMock(returncode=returncode, stdout=stdout, stderr="")
+
+    def authentication(self, entries):
+        for name, (is_enabled, role) in entries.items():
+            entry_dir = os.path.join(self.tmp.name, "hp-bioscfg", "authentication", name)
+            os.makedirs(entry_dir)
+            with open(os.path.join(entry_dir, "is_enabled"), "w") as f:
+                f.write(is_enabled + "\n")
+            if role is not None:
+                with open(os.path.join(entry_dir, "role"), "w") as f:
+                    f.write(role + "\n")
+
+    def smbios(self, status):
+        self.commands[("sudo", "dmidecode", "-t", "24")] = (
+            0,
+            f"Hardware Security\n\tAdministrator Password Status: {status}\n",
+        )
 
-    @patch.object(Utils, 'file_exists_and_executable', return_value=False)
-    def test_has_bios_password_script_not_present(self, mock_exists):
-        """When the script is absent, return False with no warning."""
+    def test_has_bios_password_nothing_reports(self):
+        """With no firmware attributes and no SMBIOS table, return False with no warning."""
         result = self.utils.has_bios_password()
         self.assertFalse(result)
         self.assertIsNone(self.utils.bios_password_warning)
 
-    @patch('subprocess.run')
-    @patch.object(Utils, 'file_exists_and_executable', return_value=True)
-    def test_has_bios_password_detected_nonzero_exit(self, mock_exists, mock_run):
-        """A nonzero exit code means a password is set; no warning expected."""
-        mock_run.return_value = MagicMock(returncode=1, stderr="")
+    def test_has_bios_password_detected_firmware_attributes(self):
+        """An enabled authentication entry means a password is set; no warning expected."""
+        self.authentication({"Setup_Password": ("1", "bios-admin")})
         result = self.utils.has_bios_password()
         self.assertTrue(result)
         self.assertIsNone(self.utils.bios_password_warning)
 
-    @patch('subprocess.run')
-    @patch.object(Utils, 'file_exists_and_executable', return_value=True)
-    def test_has_bios_password_not_detected(self, mock_exists, mock_run):
-        """Exit 0 with no stderr means no password and no warning."""
-        mock_run.return_value = MagicMock(returncode=0, stderr="")
+    def test_has_bios_password_detected_smbios(self):
+        """SMBIOS Administrator Password Status: Enabled means a password is set."""
+        self.smbios("Enabled")
+        self.assertTrue(self.utils.has_bios_password())
+        self.assertIsNone(self.utils.bios_password_warning)
+
+    def test_has_bios_password_not_detected(self):
+        """All entries disabled means no password and no warning."""
+        self.authentication({"Setup_Password": ("0", "bios-admin")})
+        self.smbios("Disabled")
         result = self.utils.has_bios_password()
         self.assertFalse(result)
         self.assertIsNone(self.utils.bios_password_warning)
 
-    @patch('subprocess.run')
-    @patch.object(Utils, 'file_exists_and_executable', return_value=True)
-    def test_has_bios_password_warning_on_stderr_exit_zero(self, mock_exists, mock_run):
-        """Exit 0 with a WARNING on stderr captures the warning and returns None (indeterminate)."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stderr="WARNING: HP BIOS authentication entries may be unreliable; verify via F10\n"
-        )
+    def test_has_bios_password_malformed_entries_indeterminate(self):
+        """Malformed hp-bioscfg entries give a warning and None (indeterminate)."""
+        self.authentication({"Setup Password\r": ("0", None)})
         result = self.utils.has_bios_password()
         self.assertIsNone(result)
-        self.assertEqual(
-            self.utils.bios_password_warning,
-            "HP BIOS authentication entries may be unreliable; verify via F10"
-        )
+        self.assertEqual(self.utils.bios_password_warning, self.HP_WARNING)
 
-    @patch('subprocess.run')
-    @patch.object(Utils, 'file_exists_and_executable', return_value=True)
-    def test_has_bios_password_warning_on_stderr_nonzero_exit(self, mock_exists, mock_run):
-        """Nonzero exit with a WARNING on stderr still returns True and captures the warning."""
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stderr="WARNING: HP BIOS authentication entries may be unreliable; verify via F10\n"
+    def test_has_bios_password_smbios_disabled_overrides_malformed_entries(self):
+        """SMBIOS saying disabled is trusted over the malformed entries heuristic."""
+        self.authentication({"Setup Password\r": ("0", None)})
+        self.smbios("Disabled")
+        self.assertFalse(self.utils.has_bios_password())
+        self.assertIsNone(self.utils.bios_password_warning)
+
+    def test_has_bios_password_malformed_entries_with_password(self):
+        """A password reported by SMBIOS wins over malformed entries, without a warning."""
+        self.authentication({"Setup Password\r": ("0", None)})
+        self.smbios("Enabled")
+        self.assertTrue(self.utils.has_bios_password())
+        self.assertIsNone(self.utils.bios_password_warning)
+
+    @patch('probe_io.isdir', return_value=False)
+    def test_hp_bioscfg_loaded_before_reading_attributes(self, mock_isdir):
+        """On HP, hp-bioscfg is loaded if it has not been autoloaded."""
+        self.utils.vendor = "HP"
+        Utils.firmware_attributes(self.utils)
+        self.mock_subproc_run.assert_any_call(
+            ["sudo", "modprobe", "hp-bioscfg"], capture_output=True, text=True
         )
-        result = self.utils.has_bios_password()
-        self.assertTrue(result)
-        self.assertEqual(
-            self.utils.bios_password_warning,
-            "HP BIOS authentication entries may be unreliable; verify via F10"
+        self.mock_subproc_run.reset_mock()
+        self.utils.vendor = "LENOVO"
+        self.utils._firmware_attrs = None
+        Utils.firmware_attributes(self.utils)
+        self.mock_subproc_run.assert_not_called()
+
+    @patch('probe_io.executable', return_value=True)
+    def test_has_bios_password_dell_cctk_probe(self, mock_executable):
+        """Without dell-wmi-sysman, cctk exit 65 on the write probe means a password is set."""
+        self.utils.vendor = "Dell Inc."
+        self.commands[("sudo", "/opt/dell/dcc/cctk", "--tpmppiclearoverride=enable")] = (65, "")
+        self.assertTrue(self.utils.has_bios_password())
+        self.commands[("sudo", "/opt/dell/dcc/cctk", "--tpmppiclearoverride=enable")] = (0, "")
+        self.assertFalse(self.utils.has_bios_password())
+
+    @patch('probe_io.executable', return_value=True)
+    def test_has_bios_password_read_only_skips_cctk_probe(self, mock_executable):
+        """The cctk probe writes a BIOS setting, so read-only mode never runs it."""
+        self.utils.vendor = "Dell Inc."
+        self.commands[("sudo", "/opt/dell/dcc/cctk", "--tpmppiclearoverride=enable")] = (65, "")
+        self.assertFalse(self.utils.has_bios_password(read_only=True))
+        for call in self.mock_subproc_run.call_args_list:
+            self.assertNotIn("--tpmppiclearoverride=enable", call.args[0])
+
+
+class TestHasAssetInfo(unittest.TestCase):
+    def setUp(self):
+        self.mock_subproc_run = patch('subprocess.run').start()
+        self.mock_subproc_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps({"HardwareVendor": "Dell Inc.", "HardwareSerial": "SER123"}),
         )
+        self.utils = Utils()
+        patch.object(
+            self.utils,
+            "firmware_attributes",
+            return_value=firmware_attrs.FirmwareAttributes("/nonexistent"),
+        ).start()
+        patch('probe_io.executable', return_value=True).start()
 
-    @patch('subprocess.run')
-    @patch.object(Utils, 'file_exists_and_executable', return_value=True)
-    def test_has_bios_password_only_first_warning_captured(self, mock_exists, mock_run):
-        """Only the first WARNING line on stderr is captured; result is None (indeterminate)."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stderr="WARNING: first warning\nWARNING: second warning\n"
+    def tearDown(self):
+        patch.stopall()
+
+    def test_dell_tags_cleared(self):
+        tags = {"Asset": "K0001", "PropOwnTag": ""}
+
+        def cctk(args, **kwargs):
+            option, _, value = args[-1][2:].partition("=")
+            if args[-1].endswith("="):
+                tags[option] = ""
+            return MagicMock(returncode=0, stdout=f"{option}={tags[option]}\n")
+
+        self.mock_subproc_run.side_effect = cctk
+        self.assertFalse(self.utils.has_asset_info())
+        self.assertEqual(tags["Asset"], "")
+
+    def test_dell_tag_not_cleared(self):
+        self.mock_subproc_run.side_effect = lambda args, **kwargs: MagicMock(
+            returncode=0, stdout="PropOwnTag=Property of ACME\n"
         )
-        result = self.utils.has_bios_password()
-        self.assertIsNone(result)
-        self.assertEqual(self.utils.bios_password_warning, "first warning")
+        self.assertTrue(self.utils.has_asset_info())
+
+    def test_dell_tags_read_only_not_cleared(self):
+        runs = []
+
+        def cctk(args, **kwargs):
+            runs.append(args)
+            return MagicMock(returncode=0, stdout=f"{args[-1][2:]}=K0001\n")
+
+        self.mock_subproc_run.side_effect = cctk
+        self.assertTrue(self.utils.has_asset_info(read_only=True))
+        self.assertFalse([args for args in runs if args[-1].endswith("=")])
+
+    @patch('probe_io.read_bytes')
+    def test_hp_tags_without_serial(self, mock_read):
+        self.utils.vendor = "HP"
+        mock_read.return_value = b"\x07\x00\x00\x00SER123\x00"
+        self.assertFalse(self.utils.has_asset_info())
+        mock_read.return_value = b"\x07\x00\x00\x00SER123K0104611\x00"
+        self.assertTrue(self.utils.has_asset_info())
 
 
 if __name__ == '__main__':